@@ -0,0 +1,49 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+"""Regenerate mmocr/registry_manifest.py, which has to be run after adding,
+renaming or moving a registered module."""
+import os.path as osp
+
+from mmocr.utils import collect_export_manifest, collect_registry_manifest
+
+HEADER = """# Copyright (c) OpenMMLab. All rights reserved.
+# Generated by .dev_scripts/update_registry_manifest.py, do not edit.
+# The modules defining the types registered in the registries of mmocr and
+# the names exported by its lazy packages, so that they are imported on demand.
+# flake8: noqa
+"""
+
+
+def format_dict(name, items):
+    """Format a dict of str keys with one item per line."""
+    lines = [f'{name} = {{']
+    for key, value in items.items():
+        if isinstance(value, dict):
+            lines.append(f'    {key!r}: {{')
+            lines.extend(f'        {k!r}: {v!r},' for k, v in value.items())
+            lines.append('    },')
+        else:
+            lines.append(f'    {key!r}: {value!r},')
+    lines.append('}')
+    return lines
+
+
+def main():
+    registry_manifest = collect_registry_manifest()
+    export_manifest = collect_export_manifest()
+    # yapf only honors the directives attached to statements
+    lines = [HEADER, '# yapf: disable']
+    lines += format_dict('REGISTRY_MANIFEST', registry_manifest)
+    lines += [''] + format_dict('EXPORT_MANIFEST', export_manifest)
+    lines += ['# yapf: enable']
+    path = osp.join(
+        osp.dirname(osp.dirname(osp.abspath(__file__))), 'mmocr',
+        'registry_manifest.py')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    print(f'Saved the manifest of '
+          f'{sum(map(len, registry_manifest.values()))} registered types and '
+          f'{len(export_manifest)} exported names to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -51,6 +51,7 @@ train_pipeline = [
     dict(type='RandomCrop', min_side_ratio=0.1),
     dict(type='Resize', scale=(640, 640), keep_ratio=True),
     dict(type='Pad', size=(640, 640)),
+    dict(type='GenerateTextDetTargets', module_loss=dict(type='DBModuleLoss')),
     dict(
         type='PackTextDetInputs',
         meta_keys=('img_path', 'ori_shape', 'img_shape'))
@@ -14,3 +14,13 @@ model = dict(
             num_sample=50,
             level_proportion_range=((0, 0.25), (0.2, 0.65), (0.55, 1.0))),
         postprocessor=dict(text_repr_type='poly', alpha=1.0, beta=2.0)))
+
+# The targets of the modified module loss
+train_pipeline = _base_.train_pipeline
+train_pipeline[-2] = dict(
+    type='GenerateTextDetTargets',
+    module_loss=dict(
+        type='FCEModuleLoss',
+        fourier_degree=5,
+        num_sample=50,
+        level_proportion_range=((0, 0.25), (0.2, 0.65), (0.55, 1.0))))
@@ -60,6 +60,10 @@ train_pipeline = [
         brightness=32.0 / 255,
         saturation=0.5,
         contrast=0.5),
+    dict(
+        type='GenerateTextDetTargets',
+        module_loss=dict(
+            type='FCEModuleLoss', fourier_degree=5, num_sample=50)),
     dict(
         type='PackTextDetInputs',
         meta_keys=('img_path', 'ori_shape', 'img_shape', 'scale_factor'))
@@ -25,6 +25,8 @@ train_pipeline = [
         op='ColorJitter',
         brightness=32.0 / 255,
         saturation=0.5),
+    dict(
+        type='GenerateTextDetTargets', module_loss=dict(type='PANModuleLoss')),
     dict(
         type='PackTextDetInputs',
         meta_keys=('img_path', 'ori_shape', 'img_shape', 'scale_factor'))
@@ -47,6 +47,8 @@ train_pipeline = [
     dict(type='RandomRotate', max_angle=10),
     dict(type='TextDetRandomCrop', target_size=(736, 736)),
     dict(type='Pad', size=(736, 736)),
+    dict(
+        type='GenerateTextDetTargets', module_loss=dict(type='PSEModuleLoss')),
     dict(
         type='PackTextDetInputs',
         meta_keys=('img_path', 'ori_shape', 'img_shape', 'scale_factor'))
@@ -61,6 +61,9 @@ train_pipeline = [
                     dict(type='Resize', scale=800, keep_ratio=False)],
         prob=[0.4, 0.6]),
     dict(type='RandomFlip', prob=0.5, direction='horizontal'),
+    dict(
+        type='GenerateTextDetTargets',
+        module_loss=dict(type='TextSnakeModuleLoss')),
     dict(
         type='PackTextDetInputs',
         meta_keys=('img_path', 'ori_shape', 'img_shape'))
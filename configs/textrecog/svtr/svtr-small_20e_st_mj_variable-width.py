@@ -0,0 +1,26 @@
+_base_ = [
+    'svtr-small_20e_st_mj.py',
+]
+
+# Keep the aspect ratio of the images at test time instead of resizing them
+# to a fixed size. The weights of svtr-small_20e_st_mj are used as they are.
+model = dict(
+    preprocessor=dict(output_image_size=(32, None), ),
+    encoder=dict(max_seq_len=None))
+
+test_pipeline = [
+    dict(type='LoadImageFromFile'),
+    dict(
+        type='RescaleToHeight',
+        height=64,
+        min_width=64,
+        max_width=None,
+        width_divisor=8),
+    dict(type='LoadOCRAnnotations', with_text=True),
+    dict(
+        type='PackTextRecogInputs',
+        meta_keys=('img_path', 'ori_shape', 'img_shape', 'valid_ratio'))
+]
+
+val_dataloader = dict(dataset=dict(pipeline=test_pipeline))
+test_dataloader = val_dataloader
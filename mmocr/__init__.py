@@ -1,7 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-
-import mmcv
-import mmdet
+from importlib import import_module, metadata
 
 try:
     import mmengine
@@ -12,27 +10,40 @@ except ImportError:
 
 from .version import __version__, short_version
 
+
+def _get_version(package: str) -> str:
+    """Get the version of a package from its metadata, so that checking the
+    versions of mmcv and mmdet does not import them, and torch with them."""
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return import_module(package).__version__
+
+
+mmcv_version_str = _get_version('mmcv')
+mmdet_version_str = _get_version('mmdet')
+
 mmcv_minimum_version = '2.0.0rc4'
 mmcv_maximum_version = '2.2.0'
-mmcv_version = digit_version(mmcv.__version__)
+mmcv_version = digit_version(mmcv_version_str)
 if mmengine is not None:
     mmengine_minimum_version = '0.7.1'
     mmengine_maximum_version = '1.1.0'
     mmengine_version = digit_version(mmengine.__version__)
 
 if not mmengine or mmcv_version < digit_version('2.0.0rc0') or digit_version(
-        mmdet.__version__) < digit_version('3.0.0rc0'):
+        mmdet_version_str) < digit_version('3.0.0rc0'):
     raise RuntimeError(
         'MMOCR 1.0 only runs with MMEngine, MMCV 2.0.0rc0+ and '
         'MMDetection 3.0.0rc0+, but got MMCV '
-        f'{mmcv.__version__} and MMDetection '
-        f'{mmdet.__version__}. For more information, please refer to '
+        f'{mmcv_version_str} and MMDetection '
+        f'{mmdet_version_str}. For more information, please refer to '
         'https://mmocr.readthedocs.io/en/dev-1.x/migration/overview.html'
     )  # noqa
 
 assert (mmcv_version >= digit_version(mmcv_minimum_version)
         and mmcv_version < digit_version(mmcv_maximum_version)), \
-    f'MMCV {mmcv.__version__} is incompatible with MMOCR {__version__}. ' \
+    f'MMCV {mmcv_version_str} is incompatible with MMOCR {__version__}. ' \
     f'Please use MMCV >= {mmcv_minimum_version}, ' \
     f'< {mmcv_maximum_version} instead.'
 
@@ -44,11 +55,11 @@ assert (mmengine_version >= digit_version(mmengine_minimum_version)
 
 mmdet_minimum_version = '3.0.0rc5'
 mmdet_maximum_version = '3.2.0'
-mmdet_version = digit_version(mmdet.__version__)
+mmdet_version = digit_version(mmdet_version_str)
 
 assert (mmdet_version >= digit_version(mmdet_minimum_version)
         and mmdet_version < digit_version(mmdet_maximum_version)), \
-    f'MMDetection {mmdet.__version__} is incompatible ' \
+    f'MMDetection {mmdet_version_str} is incompatible ' \
     f'with MMOCR {__version__}. ' \
     f'Please use MMDetection >= {mmdet_minimum_version}, ' \
     f'< {mmdet_maximum_version} instead.'
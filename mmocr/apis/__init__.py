@@ -1,2 +1,14 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .inferencers import *  # NOQA
+from .export import export_model
+from .inferencers import (ExportedInferencer, InferencerPool, KIEInferencer,
+                          MMOCRInferencer, TextDetInferencer,
+                          TextRecInferencer, TextSpotInferencer)
+from .serving import (InferenceServer, LatencyHistogram, MicroBatcher,
+                      QueueFullError)
+
+__all__ = [
+    'TextDetInferencer', 'TextRecInferencer', 'KIEInferencer',
+    'MMOCRInferencer', 'TextSpotInferencer', 'InferencerPool',
+    'InferenceServer', 'LatencyHistogram', 'MicroBatcher', 'QueueFullError',
+    'ExportedInferencer', 'export_model'
+]
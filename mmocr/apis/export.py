@@ -0,0 +1,177 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+import pickle
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch import Tensor
+
+from .inferencers import TextDetInferencer, TextRecInferencer
+from .inferencers.base_mmocr_inferencer import BaseMMOCRInferencer
+
+EXPORT_BACKENDS = ('torchscript', 'onnx')
+MODEL_FILES = dict(torchscript='model.pt', onnx='model.onnx')
+META_FILE = 'meta.pkl'
+
+
+class TextDetExportWrapper(nn.Module):
+    """The tensor part of a :class:`SingleStageTextDetector`, from the
+    normalized images to the output of the head, e.g. the probability map of
+    DBNet.
+
+    Args:
+        model (nn.Module): The text detector.
+    """
+
+    def __init__(self, model: nn.Module) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, inputs: Tensor) -> Tensor:
+        """
+        Args:
+            inputs (Tensor): Normalized images of shape :math:`(N, C, H, W)`.
+
+        Returns:
+            Tensor: The output of the head.
+        """
+        return self.model.det_head(self.model.extract_feat(inputs), None)
+
+
+class TextRecogExportWrapper(nn.Module):
+    """The tensor part of an :class:`EncoderDecoderRecognizer`, from the
+    normalized images to the character probabilities.
+
+    Args:
+        model (nn.Module): The text recognizer.
+    """
+
+    def __init__(self, model: nn.Module) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, inputs: Tensor) -> Tensor:
+        """
+        Args:
+            inputs (Tensor): Normalized images of shape :math:`(N, C, H, W)`.
+
+        Returns:
+            Tensor: Character probabilities of shape :math:`(N, T, C)`.
+        """
+        feat = self.model.extract_feat(inputs)
+        out_enc = None
+        if self.model.with_encoder:
+            out_enc = self.model.encoder(feat, None)
+        return self.model.decoder.forward_test(feat, out_enc, None)
+
+
+def _get_preprocess_cfg(data_preprocessor: nn.Module) -> Dict:
+    """Get the parameters of an :class:`ImgDataPreprocessor` to reproduce it
+    without building it."""
+    cfg = dict(
+        channel_conversion=data_preprocessor._channel_conversion,
+        pad_size_divisor=data_preprocessor.pad_size_divisor,
+        pad_value=data_preprocessor.pad_value,
+        mean=None,
+        std=None)
+    if data_preprocessor._enable_normalize:
+        cfg['mean'] = data_preprocessor.mean.cpu().numpy()
+        cfg['std'] = data_preprocessor.std.cpu().numpy()
+    return cfg
+
+
+def export_model(inferencer: BaseMMOCRInferencer,
+                 out_dir: str,
+                 backend: str = 'torchscript',
+                 example_shape: Optional[Tuple[int, int]] = None,
+                 dynamic: bool = True,
+                 opset_version: int = 16) -> None:
+    """Export the tensor part of a text detector or recognizer, to be run by
+    :class:`~mmocr.apis.inferencers.ExportedInferencer` without building
+    the model from its config.
+
+    The model is traced on a blank image run through the test pipeline, with
+    dynamic batch and width axes, and a dynamic height axis for detectors.
+    The test pipeline, the parameters of the data preprocessor and the
+    postprocessor are pickled alongside, so that they run in Python around
+    the exported graph.
+
+    Note:
+        Tracing records the operations run on the example, so the models
+        whose control flow depends on the input shape, e.g. autoregressive
+        decoders, may not generalize to other shapes. The exported graph
+        should be checked on inputs of other sizes, as done by
+        ``tools/model_converters/export_model.py``.
+
+    Args:
+        inferencer (TextDetInferencer or TextRecInferencer): The inferencer
+            of the model.
+        out_dir (str): The directory to save ``model.pt`` or ``model.onnx``
+            and ``meta.pkl`` to.
+        backend (str): 'torchscript' or 'onnx'. Defaults to 'torchscript'.
+        example_shape (tuple(int, int), optional): The ``(h, w)`` of the blank
+            image to trace the model on. Defaults to (640, 640) for detectors
+            and (32, 128) for recognizers.
+        dynamic (bool): Whether the axes of the ONNX graph are dynamic. Some
+            models, e.g. SVTR whose encoder pools to a fixed size, can only
+            be exported with static shapes, in which case the batches are
+            split into single images at runtime. Defaults to True.
+        opset_version (int): The ONNX opset version. Defaults to 16.
+    """
+    if backend not in EXPORT_BACKENDS:
+        raise ValueError(f'Invalid backend {backend}, it should be one of '
+                         f'{EXPORT_BACKENDS}')
+    if isinstance(inferencer, TextDetInferencer):
+        task = 'textdet'
+        wrapper = TextDetExportWrapper(inferencer.model)
+        postprocessor = inferencer.model.det_head.postprocessor
+        default_shape = (640, 640)
+        dynamic_axes = {0: 'batch', 2: 'height', 3: 'width'}
+    elif isinstance(inferencer, TextRecInferencer):
+        task = 'textrec'
+        wrapper = TextRecogExportWrapper(inferencer.model)
+        postprocessor = inferencer.model.decoder.postprocessor
+        default_shape = (32, 128)
+        # The test pipelines of the recognizers resize to a fixed height
+        dynamic_axes = {0: 'batch', 3: 'width'}
+    else:
+        raise TypeError('Only TextDetInferencer and TextRecInferencer can be '
+                        f'exported, but got {type(inferencer).__name__}')
+    # Unwrap the fp32 proxy set by ``optimize``
+    postprocessor = getattr(postprocessor, '_postprocessor', postprocessor)
+    wrapper.eval()
+    h, w = example_shape or default_shape
+    data = inferencer.collate_fn(
+        [inferencer.pipeline(np.zeros((h, w, 3), dtype=np.uint8))])
+    inputs = inferencer.model.data_preprocessor(data, False)['inputs']
+
+    os.makedirs(out_dir, exist_ok=True)
+    model_file = osp.join(out_dir, MODEL_FILES[backend])
+    with torch.no_grad():
+        if not isinstance(wrapper(inputs), Tensor):
+            raise TypeError(f'Only the {task} models whose tensor part '
+                            'outputs a single tensor can be exported')
+        if backend == 'torchscript':
+            torch.jit.save(torch.jit.trace(wrapper, inputs), model_file)
+        else:
+            torch.onnx.export(
+                wrapper,
+                inputs,
+                model_file,
+                input_names=['inputs'],
+                output_names=['outputs'],
+                dynamic_axes=dict(inputs=dynamic_axes, outputs={0: 'batch'})
+                if dynamic else None,
+                opset_version=opset_version)
+
+    meta = dict(
+        task=task,
+        backend=backend,
+        pipeline=inferencer.pipeline,
+        preprocess_cfg=_get_preprocess_cfg(inferencer.model.data_preprocessor),
+        postprocessor=postprocessor)
+    with open(osp.join(out_dir, META_FILE), 'wb') as f:
+        pickle.dump(meta, f)
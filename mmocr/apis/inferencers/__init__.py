@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from .exported_inferencer import ExportedInferencer
+from .inferencer_pool import InferencerPool
 from .kie_inferencer import KIEInferencer
 from .mmocr_inferencer import MMOCRInferencer
 from .textdet_inferencer import TextDetInferencer
@@ -7,5 +9,6 @@ from .textspot_inferencer import TextSpotInferencer
 
 __all__ = [
     'TextDetInferencer', 'TextRecInferencer', 'KIEInferencer',
-    'MMOCRInferencer', 'TextSpotInferencer'
+    'MMOCRInferencer', 'TextSpotInferencer', 'InferencerPool',
+    'ExportedInferencer'
 ]
@@ -1,10 +1,14 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import contextlib
 import os.path as osp
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import mmcv
 import mmengine
 import numpy as np
+import torch
+import torch.nn as nn
+from mmengine.config import Config
 from mmengine.dataset import Compose
 from mmengine.infer.infer import BaseInferencer, ModelType
 from mmengine.model.utils import revert_sync_batchnorm
@@ -12,8 +16,13 @@ from mmengine.registry import init_default_scope
 from mmengine.structures import InstanceData
 from rich.progress import track
 from torch import Tensor
+from torch.utils.hooks import RemovableHandle
 
-from mmocr.utils import ConfigType
+from mmocr.registry import MODELS
+from mmocr.utils import (ConfigType, get_active_profiler, load_checkpoint_mmap,
+                         load_config, load_metafile_index, profile_span,
+                         quantize_dynamic, quantize_static, skip_init)
+from mmocr.utils.model_cache import checkpoint_covers, get_local_checkpoint
 
 InstanceList = List[InstanceData]
 InputType = Union[str, np.ndarray]
@@ -22,6 +31,37 @@ PredType = Union[InstanceData, InstanceList]
 ImgType = Union[np.ndarray, Sequence[np.ndarray]]
 ResType = Union[Dict, List[Dict], InstanceData, List[InstanceData]]
 
+PRECISIONS = {'fp32': None, 'bf16': torch.bfloat16, 'fp16': torch.float16}
+
+
+def _to_float32(data):
+    """Cast the floating point tensors in nested lists, tuples and dicts to
+    float32."""
+    if isinstance(data, Tensor):
+        return data.float() if data.is_floating_point() else data
+    if isinstance(data, (list, tuple)):
+        return type(data)(_to_float32(item) for item in data)
+    if isinstance(data, dict):
+        return {key: _to_float32(value) for key, value in data.items()}
+    return data
+
+
+class _Float32Postprocessor:
+    """Proxy running a postprocessor in fp32 outside of autocast, so that
+    thresholds are applied to full precision maps and scores."""
+
+    def __init__(self, postprocessor, device_type: str):
+        self._postprocessor = postprocessor
+        self._device_type = device_type
+
+    def __call__(self, *args, **kwargs):
+        with torch.autocast(self._device_type, enabled=False):
+            return self._postprocessor(*_to_float32(args),
+                                       **_to_float32(kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._postprocessor, name)
+
 
 class BaseMMOCRInferencer(BaseInferencer):
     """Base inferencer.
@@ -40,6 +80,13 @@ class BaseMMOCRInferencer(BaseInferencer):
         device (str, optional): Device to run inference. If None, the available
             device will be automatically used. Defaults to None.
         scope (str, optional): The scope of the model. Defaults to "mmocr".
+
+    Note:
+        The configs parsed and the index of the metafiles are cached in
+        ``$MMOCR_CACHE_DIR``, which defaults to ``~/.cache/mmocr``, and
+        local checkpoints are loaded with memory mapping into models built
+        without initializing their weights. Set ``MMOCR_CACHE_DIR`` to an
+        empty string to disable the cache.
     """
 
     preprocess_kwargs: set = set()
@@ -52,6 +99,11 @@ class BaseMMOCRInferencer(BaseInferencer):
         'print_result', 'return_datasample', 'save_pred'
     }
     loading_transforms: list = ['LoadImageFromFile', 'LoadImageFromNDArray']
+    # The dtype of the autocast around the forward, set by :meth:`optimize`
+    _autocast_dtype: Optional[torch.dtype] = None
+    # The hook converting the inputs of the backbone to channels-last, set by
+    # :meth:`optimize`
+    _channels_last_hook: Optional[RemovableHandle] = None
 
     def __init__(self,
                  model: Union[ModelType, str, None] = None,
@@ -62,10 +114,76 @@ class BaseMMOCRInferencer(BaseInferencer):
         # of ndarray, for naming the output images
         self.num_unnamed_imgs = 0
         init_default_scope(scope)
+        self.scope = scope
+        if isinstance(model, str):
+            if osp.isfile(model):
+                model = load_config(model)
+            else:
+                model, metafile_weights = self._load_model_from_metafile(model)
+                if weights is None:
+                    weights = metafile_weights
         super().__init__(
             model=model, weights=weights, device=device, scope=scope)
         self.model = revert_sync_batchnorm(self.model)
 
+    def _load_model_from_metafile(self, model: str) -> Tuple[Config, str]:
+        """Load config and weights from metafile, with the metafiles and
+        the config cached.
+
+        Args:
+            model (str): model name defined in metafile.
+
+        Returns:
+            Tuple[Config, str]: Loaded Config and weights path defined in
+            metafile.
+        """
+        repo_or_mim_dir = BaseInferencer._get_repo_or_mim_dir(self.scope)
+        index = load_metafile_index(repo_or_mim_dir)
+        if model.lower() not in index:
+            raise ValueError(f'Cannot find model: {model} in {self.scope}')
+        config, weights = index[model.lower()]
+        return load_config(config), weights
+
+    def _init_model(self,
+                    cfg: ConfigType,
+                    weights: Optional[str],
+                    device: str = 'cpu') -> nn.Module:
+        """Initialize the model with the given config and checkpoint on the
+        specific device.
+
+        A local checkpoint, or one downloaded before, is loaded with memory
+        mapping, and the model is built without initializing its weights if
+        the checkpoint overwrites all of them. Otherwise, it falls back to
+        :meth:`BaseInferencer._init_model`.
+
+        Args:
+            cfg (ConfigType): Config containing the model information.
+            weights (str, optional): Path to the checkpoint.
+            device (str, optional): Device to run inference. Defaults to 'cpu'.
+
+        Returns:
+            nn.Module: Model loaded with checkpoint.
+        """
+        filename = get_local_checkpoint(weights) if weights else None
+        checkpoint = load_checkpoint_mmap(filename) if filename else None
+        if not cfg or checkpoint is None:
+            return super()._init_model(cfg, weights, device)
+
+        # Delete the `pretrained` field to prevent model from loading the
+        # the pretrained weights unnecessarily.
+        if cfg.model.get('pretrained') is not None:
+            del cfg.model.pretrained
+        with skip_init():
+            model = MODELS.build(cfg.model)
+        if not checkpoint_covers(model, checkpoint):
+            # The weights missing in the checkpoint need to be initialized
+            model = MODELS.build(cfg.model)
+        model.cfg = cfg
+        self._load_weights_to_model(model, checkpoint, cfg)
+        model.to(device)
+        model.eval()
+        return model
+
     def preprocess(self, inputs: InputsType, batch_size: int = 1, **kwargs):
         """Process the inputs into a model-feedable format.
 
@@ -77,7 +195,52 @@ class BaseMMOCRInferencer(BaseInferencer):
             Any: Data processed by the ``pipeline`` and ``collate_fn``.
         """
         chunked_data = self._get_chunk_data(inputs, batch_size)
-        yield from map(self.collate_fn, chunked_data)
+        yield from map(self._collate, chunked_data)
+
+    def _collate(self, chunk_data: list):
+        """Collate a batch with ``collate_fn`` and record a span for it."""
+        with profile_span('collate', 'preprocess', batch_size=len(chunk_data)):
+            return self.collate_fn(chunk_data)
+
+    def _run_pipeline(self,
+                      inputs: InputType,
+                      pipeline: Optional[Compose] = None) -> Optional[Dict]:
+        """Run an input through a pipeline.
+
+        If an :class:`~mmocr.utils.profiler.InferenceProfiler` is active, the
+        transforms are run one by one to record a span for each of them.
+
+        Args:
+            inputs (InputType): A single input.
+            pipeline (Compose, optional): The pipeline. Defaults to
+                ``self.pipeline``.
+
+        Returns:
+            dict, optional: The output of the pipeline.
+        """
+        if pipeline is None:
+            pipeline = self.pipeline
+        if get_active_profiler() is None:
+            return pipeline(inputs)
+        if isinstance(inputs, dict):
+            name = inputs.get('img_path') or 'ndarray'
+        else:
+            name = inputs if isinstance(inputs, str) else 'ndarray'
+        with profile_span('pipeline', 'preprocess', input=name):
+            for transform in pipeline.transforms:
+                with profile_span(type(transform).__name__, 'transform'):
+                    inputs = transform(inputs)
+                if inputs is None:
+                    return None
+        return inputs
+
+    def _watch_model(self):
+        """Record spans for the submodules of the model while an
+        :class:`~mmocr.utils.profiler.InferenceProfiler` is active."""
+        profiler = get_active_profiler()
+        if profiler is None:
+            return contextlib.nullcontext()
+        return profiler.watch_model(self.model)
 
     def _get_chunk_data(self, inputs: Iterable, chunk_size: int):
         """Get batch data from inputs.
@@ -95,7 +258,7 @@ class BaseMMOCRInferencer(BaseInferencer):
                 chunk_data = []
                 for _ in range(chunk_size):
                     inputs_ = next(inputs_iter)
-                    pipe_out = self.pipeline(inputs_)
+                    pipe_out = self._run_pipeline(inputs_)
                     if pipe_out['data_samples'].get('img_path') is None:
                         pipe_out['data_samples'].set_metainfo(
                             dict(img_path=f'{self.num_unnamed_imgs}.jpg'))
@@ -188,22 +351,156 @@ class BaseMMOCRInferencer(BaseInferencer):
         inputs = self.preprocess(
             ori_inputs, batch_size=batch_size, **preprocess_kwargs)
         results = {'predictions': [], 'visualization': []}
-        for ori_inputs, data in track(
-                inputs, description='Inference', disable=not progress_bar):
-            preds = self.forward(data, **forward_kwargs)
-            visualization = self.visualize(
-                ori_inputs, preds, img_out_dir=img_out_dir, **visualize_kwargs)
-            batch_res = self.postprocess(
-                preds,
-                visualization,
-                return_datasamples,
-                pred_out_dir=pred_out_dir,
-                **postprocess_kwargs)
-            results['predictions'].extend(batch_res['predictions'])
-            if return_vis and batch_res['visualization'] is not None:
-                results['visualization'].extend(batch_res['visualization'])
+        with self._watch_model():
+            for batch_idx, (ori_inputs, data) in enumerate(
+                    track(
+                        inputs,
+                        description='Inference',
+                        disable=not progress_bar)):
+                with profile_span(
+                        type(self).__name__,
+                        'batch',
+                        batch_idx=batch_idx,
+                        batch_size=len(ori_inputs)):
+                    with profile_span('forward', 'forward'), \
+                            self._autocast():
+                        preds = self.forward(data, **forward_kwargs)
+                    with profile_span('visualize', 'visualize'):
+                        visualization = self.visualize(
+                            ori_inputs,
+                            preds,
+                            img_out_dir=img_out_dir,
+                            **visualize_kwargs)
+                    with profile_span('postprocess', 'postprocess'):
+                        batch_res = self.postprocess(
+                            preds,
+                            visualization,
+                            return_datasamples,
+                            pred_out_dir=pred_out_dir,
+                            **postprocess_kwargs)
+                results['predictions'].extend(batch_res['predictions'])
+                if return_vis and batch_res['visualization'] is not None:
+                    results['visualization'].extend(batch_res['visualization'])
         return results
 
+    def quantize(self,
+                 mode: str = 'dynamic',
+                 calib_inputs: Optional[InputsType] = None,
+                 batch_size: int = 1) -> None:
+        """Quantize the model to int8 in place for faster CPU inference.
+
+        Args:
+            mode (str): 'dynamic' quantizes the weights of the Linear and
+                LSTM layers, which suits the recognizers. 'static' quantizes
+                the convolutional backbone with activation ranges calibrated
+                on ``calib_inputs``, which suits the detectors. Defaults to
+                'dynamic'.
+            calib_inputs (InputsType, optional): Representative images to
+                calibrate the static quantization, e.g. a few dozen images
+                of the target domain. Defaults to None.
+            batch_size (int): The batch size of the calibration. Defaults to
+                1.
+        """
+        if mode == 'dynamic':
+            quantize_dynamic(self.model)
+        elif mode == 'static':
+            if calib_inputs is None:
+                raise ValueError('calib_inputs must be specified for the '
+                                 'static quantization')
+            quantize_static(
+                self.model, lambda: self(
+                    calib_inputs, batch_size=batch_size, progress_bar=False))
+        else:
+            raise ValueError(f'Invalid quantization mode {mode}, it should '
+                             'be "dynamic" or "static"')
+
+    def optimize(self,
+                 precision: str = 'fp32',
+                 channels_last: bool = False,
+                 compile: bool = False,
+                 warmup_inputs: Optional[InputsType] = None) -> None:
+        """Set up the model for faster inference.
+
+        Args:
+            precision (str): 'fp32', 'bf16' or 'fp16'. The forward runs under
+                autocast in reduced precision, while the postprocessors get
+                fp32 inputs and run outside of autocast. 'fp16' is only
+                supported on CUDA, and 'bf16' is preferred on CPU. Defaults to
+                'fp32'.
+            channels_last (bool): Whether to run the backbone and the neck,
+                whose inputs and convolution weights are converted, in the
+                channels-last memory format, which is faster for
+                convolutions on recent CPUs and on tensor cores. False reverts
+                the channels-last setup of a previous call. Defaults to False.
+            compile (bool): Whether to compile the backbone, neck and encoder
+                with ``torch.compile``. Compilation happens at the first call
+                of each input shape. Defaults to False.
+            warmup_inputs (InputsType, optional): Inputs run once after the
+                setup, so that the first real call does not pay for the
+                compilation. Defaults to a blank 640x640 image if ``compile``
+                is True, and to no warm-up otherwise.
+        """
+        self._setup_model(precision, channels_last, compile)
+        if compile and warmup_inputs is None:
+            warmup_inputs = np.zeros((640, 640, 3), dtype=np.uint8)
+        if warmup_inputs is not None:
+            self(warmup_inputs, progress_bar=False)
+
+    def _setup_model(self, precision: str, channels_last: bool,
+                     compile: bool) -> None:
+        """Set up the model as described in :meth:`optimize`, without the
+        warm-up."""
+        if precision not in PRECISIONS:
+            raise ValueError(f'Invalid precision {precision}, it should be '
+                             f'one of {list(PRECISIONS)}')
+        device_type = next(self.model.parameters()).device.type
+        if precision == 'fp16' and device_type != 'cuda':
+            raise ValueError('fp16 is only supported on CUDA, please use '
+                             'bf16 on CPU')
+        self._autocast_dtype = PRECISIONS[precision]
+        for child in self.model.children():
+            postprocessor = getattr(child, 'postprocessor', None)
+            if postprocessor is not None and not isinstance(
+                    postprocessor, (nn.Module, _Float32Postprocessor)):
+                child.postprocessor = _Float32Postprocessor(
+                    postprocessor, device_type)
+
+        # The memory format of a previous call is replaced
+        if channels_last or self._channels_last_hook is not None:
+            memory_format = (
+                torch.channels_last
+                if channels_last else torch.contiguous_format)
+            for name in ('backbone', 'neck'):
+                module = getattr(self.model, name, None)
+                if isinstance(module, nn.Module):
+                    module.to(memory_format=memory_format)
+        if self._channels_last_hook is not None:
+            self._channels_last_hook.remove()
+            self._channels_last_hook = None
+        backbone = getattr(self.model, 'backbone', None)
+        if channels_last and isinstance(backbone, nn.Module):
+            self._channels_last_hook = backbone.register_forward_pre_hook(
+                lambda _, inputs: tuple(
+                    x.contiguous(memory_format=torch.channels_last)
+                    if isinstance(x, Tensor) and x.dim() == 4 else x
+                    for x in inputs))
+
+        if compile:
+            for name in ('backbone', 'neck', 'encoder'):
+                module = getattr(self.model, name, None)
+                if isinstance(module, nn.Module):
+                    # Compile the forward only, so that the module structure,
+                    # its state dict and its hooks are kept
+                    module.forward = torch.compile(module.forward)
+
+    def _autocast(self):
+        """The autocast context of the forward set by :meth:`optimize`."""
+        if self._autocast_dtype is None:
+            return contextlib.nullcontext()
+        return torch.autocast(
+            next(self.model.parameters()).device.type,
+            dtype=self._autocast_dtype)
+
     def _init_pipeline(self, cfg: ConfigType) -> Compose:
         """Initialize the test pipeline."""
         pipeline_cfg = cfg.test_dataloader.dataset.pipeline
@@ -0,0 +1,199 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import pickle
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+import mmengine
+import numpy as np
+import torch
+from mmengine.model.utils import stack_batch
+from torch import Tensor
+
+from .base_mmocr_inferencer import BaseMMOCRInferencer, InputsType
+from .textdet_inferencer import TextDetInferencer
+from .textrec_inferencer import TextRecInferencer
+
+
+class ExportedInferencer:
+    """Inferencer of a text detector or recognizer exported by
+    :func:`mmocr.apis.export_model`.
+
+    The exported graph is loaded with TorchScript or ONNX Runtime, and the
+    test pipeline and postprocessor are unpickled, so that neither the config
+    nor the registry is involved. The images are normalized and padded as by
+    the data preprocessor of the model. The predictions have the same format
+    as those of :class:`TextDetInferencer` and :class:`TextRecInferencer`.
+
+    Args:
+        model_dir (str): The directory of the exported model.
+        device (str): The device of the TorchScript graph, or ``'cuda'`` to
+            run the ONNX graph with the CUDA execution provider. Defaults to
+            'cpu'.
+
+    Example:
+        >>> export_model(TextRecInferencer('CRNN'), 'crnn_export')
+        >>> inferencer = ExportedInferencer('crnn_export')
+        >>> inferencer('demo/demo_text_recog.jpg')['predictions']
+    """
+
+    _array2list = BaseMMOCRInferencer._array2list
+    bucket_batches = TextRecInferencer.bucket_batches
+
+    def __init__(self, model_dir: str, device: str = 'cpu') -> None:
+        with open(osp.join(model_dir, 'meta.pkl'), 'rb') as f:
+            meta = pickle.load(f)
+        self.task = meta['task']
+        self.backend = meta['backend']
+        self.pipeline = meta['pipeline']
+        self.postprocessor = meta['postprocessor']
+        self.device = device
+
+        preprocess_cfg = meta['preprocess_cfg']
+        self.channel_conversion = preprocess_cfg['channel_conversion']
+        self.pad_size_divisor = preprocess_cfg['pad_size_divisor']
+        self.pad_value = preprocess_cfg['pad_value']
+        self.mean = self.std = None
+        if preprocess_cfg['mean'] is not None:
+            self.mean = torch.from_numpy(preprocess_cfg['mean']).to(device)
+            self.std = torch.from_numpy(preprocess_cfg['std']).to(device)
+
+        if self.backend == 'torchscript':
+            self.model = torch.jit.load(
+                osp.join(model_dir, 'model.pt'), map_location=device)
+            self.model.eval()
+        else:
+            try:
+                import onnxruntime
+            except ImportError:
+                raise ImportError(
+                    'Please install onnxruntime to run ONNX models.')
+            providers = ['CPUExecutionProvider']
+            if device.startswith('cuda'):
+                providers.insert(0, 'CUDAExecutionProvider')
+            self.model = onnxruntime.InferenceSession(
+                osp.join(model_dir, 'model.onnx'), providers=providers)
+            # Graphs exported with static shapes take one image at a time
+            self._static_batch = isinstance(
+                self.model.get_inputs()[0].shape[0], int)
+
+    def _inputs_to_list(self, inputs: InputsType) -> List:
+        """Expand a directory to its images and wrap a single input in a
+        list."""
+        if isinstance(inputs, str) and osp.isdir(inputs):
+            return [
+                osp.join(inputs, filename) for filename in sorted(
+                    mmengine.list_dir_or_file(
+                        inputs,
+                        list_dir=False,
+                        suffix=('.jpg', '.jpeg', '.png', '.bmp')))
+            ]
+        if not isinstance(inputs, (list, tuple)):
+            return [inputs]
+        return list(inputs)
+
+    def _preprocess(self, data: List[Dict]) -> Dict:
+        """Normalize, pad and stack the images as the data preprocessor of
+        the model does."""
+        imgs = []
+        for item in data:
+            img = item['inputs'].to(self.device)
+            if self.channel_conversion:
+                img = img[[2, 1, 0], ...]
+            img = img.float()
+            if self.mean is not None:
+                img = (img - self.mean) / self.std
+            imgs.append(img)
+        inputs = stack_batch(imgs, self.pad_size_divisor, self.pad_value)
+        data_samples = [item['data_samples'] for item in data]
+        batch_input_shape = tuple(inputs.shape[-2:])
+        for data_sample in data_samples:
+            metainfo = dict(batch_input_shape=batch_input_shape)
+            if self.task == 'textrec':
+                metainfo['valid_ratio'] = data_sample.valid_ratio * \
+                    data_sample.img_shape[1] / batch_input_shape[1]
+            data_sample.set_metainfo(metainfo)
+        return dict(inputs=inputs, data_samples=data_samples)
+
+    @torch.no_grad()
+    def forward(self, inputs: Tensor) -> Tensor:
+        """Run the exported graph."""
+        if self.backend == 'torchscript':
+            return self.model(inputs)
+        inputs = inputs.cpu().numpy()
+        if self._static_batch:
+            outputs = np.concatenate([
+                self.model.run(None, {'inputs': inputs[i:i + 1]})[0]
+                for i in range(len(inputs))
+            ])
+        else:
+            outputs = self.model.run(None, {'inputs': inputs})[0]
+        return torch.from_numpy(outputs)
+
+    def __call__(self,
+                 inputs: InputsType,
+                 batch_size: int = 1,
+                 return_datasamples: bool = False) -> Dict:
+        """Call the inferencer.
+
+        Args:
+            inputs (InputsType): Inputs for the inferencer. It can be a path
+                to image / image directory, or an array, or a list of these.
+            batch_size (int): Inference batch size. Recognition crops are
+                only batched with crops of the same width after the pipeline,
+                so that the predictions do not depend on the batch. Defaults
+                to 1.
+            return_datasamples (bool): Whether to return results as data
+                samples. Defaults to False.
+
+        Returns:
+            dict: The predictions mapped from "predictions".
+        """
+        inputs = self._inputs_to_list(inputs)
+        predictions = [None] * len(inputs)
+        for indices, data in self._batches(inputs, batch_size):
+            data = self._preprocess(data)
+            outputs = self.forward(data['inputs'])
+            data_samples = self.postprocessor(outputs, data['data_samples'])
+            for idx, data_sample in zip(indices, data_samples):
+                predictions[idx] = data_sample if return_datasamples \
+                    else self.pred2dict(data_sample)
+        return dict(predictions=predictions)
+
+    def _batches(self, inputs: List,
+                 batch_size: int) -> Iterator[Tuple[List[int], List[Dict]]]:
+        """Run the pipeline on the inputs and group them into batches.
+
+        The exported recognizer has no valid ratio input and decodes the
+        padding of a batch, so the crops are only batched with crops of the
+        same width after the pipeline. As in :class:`TextRecInferencer`, they
+        are grouped within windows of ``bucket_batches`` batches.
+
+        Yields:
+            tuple(list[int], list[dict]): The indices of the inputs in a batch
+            and their outputs of the pipeline.
+        """
+        if self.task != 'textrec' or batch_size <= 1:
+            for start in range(0, len(inputs), batch_size):
+                indices = list(
+                    range(start, min(start + batch_size, len(inputs))))
+                yield indices, [self.pipeline(inputs[i]) for i in indices]
+            return
+        window_size = batch_size * self.bucket_batches
+        for offset in range(0, len(inputs), window_size):
+            buckets = defaultdict(list)
+            for idx in range(offset, min(offset + window_size, len(inputs))):
+                item = self.pipeline(inputs[idx])
+                buckets[item['inputs'].shape[-1]].append((idx, item))
+            for width in sorted(buckets):
+                bucket = buckets[width]
+                for start in range(0, len(bucket), batch_size):
+                    indices, data = zip(*bucket[start:start + batch_size])
+                    yield list(indices), list(data)
+
+    def pred2dict(self, data_sample) -> Dict:
+        """Convert a prediction to a json-serializable dictionary, as
+        :class:`TextDetInferencer` or :class:`TextRecInferencer` does."""
+        if self.task == 'textdet':
+            return TextDetInferencer.pred2dict(self, data_sample)
+        return TextRecInferencer.pred2dict(self, data_sample)
@@ -0,0 +1,163 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import multiprocessing as mp
+import os
+from typing import Dict, List, Optional
+
+import torch
+import torch.nn as nn
+
+from .base_mmocr_inferencer import BaseMMOCRInferencer, InputsType
+
+# The inferencers of the live pools by id. They are registered in the parent
+# process before forking, so that the workers inherit them without pickling.
+_shared_inferencers: Dict[int, BaseMMOCRInferencer] = {}
+_worker_inferencer: Optional[BaseMMOCRInferencer] = None
+
+
+def _init_worker(inferencer_id: int, counter, num_threads: int,
+                 cpu_groups: Optional[List[List[int]]]) -> None:
+    """Initialize a worker: pin its intra-op threads, and optionally its
+    CPUs."""
+    global _worker_inferencer
+    _worker_inferencer = _shared_inferencers[inferencer_id]
+    with counter.get_lock():
+        worker_idx = counter.value
+        counter.value += 1
+    if cpu_groups is not None:
+        os.sched_setaffinity(0, cpu_groups[worker_idx % len(cpu_groups)])
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+
+
+def _worker_infer(args) -> List[Dict]:
+    inputs, call_kwargs = args
+    return _worker_inferencer(
+        inputs, batch_size=len(inputs), progress_bar=False,
+        **call_kwargs)['predictions']
+
+
+def _get_models(inferencer: BaseMMOCRInferencer) -> List[nn.Module]:
+    """Get the models of an inferencer and of its nested inferencers, e.g.
+    the text detector and recognizer of :class:`MMOCRInferencer`."""
+    models = []
+    if isinstance(getattr(inferencer, 'model', None), nn.Module):
+        models.append(inferencer.model)
+    for value in vars(inferencer).values():
+        if isinstance(value, BaseMMOCRInferencer):
+            models.extend(_get_models(value))
+    return models
+
+
+class InferencerPool:
+    """Pool of worker processes running replicas of an inferencer on CPU.
+
+    The inferencer is built once in the parent process. Its weights are moved
+    to shared memory, then the workers are forked and inherit the inferencer
+    without pickling it, so the weights are stored once in RAM whatever the
+    number of workers. Each worker runs ``num_threads`` intra-op threads, and
+    may be pinned to its own CPUs, which avoids the contention of a single
+    process running all the threads and lets the Python postprocessing of
+    the workers run in parallel.
+
+    The inputs are split into chunks of ``batch_size`` images, which are
+    distributed to the workers. The results are returned in the input order.
+
+    Note:
+        The workers are forked, which is only available on POSIX systems.
+        The inferencer must run on CPU, as CUDA cannot be used in forked
+        processes.
+
+    Args:
+        inferencer (BaseMMOCRInferencer): The inferencer on CPU, e.g.
+            :class:`MMOCRInferencer`.
+        num_workers (int, optional): The number of worker processes. Defaults
+            to the number of CPUs available divided by ``num_threads``.
+        num_threads (int): The number of intra-op threads of each worker.
+            Defaults to 1.
+        pin_cpus (bool): Whether to pin each worker to ``num_threads``
+            distinct CPUs. Defaults to False.
+
+    Example:
+        >>> inferencer = MMOCRInferencer(det='DBNet', rec='CRNN', device='cpu')
+        >>> with InferencerPool(inferencer, num_workers=4) as pool:
+        ...     results = pool('path/to/images/', batch_size=2)
+    """
+
+    def __init__(self,
+                 inferencer: BaseMMOCRInferencer,
+                 num_workers: Optional[int] = None,
+                 num_threads: int = 1,
+                 pin_cpus: bool = False) -> None:
+        if 'fork' not in mp.get_all_start_methods():
+            raise RuntimeError('InferencerPool requires the fork start method')
+        models = _get_models(inferencer)
+        for model in models:
+            for tensor in list(model.parameters()) + list(model.buffers()):
+                if tensor.device.type != 'cpu':
+                    raise ValueError(
+                        'InferencerPool only supports inferencers '
+                        'on CPU')
+            model.share_memory()
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(
+            os, 'sched_getaffinity') else list(range(os.cpu_count() or 1))
+        if num_workers is None:
+            num_workers = max(len(cpus) // num_threads, 1)
+        cpu_groups = None
+        if pin_cpus:
+            if len(cpus) < num_workers * num_threads:
+                raise ValueError(
+                    f'Cannot pin {num_workers} workers of {num_threads} '
+                    f'threads to {len(cpus)} CPUs')
+            cpu_groups = [
+                cpus[i * num_threads:(i + 1) * num_threads]
+                for i in range(num_workers)
+            ]
+        self.inferencer = inferencer
+        self.num_workers = num_workers
+        self.num_threads = num_threads
+
+        ctx = mp.get_context('fork')
+        _shared_inferencers[id(inferencer)] = inferencer
+        self._pool = ctx.Pool(
+            num_workers,
+            initializer=_init_worker,
+            initargs=(id(inferencer), ctx.Value('i',
+                                                0), num_threads, cpu_groups))
+
+    def __call__(self,
+                 inputs: InputsType,
+                 batch_size: int = 1,
+                 **kwargs) -> Dict:
+        """Run the inferencer on the inputs in the workers.
+
+        Args:
+            inputs (InputsType): Inputs for the inferencer. It can be a path
+                to image / image directory, or an array, or a list of these.
+            batch_size (int): The number of images of each chunk sent to a
+                worker, inferred as a single batch. Defaults to 1.
+            **kwargs: Other keyword arguments of the inferencer call, except
+                the visualization ones, e.g. ``det_batch_size``.
+
+        Returns:
+            dict: The results with the key ``predictions``, in the order of
+            the inputs, and an empty ``visualization``.
+        """
+        inputs = self.inferencer._inputs_to_list(inputs)
+        chunks = [(inputs[i:i + batch_size], kwargs)
+                  for i in range(0, len(inputs), batch_size)]
+        predictions = []
+        for chunk_predictions in self._pool.imap(_worker_infer, chunks):
+            predictions.extend(chunk_predictions)
+        return dict(predictions=predictions, visualization=[])
+
+    def close(self) -> None:
+        """Stop the workers."""
+        self._pool.close()
+        self._pool.join()
+        _shared_inferencers.pop(id(self.inferencer), None)
+
+    def __enter__(self) -> 'InferencerPool':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -3,14 +3,19 @@ import os.path as osp
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Union
 
+import cv2
 import mmcv
 import mmengine
 import numpy as np
+import torch
+from mmengine.structures import InstanceData
 from rich.progress import track
 
+from mmocr.datasets.transforms import InferencerLoader
 from mmocr.registry import VISUALIZERS
-from mmocr.structures import TextSpottingDataSample
-from mmocr.utils import ConfigType, bbox2poly, crop_img, poly2bbox
+from mmocr.structures import TextDetDataSample, TextSpottingDataSample
+from mmocr.utils import (ConfigType, bbox2poly, crop_img, poly2bbox,
+                         profile_span)
 from .base_mmocr_inferencer import (BaseMMOCRInferencer, InputsType, PredType,
                                     ResType)
 from .kie_inferencer import KIEInferencer
@@ -50,6 +55,8 @@ class MMOCRInferencer(BaseMMOCRInferencer):
 
     """
 
+    forward_kwargs: set = {'sequence', 'diff_thr', 'match_iou_thr'}
+
     def __init__(self,
                  det: Optional[Union[ConfigType, str]] = None,
                  det_weights: Optional[str] = None,
@@ -64,6 +71,8 @@ class MMOCRInferencer(BaseMMOCRInferencer):
                              'provided.')
 
         self.visualizer = None
+        # The last keyframe of the sequence mode
+        self._keyframe = None
 
         if det is not None:
             self.textdet_inferencer = TextDetInferencer(
@@ -93,26 +102,113 @@ class MMOCRInferencer(BaseMMOCRInferencer):
             self.kie_inferencer = KIEInferencer(kie, kie_weights, device)
             self.mode = 'det_rec_kie'
 
+    def quantize(self,
+                 mode: str = 'dynamic',
+                 calib_inputs: Optional[InputsType] = None,
+                 batch_size: int = 1) -> None:
+        """Quantize the models to int8 in place for faster CPU inference. See
+        :meth:`BaseMMOCRInferencer.quantize`.
+
+        The recognition and KIE models are always dynamically quantized. The
+        detection model is dynamically quantized in the 'dynamic' mode, and
+        its backbone is statically quantized in the 'static' mode.
+
+        Args:
+            mode (str): 'dynamic' or 'static'. Defaults to 'dynamic'.
+            calib_inputs (InputsType, optional): Representative images to
+                calibrate the detection model, required by the 'static' mode.
+                Defaults to None.
+            batch_size (int): The batch size of the calibration. Defaults to
+                1.
+        """
+        if mode not in ('dynamic', 'static'):
+            raise ValueError(f'Invalid quantization mode {mode}, it should '
+                             'be "dynamic" or "static"')
+        if hasattr(self, 'textdet_inferencer'):
+            self.textdet_inferencer.quantize(mode, calib_inputs, batch_size)
+        if hasattr(self, 'textrec_inferencer'):
+            self.textrec_inferencer.quantize('dynamic')
+        if hasattr(self, 'kie_inferencer'):
+            self.kie_inferencer.quantize('dynamic')
+
+    def optimize(self,
+                 precision: str = 'fp32',
+                 channels_last: bool = False,
+                 compile: bool = False,
+                 warmup_inputs: Optional[InputsType] = None) -> None:
+        """Set up the models for faster inference. See
+        :meth:`BaseMMOCRInferencer.optimize`.
+
+        The precision and the compilation apply to all the models, while the
+        channels-last memory format only applies to the detection model,
+        whose convolutions dominate. The warm-up runs the whole pipeline.
+        """
+        for name in ('textdet_inferencer', 'textrec_inferencer',
+                     'kie_inferencer'):
+            if hasattr(self, name):
+                getattr(self, name)._setup_model(
+                    precision,
+                    channels_last=channels_last
+                    and name == 'textdet_inferencer',
+                    compile=compile)
+        if compile and warmup_inputs is None:
+            warmup_inputs = np.zeros((640, 640, 3), dtype=np.uint8)
+        if warmup_inputs is not None:
+            self(warmup_inputs, progress_bar=False)
+
+    def reset_sequence(self) -> None:
+        """Forget the last keyframe, so that the next frame passed in
+        sequence mode starts a new sequence."""
+        self._keyframe = None
+
     def _inputs2ndarrray(self, inputs: List[InputsType]) -> List[np.ndarray]:
-        """Preprocess the inputs to a list of numpy arrays."""
+        """Preprocess the inputs to a list of numpy arrays.
+
+        Image files are decoded by the loader of the text detection pipeline
+        if any, so that the arrays are the images the detector sees.
+        """
+        loader = None
+        if hasattr(self, 'textdet_inferencer'):
+            for transform in self.textdet_inferencer.pipeline.transforms:
+                if isinstance(transform, InferencerLoader):
+                    loader = transform
+                    break
         new_inputs = []
         for item in inputs:
             if isinstance(item, np.ndarray):
                 new_inputs.append(item)
             elif isinstance(item, str):
-                img_bytes = mmengine.fileio.get(item)
-                new_inputs.append(mmcv.imfrombytes(img_bytes))
+                with profile_span('decode', 'preprocess', input=item):
+                    if loader is not None:
+                        img = loader(dict(img_path=item))['img']
+                    else:
+                        img = mmcv.imfrombytes(mmengine.fileio.get(item))
+                new_inputs.append(img)
             else:
                 raise NotImplementedError(f'The input type {type(item)} is not'
                                           'supported yet.')
         return new_inputs
 
+    @staticmethod
+    def _decoded_inputs(inputs: List[InputsType], imgs: List[np.ndarray]
+                        ) -> List[Union[dict, np.ndarray]]:
+        """Pair the decoded images with the paths they are loaded from, so
+        that the task inferencers neither decode the images again nor lose
+        their names."""
+        return [
+            dict(img=img, img_path=item) if isinstance(item, str) else img
+            for item, img in zip(inputs, imgs)
+        ]
+
     def forward(self,
                 inputs: InputsType,
                 batch_size: int = 1,
                 det_batch_size: Optional[int] = None,
                 rec_batch_size: Optional[int] = None,
                 kie_batch_size: Optional[int] = None,
+                sequence: bool = False,
+                diff_thr: float = 0.02,
+                match_iou_thr: float = 0.5,
                 **forward_kwargs) -> PredType:
         """Forward the inputs to the model.
 
@@ -128,11 +224,27 @@ class MMOCRInferencer(BaseMMOCRInferencer):
             kie_batch_size (Optional[int]): Batch size for KIE model.
                 Overwrite batch_size if it is not None.
                 Defaults to None.
+            sequence (bool): Whether the inputs are consecutive frames of a
+                video, in which case the results of the last keyframe, which
+                may come from a previous call, are reused as much as
+                possible. See :meth:`_forward_sequence`.
+                Only applicable when a text detector is given.
+                Defaults to False.
+            diff_thr (float): The maximum mean absolute difference, with
+                pixel values scaled to [0, 1], between two frames or two text
+                crops that are considered unchanged in sequence mode.
+                Defaults to 0.02.
+            match_iou_thr (float): The minimum IoU between a detected box and
+                a box tracked from the last keyframe for the latter's
+                recognition result to be reused in sequence mode.
+                Defaults to 0.5.
 
         Returns:
             Dict: The prediction results. Possibly with keys "det", "rec", and
             "kie"..
         """
+        if sequence and not self.mode.startswith('det'):
+            raise ValueError('Sequence mode requires a text detection model')
         result = {}
         forward_kwargs['progress_bar'] = False
         if det_batch_size is None:
@@ -150,52 +262,179 @@ class MMOCRInferencer(BaseMMOCRInferencer):
                 batch_size=rec_batch_size,
                 **forward_kwargs)['predictions']
             result['rec'] = [[p] for p in predictions]
-        elif self.mode.startswith('det'):  # 'det'/'det_rec'/'det_rec_kie'
+        elif sequence:
+            result.update(
+                self._forward_sequence(
+                    inputs,
+                    rec_batch_size=rec_batch_size,
+                    diff_thr=diff_thr,
+                    match_iou_thr=match_iou_thr,
+                    **forward_kwargs))
+        else:  # 'det'/'det_rec'/'det_rec_kie'
+            imgs = self._inputs2ndarrray(inputs)
             result['det'] = self.textdet_inferencer(
-                inputs,
+                self._decoded_inputs(inputs, imgs),
                 return_datasamples=True,
                 batch_size=det_batch_size,
                 **forward_kwargs)['predictions']
             if self.mode.startswith('det_rec'):  # 'det_rec'/'det_rec_kie'
                 result['rec'] = []
-                for img, det_data_sample in zip(
-                        self._inputs2ndarrray(inputs), result['det']):
+                for img, det_data_sample in zip(imgs, result['det']):
                     det_pred = det_data_sample.pred_instances
                     self.rec_inputs = []
-                    for polygon in det_pred['polygons']:
-                        # Roughly convert the polygon to a quadangle with
-                        # 4 points
-                        quad = bbox2poly(poly2bbox(polygon)).tolist()
-                        self.rec_inputs.append(crop_img(img, quad))
+                    with profile_span(
+                            'crop',
+                            'preprocess',
+                            num_crops=len(det_pred['polygons'])):
+                        for polygon in det_pred['polygons']:
+                            # Roughly convert the polygon to a quadangle with
+                            # 4 points
+                            quad = bbox2poly(poly2bbox(polygon)).tolist()
+                            self.rec_inputs.append(crop_img(img, quad))
                     result['rec'].append(
                         self.textrec_inferencer(
                             self.rec_inputs,
                             return_datasamples=True,
                             batch_size=rec_batch_size,
                             **forward_kwargs)['predictions'])
-                if self.mode == 'det_rec_kie':
-                    self.kie_inputs = []
-                    # TODO: when the det output is empty, kie will fail
-                    # as no gt-instances can be provided. It's a known
-                    # issue but cannot be solved elegantly since we support
-                    # batch inference.
-                    for img, det_data_sample, rec_data_samples in zip(
-                            inputs, result['det'], result['rec']):
-                        det_pred = det_data_sample.pred_instances
-                        kie_input = dict(img=img)
-                        kie_input['instances'] = []
-                        for polygon, rec_data_sample in zip(
-                                det_pred['polygons'], rec_data_samples):
-                            kie_input['instances'].append(
-                                dict(
-                                    bbox=poly2bbox(polygon),
-                                    text=rec_data_sample.pred_text.item))
-                        self.kie_inputs.append(kie_input)
-                    result['kie'] = self.kie_inferencer(
-                        self.kie_inputs,
+        if self.mode == 'det_rec_kie':
+            self.kie_inputs = []
+            # TODO: when the det output is empty, kie will fail
+            # as no gt-instances can be provided. It's a known
+            # issue but cannot be solved elegantly since we support
+            # batch inference.
+            for img, det_data_sample, rec_data_samples in zip(
+                    inputs, result['det'], result['rec']):
+                det_pred = det_data_sample.pred_instances
+                kie_input = dict(img=img)
+                kie_input['instances'] = []
+                for polygon, rec_data_sample in zip(det_pred['polygons'],
+                                                    rec_data_samples):
+                    kie_input['instances'].append(
+                        dict(
+                            bbox=poly2bbox(polygon),
+                            text=rec_data_sample.pred_text.item))
+                self.kie_inputs.append(kie_input)
+            result['kie'] = self.kie_inferencer(
+                self.kie_inputs,
+                return_datasamples=True,
+                batch_size=kie_batch_size,
+                **forward_kwargs)['predictions']
+        return result
+
+    def _forward_sequence(self, inputs: InputsType, rec_batch_size: int,
+                          diff_thr: float, match_iou_thr: float,
+                          **forward_kwargs) -> PredType:
+        """Forward consecutive frames of a video to the text detection and
+        recognition models, reusing the results of the last keyframe.
+
+        The keyframe is kept across calls, so that the frames of a stream
+        can be passed one call at a time, until :meth:`reset_sequence` is
+        called.
+
+        The global translation between a frame and the last keyframe is
+        estimated by phase correlation on downsampled grayscale frames. If
+        the frames differ by no more than ``diff_thr`` once the translation
+        is compensated, the keyframe results are moved along and neither
+        model is run. Otherwise, the frame is detected and becomes the new
+        keyframe, while only the boxes that cannot be matched to a tracked
+        one, or whose crops have changed, are recognized again.
+
+        Args:
+            inputs (InputsType): The frames in chronological order.
+            rec_batch_size (int): Batch size for text recognition model.
+            diff_thr (float): The maximum mean absolute difference of
+                unchanged frames and crops.
+            match_iou_thr (float): The minimum IoU between matched boxes.
+
+        Returns:
+            Dict: The prediction results with keys "det" and possibly "rec".
+        """
+        result = dict(det=[], rec=[])
+        with_rec = self.mode.startswith('det_rec')
+        imgs = self._inputs2ndarrray(inputs)
+        for single_input, det_input, img in zip(
+                inputs, self._decoded_inputs(inputs, imgs), imgs):
+            h, w = img.shape[:2]
+            thumb = _thumbnail(img)
+            keyframe = self._keyframe
+            motion, diff = np.zeros(2, dtype=np.float32), 1.0
+            if keyframe is not None and keyframe['thumb'].shape == thumb.shape:
+                motion, diff = _compensated_diff(keyframe['thumb'], thumb)
+                motion *= np.array([w / thumb.shape[1], h / thumb.shape[0]],
+                                   dtype=np.float32)
+
+            if diff <= diff_thr:
+                if isinstance(single_input, str):
+                    img_path = single_input
+                else:
+                    img_path = (f'{self.textdet_inferencer.num_unnamed_imgs}'
+                                '.jpg')
+                    self.textdet_inferencer.num_unnamed_imgs += 1
+                det_data_sample = TextDetDataSample(
+                    metainfo=dict(
+                        img_path=img_path, ori_shape=(h, w), img_shape=(h, w)))
+                det_data_sample.pred_instances = InstanceData(
+                    polygons=[(polygon.reshape(-1, 2) + motion).flatten()
+                              for polygon in keyframe['polygons']],
+                    scores=keyframe['scores'].clone())
+                result['det'].append(det_data_sample)
+                if with_rec:
+                    result['rec'].append(keyframe['rec'])
+                continue
+
+            det_data_sample = self.textdet_inferencer(
+                [det_input],
+                return_datasamples=True,
+                batch_size=1,
+                **forward_kwargs)['predictions'][0]
+            det_pred = det_data_sample.pred_instances
+            polygons = [
+                np.array(polygon, dtype=np.float32)
+                for polygon in det_pred['polygons']
+            ]
+            bboxes = np.array([poly2bbox(polygon) for polygon in polygons],
+                              dtype=np.float32).reshape(-1, 4)
+            crops, rec_data_samples = [], [None] * len(polygons)
+            if with_rec:
+                for bbox in bboxes:
+                    crops.append(crop_img(img, bbox2poly(bbox).tolist()))
+            if (with_rec and keyframe is not None and len(polygons) > 0
+                    and len(keyframe['bboxes']) > 0):
+                tracked_bboxes = keyframe['bboxes'] + np.tile(motion, 2)
+                ious = _bbox_ious(bboxes, tracked_bboxes)
+                for i in np.argsort(-ious.max(axis=1), kind='stable'):
+                    j = int(ious[i].argmax())
+                    if ious[i, j] < match_iou_thr:
+                        continue
+                    if _crop_diff(crops[i], keyframe['crops'][j]) <= diff_thr:
+                        rec_data_samples[i] = keyframe['rec'][j]
+                    ious[:, j] = -1
+            if with_rec:
+                indices = [
+                    i for i, sample in enumerate(rec_data_samples)
+                    if sample is None
+                ]
+                if indices:
+                    self.rec_inputs = [crops[i] for i in indices]
+                    preds = self.textrec_inferencer(
+                        self.rec_inputs,
                         return_datasamples=True,
-                        batch_size=kie_batch_size,
+                        batch_size=rec_batch_size,
                         **forward_kwargs)['predictions']
+                    for i, pred in zip(indices, preds):
+                        rec_data_samples[i] = pred
+                result['rec'].append(rec_data_samples)
+            result['det'].append(det_data_sample)
+            self._keyframe = dict(
+                thumb=thumb,
+                polygons=polygons,
+                scores=torch.as_tensor(det_pred['scores']).float(),
+                bboxes=bboxes,
+                crops=crops,
+                rec=rec_data_samples)
+        if not with_rec:
+            del result['rec']
         return result
 
     def visualize(self, inputs: InputsType, preds: PredType,
@@ -248,6 +487,7 @@ class MMOCRInferencer(BaseMMOCRInferencer):
         return_vis: bool = False,
         save_vis: bool = False,
         save_pred: bool = False,
+        progress_bar: bool = True,
         **kwargs,
     ) -> dict:
         """Call the inferencer.
@@ -272,6 +512,8 @@ class MMOCRInferencer(BaseMMOCRInferencer):
                 "out_dir". Defaults to False.
             save_pred (bool): Whether to save the inference results to
                 "out_dir". Defaults to False.
+            progress_bar (bool): Whether to show a progress bar. Defaults to
+                True.
             **kwargs: Key words arguments passed to :meth:`preprocess`,
                 :meth:`forward`, :meth:`visualize` and :meth:`postprocess`.
                 Each key in kwargs should be in the corresponding set of
@@ -313,20 +555,35 @@ class MMOCRInferencer(BaseMMOCRInferencer):
         chunked_inputs = super(BaseMMOCRInferencer,
                                self)._get_chunk_data(ori_inputs, batch_size)
         results = {'predictions': [], 'visualization': []}
-        for ori_input in track(chunked_inputs, description='Inference'):
-            preds = self.forward(
-                ori_input,
-                det_batch_size=det_batch_size,
-                rec_batch_size=rec_batch_size,
-                kie_batch_size=kie_batch_size,
-                **forward_kwargs)
-            visualization = self.visualize(
-                ori_input, preds, img_out_dir=img_out_dir, **visualize_kwargs)
-            batch_res = self.postprocess(
-                preds,
-                visualization,
-                pred_out_dir=pred_out_dir,
-                **postprocess_kwargs)
+        for batch_idx, ori_input in enumerate(
+                track(
+                    chunked_inputs,
+                    description='Inference',
+                    disable=not progress_bar)):
+            with profile_span(
+                    type(self).__name__,
+                    'batch',
+                    batch_idx=batch_idx,
+                    batch_size=len(ori_input)):
+                with profile_span('forward', 'forward'):
+                    preds = self.forward(
+                        ori_input,
+                        det_batch_size=det_batch_size,
+                        rec_batch_size=rec_batch_size,
+                        kie_batch_size=kie_batch_size,
+                        **forward_kwargs)
+                with profile_span('visualize', 'visualize'):
+                    visualization = self.visualize(
+                        ori_input,
+                        preds,
+                        img_out_dir=img_out_dir,
+                        **visualize_kwargs)
+                with profile_span('postprocess', 'postprocess'):
+                    batch_res = self.postprocess(
+                        preds,
+                        visualization,
+                        pred_out_dir=pred_out_dir,
+                        **postprocess_kwargs)
             results['predictions'].extend(batch_res['predictions'])
             if return_vis and batch_res['visualization'] is not None:
                 results['visualization'].extend(batch_res['visualization'])
@@ -422,3 +679,73 @@ class MMOCRInferencer(BaseMMOCRInferencer):
             det_data_sample.pred_instances.texts = texts
             results.append(det_data_sample)
         return results
+
+
+def _thumbnail(img: np.ndarray, width: int = 160) -> np.ndarray:
+    """Downsample an image into a grayscale thumbnail with pixel values in
+    [0, 1], keeping its aspect ratio."""
+    h, w = img.shape[:2]
+    height = max(int(round(h * width / w)), 1)
+    thumb = cv2.resize(
+        img.astype(np.float32), (width, height), interpolation=cv2.INTER_AREA)
+    if thumb.ndim == 3:
+        thumb = thumb.mean(axis=2)
+    return thumb / 255.
+
+
+def _compensated_diff(src: np.ndarray,
+                      dst: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Estimate the global translation from one thumbnail to another, and
+    their mean absolute difference after compensating it.
+
+    Args:
+        src (np.ndarray): The source thumbnail.
+        dst (np.ndarray): The destination thumbnail of the same shape.
+
+    Returns:
+        tuple(np.ndarray, float): The ``(dx, dy)`` translation and the
+        difference, where the area revealed by the translation counts as
+        fully different.
+    """
+    h, w = src.shape
+    (dx, dy), _ = cv2.phaseCorrelate(src, dst)
+    if not np.isfinite(dx) or not np.isfinite(dy):
+        dx, dy = 0., 0.
+    ix, iy = int(round(dx)), int(round(dy))
+    motion = np.array([dx, dy], dtype=np.float32)
+    if abs(ix) >= w or abs(iy) >= h:
+        return motion, 1.0
+    # dst[y, x] is src[y - iy, x - ix]
+    dst = dst[max(iy, 0):h + min(iy, 0), max(ix, 0):w + min(ix, 0)]
+    src = src[max(-iy, 0):h + min(-iy, 0), max(-ix, 0):w + min(-ix, 0)]
+    diff = np.abs(dst - src).sum() + h * w - dst.size
+    return motion, float(diff / (h * w))
+
+
+def _crop_diff(crop1: np.ndarray, crop2: np.ndarray) -> float:
+    """Compute the mean absolute difference between two text crops resized
+    to the same shape, with pixel values scaled to [0, 1]."""
+    if crop1.size == 0 or crop2.size == 0:
+        return 1.0
+    crop1 = _thumbnail(cv2.resize(crop1, (64, 16)), width=64)
+    crop2 = _thumbnail(cv2.resize(crop2, (64, 16)), width=64)
+    return float(np.abs(crop1 - crop2).mean())
+
+
+def _bbox_ious(bboxes1: np.ndarray, bboxes2: np.ndarray) -> np.ndarray:
+    """Compute the IoUs between two sets of boxes in (x1, y1, x2, y2) order.
+
+    Args:
+        bboxes1 (np.ndarray): Boxes in shape (N, 4).
+        bboxes2 (np.ndarray): Boxes in shape (M, 4).
+
+    Returns:
+        np.ndarray: The IoUs in shape (N, M).
+    """
+    lt = np.maximum(bboxes1[:, None, :2], bboxes2[None, :, :2])
+    rb = np.minimum(bboxes1[:, None, 2:], bboxes2[None, :, 2:])
+    inters = np.prod(np.clip(rb - lt, 0, None), axis=2)
+    areas1 = np.prod(bboxes1[:, 2:] - bboxes1[:, :2], axis=1)
+    areas2 = np.prod(bboxes2[:, 2:] - bboxes2[:, :2], axis=1)
+    unions = areas1[:, None] + areas2[None, :] - inters
+    return inters / np.maximum(unions, 1e-6)
@@ -1,8 +1,17 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Dict
+import copy
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+import torch
+from mmengine.dataset import Compose
+from mmengine.structures import InstanceData
+from torch import Tensor
 
 from mmocr.structures import TextDetDataSample
-from .base_mmocr_inferencer import BaseMMOCRInferencer
+from mmocr.utils import poly_nms
+from .base_mmocr_inferencer import BaseMMOCRInferencer, InputsType, PredType
 
 
 class TextDetInferencer(BaseMMOCRInferencer):
@@ -24,6 +33,349 @@ class TextDetInferencer(BaseMMOCRInferencer):
         scope (str, optional): The scope of the model. Defaults to "mmocr".
     """
 
+    preprocess_kwargs: set = {'coarse_to_fine', 'tile_size'}
+    forward_kwargs: set = {
+        'coarse_scale', 'fine_scale', 'roi_thr', 'roi_dilation',
+        'roi_min_area', 'tile_overlap', 'tile_batch_size', 'nms_thr'
+    }
+
+    def preprocess(self,
+                   inputs: InputsType,
+                   batch_size: int = 1,
+                   coarse_to_fine: bool = False,
+                   tile_size: Optional[Union[int, Tuple[int, int]]] = None,
+                   **kwargs):
+        """Process the inputs into a model-feedable format.
+
+        Args:
+            inputs (InputsType): Inputs given by user.
+            batch_size (int): batch size. Defaults to 1.
+            coarse_to_fine (bool): Whether to run the coarse-to-fine
+                detection. If True, the images are only decoded here and the
+                resizing is deferred to :meth:`forward`, which needs the
+                full-resolution images to crop the regions of interest.
+                Defaults to False.
+            tile_size (int or tuple(int, int), optional): The ``(w, h)`` size
+                of the tiles in tiled detection. If given, the images are
+                split into overlapping tiles which are detected at their
+                original resolution in :meth:`forward`. Defaults to None.
+
+        Yields:
+            Any: Data processed by the ``pipeline`` and ``collate_fn``, or
+            a dict of the decoded images in coarse-to-fine or tiled mode.
+        """
+        if coarse_to_fine and tile_size is not None:
+            raise ValueError('coarse_to_fine and tile_size cannot be set at '
+                             'the same time')
+        if not coarse_to_fine and tile_size is None:
+            yield from super().preprocess(inputs, batch_size, **kwargs)
+            return
+        for chunk_data in self._get_chunk_imgs(inputs, batch_size):
+            ori_inputs = [single_input for single_input, _ in chunk_data]
+            imgs = [results for _, results in chunk_data]
+            yield ori_inputs, dict(
+                imgs=imgs, coarse_to_fine=coarse_to_fine, tile_size=tile_size)
+
+    def _get_chunk_imgs(self, inputs: Iterable, chunk_size: int):
+        """Get batches of decoded full-resolution images from inputs.
+
+        Args:
+            inputs (Iterable): An iterable dataset.
+            chunk_size (int): Equivalent to batch size.
+
+        Yields:
+            list: batch data, each item is a tuple of the raw input and a
+            dict with keys ``img`` and ``img_path``.
+        """
+        load_idx = self._get_transform_idx(
+            self.cfg.test_dataloader.dataset.pipeline, 'InferencerLoader')
+        loader = self.pipeline.transforms[load_idx]
+        chunk_data = []
+        for single_input in inputs:
+            results = loader(single_input)
+            if results.get('img_path') is None:
+                results['img_path'] = f'{self.num_unnamed_imgs}.jpg'
+                self.num_unnamed_imgs += 1
+            chunk_data.append(
+                (single_input,
+                 dict(img=results['img'], img_path=results['img_path'])))
+            if len(chunk_data) == chunk_size:
+                yield chunk_data
+                chunk_data = []
+        if chunk_data:
+            yield chunk_data
+
+    @torch.no_grad()
+    def forward(self,
+                inputs: Dict,
+                coarse_scale: Optional[Tuple[int, int]] = None,
+                fine_scale: Optional[Tuple[int, int]] = None,
+                roi_thr: float = 0.1,
+                roi_dilation: int = 5,
+                roi_min_area: int = 16,
+                tile_overlap: int = 64,
+                tile_batch_size: int = 4,
+                nms_thr: float = 0.5,
+                **kwargs) -> PredType:
+        """Feed the inputs to the model.
+
+        Args:
+            inputs (dict): Collated data, or decoded images in coarse-to-fine
+                or tiled mode.
+            coarse_scale (tuple(int, int), optional): The ``(w, h)`` scale of
+                the coarse pass. If None, the scale of the ``Resize`` in the
+                test pipeline is used. Defaults to None.
+            fine_scale (tuple(int, int), optional): The ``(w, h)`` scale that
+                the full image would be resized to in the fine pass. Regions
+                of interest are cropped from the full-resolution image and
+                rescaled by the same factor. If None, the regions are detected
+                at the original resolution. Defaults to None.
+            roi_thr (float): The threshold on the coarse probability map to
+                propose text regions. It is usually lower than the mask
+                threshold of the postprocessor to recall small and faint text.
+                Only applicable to detectors whose head outputs a single
+                probability map (e.g. DBNet). Other detectors fall back to
+                the coarse polygons. Defaults to 0.1.
+            roi_dilation (int): The radius, in pixels of the coarse map, that
+                the proposed regions are dilated by before being merged into
+                regions of interest. Defaults to 5.
+            roi_min_area (int): The minimum area, in pixels of the coarse map,
+                of a proposed region. Smaller ones are dropped. Defaults to 16.
+            tile_overlap (int): The overlap in pixels between adjacent tiles.
+                Text no larger than it is guaranteed to be complete in at
+                least one tile. Defaults to 64.
+            tile_batch_size (int): The number of tiles, possibly from
+                different images, fed to the model at once. Defaults to 4.
+            nms_thr (float): The threshold of the polygon NMS, measured as
+                intersection over the smaller area, which merges the
+                duplicates detected in overlapping tiles. Defaults to 0.5.
+
+        Returns:
+            list[TextDetDataSample]: A list of predictions.
+        """
+        tile_size = inputs.get('tile_size')
+        if tile_size is not None:
+            if isinstance(tile_size, int):
+                tile_size = (tile_size, tile_size)
+            return self._forward_tiled(
+                inputs['imgs'],
+                tile_size=tile_size,
+                tile_overlap=tile_overlap,
+                tile_batch_size=tile_batch_size,
+                nms_thr=nms_thr)
+        if not inputs.get('coarse_to_fine', False):
+            return super().forward(inputs, **kwargs)
+        return self._forward_coarse_to_fine(
+            inputs['imgs'],
+            coarse_scale=coarse_scale,
+            fine_scale=fine_scale,
+            roi_thr=roi_thr,
+            roi_dilation=roi_dilation,
+            roi_min_area=roi_min_area)
+
+    def _forward_coarse_to_fine(self, imgs: List[Dict],
+                                coarse_scale: Optional[Tuple[int, int]],
+                                fine_scale: Optional[Tuple[int, int]],
+                                roi_thr: float, roi_dilation: int,
+                                roi_min_area: int) -> List[TextDetDataSample]:
+        """Detect text at low resolution first, then re-detect the regions of
+        interest cropped from the full-resolution images.
+
+        Args:
+            imgs (list[dict]): Decoded images with keys ``img`` and
+                ``img_path``.
+
+        Returns:
+            list[TextDetDataSample]: A list of predictions whose polygons are
+            in the coordinates of the original images.
+        """
+        if coarse_scale is None:
+            coarse_pipeline = self.pipeline
+        else:
+            coarse_pipeline = self._build_pipeline(scale=coarse_scale)
+        data = self.collate_fn([
+            self._run_pipeline(
+                dict(img=item['img'], img_path=item['img_path']),
+                coarse_pipeline) for item in imgs
+        ])
+        data = self.model.data_preprocessor(data, False)
+        coarse_preds, prob_maps = self._coarse_predict(data)
+
+        results = []
+        for i, (item, coarse_pred) in enumerate(zip(imgs, coarse_preds)):
+            img = item['img']
+            ori_h, ori_w = img.shape[:2]
+            img_h, img_w = coarse_pred.img_shape
+            if prob_maps is not None:
+                pad_h, pad_w = data['inputs'].shape[-2:]
+                prob_map = prob_maps[i].cpu().numpy()
+                map_h = int(np.ceil(img_h * prob_map.shape[0] / pad_h))
+                map_w = int(np.ceil(img_w * prob_map.shape[1] / pad_w))
+                mask = (prob_map[:map_h, :map_w] > roi_thr).astype(np.uint8)
+            else:
+                mask = np.zeros((img_h, img_w), dtype=np.uint8)
+                for polygon in coarse_pred.pred_instances.polygons:
+                    polygon = np.array(
+                        polygon, dtype=np.float32).reshape(-1, 2) * np.array(
+                            [img_w / ori_w, img_h / ori_h])
+                    cv2.fillPoly(mask, [polygon.round().astype(np.int32)], 1)
+            rois = _mask2rois(mask,
+                              (ori_w / mask.shape[1], ori_h / mask.shape[0]),
+                              (ori_h, ori_w), roi_dilation, roi_min_area)
+
+            # Never detect at a lower resolution than the coarse pass
+            scale_factor = max(img_w / ori_w, img_h / ori_h)
+            if fine_scale is None:
+                scale_factor = max(scale_factor, 1.0)
+            else:
+                scale_factor = max(
+                    scale_factor,
+                    min(fine_scale[0] / ori_w, fine_scale[1] / ori_h))
+            fine_pipeline = self._build_pipeline(
+                scale_factor=float(scale_factor))
+
+            polygons, scores = [], []
+            for x1, y1, x2, y2 in rois:
+                fine_data = self.collate_fn([
+                    self._run_pipeline(
+                        dict(img=img[y1:y2, x1:x2]), fine_pipeline)
+                ])
+                fine_pred = self.model.test_step(fine_data)[0]
+                offset = np.array([x1, y1], dtype=np.float32)
+                for polygon, score in zip(fine_pred.pred_instances.polygons,
+                                          fine_pred.pred_instances.scores):
+                    polygon = np.array(
+                        polygon, dtype=np.float32).reshape(-1, 2) + offset
+                    polygons.append(polygon.flatten())
+                    scores.append(float(score))
+            coarse_pred.pred_instances = InstanceData(
+                polygons=polygons, scores=torch.FloatTensor(scores))
+            results.append(coarse_pred)
+        return results
+
+    def _forward_tiled(self, imgs: List[Dict], tile_size: Tuple[int, int],
+                       tile_overlap: int, tile_batch_size: int,
+                       nms_thr: float) -> List[TextDetDataSample]:
+        """Detect text in overlapping tiles at the original resolution and
+        merge the tile predictions with polygon NMS.
+
+        Polygons touching a border shared with a neighbouring tile are likely
+        truncated. They are ranked below the complete ones in the NMS, so that
+        a text cut by one tile is taken from the tile containing it entirely.
+
+        Args:
+            imgs (list[dict]): Decoded images with keys ``img`` and
+                ``img_path``.
+
+        Returns:
+            list[TextDetDataSample]: A list of predictions whose polygons are
+            in the coordinates of the original images.
+        """
+        tile_w, tile_h = tile_size
+        pipeline = self._build_pipeline(scale_factor=1.0)
+
+        tiles = []
+        for i, item in enumerate(imgs):
+            h, w = item['img'].shape[:2]
+            for y in _tile_starts(h, tile_h, tile_overlap):
+                for x in _tile_starts(w, tile_w, tile_overlap):
+                    tiles.append((i, x, y, min(x + tile_w,
+                                               w), min(y + tile_h, h)))
+
+        polygons = [[] for _ in imgs]
+        scores = [[] for _ in imgs]
+        truncated = [[] for _ in imgs]
+        margin = 2
+        for start in range(0, len(tiles), tile_batch_size):
+            batch_tiles = tiles[start:start + tile_batch_size]
+            data = self.collate_fn([
+                self._run_pipeline(
+                    dict(img=imgs[i]['img'][y1:y2, x1:x2]), pipeline)
+                for i, x1, y1, x2, y2 in batch_tiles
+            ])
+            preds = self.model.test_step(data)
+            for (i, x1, y1, x2, y2), pred in zip(batch_tiles, preds):
+                h, w = imgs[i]['img'].shape[:2]
+                offset = np.array([x1, y1], dtype=np.float32)
+                for polygon, score in zip(pred.pred_instances.polygons,
+                                          pred.pred_instances.scores):
+                    polygon = np.array(
+                        polygon, dtype=np.float32).reshape(-1, 2)
+                    min_x, min_y = polygon.min(axis=0)
+                    max_x, max_y = polygon.max(axis=0)
+                    truncated[i].append(
+                        (x1 > 0 and min_x <= margin)
+                        or (y1 > 0 and min_y <= margin)
+                        or (x2 < w and max_x >= x2 - x1 - margin)
+                        or (y2 < h and max_y >= y2 - y1 - margin))
+                    polygons[i].append((polygon + offset).flatten())
+                    scores[i].append(float(score))
+
+        results = []
+        for i, item in enumerate(imgs):
+            h, w = item['img'].shape[:2]
+            priorities = np.array(scores[i]) - np.array(truncated[i])
+            keep = poly_nms(polygons[i], priorities, nms_thr, mode='iom')
+            pred = TextDetDataSample(
+                metainfo=dict(
+                    img_path=item['img_path'],
+                    ori_shape=(h, w),
+                    img_shape=(h, w)))
+            pred.pred_instances = InstanceData(
+                polygons=[polygons[i][k] for k in keep],
+                scores=torch.FloatTensor([scores[i][k] for k in keep]))
+            results.append(pred)
+        return results
+
+    def _coarse_predict(self, data: Dict
+                        ) -> Tuple[List[TextDetDataSample], Optional[Tensor]]:
+        """Run the coarse pass on preprocessed data.
+
+        Args:
+            data (dict): Data processed by the model's data preprocessor.
+
+        Returns:
+            tuple(list[TextDetDataSample], Tensor or None): The coarse
+            predictions and the probability maps of shape (N, H, W) if the
+            detection head produces them.
+        """
+        if hasattr(self.model, 'extract_feat') and hasattr(
+                self.model, 'det_head'):
+            det_head = self.model.det_head
+            outs = det_head(
+                self.model.extract_feat(data['inputs']), data['data_samples'])
+            preds = det_head.postprocessor(outs, data['data_samples'])
+            if isinstance(outs, Tensor) and outs.dim() == 3:
+                return preds, outs.float()
+            return preds, None
+        return self.model(**data, mode='predict'), None
+
+    def _build_pipeline(self, **resize_kwargs) -> Compose:
+        """Build a copy of the test pipeline whose ``Resize`` is overridden by
+        ``resize_kwargs``.
+
+        Args:
+            **resize_kwargs: Either ``scale`` or ``scale_factor`` accepted by
+                :class:`mmocr.datasets.transforms.Resize`.
+
+        Returns:
+            Compose: The new pipeline.
+        """
+        pipeline_cfg = copy.deepcopy(self.cfg.test_dataloader.dataset.pipeline)
+        idx = self._get_transform_idx(pipeline_cfg, 'Resize')
+        if idx == -1:
+            raise ValueError(
+                'Resize is not found in the test pipeline, which is required '
+                'to rescale the images')
+        resize_cfg = {
+            k: v
+            for k, v in pipeline_cfg[idx].items()
+            if k not in ('scale', 'scale_factor')
+        }
+        resize_cfg.update(keep_ratio=True, **resize_kwargs)
+        pipeline_cfg[idx] = resize_cfg
+        return Compose(pipeline_cfg)
+
     def pred2dict(self, data_sample: TextDetDataSample) -> Dict:
         """Extract elements necessary to represent a prediction into a
         dictionary. It's better to contain only basic data elements such as
@@ -43,3 +395,87 @@ class TextDetInferencer(BaseMMOCRInferencer):
             result['bboxes'] = self._array2list(pred_instances.bboxes)
         result['scores'] = self._array2list(pred_instances.scores)
         return result
+
+
+def _tile_starts(length: int, tile: int, overlap: int) -> List[int]:
+    """Get the start coordinates of the tiles covering a side of an image.
+
+    Args:
+        length (int): The length of the side.
+        tile (int): The length of a tile.
+        overlap (int): The overlap between adjacent tiles.
+
+    Returns:
+        list[int]: The start coordinates. The last tile is aligned with the
+        end of the side.
+    """
+    assert 0 <= overlap < tile, 'tile_overlap must be in [0, tile_size)'
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, tile - overlap))
+    return starts + [length - tile]
+
+
+def _mask2rois(mask: np.ndarray, scale: Tuple[float, float],
+               img_shape: Tuple[int, int], dilation: int,
+               min_area: int) -> List[Tuple[int, int, int, int]]:
+    """Turn a binary text mask into non-overlapping regions of interest.
+
+    Args:
+        mask (np.ndarray): The binary mask in coarse resolution.
+        scale (tuple(float, float)): The ``(w, h)`` ratios from the mask to
+            the original image.
+        img_shape (tuple(int, int)): The ``(h, w)`` shape of the original
+            image.
+        dilation (int): The dilation radius in pixels of the mask.
+        min_area (int): The minimum area in pixels of a component.
+
+    Returns:
+        list[tuple(int, int, int, int)]: Boxes in ``(x1, y1, x2, y2)`` order
+        in the coordinates of the original image.
+    """
+    if dilation > 0:
+        kernel = np.ones((2 * dilation + 1, 2 * dilation + 1), np.uint8)
+        mask = cv2.dilate(mask, kernel)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    h, w = img_shape
+    boxes = []
+    # The first component is the background
+    for x, y, box_w, box_h, area in stats[1:]:
+        if area < min_area:
+            continue
+        boxes.append([
+            max(int(np.floor(x * scale[0])), 0),
+            max(int(np.floor(y * scale[1])), 0),
+            min(int(np.ceil((x + box_w) * scale[0])), w),
+            min(int(np.ceil((y + box_h) * scale[1])), h)
+        ])
+    return [tuple(box) for box in _merge_boxes(boxes)]
+
+
+def _merge_boxes(boxes: Sequence[List[int]]) -> List[List[int]]:
+    """Merge overlapping boxes until none of them overlaps.
+
+    Args:
+        boxes (list[list[int]]): Boxes in ``(x1, y1, x2, y2)`` order.
+
+    Returns:
+        list[list[int]]: The merged boxes.
+    """
+    boxes = [list(box) for box in boxes]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(len(boxes) - 1, i, -1):
+                a, b = boxes[i], boxes[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    boxes[i] = [
+                        min(a[0], b[0]),
+                        min(a[1], b[1]),
+                        max(a[2], b[2]),
+                        max(a[3], b[3])
+                    ]
+                    del boxes[j]
+                    merged = True
+    return boxes
@@ -1,10 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Dict
+from typing import Dict, List, Optional
 
 import numpy as np
 
 from mmocr.structures import TextRecogDataSample
-from .base_mmocr_inferencer import BaseMMOCRInferencer
+from .base_mmocr_inferencer import BaseMMOCRInferencer, InputsType
 
 
 class TextRecInferencer(BaseMMOCRInferencer):
@@ -26,6 +26,67 @@ class TextRecInferencer(BaseMMOCRInferencer):
         scope (str, optional): The scope of the model. Defaults to "mmocr".
     """
 
+    preprocess_kwargs: set = {'bucket_by_width'}
+    # The number of batches whose images are sorted by width together
+    bucket_batches: int = 8
+
+    def preprocess(self,
+                   inputs: InputsType,
+                   batch_size: int = 1,
+                   bucket_by_width: bool = True,
+                   **kwargs):
+        """Process the inputs into a model-feedable format.
+
+        Args:
+            inputs (InputsType): Inputs given by user.
+            batch_size (int): batch size. Defaults to 1.
+            bucket_by_width (bool): Whether to batch the images of similar
+                widths together if ``batch_size`` is larger than 1. With a
+                pipeline keeping the aspect ratio, e.g. ``RescaleToHeight``,
+                the images are then padded little in a batch. The inputs are
+                processed ``bucket_batches`` batches at a time and sorted by
+                width within each window, and the predictions are returned
+                in the order of the inputs. Defaults to True.
+
+        Yields:
+            Any: Data processed by the ``pipeline`` and ``collate_fn``.
+        """
+        self._order: Optional[List[int]] = None
+        if not bucket_by_width or batch_size <= 1 or len(inputs) <= 1:
+            yield from super().preprocess(inputs, batch_size, **kwargs)
+            return
+        self._order = []
+        window_size = batch_size * self.bucket_batches
+        for window in self._get_chunk_data(inputs, window_size):
+            order = sorted(
+                range(len(window)),
+                key=lambda i: window[i][1]['inputs'].shape[-1])
+            offset = len(self._order)
+            self._order.extend(offset + i for i in order)
+            for start in range(0, len(window), batch_size):
+                yield self._collate(
+                    [window[i] for i in order[start:start + batch_size]])
+
+    def __call__(self, inputs: InputsType, *args, **kwargs) -> dict:
+        """Call the inferencer.
+
+        See :meth:`BaseMMOCRInferencer.__call__` for the arguments. The
+        results are in the order of the inputs, even if the inputs are
+        bucketed by width in :meth:`preprocess`.
+        """
+        results = super().__call__(inputs, *args, **kwargs)
+        order, self._order = getattr(self, '_order', None), None
+        if order is None:
+            return results
+        for key in ('predictions', 'visualization'):
+            if len(results[key]) != len(order):
+                continue
+            restored = [None] * len(order)
+            for idx, result in zip(order, results[key]):
+                restored[idx] = result
+            results[key] = restored
+        return results
+
     def pred2dict(self, data_sample: TextRecogDataSample) -> Dict:
         """Extract elements necessary to represent a prediction into a
         dictionary. It's better to contain only basic data elements such as
@@ -0,0 +1,402 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import asyncio
+import bisect
+import json
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import mmcv
+import numpy as np
+
+from .inferencers.base_mmocr_inferencer import BaseMMOCRInferencer
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a request is submitted to a full :class:`MicroBatcher`."""
+
+
+class LatencyHistogram:
+    """Histogram of latencies in milliseconds.
+
+    It keeps cumulative counts for fixed buckets, like a Prometheus
+    histogram, and the most recent samples to estimate quantiles.
+
+    Args:
+        buckets (Sequence[float]): The upper bounds of the buckets in
+            milliseconds. Defaults to (5, 10, 25, 50, 100, 250, 500, 1000,
+            2500, 5000, 10000).
+        window (int): The number of recent samples the quantiles are
+            estimated from. Defaults to 10000.
+    """
+
+    def __init__(self,
+                 buckets: Sequence[float] = (5, 10, 25, 50, 100, 250, 500,
+                                             1000, 2500, 5000, 10000),
+                 window: int = 10000) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        """Add a latency in milliseconds."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def to_dict(self) -> Dict:
+        """Summarize the histogram as a json-serializable dict."""
+        cumulative = np.cumsum(self.counts).tolist()
+        buckets = {
+            f'le_{bound:g}': count
+            for bound, count in zip(self.buckets, cumulative)
+        }
+        buckets['le_inf'] = cumulative[-1]
+        result = dict(count=self.count, sum_ms=self.sum, buckets=buckets)
+        if self.recent:
+            recent = np.array(self.recent)
+            for q in (50, 95, 99):
+                result[f'p{q}_ms'] = float(np.percentile(recent, q))
+        return result
+
+
+class MicroBatcher:
+    """Group the images submitted concurrently into dynamic batches for an
+    inferencer.
+
+    Requests are queued, and a batch is formed as soon as either
+    ``max_batch_size`` images are queued or ``max_wait_ms`` has elapsed since
+    the first image of the batch was taken. Batches run one at a time on a
+    dedicated inference thread, so the event loop keeps accepting requests
+    while the models compute, and the next batch fills up meanwhile.
+
+    Args:
+        inferencer (BaseMMOCRInferencer): The inferencer, e.g.
+            :class:`MMOCRInferencer`.
+        max_batch_size (int): The maximum number of images per batch.
+            Defaults to 8.
+        max_wait_ms (float): The maximum time to wait for a batch to fill up
+            after its first image, in milliseconds. Defaults to 10.
+        max_queue_size (int): The maximum number of queued images. Further
+            requests are rejected with :class:`QueueFullError`, which bounds
+            the queueing delay under overload. Defaults to 256.
+        **call_kwargs: Other keyword arguments of the inferencer call, e.g.
+            ``det_batch_size``.
+
+    Example:
+        >>> batcher = MicroBatcher(MMOCRInferencer(det='DBNet', rec='CRNN'))
+        >>> await batcher.start()
+        >>> results = await asyncio.gather(
+        ...     *[batcher.submit(img) for img in imgs])
+        >>> await batcher.stop()
+    """
+
+    def __init__(self,
+                 inferencer: BaseMMOCRInferencer,
+                 max_batch_size: int = 8,
+                 max_wait_ms: float = 10.,
+                 max_queue_size: int = 256,
+                 **call_kwargs) -> None:
+        assert max_batch_size >= 1
+        self.inferencer = inferencer
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue_size = max_queue_size
+        self.call_kwargs = call_kwargs
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.requests_total = 0
+        self.requests_failed = 0
+        self.requests_rejected = 0
+        self.batch_sizes: Counter = Counter()
+        self.latency = LatencyHistogram()
+        self.inference_time = LatencyHistogram()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of images waiting for a batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Start the batching loop in the running event loop."""
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='mmocr-inference')
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching loop and fail the queued requests."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError('The batcher is stopped'))
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def submit(self, img: np.ndarray) -> Dict:
+        """Queue an image and wait for its prediction.
+
+        Args:
+            img (np.ndarray): The image in BGR order.
+
+        Returns:
+            dict: The prediction, as in the ``predictions`` of the
+            inferencer.
+        """
+        if self._task is None:
+            raise RuntimeError('The batcher is not started')
+        if self._queue.qsize() >= self.max_queue_size:
+            self.requests_rejected += 1
+            raise QueueFullError(
+                f'{self._queue.qsize()} images are already queued')
+        future = asyncio.get_running_loop().create_future()
+        self.requests_total += 1
+        await self._queue.put((img, future, time.perf_counter()))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+            await self._process(batch)
+
+    async def _process(self, batch: List[Tuple]) -> None:
+        # Skip the requests whose caller gave up waiting
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+        imgs = [img for img, _, _ in batch]
+        self.batch_sizes[len(batch)] += 1
+        start = time.perf_counter()
+        try:
+            predictions = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._infer, imgs)
+        except Exception as e:
+            self.requests_failed += len(batch)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        end = time.perf_counter()
+        self.inference_time.observe((end - start) * 1000)
+        for (_, future, submitted), prediction in zip(batch, predictions):
+            self.latency.observe((end - submitted) * 1000)
+            if not future.done():
+                future.set_result(prediction)
+
+    def _infer(self, imgs: List[np.ndarray]) -> List[Dict]:
+        return self.inferencer(
+            imgs, batch_size=len(imgs), progress_bar=False,
+            **self.call_kwargs)['predictions']
+
+    def metrics(self) -> Dict:
+        """Get the serving metrics as a json-serializable dict.
+
+        Returns:
+            dict: The queue depth, the request counters, the number of
+            batches per batch size, the mean batch fill (mean batch size
+            over ``max_batch_size``), and the histograms of the request
+            latencies and of the batch inference times.
+        """
+        num_batches = sum(self.batch_sizes.values())
+        num_batched = sum(size * count
+                          for size, count in self.batch_sizes.items())
+        return dict(
+            queue_depth=self.queue_depth,
+            requests_total=self.requests_total,
+            requests_failed=self.requests_failed,
+            requests_rejected=self.requests_rejected,
+            batches_total=num_batches,
+            batch_size_histogram={
+                str(size): count
+                for size, count in sorted(self.batch_sizes.items())
+            },
+            batch_fill=num_batched / num_batches /
+            self.max_batch_size if num_batches else 0.,
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=self.max_wait_ms,
+            latency_ms=self.latency.to_dict(),
+            inference_ms=self.inference_time.to_dict())
+
+
+class InferenceServer:
+    """Minimal HTTP/1.1 server exposing a :class:`MicroBatcher`, over TCP or
+    a Unix socket.
+
+    Endpoints:
+
+    - ``POST /predict``: the body is an encoded image (e.g. JPEG or PNG), and
+      the response is its prediction as JSON. Returns 400 if the image cannot
+      be decoded and 503 if the queue is full.
+    - ``GET /health``: ``{"status": "ok"}`` with the queue depth.
+    - ``GET /metrics``: :meth:`MicroBatcher.metrics`.
+
+    Args:
+        batcher (MicroBatcher): The batcher of the inferencer.
+        host (str): The host to listen on. Defaults to '127.0.0.1'.
+        port (int): The port to listen on. Defaults to 8000.
+        unix_socket (str, optional): The path of a Unix socket to listen on
+            instead of ``host`` and ``port``. Defaults to None.
+        max_body_size (int): The maximum size of a request body in bytes.
+            Defaults to 32 MB.
+
+    Example:
+        >>> server = InferenceServer(MicroBatcher(inferencer), port=8000)
+        >>> asyncio.run(server.serve_forever())
+        $ curl --data-binary @demo/demo_text_ocr.jpg localhost:8000/predict
+    """
+
+    def __init__(self,
+                 batcher: MicroBatcher,
+                 host: str = '127.0.0.1',
+                 port: int = 8000,
+                 unix_socket: Optional[str] = None,
+                 max_body_size: int = 32 * 1024**2) -> None:
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.max_body_size = max_body_size
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start the batcher and listen for connections."""
+        await self.batcher.start()
+        if self.unix_socket is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=self.unix_socket)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host,
+                                                      self.port)
+
+    async def close(self) -> None:
+        """Stop listening and stop the batcher."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        """Start the server and serve until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                status, payload = await self._dispatch(method, path, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            self._write_response(writer, 400, dict(error=str(e)), False)
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise ValueError('Malformed request line')
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length > self.max_body_size:
+            raise ValueError(f'The body exceeds {self.max_body_size} bytes')
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    async def _dispatch(self, method: str, path: str,
+                        body: bytes) -> Tuple[int, Dict]:
+        if method == 'GET' and path == '/health':
+            return 200, dict(status='ok', queue_depth=self.batcher.queue_depth)
+        if method == 'GET' and path == '/metrics':
+            return 200, self.batcher.metrics()
+        if method == 'POST' and path == '/predict':
+            loop = asyncio.get_running_loop()
+            # Decode in the default executor so the event loop is not blocked
+            img = await loop.run_in_executor(None, _decode_image, body)
+            if img is None:
+                return 400, dict(error='The body is not a valid image')
+            try:
+                return 200, await self.batcher.submit(img)
+            except QueueFullError as e:
+                return 503, dict(error=str(e))
+            except Exception as e:
+                return 500, dict(error=repr(e))
+        return 404, dict(error=f'{method} {path} is not found')
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int,
+                        payload: Dict, keep_alive: bool) -> None:
+        reasons = {
+            200: 'OK',
+            400: 'Bad Request',
+            404: 'Not Found',
+            500: 'Internal Server Error',
+            503: 'Service Unavailable'
+        }
+        body = json.dumps(payload).encode()
+        head = (f'HTTP/1.1 {status} {reasons[status]}\r\n'
+                'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+                '\r\n')
+        writer.write(head.encode('latin-1') + body)
+
+
+def _decode_image(content: bytes) -> Optional[np.ndarray]:
+    if not content:
+        return None
+    try:
+        return mmcv.imfrombytes(content)
+    except Exception:
+        return None
@@ -1,12 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .dataset_wrapper import ConcatDataset
-from .icdar_dataset import IcdarDataset
-from .ocr_dataset import OCRDataset
-from .recog_lmdb_dataset import RecogLMDBDataset
-from .recog_text_dataset import RecogTextDataset
-from .samplers import *  # NOQA
-from .transforms import *  # NOQA
-from .wildreceipt_dataset import WildReceiptDataset
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'dataset_wrapper', 'icdar_dataset', 'ocr_dataset', 'recog_lmdb_dataset',
+    'recog_text_dataset', 'samplers', 'transforms', 'wildreceipt_dataset'
+])
 
 __all__ = [
     'IcdarDataset', 'OCRDataset', 'RecogLMDBDataset', 'RecogTextDataset',
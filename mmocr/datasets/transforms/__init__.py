@@ -1,18 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .adapters import MMDet2MMOCR, MMOCR2MMDet
-from .formatting import PackKIEInputs, PackTextDetInputs, PackTextRecogInputs
-from .loading import (InferencerLoader, LoadImageFromFile,
-                      LoadImageFromNDArray, LoadKIEAnnotations,
-                      LoadOCRAnnotations)
-from .ocr_transforms import (FixInvalidPolygon, RandomCrop, RandomRotate,
-                             RemoveIgnored, Resize)
-from .textdet_transforms import (BoundedScaleAspectJitter, RandomFlip,
-                                 ShortScaleAspectJitter, SourceImagePad,
-                                 TextDetRandomCrop, TextDetRandomCropFlip)
-from .textrecog_transforms import (CropHeight, ImageContentJitter, PadToWidth,
-                                   PyramidRescale, RescaleToHeight,
-                                   ReversePixels, TextRecogGeneralAug)
-from .wrappers import ConditionApply, ImgAugWrapper, TorchVisionWrapper
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'adapters', 'formatting', 'loading', 'ocr_transforms',
+    'textdet_transforms', 'textrecog_transforms', 'wrappers'
+])
 
 __all__ = [
     'LoadOCRAnnotations', 'RandomRotate', 'ImgAugWrapper', 'SourceImagePad',
@@ -23,5 +15,6 @@ __all__ = [
     'PackKIEInputs', 'LoadKIEAnnotations', 'FixInvalidPolygon', 'MMDet2MMOCR',
     'MMOCR2MMDet', 'LoadImageFromFile', 'LoadImageFromNDArray', 'CropHeight',
     'InferencerLoader', 'RemoveIgnored', 'ConditionApply', 'CropHeight',
-    'TextRecogGeneralAug', 'ImageContentJitter', 'ReversePixels'
+    'TextRecogGeneralAug', 'ImageContentJitter', 'ReversePixels',
+    'GenerateTextDetTargets'
 ]
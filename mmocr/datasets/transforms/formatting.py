@@ -37,6 +37,8 @@ class PackTextDetInputs(BaseTransform):
           'gt_ignored'.
         - texts (list[str]): The groundtruth texts. Renamed from 'gt_texts'.
 
+      - gt_targets (dict): The loss targets generated by
+        :class:`GenerateTextDetTargets`, if any.
       - metainfo (dict): 'metainfo' is always populated. The contents of the
         'metainfo' depends on ``meta_keys``. By default it includes:
 
@@ -113,6 +115,8 @@ class PackTextDetInputs(BaseTransform):
             else:
                 instance_data[self.mapping_table[key]] = results[key]
         data_sample.gt_instances = instance_data
+        if 'gt_targets' in results:
+            data_sample.gt_targets = results['gt_targets']
 
         img_meta = {}
         for key in self.meta_keys:
@@ -6,12 +6,15 @@ from typing import Dict, List, Sequence, Tuple, Union
 import cv2
 import mmcv
 import numpy as np
+import torch
 from mmcv.transforms import RandomFlip as MMCV_RandomFlip
 from mmcv.transforms.base import BaseTransform
 from mmcv.transforms.utils import avoid_cache_randomness, cache_randomness
+from mmengine.structures import InstanceData
 from shapely.geometry import Polygon as plg
 
-from mmocr.registry import TRANSFORMS
+from mmocr.registry import MODELS, TRANSFORMS
+from mmocr.structures import TextDetDataSample
 from mmocr.utils import crop_polygon, poly2bbox, poly_intersection
 
 
@@ -852,3 +855,69 @@ class TextDetRandomCrop(BaseTransform):
         repr_str += f'(target_size = {self.target_size}, '
         repr_str += f'positive_sample_ratio = {self.positive_sample_ratio})'
         return repr_str
+
+
+@TRANSFORMS.register_module()
+class GenerateTextDetTargets(BaseTransform):
+    """Generate the loss targets of a segmentation-based text detector, e.g.
+    the shrunk text kernels and the threshold map of DBNet, in the data
+    pipeline.
+
+    The targets are generated by the module loss of the detector, which then
+    uses them instead of generating them on the main process in each training
+    step. Therefore, the transform should be the last one before
+    :class:`PackTextDetInputs`, and be given the same ``module_loss`` as the
+    head of the detector. The targets generated with other settings than the
+    ones of the module loss of the model are regenerated in the loss.
+
+    Required Keys:
+
+    - img_shape
+    - gt_polygons
+    - gt_ignored
+
+    Added Keys:
+
+    - gt_targets
+
+    Args:
+        module_loss (dict): The config of the module loss of the detector,
+            which is one of ``DBModuleLoss``, ``PANModuleLoss``,
+            ``PSEModuleLoss``, ``FCEModuleLoss``, ``TextSnakeModuleLoss`` and
+            ``DRRGModuleLoss``.
+    """
+
+    def __init__(self, module_loss: Dict) -> None:
+        self.module_loss_cfg = module_loss
+        self.module_loss = MODELS.build(module_loss)
+        # Only the module losses of segmentation-based detectors generate
+        # their targets per data sample
+        if not hasattr(self.module_loss, 'precompute_targets'):
+            raise TypeError(
+                f'{type(self.module_loss).__name__} does not support '
+                'generating its targets in the data pipeline, which requires '
+                'a module loss based on SegBasedModuleLoss')
+
+    def transform(self, results: Dict) -> Dict:
+        """Generate the loss targets.
+
+        Args:
+            results (dict): Result dict containing the data to transform.
+
+        Returns:
+            dict: The transformed data.
+        """
+        data_sample = TextDetDataSample(
+            metainfo=dict(img_shape=tuple(results['img_shape'][:2])))
+        # The module losses may modify the polygons and the flags in place
+        data_sample.gt_instances = InstanceData(
+            polygons=[polygon.copy() for polygon in results['gt_polygons']],
+            ignored=torch.tensor(results['gt_ignored'], dtype=torch.bool))
+        results['gt_targets'] = self.module_loss.precompute_targets(
+            data_sample)
+        return results
+
+    def __repr__(self) -> str:
+        repr_str = self.__class__.__name__
+        repr_str += f'(module_loss={self.module_loss_cfg})'
+        return repr_str
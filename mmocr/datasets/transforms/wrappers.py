@@ -1,9 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import warnings
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-import imgaug
-import imgaug.augmenters as iaa
 import numpy as np
 import torchvision.transforms as torchvision_transforms
 from mmcv.transforms import Compose
@@ -13,6 +11,11 @@ from PIL import Image
 from mmocr.registry import TRANSFORMS
 from mmocr.utils import poly2bbox
 
+if TYPE_CHECKING:
+    # imgaug is imported when an ImgAugWrapper is built, as importing it takes
+    # a while
+    import imgaug
+
 
 @TRANSFORMS.register_module()
 class ImgAugWrapper(BaseTransform):
@@ -94,7 +97,7 @@ class ImgAugWrapper(BaseTransform):
             results = self.fix(results)
         return results
 
-    def _augment_annotations(self, aug: imgaug.augmenters.meta.Augmenter,
+    def _augment_annotations(self, aug: 'imgaug.augmenters.meta.Augmenter',
                              ori_shape: Tuple[int,
                                               int], results: Dict) -> Dict:
         """Augment annotations following the pre-defined augmentation sequence.
@@ -140,7 +143,7 @@ class ImgAugWrapper(BaseTransform):
 
         return True
 
-    def _augment_polygons(self, aug: imgaug.augmenters.meta.Augmenter,
+    def _augment_polygons(self, aug: 'imgaug.augmenters.meta.Augmenter',
                           ori_shape: Tuple[int, int], polys: List[np.ndarray]
                           ) -> Tuple[List[np.ndarray], List[int]]:
         """Augment polygons.
@@ -154,6 +157,8 @@ class ImgAugWrapper(BaseTransform):
             tuple(list[np.ndarray], list[int]): The augmented polygons, and the
             indices of polygons removed as they are out of the augmented image.
         """
+        import imgaug
+
         imgaug_polys = []
         for poly in polys:
             poly = poly.reshape(-1, 2)
@@ -195,6 +200,8 @@ class ImgAugWrapper(BaseTransform):
         Returns:
             imgaug.augmenters.meta.Augmenter: The built augmenter.
         """
+        import imgaug.augmenters as iaa
+
         if args is None:
             return None
         if isinstance(args, (int, float, str)):
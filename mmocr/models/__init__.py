@@ -1,5 +1,4 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .common import *  # NOQA
-from .kie import *  # NOQA
-from .textdet import *  # NOQA
-from .textrecog import *  # NOQA
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['common', 'kie', 'textdet', 'textrecog'])
@@ -1,7 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .backbones import *  # NOQA
-from .dictionary import *  # NOQA
-from .layers import *  # NOQA
-from .losses import *  # NOQA
-from .modules import *  # NOQA
-from .plugins import *  # NOQA
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(
+    __name__,
+    ['backbones', 'dictionary', 'layers', 'losses', 'modules', 'plugins'])
@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .clip_resnet import CLIPResNet
-from .unet import UNet
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['clip_resnet', 'unet'])
 
 __all__ = ['UNet', 'CLIPResNet']
@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from mmocr.utils.lazy_import import lazy_package
 
-from .dictionary import Dictionary
+__getattr__ = lazy_package(__name__, ['dictionary'])
 
 __all__ = ['Dictionary']
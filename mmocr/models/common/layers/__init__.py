@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .transformer_layers import TFDecoderLayer, TFEncoderLayer
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['transformer_layers'])
 
 __all__ = ['TFEncoderLayer', 'TFDecoderLayer']
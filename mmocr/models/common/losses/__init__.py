@@ -1,9 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .bce_loss import (MaskedBalancedBCELoss, MaskedBalancedBCEWithLogitsLoss,
-                       MaskedBCELoss, MaskedBCEWithLogitsLoss)
-from .ce_loss import CrossEntropyLoss
-from .dice_loss import MaskedDiceLoss, MaskedSquareDiceLoss
-from .l1_loss import MaskedSmoothL1Loss, SmoothL1Loss
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__,
+                           ['bce_loss', 'ce_loss', 'dice_loss', 'l1_loss'])
 
 __all__ = [
     'MaskedBalancedBCEWithLogitsLoss', 'MaskedDiceLoss', 'MaskedSmoothL1Loss',
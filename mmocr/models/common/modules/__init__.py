@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .transformer_module import (MultiHeadAttention, PositionalEncoding,
-                                 PositionwiseFeedForward,
-                                 ScaledDotProductAttention)
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['transformer_module'])
 
 __all__ = [
     'ScaledDotProductAttention', 'MultiHeadAttention',
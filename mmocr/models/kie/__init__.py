@@ -1,5 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .extractors import *  # NOQA
-from .heads import *  # NOQA
-from .module_losses import *  # NOQA
-from .postprocessors import *  # NOQA
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(
+    __name__, ['extractors', 'heads', 'module_losses', 'postprocessors'])
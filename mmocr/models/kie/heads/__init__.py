@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .sdmgr_head import SDMGRHead
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['sdmgr_head'])
 
 __all__ = ['SDMGRHead']
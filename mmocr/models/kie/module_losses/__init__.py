@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .sdmgr_module_loss import SDMGRModuleLoss
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['sdmgr_module_loss'])
 
 __all__ = ['SDMGRModuleLoss']
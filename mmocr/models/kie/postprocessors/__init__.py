@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .sdmgr_postprocessor import SDMGRPostProcessor
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['sdmgr_postprocessor'])
 
 __all__ = ['SDMGRPostProcessor']
@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .data_preprocessors import *  # NOQA
-from .detectors import *  # NOQA
-from .heads import *  # NOQA
-from .module_losses import *  # NOQA
-from .necks import *  # NOQA
-from .postprocessors import *  # NOQA
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'data_preprocessors', 'detectors', 'heads', 'module_losses', 'necks',
+    'postprocessors'
+])
@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .data_preprocessor import TextDetDataPreprocessor
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['data_preprocessor'])
 
 __all__ = ['TextDetDataPreprocessor']
@@ -1,12 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .dbnet import DBNet
-from .drrg import DRRG
-from .fcenet import FCENet
-from .mmdet_wrapper import MMDetWrapper
-from .panet import PANet
-from .psenet import PSENet
-from .single_stage_text_detector import SingleStageTextDetector
-from .textsnake import TextSnake
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'dbnet', 'drrg', 'fcenet', 'mmdet_wrapper', 'panet', 'psenet',
+    'single_stage_text_detector', 'textsnake'
+])
 
 __all__ = [
     'SingleStageTextDetector', 'DBNet', 'PANet', 'PSENet', 'TextSnake',
@@ -1,11 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .base import BaseTextDetHead
-from .db_head import DBHead
-from .drrg_head import DRRGHead
-from .fce_head import FCEHead
-from .pan_head import PANHead
-from .pse_head import PSEHead
-from .textsnake_head import TextSnakeHead
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'base', 'db_head', 'drrg_head', 'fce_head', 'pan_head', 'pse_head',
+    'textsnake_head'
+])
 
 __all__ = [
     'PSEHead', 'PANHead', 'DBHead', 'FCEHead', 'TextSnakeHead', 'DRRGHead',
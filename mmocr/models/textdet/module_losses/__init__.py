@@ -1,11 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .db_module_loss import DBModuleLoss
-from .drrg_module_loss import DRRGModuleLoss
-from .fce_module_loss import FCEModuleLoss
-from .pan_module_loss import PANModuleLoss
-from .pse_module_loss import PSEModuleLoss
-from .seg_based_module_loss import SegBasedModuleLoss
-from .textsnake_module_loss import TextSnakeModuleLoss
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'db_module_loss', 'drrg_module_loss', 'fce_module_loss', 'pan_module_loss',
+    'pse_module_loss', 'seg_based_module_loss', 'textsnake_module_loss'
+])
 
 __all__ = [
     'PANModuleLoss', 'PSEModuleLoss', 'DBModuleLoss', 'TextSnakeModuleLoss',
@@ -162,49 +162,40 @@ class DBModuleLoss(SegBasedModuleLoss):
         else:
             expanded_polygon = expanded_polygon.reshape(-1, 2).astype(np.int32)
 
-        x_min = expanded_polygon[:, 0].min()
-        x_max = expanded_polygon[:, 0].max()
-        y_min = expanded_polygon[:, 1].min()
-        y_max = expanded_polygon[:, 1].max()
-
-        width = x_max - x_min + 1
-        height = y_max - y_min + 1
-
-        polygon[:, 0] = polygon[:, 0] - x_min
-        polygon[:, 1] = polygon[:, 1] - y_min
-
-        xs = np.broadcast_to(
-            np.linspace(0, width - 1, num=width).reshape(1, width),
-            (height, width))
-        ys = np.broadcast_to(
-            np.linspace(0, height - 1, num=height).reshape(height, 1),
-            (height, width))
-
-        distance_map = np.zeros((polygon.shape[0], height, width),
-                                dtype=np.float32)
-        for i in range(polygon.shape[0]):
-            j = (i + 1) % polygon.shape[0]
-            absolute_distance = self._dist_points2line(xs, ys, polygon[i],
-                                                       polygon[j])
-            distance_map[i] = np.clip(absolute_distance / distance, 0, 1)
-        distance_map = distance_map.min(axis=0)
-
-        x_min_valid = min(max(0, x_min), canvas.shape[1] - 1)
-        x_max_valid = min(max(0, x_max), canvas.shape[1] - 1)
-        y_min_valid = min(max(0, y_min), canvas.shape[0] - 1)
-        y_max_valid = min(max(0, y_max), canvas.shape[0] - 1)
-
-        if x_min_valid - x_min >= width or y_min_valid - y_min >= height:
+        # The bounding box of the expanded polygon, cropped by the canvas
+        x_min = max(expanded_polygon[:, 0].min(), 0)
+        x_max = min(expanded_polygon[:, 0].max(), canvas.shape[1] - 1)
+        y_min = max(expanded_polygon[:, 1].min(), 0)
+        y_max = min(expanded_polygon[:, 1].max(), canvas.shape[0] - 1)
+        if x_min > x_max or y_min > y_max:
             return
 
-        cv2.fillPoly(mask, [expanded_polygon.astype(np.int32)], 1.0)
-        canvas[y_min_valid:y_max_valid + 1,
-               x_min_valid:x_max_valid + 1] = np.fmax(
-                   1 - distance_map[y_min_valid - y_min:y_max_valid - y_max +
-                                    height, x_min_valid - x_min:x_max_valid -
-                                    x_max + width],
-                   canvas[y_min_valid:y_max_valid + 1,
-                          x_min_valid:x_max_valid + 1])
+        cv2.fillPoly(mask, [expanded_polygon], 1.0)
+
+        # The normalized distance to the closest edge. An edge only affects
+        # the pixels closer to it than the offset distance, which lie in its
+        # bounding box expanded by that distance
+        distance_map = np.ones((y_max - y_min + 1, x_max - x_min + 1),
+                               dtype=np.float32)
+        for pt1, pt2 in zip(polygon, np.roll(polygon, -1, axis=0)):
+            left = max(int(np.floor(min(pt1[0], pt2[0]) - distance)), x_min)
+            right = min(int(np.ceil(max(pt1[0], pt2[0]) + distance)), x_max)
+            top = max(int(np.floor(min(pt1[1], pt2[1]) - distance)), y_min)
+            bottom = min(int(np.ceil(max(pt1[1], pt2[1]) + distance)), y_max)
+            if left > right or top > bottom:
+                continue
+            xs = np.arange(left, right + 1, dtype=np.float64).reshape(1, -1)
+            ys = np.arange(top, bottom + 1, dtype=np.float64).reshape(-1, 1)
+            absolute_distance = self._dist_points2line(xs, ys, pt1, pt2)
+            window = distance_map[top - y_min:bottom - y_min + 1,
+                                  left - x_min:right - x_min + 1]
+            np.minimum(
+                window,
+                np.clip(absolute_distance / distance, 0, 1),
+                out=window)
+
+        region = canvas[y_min:y_max + 1, x_min:x_max + 1]
+        np.fmax(1 - distance_map, region, out=region)
 
     def get_targets(self, data_samples: List[TextDetDataSample]) -> Tuple:
         """Generate loss targets from data samples.
@@ -217,7 +208,7 @@ class DBModuleLoss(SegBasedModuleLoss):
         """
 
         gt_shrinks, gt_shrink_masks, gt_thrs, gt_thr_masks = multi_apply(
-            self._get_target_single, data_samples)
+            self._get_target_or_precomputed, data_samples)
         gt_shrinks = torch.cat(gt_shrinks)
         gt_shrink_masks = torch.cat(gt_shrink_masks)
         gt_thrs = torch.cat(gt_thrs)
@@ -268,12 +259,15 @@ class DBModuleLoss(SegBasedModuleLoss):
 
         Args:
             xs (ndarray): The x coordinates of points of size :math:`(N, )`.
-            ys (ndarray): The y coordinates of size :math:`(N, )`.
+            ys (ndarray): The y coordinates of size :math:`(N, )`. ``xs`` and
+                ``ys`` can also be of any shapes broadcastable to each other,
+                e.g. a row and a column of a grid.
             pt1 (ndarray): The first point on the line of size :math:`(2, )`.
             pt2 (ndarray): The second point on the line of size :math:`(2, )`.
 
         Returns:
-            ndarray: The distance matrix of size :math:`(N, )`.
+            ndarray: The distance matrix of size :math:`(N, )`, or of the
+            broadcast shape of ``xs`` and ``ys``.
         """
         # suppose a triangle with three edge abc with c=point_1 point_2
         # a^2
@@ -282,19 +276,14 @@ class DBModuleLoss(SegBasedModuleLoss):
         b_square = np.square(xs - pt2[0]) + np.square(ys - pt2[1])
         # c^2
         c_square = np.square(pt1[0] - pt2[0]) + np.square(pt1[1] - pt2[1])
-        # -cosC=(c^2-a^2-b^2)/2(ab)
-        neg_cos_c = (
-            (c_square - a_square - b_square) /
-            (np.finfo(np.float32).eps + 2 * np.sqrt(a_square * b_square)))
-        # clip -cosC value to [-1, 1]
-        neg_cos_c = np.clip(neg_cos_c, -1.0, 1.0)
-        # sinC^2=1-cosC^2
-        square_sin = 1 - np.square(neg_cos_c)
-        square_sin = np.nan_to_num(square_sin)
-        # distance=a*b*sinC/c=a*h/c=2*area/c
-        result = np.sqrt(a_square * b_square * square_sin /
-                         (np.finfo(np.float32).eps + c_square))
-        # set result to minimum edge if C<pi/2
-        result[neg_cos_c < 0] = np.sqrt(np.fmin(a_square,
-                                                b_square))[neg_cos_c < 0]
+        # distance^2=(2*area/c)^2, where 2*area is the cross product of the
+        # vectors from point_1 to point_2 and to the points
+        cross = ((pt2[0] - pt1[0]) * (ys - pt1[1]) - (pt2[1] - pt1[1]) *
+                 (xs - pt1[0]))
+        square_distance = np.square(cross) / (
+            np.finfo(np.float32).eps + c_square)
+        # set result to minimum edge if C<pi/2, i.e. c^2<a^2+b^2
+        result = np.sqrt(
+            np.where(c_square < a_square + b_square,
+                     np.fmin(a_square, b_square), square_distance))
         return result
@@ -252,7 +252,8 @@ class DRRGModuleLoss(TextSnakeModuleLoss):
             return self.targets
 
         self.cache_data_samples = data_samples
-        self.targets = multi_apply(self._get_target_single, data_samples)
+        self.targets = multi_apply(self._get_target_or_precomputed,
+                                   data_samples)
         return self.targets
 
     def _get_target_single(self, data_sample: TextDetDataSample) -> Tuple:
@@ -5,7 +5,6 @@ import cv2
 import numpy as np
 import torch
 from mmdet.models.utils import multi_apply
-from numpy.fft import fft
 from numpy.linalg import norm
 
 from mmocr.registry import MODELS
@@ -193,8 +192,8 @@ class FCEModuleLoss(TextSnakeModuleLoss):
             tuple[Tensor]: A tuple of three tensors from three different
                 feature level as FCENet targets.
         """
-        p3_maps, p4_maps, p5_maps = multi_apply(self._get_target_single,
-                                                data_samples)
+        p3_maps, p4_maps, p5_maps = multi_apply(
+            self._get_target_or_precomputed, data_samples)
         p3_maps = torch.cat(p3_maps, 0)
         p4_maps = torch.cat(p4_maps, 0)
         p5_maps = torch.cat(p5_maps, 0)
@@ -329,20 +328,18 @@ class FCEModuleLoss(TextSnakeModuleLoss):
                 resampled_bot_line = resampled_bot_line[
                     head_shrink_num:len(resampled_bot_line) - tail_shrink_num]
 
-            for i in range(0, len(center_line) - 1):
-                tl = center_line[i] + (resampled_top_line[i] - center_line[i]
-                                       ) * self.center_region_shrink_ratio
-                tr = center_line[i + 1] + (
-                    resampled_top_line[i + 1] -
-                    center_line[i + 1]) * self.center_region_shrink_ratio
-                br = center_line[i + 1] + (
-                    resampled_bot_line[i + 1] -
-                    center_line[i + 1]) * self.center_region_shrink_ratio
-                bl = center_line[i] + (resampled_bot_line[i] - center_line[i]
-                                       ) * self.center_region_shrink_ratio
-                current_center_box = np.vstack([tl, tr, br,
-                                                bl]).astype(np.int32)
-                center_region_boxes.append(current_center_box)
+            shrunk_top_line = center_line + (
+                resampled_top_line -
+                center_line) * self.center_region_shrink_ratio
+            shrunk_bot_line = center_line + (
+                resampled_bot_line -
+                center_line) * self.center_region_shrink_ratio
+            center_region_boxes.extend(
+                np.stack([
+                    shrunk_top_line[:-1], shrunk_top_line[1:],
+                    shrunk_bot_line[1:], shrunk_bot_line[:-1]
+                ],
+                         axis=1).astype(np.int32))
 
         cv2.fillPoly(center_region_mask, center_region_boxes, 1)
         return center_region_mask
@@ -371,24 +368,25 @@ class FCEModuleLoss(TextSnakeModuleLoss):
         k = self.fourier_degree
         real_map = np.zeros((k * 2 + 1, h, w), dtype=np.float32)
         imag_map = np.zeros((k * 2 + 1, h, w), dtype=np.float32)
-
-        for poly in text_polys:
-            mask = np.zeros((h, w), dtype=np.uint8)
-            polygon = np.array(poly).reshape((1, -1, 2))
-            cv2.fillPoly(mask, polygon.astype(np.int32), 1)
-            fourier_coeff = self._cal_fourier_signature(polygon[0], k)
-            for i in range(-k, k + 1):
-                if i != 0:
-                    real_map[i + k, :, :] = mask * fourier_coeff[i + k, 0] + (
-                        1 - mask) * real_map[i + k, :, :]
-                    imag_map[i + k, :, :] = mask * fourier_coeff[i + k, 1] + (
-                        1 - mask) * imag_map[i + k, :, :]
-                else:
-                    yx = np.argwhere(mask > 0.5)
-                    k_ind = np.ones((len(yx)), dtype=np.int64) * k
-                    y, x = yx[:, 0], yx[:, 1]
-                    real_map[k_ind, y, x] = fourier_coeff[k, 0] - x
-                    imag_map[k_ind, y, x] = fourier_coeff[k, 1] - y
+        if len(text_polys) == 0:
+            return real_map, imag_map
+
+        polygons = [np.array(poly).reshape(-1, 2) for poly in text_polys]
+        fourier_coeffs = self._cal_fourier_signatures(polygons, k)
+
+        # The index of the polygon covering each pixel plus one, where the
+        # later polygons overwrite the earlier ones. The polygons without
+        # any resampled point have no contour to encode and are left out
+        index_map = np.zeros((h, w), dtype=np.int32)
+        for i, polygon in enumerate(polygons):
+            if not np.isnan(fourier_coeffs[i, 0, 0]):
+                cv2.fillPoly(index_map, [polygon.astype(np.int32)], i + 1)
+        y, x = np.nonzero(index_map)
+        pixel_coeffs = fourier_coeffs[index_map[y, x] - 1]
+        real_map[:, y, x] = pixel_coeffs[:, :, 0].T
+        imag_map[:, y, x] = pixel_coeffs[:, :, 1].T
+        real_map[k, y, x] = pixel_coeffs[:, k, 0] - x
+        imag_map[k, y, x] = pixel_coeffs[:, k, 1] - y
 
         return real_map, imag_map
 
@@ -403,118 +401,165 @@ class FCEModuleLoss(TextSnakeModuleLoss):
               ndarray: An array shaped (2k+1, 2) containing
                   real part and image part of 2k+1 Fourier coefficients.
         """
-        resampled_polygon = self._resample_polygon(polygon)
-        resampled_polygon = self._normalize_polygon(resampled_polygon)
-
-        fourier_coeff = self._poly2fourier(resampled_polygon, fourier_degree)
-        fourier_coeff = self._clockwise(fourier_coeff, fourier_degree)
+        return self._cal_fourier_signatures([polygon], fourier_degree)[0]
 
-        real_part = np.real(fourier_coeff).reshape((-1, 1))
-        image_part = np.imag(fourier_coeff).reshape((-1, 1))
-        fourier_signature = np.hstack([real_part, image_part])
-
-        return fourier_signature
-
-    def _resample_polygon(self,
-                          polygon: ArrayLike,
-                          n: int = 400) -> np.ndarray:
-        """Resample one polygon with n points on its boundary.
+    def _cal_fourier_signatures(self, polygons: Sequence[ArrayLike],
+                                fourier_degree: int) -> np.ndarray:
+        """Calculate the Fourier signatures of polygons at once.
 
         Args:
-            polygon (list[ndarray]): The input polygon.
-            n (int): The number of resampled points. Defaults to 400.
+              polygons (list[ndarray]): The input polygons, each of shape
+                  (n, 2).
+              fourier_degree (int): The maximum Fourier degree K.
         Returns:
-            ndarray: The resampled polygon.
+              ndarray: An array shaped (N, 2k+1, 2) containing real part and
+                  image part of 2k+1 Fourier coefficients of each polygon,
+                  which are NaN if the polygon has no resampled point.
         """
-        length = []
+        points, num_points = self._resample_polygons(polygons)
+        start_inds = self._normalize_polygons(points, num_points)
 
-        for i in range(len(polygon)):
-            p1 = polygon[i]
-            if i == len(polygon) - 1:
-                p2 = polygon[0]
-            else:
-                p2 = polygon[i + 1]
-            length.append(((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5)
+        fourier_coeff = self._poly2fourier(points, num_points, start_inds,
+                                           fourier_degree)
+        fourier_coeff = self._clockwise(fourier_coeff, fourier_degree)
 
-        total_length = sum(length)
-        n_on_each_line = (np.array(length) / (total_length + 1e-8)) * n
-        n_on_each_line = n_on_each_line.astype(np.int32)
-        new_polygon = []
+        return np.stack([np.real(fourier_coeff),
+                         np.imag(fourier_coeff)],
+                        axis=-1)
 
-        for i in range(len(polygon)):
-            num = n_on_each_line[i]
-            p1 = polygon[i]
-            if i == len(polygon) - 1:
-                p2 = polygon[0]
-            else:
-                p2 = polygon[i + 1]
+    def _resample_polygons(self,
+                           polygons: Sequence[ArrayLike],
+                           n: int = 400) -> Tuple[np.ndarray, np.ndarray]:
+        """Resample polygons with about n points on each boundary. Each edge
+        gets a number of points proportional to its length, evenly spaced
+        from its first end.
 
-            if num == 0:
-                continue
+        Args:
+            polygons (list[ndarray]): The input polygons, each of shape
+                (n, 2).
+            n (int): The number of resampled points. Defaults to 400.
+        Returns:
+            tuple(ndarray, ndarray):
 
-            dxdy = (p2 - p1) / num
-            for j in range(num):
-                point = p1 + dxdy * j
-                new_polygon.append(point)
+            - points (ndarray): The resampled points of all the polygons,
+              concatenated in a (M, 2) array.
+            - num_points (ndarray): The number of resampled points of each
+              polygon.
+        """
+        num_vertices = np.array([len(polygon) for polygon in polygons])
+        vertices = np.concatenate(
+            [np.asarray(polygon).reshape(-1, 2) for polygon in polygons])
+        poly_inds = np.repeat(np.arange(len(polygons)), num_vertices)
+
+        # The edges from each vertex to the next one on its polygon
+        next_inds = np.arange(len(vertices)) + 1
+        ends = np.cumsum(num_vertices)
+        next_inds[ends - 1] = ends - num_vertices
+        edges = vertices[next_inds] - vertices
+        lengths = np.sqrt(np.square(edges).sum(axis=1))
+        total_lengths = np.bincount(
+            poly_inds, lengths, minlength=len(polygons))
+        n_on_each_line = (lengths / (total_lengths[poly_inds] + 1e-8)) * n
+        n_on_each_line = n_on_each_line.astype(np.int32)
 
-        return np.array(new_polygon)
+        edge_inds = np.repeat(np.arange(len(vertices)), n_on_each_line)
+        steps = np.arange(len(edge_inds)) - np.repeat(
+            np.cumsum(n_on_each_line) - n_on_each_line, n_on_each_line)
+        dxdy = edges[edge_inds] / n_on_each_line[edge_inds, None]
+        points = vertices[edge_inds] + dxdy * steps[:, None]
+        num_points = np.bincount(
+            poly_inds, n_on_each_line,
+            minlength=len(polygons)).astype(np.int64)
+        return points, num_points
 
-    def _normalize_polygon(self, polygon: ArrayLike) -> np.ndarray:
-        """Normalize one polygon so that its start point is at right most.
+    def _normalize_polygons(self, points: np.ndarray,
+                            num_points: np.ndarray) -> np.ndarray:
+        """Find the start point of each polygon, which is at right most.
 
         Args:
-            polygon (list[ndarray]): The origin polygon.
+            points (ndarray): The points of all the polygons, concatenated in
+                a (M, 2) array.
+            num_points (ndarray): The number of points of each polygon.
         Returns:
-            ndarray: The polygon with start point at right.
+            ndarray: The index of the start point on each polygon.
         """
-        temp_polygon = polygon - polygon.mean(axis=0)
-        x = np.abs(temp_polygon[:, 0])
-        y = temp_polygon[:, 1]
-        index_x = np.argsort(x)
-        index_y = np.argmin(y[index_x[:8]])
-        index = index_x[index_y]
-        new_polygon = np.concatenate([polygon[index:], polygon[:index]])
-        return new_polygon
+        start_inds = np.zeros(len(num_points), dtype=np.int64)
+        starts = np.cumsum(num_points) - num_points
+        # Sorted polygon by polygon, so that the points tied are ordered
+        # the same as for a single polygon
+        for i, (start, num) in enumerate(zip(starts, num_points)):
+            if num == 0:
+                continue
+            polygon = points[start:start + num]
+            temp_polygon = polygon - polygon.mean(axis=0)
+            x = np.abs(temp_polygon[:, 0])
+            y = temp_polygon[:, 1]
+            index_x = np.argsort(x)
+            index_y = np.argmin(y[index_x[:8]])
+            start_inds[i] = index_x[index_y]
+        return start_inds
 
     def _clockwise(self, fourier_coeff: np.ndarray,
                    fourier_degree: int) -> np.ndarray:
-        """Make sure the polygon reconstructed from Fourier coefficients c in
+        """Make sure the polygons reconstructed from Fourier coefficients c in
         the clockwise direction.
 
         Args:
-            fourier_coeff (ndarray[complex]): The Fourier coefficients.
+            fourier_coeff (ndarray[complex]): The Fourier coefficients of
+                shape (N, 2k+1).
             fourier_degree: The maximum Fourier degree K.
         Returns:
-            lost[float]: The polygon in clockwise point order.
+            ndarray[complex]: The coefficients of the polygons in clockwise
+            point order.
         """
-        if np.abs(fourier_coeff[fourier_degree + 1]) > np.abs(
-                fourier_coeff[fourier_degree - 1]):
-            return fourier_coeff
-        elif np.abs(fourier_coeff[fourier_degree + 1]) < np.abs(
-                fourier_coeff[fourier_degree - 1]):
-            return fourier_coeff[::-1]
-        else:
-            if np.abs(fourier_coeff[fourier_degree + 2]) > np.abs(
-                    fourier_coeff[fourier_degree - 2]):
-                return fourier_coeff
-            else:
-                return fourier_coeff[::-1]
-
-    def _poly2fourier(self, polygon: ArrayLike,
+        k = fourier_degree
+        magnitude = np.abs(fourier_coeff)
+        clockwise = magnitude[:, k + 1] > magnitude[:, k - 1]
+        if k > 1:
+            clockwise |= (magnitude[:, k + 1] == magnitude[:, k - 1]) & (
+                magnitude[:, k + 2] > magnitude[:, k - 2])
+        return np.where(clockwise[:, None], fourier_coeff,
+                        fourier_coeff[:, ::-1])
+
+    def _poly2fourier(self, points: np.ndarray, num_points: np.ndarray,
+                      start_inds: np.ndarray,
                       fourier_degree: int) -> np.ndarray:
         """Perform Fourier transformation to generate Fourier coefficients ck
-        from polygon.
+        from polygons.
+
+        Only the 2k+1 coefficients in use are computed, from the discrete
+        Fourier transform of the points of all the polygons at once.
 
         Args:
-            polygon (list[ndarray]): An input polygon.
+            points (ndarray): The points of all the polygons, concatenated in
+                a (M, 2) array.
+            num_points (ndarray): The number of points of each polygon.
+            start_inds (ndarray): The index of the start point on each
+                polygon.
             fourier_degree (int): The maximum Fourier degree K.
         Returns:
-            ndarray: Fourier coefficients.
+            ndarray: Fourier coefficients of shape (N, 2k+1), which are NaN
+            for the polygons without any point.
         """
-        points = polygon[:, 0] + polygon[:, 1] * 1j
-        c_fft = fft(points) / len(points)
-        c = np.hstack((c_fft[-fourier_degree:], c_fft[:fourier_degree + 1]))
-        return c
+        k = fourier_degree
+        fourier_coeff = np.full((len(num_points), 2 * k + 1),
+                                complex(np.nan, np.nan))
+        valid = num_points > 0
+        if not valid.any():
+            return fourier_coeff
+
+        starts = np.cumsum(num_points) - num_points
+        poly_inds = np.repeat(np.arange(len(num_points)), num_points)
+        # The index of each point on its polygon from the start point
+        inds = (np.arange(len(points)) - starts[poly_inds] -
+                start_inds[poly_inds]) % num_points[poly_inds]
+        freqs = np.arange(-k, k + 1)
+        phases = np.exp(-2j * np.pi * (inds[:, None] * freqs) /
+                        num_points[poly_inds, None])
+        terms = (points[:, 0] + points[:, 1] * 1j)[:, None] * phases
+        fourier_coeff[valid] = np.add.reduceat(
+            terms, starts[valid], axis=0) / num_points[valid, None]
+        return fourier_coeff
 
     def _fourier2poly(self, real_maps: torch.Tensor,
                       imag_maps: torch.Tensor) -> Sequence[torch.Tensor]:
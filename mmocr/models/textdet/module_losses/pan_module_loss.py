@@ -133,7 +133,7 @@ class PANModuleLoss(SegBasedModuleLoss):
         Returns:
             results (dict): The output result dictionary.
         """
-        gt_kernels, gt_masks = multi_apply(self._get_target_single,
+        gt_kernels, gt_masks = multi_apply(self._get_target_or_precomputed,
                                            data_samples)
         # gt_kernels: (N, kernel_number, H, W)->(kernel_number, N, H, W)
         gt_kernels = torch.stack(gt_kernels, dim=0).permute(1, 0, 2, 3)
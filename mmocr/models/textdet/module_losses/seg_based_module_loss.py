@@ -1,6 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import sys
-from typing import Optional, Sequence, Tuple, Union
+import warnings
+from abc import abstractmethod
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 import cv2
 import numpy as np
@@ -9,12 +11,88 @@ from mmengine.logging import MMLogger
 from shapely.geometry import Polygon
 
 from mmocr.utils.polygon_utils import offset_polygon
+from mmocr.utils.typing_utils import TextDetDataSample
 from .base import BaseTextDetModuleLoss
 
 
 class SegBasedModuleLoss(BaseTextDetModuleLoss):
     """Base class for the module loss of segmentation-based text detection
-    algorithms with some handy utilities."""
+    algorithms with some handy utilities.
+
+    The loss targets of a data sample, generated by ``_get_target_single``,
+    can also be precomputed in the data pipeline by
+    :class:`GenerateTextDetTargets`.
+    """
+
+    @abstractmethod
+    def _get_target_single(self, data_sample: TextDetDataSample) -> Tuple:
+        """Generates the loss targets of a data sample.
+
+        Args:
+            data_sample (TextDetDataSample): Ground truth data sample.
+
+        Returns:
+            tuple: A tuple of targets.
+        """
+        pass
+
+    def precompute_targets(self, data_sample: TextDetDataSample) -> Dict:
+        """Generates the loss targets of a data sample ahead of the loss, e.g.
+        in the data pipeline by :class:`GenerateTextDetTargets`.
+
+        Args:
+            data_sample (TextDetDataSample): Ground truth data sample.
+
+        Returns:
+            dict: The targets, with the settings of the module loss which they
+            are generated with.
+        """
+        return dict(
+            settings=self._target_settings(),
+            targets=self._get_target_single(data_sample))
+
+    def _target_settings(self) -> Dict:
+        """The plain attributes of the module loss, e.g. the shrink ratio,
+        which the precomputed targets must be generated with."""
+
+        def to_plain(value: Any) -> Any:
+            if isinstance(value, (tuple, list)):
+                value = [to_plain(item) for item in value]
+                return None if None in value else value
+            if isinstance(value, (bool, int, float, str)):
+                return value
+            return None
+
+        settings = {}
+        for name, value in vars(self).items():
+            if name.startswith('_') or name == 'training':
+                continue
+            value = to_plain(value)
+            if value is not None:
+                settings[name] = value
+        return settings
+
+    def _get_target_or_precomputed(self,
+                                   data_sample: TextDetDataSample) -> Tuple:
+        """Gets the loss targets of a data sample, which are generated in the
+        data pipeline if present and generated here otherwise.
+
+        Args:
+            data_sample (TextDetDataSample): Ground truth data sample.
+
+        Returns:
+            tuple: A tuple of targets.
+        """
+        precomputed = data_sample.get('gt_targets', None)
+        if precomputed is None:
+            return self._get_target_single(data_sample)
+        if precomputed['settings'] != self._target_settings():
+            warnings.warn(
+                f'The targets generated in the data pipeline do not match '
+                f'the settings of {type(self).__name__} and are regenerated. '
+                'Pass the module_loss of the model to GenerateTextDetTargets.')
+            return self._get_target_single(data_sample)
+        return precomputed['targets']
 
     def _generate_kernels(
         self,
@@ -183,7 +183,7 @@ class TextSnakeModuleLoss(SegBasedModuleLoss):
             gt_radius_maps, gt_sin_maps, gt_cos_maps):
             A tuple of six lists of ndarrays as the targets.
         """
-        return multi_apply(self._get_target_single, data_samples)
+        return multi_apply(self._get_target_or_precomputed, data_samples)
 
     def _get_target_single(self, data_sample: TextDetDataSample) -> Tuple:
         """Generate loss target from a data sample.
@@ -268,13 +268,10 @@ class TextSnakeModuleLoss(SegBasedModuleLoss):
         for poly in text_polys:
             polygon_points = np.array(poly).reshape(-1, 2)
 
-            n = len(polygon_points)
-            keep_inds = []
-            for i in range(n):
-                if norm(polygon_points[i] -
-                        polygon_points[(i + 1) % n]) > 1e-5:
-                    keep_inds.append(i)
-            polygon_points = polygon_points[keep_inds]
+            # Remove the points identical to the next ones
+            next_points = np.roll(polygon_points, -1, axis=0)
+            polygon_points = polygon_points[
+                norm(polygon_points - next_points, axis=-1) > 1e-5]
 
             _, _, top_line, bot_line = self._reorder_poly_edge(polygon_points)
             resampled_top_line, resampled_bot_line = self._resample_sidelines(
@@ -389,17 +386,15 @@ class TextSnakeModuleLoss(SegBasedModuleLoss):
             pad_points = np.vstack([points, points[0]])
             edge_vec = pad_points[1:] - pad_points[:-1]
 
-            theta_sum = []
-            adjacent_vec_theta = []
-            for i, edge_vec1 in enumerate(edge_vec):
-                adjacent_ind = [x % len(edge_vec) for x in [i - 1, i + 1]]
-                adjacent_edge_vec = edge_vec[adjacent_ind]
-                temp_theta_sum = np.sum(
-                    self.vector_angle(edge_vec1, adjacent_edge_vec))
-                temp_adjacent_theta = self.vector_angle(
-                    adjacent_edge_vec[0], adjacent_edge_vec[1])
-                theta_sum.append(temp_theta_sum)
-                adjacent_vec_theta.append(temp_adjacent_theta)
+            # The angles of each edge to the previous and the next ones, and
+            # the angle between these two
+            prev_edge_vec = np.roll(edge_vec, 1, axis=0)
+            next_edge_vec = np.roll(edge_vec, -1, axis=0)
+            theta_sum = (
+                self.vector_angle(edge_vec, prev_edge_vec) +
+                self.vector_angle(edge_vec, next_edge_vec))
+            adjacent_vec_theta = self.vector_angle(prev_edge_vec,
+                                                   next_edge_vec)
             theta_sum_score = np.array(theta_sum) / np.pi
             adjacent_theta_score = np.array(adjacent_vec_theta) / np.pi
             poly_center = np.mean(points, axis=0)
@@ -415,14 +410,16 @@ class TextSnakeModuleLoss(SegBasedModuleLoss):
                 position_score[-1] += 1
             score += 0.1 * position_score
             pad_score = np.concatenate([score, score])
-            score_matrix = np.zeros((len(score), len(score) - 3))
             x = np.arange(len(score) - 3) / float(len(score) - 4)
             gaussian = 1. / (np.sqrt(2. * np.pi) * 0.5) * np.exp(-np.power(
                 (x - 0.5) / 0.5, 2.) / 2)
             gaussian = gaussian / np.max(gaussian)
-            for i in range(len(score)):
-                score_matrix[i, :] = score[i] + pad_score[
-                    (i + 2):(i + len(score) - 1)] * gaussian * 0.3
+            # The i-th row scores the edges from i + 2 to i + len(score) - 2
+            # as the tail edge, for the head edge i
+            head_inds = np.arange(len(score))[:, None]
+            pad_inds = head_inds + np.arange(2, len(score) - 1)
+            score_matrix = score[:, None] + (
+                pad_score[pad_inds] * gaussian * 0.3)
 
             head_start, tail_increment = np.unravel_index(
                 score_matrix.argmax(), score_matrix.shape)
@@ -486,18 +483,17 @@ class TextSnakeModuleLoss(SegBasedModuleLoss):
         t_org = np.insert(np.cumsum(edges_length), 0, 0)
         unit_t = total_length / (n - 1)
         t_equidistant = np.arange(1, n - 1, dtype=np.float32) * unit_t
-        edge_ind = 0
-        points = [line[0]]
-        for t in t_equidistant:
-            while edge_ind < len(edges_length) - 1 and t > t_org[edge_ind + 1]:
-                edge_ind += 1
-            t_l, t_r = t_org[edge_ind], t_org[edge_ind + 1]
-            weight = np.array([t_r - t, t - t_l], dtype=np.float32) / (
-                t_r - t_l + self.eps)
-            p_coords = np.dot(weight, line[[edge_ind, edge_ind + 1]])
-            points.append(p_coords)
-        points.append(line[-1])
-        resampled_line = np.vstack(points)
+        # The first edge ending at or after each point
+        edge_inds = np.minimum(
+            np.searchsorted(t_org[1:], t_equidistant),
+            len(edges_length) - 1)
+        t_l, t_r = t_org[edge_inds], t_org[edge_inds + 1]
+        weight = np.stack([t_r - t_equidistant, t_equidistant - t_l],
+                          axis=-1).astype(np.float32)
+        weight /= (t_r - t_l + self.eps).astype(np.float32)[:, None]
+        start_points, end_points = line[edge_inds], line[edge_inds + 1]
+        points = weight[:, :1] * start_points + weight[:, 1:] * end_points
+        resampled_line = np.vstack([line[:1], points, line[-1:]])
 
         return resampled_line
 
@@ -592,30 +588,49 @@ class TextSnakeModuleLoss(SegBasedModuleLoss):
         assert (center_region_mask.shape == radius_map.shape == sin_map.shape
                 == cos_map.shape)
         assert isinstance(region_shrink_ratio, float)
-        for i in range(0, len(center_line) - 1):
-
-            top_mid_point = (top_line[i] + top_line[i + 1]) / 2
-            bot_mid_point = (bot_line[i] + bot_line[i + 1]) / 2
-            radius = norm(top_mid_point - bot_mid_point) / 2
-
-            text_direction = center_line[i + 1] - center_line[i]
-            sin_theta = self.vector_sin(text_direction)
-            cos_theta = self.vector_cos(text_direction)
-
-            tl = center_line[i] + (top_line[i] -
-                                   center_line[i]) * region_shrink_ratio
-            tr = center_line[i + 1] + (
-                top_line[i + 1] - center_line[i + 1]) * region_shrink_ratio
-            br = center_line[i + 1] + (
-                bot_line[i + 1] - center_line[i + 1]) * region_shrink_ratio
-            bl = center_line[i] + (bot_line[i] -
-                                   center_line[i]) * region_shrink_ratio
-            current_center_box = np.vstack([tl, tr, br, bl]).astype(np.int32)
-
-            cv2.fillPoly(center_region_mask, [current_center_box], color=1)
-            cv2.fillPoly(sin_map, [current_center_box], color=sin_theta)
-            cv2.fillPoly(cos_map, [current_center_box], color=cos_theta)
-            cv2.fillPoly(radius_map, [current_center_box], color=radius)
+
+        top_mid_points = (top_line[:-1] + top_line[1:]) / 2
+        bot_mid_points = (bot_line[:-1] + bot_line[1:]) / 2
+        radius = norm(top_mid_points - bot_mid_points, axis=-1) / 2
+
+        text_direction = center_line[1:] - center_line[:-1]
+        direction_norm = norm(text_direction, axis=-1) + self.eps
+        sin_theta = text_direction[:, 1] / direction_norm
+        cos_theta = text_direction[:, 0] / direction_norm
+
+        top_points = center_line + (top_line -
+                                    center_line) * region_shrink_ratio
+        bot_points = center_line + (bot_line -
+                                    center_line) * region_shrink_ratio
+        center_boxes = np.stack(
+            [top_points[:-1], top_points[1:], bot_points[1:], bot_points[:-1]],
+            axis=1).astype(np.int32)
+        if len(center_boxes) == 0:
+            return
+
+        # Draw the boxes once, on the index map of their bounding box in the
+        # image, and fill all the maps from it
+        h, w = center_region_mask.shape
+        x_min = max(center_boxes[..., 0].min(), 0)
+        x_max = min(center_boxes[..., 0].max(), w - 1)
+        y_min = max(center_boxes[..., 1].min(), 0)
+        y_max = min(center_boxes[..., 1].max(), h - 1)
+        if x_min > x_max or y_min > y_max:
+            return
+        # The index of the box covering each pixel plus one, where the later
+        # boxes overwrite the earlier ones
+        index_map = np.zeros((y_max - y_min + 1, x_max - x_min + 1),
+                             dtype=np.int32)
+        offset = np.array([x_min, y_min], dtype=np.int32)
+        for i, box in enumerate(center_boxes - offset):
+            cv2.fillPoly(index_map, [box], i + 1)
+        ys, xs = np.nonzero(index_map)
+        box_inds = index_map[ys, xs] - 1
+        ys, xs = ys + y_min, xs + x_min
+        center_region_mask[ys, xs] = 1
+        sin_map[ys, xs] = sin_theta[box_inds]
+        cos_map[ys, xs] = cos_theta[box_inds]
+        radius_map[ys, xs] = radius[box_inds]
 
     def vector_angle(self, vec1: ndarray, vec2: ndarray) -> ndarray:
         """Compute the angle between two vectors."""
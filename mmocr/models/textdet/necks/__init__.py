@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .fpem_ffm import FPEM_FFM
-from .fpn_cat import FPNC
-from .fpn_unet import FPN_UNet
-from .fpnf import FPNF
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__,
+                           ['fpem_ffm', 'fpn_cat', 'fpn_unet', 'fpnf'])
 
 __all__ = ['FPEM_FFM', 'FPNF', 'FPNC', 'FPN_UNet']
@@ -1,11 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .base import BaseTextDetPostProcessor
-from .db_postprocessor import DBPostprocessor
-from .drrg_postprocessor import DRRGPostprocessor
-from .fce_postprocessor import FCEPostprocessor
-from .pan_postprocessor import PANPostprocessor
-from .pse_postprocessor import PSEPostprocessor
-from .textsnake_postprocessor import TextSnakePostprocessor
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'base', 'db_postprocessor', 'drrg_postprocessor', 'fce_postprocessor',
+    'pan_postprocessor', 'pse_postprocessor', 'textsnake_postprocessor'
+])
 
 __all__ = [
     'PSEPostprocessor', 'PANPostprocessor', 'DBPostprocessor',
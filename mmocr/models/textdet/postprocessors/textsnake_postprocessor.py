@@ -7,7 +7,6 @@ import numpy as np
 import torch
 from mmengine.structures import InstanceData
 from numpy.linalg import norm
-from skimage.morphology import skeletonize
 
 from mmocr.registry import MODELS
 from mmocr.structures import TextDetDataSample
@@ -66,6 +65,10 @@ class TextSnakePostprocessor(BaseTextDetPostProcessor):
         Returns:
             list[list[float]]: The instance boundary and its confidence.
         """
+        # Imported here as scikit-image is slow to import and only used by
+        # TextSnake
+        from skimage.morphology import skeletonize
+
         assert pred_results.dim() == 3
         data_sample.pred_instances = InstanceData()
         data_sample.pred_instances.polygons = []
@@ -1,11 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .mini_vgg import MiniVGG
-from .mobilenet_v2 import MobileNetV2
-from .nrtr_modality_transformer import NRTRModalityTransform
-from .resnet import ResNet
-from .resnet31_ocr import ResNet31OCR
-from .resnet_abi import ResNetABI
-from .shallow_cnn import ShallowCNN
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'mini_vgg', 'mobilenet_v2', 'nrtr_modality_transformer', 'resnet',
+    'resnet31_ocr', 'resnet_abi', 'shallow_cnn'
+])
 
 __all__ = [
     'ResNet31OCR', 'MiniVGG', 'NRTRModalityTransform', 'ShallowCNN',
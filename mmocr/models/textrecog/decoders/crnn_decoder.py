@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import math
 from typing import Dict, Optional, Sequence, Union
 
 import torch
@@ -20,7 +21,10 @@ class CRNNDecoder(BaseDecoder):
         in_channels (int): Number of input channels.
         dictionary (dict or :obj:`Dictionary`): The config for `Dictionary` or
             the instance of `Dictionary`.
-        rnn_flag (bool): Use RNN or CNN as the decoder. Defaults to False.
+        rnn_flag (bool): Use RNN or CNN as the decoder. The RNN decoder skips
+            the padded columns of the images whose ``valid_ratio`` is less
+            than 1, so that an image is recognized the same in any batch.
+            Defaults to False.
         module_loss (dict, optional): Config to build module_loss. Defaults
             to None.
         postprocessor (dict, optional): Config to build postprocessor.
@@ -78,7 +82,9 @@ class CRNNDecoder(BaseDecoder):
         if self.rnn_flag:
             x = feat.squeeze(2)  # [N, C, W]
             x = x.permute(2, 0, 1)  # [W, N, C]
-            x = self.decoder(x)  # [W, N, C]
+            lengths = self._get_valid_lengths(x.size(0), data_samples)
+            for layer in self.decoder:
+                x = layer(x, lengths)  # [W, N, C]
             outputs = x.permute(1, 0, 2).contiguous()
         else:
             x = self.decoder(feat)
@@ -87,6 +93,21 @@ class CRNNDecoder(BaseDecoder):
             outputs = x.view(n, w, c * h)
         return outputs
 
+    def _get_valid_lengths(
+        self, width: int, data_samples: Optional[Sequence[TextRecogDataSample]]
+    ) -> Optional[torch.Tensor]:
+        """Get the number of feature columns not from padding in each image,
+        which is None if no image is padded."""
+        if data_samples is None:
+            return None
+        lengths = [
+            min(width, math.ceil(width * data_sample.get('valid_ratio', 1.0)))
+            for data_sample in data_samples
+        ]
+        if all(length == width for length in lengths):
+            return None
+        return torch.tensor(lengths)
+
     def forward_test(
         self,
         feat: Optional[torch.Tensor] = None,
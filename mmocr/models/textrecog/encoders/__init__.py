@@ -1,12 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .abi_encoder import ABIEncoder
-from .aster_encoder import ASTEREncoder
-from .base import BaseEncoder
-from .channel_reduction_encoder import ChannelReductionEncoder
-from .nrtr_encoder import NRTREncoder
-from .sar_encoder import SAREncoder
-from .satrn_encoder import SATRNEncoder
-from .svtr_encoder import SVTREncoder
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'abi_encoder', 'aster_encoder', 'base', 'channel_reduction_encoder',
+    'nrtr_encoder', 'sar_encoder', 'satrn_encoder', 'svtr_encoder'
+])
 
 __all__ = [
     'SAREncoder', 'NRTREncoder', 'BaseEncoder', 'ChannelReductionEncoder',
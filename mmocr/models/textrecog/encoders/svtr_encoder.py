@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -14,6 +15,72 @@ from mmocr.registry import MODELS
 from mmocr.structures import TextRecogDataSample
 
 
+def _in_window(offsets: torch.Tensor, size: int) -> torch.Tensor:
+    """Whether the offsets from the center of a window of the size are in
+    the window."""
+    return (offsets >= -(size // 2)) & (offsets < size - size // 2)
+
+
+@lru_cache(maxsize=32)
+def _dense_window_mask(height: int, width: int, local_k: Tuple[int, int],
+                       device: torch.device) -> torch.Tensor:
+    """The mask of the keys in the window of each query.
+
+    Returns:
+        torch.Tensor: A bool Tensor of shape :math:`(H*W, H*W)`.
+    """
+    rows = torch.arange(height, device=device)
+    cols = torch.arange(width, device=device)
+    in_rows = _in_window(rows[None] - rows[:, None], local_k[0])
+    in_cols = _in_window(cols[None] - cols[:, None], local_k[1])
+    mask = in_rows[:, None, :, None] & in_cols[None, :, None, :]
+    return mask.reshape(height * width, height * width)
+
+
+@lru_cache(maxsize=32)
+def _band_window_mask(height: int, width: int, local_k: Tuple[int, int],
+                      chunk: int, device: torch.device) -> torch.Tensor:
+    """The mask of the keys in the window of each query, where the queries
+    are split into chunks of columns, each attending to the band of columns
+    covered by its windows.
+
+    Returns:
+        torch.Tensor: A bool Tensor of shape
+        :math:`(N_{chunks}, H*chunk, H*band)`.
+    """
+    num_chunks = -(-width // chunk)
+    band = chunk + local_k[1] - 1
+    rows = torch.arange(height, device=device)
+    in_rows = _in_window(rows[None] - rows[:, None], local_k[0])
+    query_cols = torch.arange(
+        num_chunks * chunk, device=device).reshape(num_chunks, chunk)
+    key_cols = query_cols[:, :1] - local_k[1] // 2 + torch.arange(
+        band, device=device)
+    in_cols = _in_window(key_cols[:, None] - query_cols[:, :, None],
+                         local_k[1])
+    # The keys out of the feature map are padding
+    in_cols &= ((key_cols >= 0) & (key_cols < width))[:, None]
+    mask = in_rows[None, :, None, :, None] & in_cols[:, None, :, None, :]
+    return mask.reshape(num_chunks, height * chunk, height * band)
+
+
+def _mask_columns(x: torch.Tensor, valid_widths: List[int]) -> torch.Tensor:
+    """Zero the columns of a Tensor of shape :math:`(N, C, H, W)` out of the
+    valid width of each sample."""
+    cols = torch.arange(x.size(-1), device=x.device)
+    valid_widths = torch.tensor(valid_widths, device=x.device)
+    return x.masked_fill((cols >= valid_widths[:, None])[:, None, None], 0)
+
+
+def _mask_tokens(x: torch.Tensor,
+                 valid_mask: Optional[torch.Tensor]) -> torch.Tensor:
+    """Zero the tokens of a Tensor of shape :math:`(N, H*W, C)` which are
+    padding."""
+    if valid_mask is None:
+        return x
+    return x.masked_fill(~valid_mask[..., None], 0)
+
+
 class OverlapPatchEmbed(BaseModule):
     """Image to the progressive overlapping Patch Embedding.
 
@@ -53,17 +120,28 @@ class OverlapPatchEmbed(BaseModule):
                     act_cfg=dict(type='GELU')))
             _input = _output
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self,
+                x: torch.Tensor,
+                valid_widths: Optional[List[int]] = None) -> torch.Tensor:
         """Forward function.
 
         Args:
             x (Tensor): A Tensor of shape :math:`(N, C, H, W)`.
+            valid_widths (list[int], optional): The widths of the images
+                without padding. If given, the padding is zeroed before each
+                conv, as the zero padding of the conv at the border of an
+                image not padded. Defaults to None.
 
         Returns:
             Tensor: A tensor of shape math:`(N, HW//16, C)`.
         """
-        x = self.net(x).flatten(2).permute(0, 2, 1)
-        return x
+        if valid_widths is None:
+            return self.net(x).flatten(2).permute(0, 2, 1)
+        for layer in self.net:
+            x = _mask_columns(x, valid_widths)
+            x = layer(x)
+            valid_widths = [(width + 1) // 2 for width in valid_widths]
+        return _mask_columns(x, valid_widths).flatten(2).permute(0, 2, 1)
 
 
 class ConvMixer(BaseModule):
@@ -96,16 +174,25 @@ class ConvMixer(BaseModule):
             padding=(local_k[0] // 2, local_k[1] // 2),
             groups=num_heads)
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self,
+                x: torch.Tensor,
+                input_shape: Optional[Tuple[int, int]] = None,
+                valid_mask: Optional[torch.Tensor] = None) -> torch.Tensor:
         """Forward function.
 
         Args:
             x (torch.Tensor): A Tensor of shape :math:`(N, HW, C)`.
+            input_shape (Tuple[int, int], optional): The shape of input
+                [H, W]. Defaults to ``self.input_shape``.
+            valid_mask (torch.Tensor, optional): A bool Tensor of shape
+                :math:`(N, HW)`, which is False at the padding. Defaults to
+                None.
 
         Returns:
             torch.Tensor: Tensor: A tensor of shape math:`(N, HW, C)`.
         """
-        h, w = self.input_shape
+        h, w = input_shape or self.input_shape
+        x = _mask_tokens(x, valid_mask)
         x = x.permute(0, 2, 1).reshape([-1, self.embed_dims, h, w])
         x = self.local_mixer(x)
         x = x.flatten(2).permute(0, 2, 1)
@@ -115,6 +202,12 @@ class ConvMixer(BaseModule):
 class AttnMixer(BaseModule):
     """One of mixer of {'Global', 'Local'}. Defaults to Global Mixer.
 
+    The local mixer attends to the positions in a window around each
+    position only. When the feature map is much wider than the window, the
+    queries are split into chunks of columns, each attending to the band of
+    columns covered by its windows, so that its cost grows linearly with the
+    width instead of quadratically.
+
     Args:
         embed_dims (int): Number of character components.
         num_heads (int, optional): Number of heads. Defaults to 8.
@@ -154,54 +247,127 @@ class AttnMixer(BaseModule):
         self.proj = nn.Linear(embed_dims, embed_dims)
         self.proj_drop = nn.Dropout(proj_drop)
         self.input_shape = input_shape
-        if input_shape is not None:
-            height, width = input_shape
-            self.input_size = height * width
-            self.embed_dims = embed_dims
-        if mixer == 'Local' and input_shape is not None:
-            hk = local_k[0]
-            wk = local_k[1]
-            mask = torch.ones(
-                [height * width, height + hk - 1, width + wk - 1],
-                dtype=torch.float32)
-            for h in range(0, height):
-                for w in range(0, width):
-                    mask[h * width + w, h:h + hk, w:w + wk] = 0.
-            mask = mask[:, hk // 2:height + hk // 2,
-                        wk // 2:width + wk // 2].flatten(1)
-            mask[mask >= 1] = -np.inf
-            self.register_buffer('mask', mask[None, None, :, :])
+        self.local_k = tuple(local_k)
         self.mixer = mixer
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # The window of the local mixer was a mask buffer of a fixed input
+        # shape in the checkpoints of the previous versions
+        state_dict.pop(prefix + 'mask', None)
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
+
+    def forward(self,
+                x: torch.Tensor,
+                input_shape: Optional[Tuple[int, int]] = None,
+                valid_mask: Optional[torch.Tensor] = None) -> torch.Tensor:
         """Forward function.
 
         Args:
-            x (torch.Tensor): A Tensor of shape :math:`(N, H, W, C)`.
+            x (torch.Tensor): A Tensor of shape :math:`(N, H*W, C)`.
+            input_shape (Tuple[int, int], optional): The shape of input
+                [H, W], which the local mixer requires. Defaults to
+                ``self.input_shape``.
+            valid_mask (torch.Tensor, optional): A bool Tensor of shape
+                :math:`(N, H*W)`, which is False at the padding, whose keys
+                are not attended to. Defaults to None.
 
         Returns:
-            torch.Tensor: A Tensor of shape :math:`(N, H, W, C)`.
+            torch.Tensor: A Tensor of shape :math:`(N, H*W, C)`.
         """
-        if self.input_shape is not None:
-            input_size, embed_dims = self.input_size, self.embed_dims
-        else:
-            _, input_size, embed_dims = x.shape
+        _, input_size, embed_dims = x.shape
         qkv = self.qkv(x).reshape((-1, input_size, 3, self.num_heads,
                                    embed_dims // self.num_heads)).permute(
                                        (2, 0, 3, 1, 4))
         q, k, v = qkv[0] * self.scale, qkv[1], qkv[2]
-        attn = q.matmul(k.permute(0, 1, 3, 2))
         if self.mixer == 'Local':
-            attn += self.mask
-        attn = F.softmax(attn, dim=-1)
-        attn = self.attn_drop(attn)
-
-        x = attn.matmul(v).permute(0, 2, 1, 3).reshape(-1, input_size,
-                                                       embed_dims)
+            height, width = input_shape or self.input_shape
+            x = self._local_attention(q, k, v, height, width, valid_mask)
+        else:
+            attn = q.matmul(k.permute(0, 1, 3, 2))
+            if valid_mask is not None:
+                attn = attn.masked_fill(~valid_mask[:, None, None],
+                                        torch.finfo(attn.dtype).min)
+            attn = F.softmax(attn, dim=-1)
+            attn = self.attn_drop(attn)
+            x = attn.matmul(v)
+
+        x = x.permute(0, 2, 1, 3).reshape(-1, input_size, embed_dims)
         x = self.proj(x)
         x = self.proj_drop(x)
         return x
 
+    def _local_attention(self,
+                         q: torch.Tensor,
+                         k: torch.Tensor,
+                         v: torch.Tensor,
+                         height: int,
+                         width: int,
+                         valid_mask: Optional[torch.Tensor] = None
+                         ) -> torch.Tensor:
+        """Attention of each query to the keys in its window.
+
+        Args:
+            q (torch.Tensor): The scaled queries of shape
+                :math:`(N, heads, H*W, C/heads)`.
+            k (torch.Tensor): The keys of the same shape.
+            v (torch.Tensor): The values of the same shape.
+            height (int): The height of the feature map.
+            width (int): The width of the feature map.
+            valid_mask (torch.Tensor, optional): A bool Tensor of shape
+                :math:`(N, H*W)`, which is False at the padding. Defaults to
+                None.
+
+        Returns:
+            torch.Tensor: A Tensor of shape :math:`(N, heads, H*W, C/heads)`.
+        """
+        win_w = self.local_k[1]
+        chunk = win_w // 2 + 1
+        band = chunk + win_w - 1
+        if width <= 2 * band:
+            # Masking the full attention map is faster on narrow maps
+            attn = q.matmul(k.permute(0, 1, 3, 2))
+            mask = _dense_window_mask(height, width, self.local_k, q.device)
+            if valid_mask is not None:
+                mask = mask & valid_mask[:, None, None]
+            attn = attn.masked_fill(~mask, torch.finfo(attn.dtype).min)
+            attn = F.softmax(attn, dim=-1)
+            attn = self.attn_drop(attn)
+            return attn.matmul(v)
+
+        n, num_heads, _, head_dims = q.shape
+        num_chunks = -(-width // chunk)
+        pad = num_chunks * chunk - width
+        q = q.reshape(n, num_heads, height, width, head_dims)
+        q = F.pad(q, (0, 0, 0, pad))
+        q = q.reshape(n, num_heads, height, num_chunks, chunk, head_dims)
+        q = q.transpose(2, 3).reshape(n, num_heads, num_chunks, height * chunk,
+                                      head_dims)
+
+        def to_bands(x: torch.Tensor) -> torch.Tensor:
+            x = x.reshape(n, -1, height, width, x.size(-1))
+            x = F.pad(x, (0, 0, win_w // 2, pad + win_w - 1 - win_w // 2))
+            # (N, heads, H, chunks, C/heads, band), a view of x
+            x = x.unfold(3, band, chunk).permute(0, 1, 3, 2, 5, 4)
+            return x.reshape(n, x.size(1), num_chunks, height * band,
+                             x.size(-1))
+
+        attn = q.matmul(to_bands(k).transpose(-2, -1))
+        mask = _band_window_mask(height, width, self.local_k, chunk, q.device)
+        if valid_mask is not None:
+            valid_keys = to_bands(valid_mask[:, None, :, None].to(q.dtype))
+            mask = mask & (valid_keys[..., 0] > 0)[:, :, :, None]
+        # The padded queries have no key in their windows, whose finite
+        # scores avoid NaN in the softmax
+        attn = attn.masked_fill(~mask, torch.finfo(attn.dtype).min)
+        attn = F.softmax(attn, dim=-1)
+        attn = self.attn_drop(attn)
+        x = attn.matmul(to_bands(v))
+        x = x.reshape(n, num_heads, num_chunks, height, chunk,
+                      head_dims).transpose(2, 3)
+        x = x.reshape(n, num_heads, height, num_chunks * chunk,
+                      head_dims)[:, :, :, :width]
+        return x.reshape(n, num_heads, height * width, head_dims)
+
 
 class MLP(BaseModule):
     """The MLP block.
@@ -318,20 +484,30 @@ class MixingBlock(BaseModule):
             in_features=embed_dims, hidden_features=mlp_hidden_dim, drop=drop)
         self.prenorm = prenorm
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self,
+                x: torch.Tensor,
+                input_shape: Optional[Tuple[int, int]] = None,
+                valid_mask: Optional[torch.Tensor] = None) -> torch.Tensor:
         """Forward function.
 
         Args:
             x (torch.Tensor): A Tensor of shape :math:`(N, H*W, C)`.
+            input_shape (Tuple[int, int], optional): The shape of input
+                [H, W]. Defaults to the ``input_shape`` of the mixer.
+            valid_mask (torch.Tensor, optional): A bool Tensor of shape
+                :math:`(N, H*W)`, which is False at the padding, ignored by
+                the mixer. Defaults to None.
 
         Returns:
             torch.Tensor: A Tensor of shape :math:`(N, H*W, C)`.
         """
         if self.prenorm:
-            x = self.norm1(x + self.drop_path(self.mixer(x)))
+            x = self.norm1(
+                x + self.drop_path(self.mixer(x, input_shape, valid_mask)))
             x = self.norm2(x + self.drop_path(self.mlp(x)))
         else:
-            x = x + self.drop_path(self.mixer(self.norm1(x)))
+            x = x + self.drop_path(
+                self.mixer(self.norm1(x), input_shape, valid_mask))
             x = x + self.drop_path(self.mlp(self.norm2(x)))
         return x
 
@@ -441,6 +617,8 @@ class SVTREncoder(BaseModule):
         out_channels (int, optional): The num of output channels in backone.
             Defaults to 192.
         max_seq_len (int, optional): Maximum output sequence length :math:`T`.
+            If None, the output has a step for each column of patches, i.e.
+            :math:`T = W/4`, which grows with the width of the images.
             Defaults to 25.
         num_layers (int, optional): The num of conv in PatchEmbedding.
             Defaults to 2.
@@ -468,13 +646,14 @@ class SVTREncoder(BaseModule):
                  attn_drop_rate: float = 0.,
                  drop_path_rate: float = 0.1,
                  out_channels: int = 192,
-                 max_seq_len: int = 25,
+                 max_seq_len: Optional[int] = 25,
                  num_layers: int = 2,
                  prenorm: bool = True,
                  init_cfg: Optional[Union[Dict, List[Dict]]] = None):
         super().__init__(init_cfg)
         self.img_size = img_size
         self.embed_dims = embed_dims
+        self.num_layers = num_layers
         self.out_channels = out_channels
         self.prenorm = prenorm
         self.patch_embed = OverlapPatchEmbed(
@@ -579,39 +758,121 @@ class SVTREncoder(BaseModule):
             nn.init.kaiming_normal_(
                 m.weight, mode='fan_out', nonlinearity='relu')
 
-    def forward_features(self, x: torch.Tensor) -> torch.Tensor:
+    def _get_patch_shape(self, img_shape: Tuple[int, int]) -> List[int]:
+        """The shape [H, W] of the patches embedded from an image."""
+        height, width = img_shape
+        for _ in range(self.num_layers):
+            # Each conv of the patch embedding halves the size, rounding up
+            height, width = (height + 1) // 2, (width + 1) // 2
+        return [height, width]
+
+    def _get_pos_embed(self, patch_shape: List[int]) -> torch.Tensor:
+        """The absolute position embedding, interpolated to the patch shape
+        if it differs from the one of ``img_size``."""
+        if list(patch_shape) == list(self.input_shape):
+            return self.absolute_pos_embed
+        pos_embed = self.absolute_pos_embed.permute(0, 2, 1).reshape(
+            [1, -1, *self.input_shape])
+        pos_embed = F.interpolate(
+            pos_embed, size=patch_shape, mode='bilinear', align_corners=False)
+        return pos_embed.flatten(2).permute(0, 2, 1)
+
+    def _get_padded_pos_embed(self, patch_shape: List[int],
+                              valid_widths: List[int]) -> torch.Tensor:
+        """The position embedding of each image of a batch padded to the
+        patch shape, interpolated to the valid width of the image."""
+        height, width = patch_shape
+        pos_embed = self.absolute_pos_embed.new_zeros(
+            [len(valid_widths), height, width, self.embed_dims[0]])
+        for valid_width in set(valid_widths):
+            indices = [
+                i for i, w in enumerate(valid_widths) if w == valid_width
+            ]
+            pos_embed[indices, :, :valid_width] = self._get_pos_embed(
+                [height, valid_width]).reshape(height, valid_width, -1)
+        return pos_embed.flatten(1, 2)
+
+    def _get_valid_widths(self, width: int,
+                          data_samples: Optional[List[TextRecogDataSample]]
+                          ) -> Optional[List[int]]:
+        """The widths of the images in a batch without padding, which is None
+        if no image is padded."""
+        if data_samples is None:
+            return None
+        valid_widths = [
+            min(width,
+                max(1, round(width * data_sample.get('valid_ratio', 1.0))))
+            for data_sample in data_samples
+        ]
+        if all(valid_width == width for valid_width in valid_widths):
+            return None
+        return valid_widths
+
+    def forward_features(self,
+                         x: torch.Tensor,
+                         valid_widths: Optional[List[int]] = None
+                         ) -> torch.Tensor:
         """Forward function except the last combing operation.
 
+        Images of another size than ``img_size``, e.g. of a variable width,
+        are supported by interpolating the position embedding.
+
         Args:
             x (torch.Tensor): A Tensor of shape :math:`(N, H, W, C)`.
+            valid_widths (list[int], optional): The widths of the images
+                without the padding of the batch. If given, the padding is
+                masked out, so that the features of an image are the same as
+                if it were not padded, and the features of the padding are
+                zeros. Defaults to None.
 
         Returns:
             torch.Tensor: A Tensor of shape :math:`(N, H/16, W/4, 256)`.
         """
-        x = self.patch_embed(x)
-        x = x + self.absolute_pos_embed
+        height, width = self._get_patch_shape(x.shape[-2:])
+        if valid_widths is None:
+            col_mask = None
+            x = self.patch_embed(x)
+            x = x + self._get_pos_embed([height, width])
+        else:
+            x = self.patch_embed(x, valid_widths)
+            valid_widths = [
+                self._get_patch_shape([1, valid_width])[1]
+                for valid_width in valid_widths
+            ]
+            x = x + self._get_padded_pos_embed([height, width], valid_widths)
+            col_mask = torch.arange(
+                width, device=x.device) < torch.tensor(
+                    valid_widths, device=x.device)[:, None]
+
+        def get_valid_mask(height: int) -> Optional[torch.Tensor]:
+            return None if col_mask is None else col_mask.repeat(1, height)
+
         x = self.pos_drop(x)
+        valid_mask = get_valid_mask(height)
         for blk in self.blocks1:
-            x = blk(x)
+            x = blk(x, [height, width], valid_mask)
+        x = _mask_tokens(x, valid_mask)
         x = self.downsample1(
-            x.permute(0, 2, 1).reshape([
-                -1, self.embed_dims[0], self.input_shape[0],
-                self.input_shape[1]
-            ]))
+            x.permute(0, 2, 1).reshape([-1, self.embed_dims[0], height,
+                                        width]))
 
+        # The merging blocks halve the height, rounding up
+        height = (height + 1) // 2
+        valid_mask = get_valid_mask(height)
         for blk in self.blocks2:
-            x = blk(x)
+            x = blk(x, [height, width], valid_mask)
+        x = _mask_tokens(x, valid_mask)
         x = self.downsample2(
-            x.permute(0, 2, 1).reshape([
-                -1, self.embed_dims[1], self.input_shape[0] // 2,
-                self.input_shape[1]
-            ]))
+            x.permute(0, 2, 1).reshape([-1, self.embed_dims[1], height,
+                                        width]))
 
+        height = (height + 1) // 2
+        valid_mask = get_valid_mask(height)
         for blk in self.blocks3:
-            x = blk(x)
+            x = blk(x, [height, width], valid_mask)
         if not self.prenorm:
             x = self.layer_norm(x)
-        return x
+        return _mask_tokens(x, valid_mask)
 
     def forward(self,
                 x: torch.Tensor,
@@ -622,17 +883,18 @@ class SVTREncoder(BaseModule):
         Args:
             x (torch.Tensor): A Tensor of shape :math:`(N, H/16, W/4, 256)`.
             data_samples (list[TextRecogDataSample]): Batch of
-                TextRecogDataSample. Defaults to None.
+                TextRecogDataSample. The padding of the images whose
+                ``valid_ratio`` is less than 1 is masked out. Defaults to None.
 
         Returns:
             torch.Tensor: A Tensor of shape :math:`(N, 1, W/4, 192)`.
         """
-        x = self.forward_features(x)
-        x = self.avgpool(
-            x.permute(0, 2, 1).reshape([
-                -1, self.embed_dims[2], self.input_shape[0] // 4,
-                self.input_shape[1]
-            ]))
+        _, width = self._get_patch_shape(x.shape[-2:])
+        x = self.forward_features(
+            x, self._get_valid_widths(x.size(-1), data_samples))
+        x = x.transpose(1, 2)
+        x = x.reshape([x.size(0), self.embed_dims[2], -1, width])
+        x = self.avgpool(x)
         x = self.last_conv(x)
         x = self.hardwish(x)
         x = self.dropout(x)
@@ -1,10 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .conv_layer import BasicBlock, Bottleneck
-from .dot_product_attention_layer import DotProductAttentionLayer
-from .lstm_layer import BidirectionalLSTM
-from .position_aware_layer import PositionAwareLayer
-from .robust_scanner_fusion_layer import RobustScannerFusionLayer
-from .satrn_layers import Adaptive2DPositionalEncoding, SATRNEncoderLayer
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'conv_layer', 'dot_product_attention_layer', 'lstm_layer',
+    'position_aware_layer', 'robust_scanner_fusion_layer', 'satrn_layers'
+])
 
 __all__ = [
     'BidirectionalLSTM', 'Adaptive2DPositionalEncoding', 'BasicBlock',
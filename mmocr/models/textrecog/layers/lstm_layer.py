@@ -1,5 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from typing import Optional
+
+import torch
 import torch.nn as nn
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 
 
 class BidirectionalLSTM(nn.Module):
@@ -10,8 +14,29 @@ class BidirectionalLSTM(nn.Module):
         self.rnn = nn.LSTM(nIn, nHidden, bidirectional=True)
         self.embedding = nn.Linear(nHidden * 2, nOut)
 
-    def forward(self, input):
-        recurrent, _ = self.rnn(input)
+    def forward(self,
+                input: torch.Tensor,
+                lengths: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """
+        Args:
+            input (Tensor): A Tensor of shape :math:`(T, N, nIn)`.
+            lengths (Tensor, optional): The valid lengths of the sequences in
+                the batch, of shape :math:`(N, )`. If given, the padding at the
+                end of the sequences is skipped, so that it doesn't change the
+                output of the valid steps, and the output of the padding is
+                the output of zeros. Defaults to None.
+
+        Returns:
+            Tensor: A Tensor of shape :math:`(T, N, nOut)`.
+        """
+        if lengths is None:
+            recurrent, _ = self.rnn(input)
+        else:
+            packed = pack_padded_sequence(
+                input, lengths.cpu(), enforce_sorted=False)
+            recurrent, _ = self.rnn(packed)
+            recurrent, _ = pad_packed_sequence(
+                recurrent, total_length=input.size(0))
         T, b, h = recurrent.size()
         t_rec = recurrent.view(T * b, h)
 
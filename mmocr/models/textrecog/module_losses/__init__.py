@@ -1,8 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .abi_module_loss import ABIModuleLoss
-from .base import BaseTextRecogModuleLoss
-from .ce_module_loss import CEModuleLoss
-from .ctc_module_loss import CTCModuleLoss
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(
+    __name__, ['abi_module_loss', 'base', 'ce_module_loss', 'ctc_module_loss'])
 
 __all__ = [
     'BaseTextRecogModuleLoss', 'CEModuleLoss', 'CTCModuleLoss', 'ABIModuleLoss'
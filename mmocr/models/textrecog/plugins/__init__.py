@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .common import GCAModule, Maxpool2d
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['common'])
 
 __all__ = ['Maxpool2d', 'GCAModule']
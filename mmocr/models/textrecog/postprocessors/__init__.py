@@ -1,7 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .attn_postprocessor import AttentionPostprocessor
-from .base import BaseTextRecogPostprocessor
-from .ctc_postprocessor import CTCPostProcessor
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__,
+                           ['attn_postprocessor', 'base', 'ctc_postprocessor'])
 
 __all__ = [
     'BaseTextRecogPostprocessor', 'AttentionPostprocessor', 'CTCPostProcessor'
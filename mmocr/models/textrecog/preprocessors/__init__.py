@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .tps_preprocessor import STN, TPStransform
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, ['tps_preprocessor'])
 
 __all__ = ['TPStransform', 'STN']
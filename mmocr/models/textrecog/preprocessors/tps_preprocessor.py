@@ -1,5 +1,4 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-import itertools
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -19,14 +18,16 @@ class TPStransform(nn.Module):
 
     Args:
         output_image_size (tuple[int, int]): The size of the output image.
-            Defaults to (32, 128).
+            If the width is None, the output image keeps the aspect ratio of
+            the input image, so that images of any width can be rectified
+            without being squeezed. Defaults to (32, 100).
         num_control_points (int): The number of control points. Defaults to 20.
         margins (tuple[float, float]): The margins for control points to the
             top and down side of the image. Defaults to [0.05, 0.05].
     """
 
     def __init__(self,
-                 output_image_size: Tuple[int, int] = (32, 100),
+                 output_image_size: Tuple[int, Optional[int]] = (32, 100),
                  num_control_points: int = 20,
                  margins: Tuple[float, float] = [0.05, 0.05]) -> None:
         super().__init__()
@@ -53,27 +54,25 @@ class TPStransform(nn.Module):
         # compute inverse matrix
         inverse_kernel = torch.inverse(forward_kernel).contiguous()
 
-        # create target coordinate matrix
-        HW = self.target_height * self.target_width
-        tgt_coord = list(
-            itertools.product(
-                range(self.target_height), range(self.target_width)))
-        tgt_coord = torch.Tensor(tgt_coord)
-        Y, X = tgt_coord.split(1, dim=1)
-        Y = Y / (self.target_height - 1)
-        X = X / (self.target_width - 1)
-        tgt_coord = torch.cat([X, Y], dim=1)
-        tgt_coord_partial_repr = self._compute_partial_repr(
-            tgt_coord, target_control_points)
-        tgt_coord_repr = torch.cat(
-            [tgt_coord_partial_repr,
-             torch.ones(HW, 1), tgt_coord], dim=1)
-
         # register precomputed matrices
         self.register_buffer('inverse_kernel', inverse_kernel)
         self.register_buffer('padding_matrix', torch.zeros(3, 2))
-        self.register_buffer('target_coordinate_repr', tgt_coord_repr)
+        if self.target_width is not None:
+            self.register_buffer(
+                'target_coordinate_repr',
+                self._build_target_coordinate_repr(target_control_points,
+                                                   self.target_height,
+                                                   self.target_width))
         self.register_buffer('target_control_points', target_control_points)
+        self._target_coordinate_reprs: Dict[Tuple[int, torch.device],
+                                            torch.Tensor] = {}
+
+    def _load_from_state_dict(self, state_dict: Dict, prefix: str, *args,
+                              **kwargs) -> None:
+        if self.target_width is None:
+            # Computed for each input width instead
+            state_dict.pop(prefix + 'target_coordinate_repr', None)
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
 
     def forward(self, input: torch.Tensor,
                 source_control_points: torch.Tensor) -> torch.Tensor:
@@ -96,11 +95,18 @@ class TPStransform(nn.Module):
             self.padding_matrix.expand(batch_size, 3, 2)
         ], 1)
         mapping_matrix = torch.matmul(self.inverse_kernel, Y)
-        source_coordinate = torch.matmul(self.target_coordinate_repr,
+        target_width = self.target_width
+        if target_width is None:
+            target_width = max(
+                2, round(input.size(3) * self.target_height / input.size(2)))
+            target_coordinate_repr = self._cached_target_coordinate_repr(
+                target_width, mapping_matrix.device)
+        else:
+            target_coordinate_repr = self.target_coordinate_repr
+        source_coordinate = torch.matmul(target_coordinate_repr,
                                          mapping_matrix)
 
-        grid = source_coordinate.view(-1, self.target_height,
-                                      self.target_width, 2)
+        grid = source_coordinate.view(-1, self.target_height, target_width, 2)
         grid = torch.clamp(grid, 0, 1)
         grid = 2.0 * grid - 1.0
         output_maps = self._grid_sample(input, grid, canvas=None)
@@ -150,6 +156,46 @@ class TPStransform(nn.Module):
         repr_matrix.masked_fill_(mask, 0)
         return repr_matrix
 
+    def _cached_target_coordinate_repr(self, width: int,
+                                       device: torch.device) -> torch.Tensor:
+        """Get the target coordinate matrix of an output width, which is
+        cached as the widths of the batches repeat."""
+        key = (width, device)
+        if key not in self._target_coordinate_reprs:
+            self._target_coordinate_reprs[key] = \
+                self._build_target_coordinate_repr(
+                    self.target_control_points.cpu(), self.target_height,
+                    width).to(device)
+        return self._target_coordinate_reprs[key]
+
+    def _build_target_coordinate_repr(self,
+                                      target_control_points: torch.Tensor,
+                                      height: int, width: int) -> torch.Tensor:
+        """Build the representation of the coordinates of an output image,
+        which maps the TPS parameters to the sampling grid.
+
+        Args:
+            target_control_points (Tensor): The output control points.
+            height (int): The height of the output image.
+            width (int): The width of the output image.
+        Returns:
+            Tensor: The target coordinate matrix of shape
+            (height * width, num_control_points + 3).
+        """
+        Y, X = torch.meshgrid(
+            torch.arange(height, dtype=torch.float32),
+            torch.arange(width, dtype=torch.float32),
+            indexing='ij')
+        Y = Y.reshape(-1, 1) / (height - 1)
+        X = X.reshape(-1, 1) / (width - 1)
+        tgt_coord = torch.cat([X, Y], dim=1)
+        tgt_coord_partial_repr = self._compute_partial_repr(
+            tgt_coord, target_control_points)
+        return torch.cat(
+            [tgt_coord_partial_repr,
+             torch.ones(height * width, 1), tgt_coord],
+            dim=1)
+
     # output_ctrl_pts are specified, according to our task.
     def _build_output_control_points(self, num_control_points: torch.Tensor,
                                      margins: Tuple[float,
@@ -189,8 +235,9 @@ class STN(BasePreprocessor):
         in_channels (int): The number of input channels.
         resized_image_size (Tuple[int, int]): The resized image size. The input
             image will be downsampled to have a better recitified result.
-        output_image_size: The size of the output image for TPS. Defaults to
-            (32, 100).
+        output_image_size: The size of the output image for TPS. If the width
+            is None, the output image keeps the aspect ratio of the input
+            image. Defaults to (32, 100).
         num_control_points: The number of control points. Defaults to 20.
         margins: The margins for control points to the top and down side of the
             image for TPS. Defaults to [0.05, 0.05].
@@ -199,7 +246,7 @@ class STN(BasePreprocessor):
     def __init__(self,
                  in_channels: int,
                  resized_image_size: Tuple[int, int] = (32, 64),
-                 output_image_size: Tuple[int, int] = (32, 100),
+                 output_image_size: Tuple[int, Optional[int]] = (32, 100),
                  num_control_points: int = 20,
                  margins: Tuple[float, float] = [0.05, 0.05],
                  init_cfg: Optional[Union[Dict, List[Dict]]] = [
@@ -1,16 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .abinet import ABINet
-from .aster import ASTER
-from .base import BaseRecognizer
-from .crnn import CRNN
-from .encoder_decoder_recognizer import EncoderDecoderRecognizer
-from .encoder_decoder_recognizer_tta import EncoderDecoderRecognizerTTAModel
-from .master import MASTER
-from .nrtr import NRTR
-from .robust_scanner import RobustScanner
-from .sar import SARNet
-from .satrn import SATRN
-from .svtr import SVTR
+from mmocr.utils.lazy_import import lazy_package
+
+__getattr__ = lazy_package(__name__, [
+    'abinet', 'aster', 'base', 'crnn', 'encoder_decoder_recognizer',
+    'encoder_decoder_recognizer_tta', 'master', 'nrtr', 'robust_scanner',
+    'sar', 'satrn', 'svtr'
+])
 
 __all__ = [
     'BaseRecognizer', 'EncoderDecoderRecognizer', 'CRNN', 'SARNet', 'NRTR',
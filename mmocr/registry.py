@@ -2,9 +2,15 @@
 """MMOCR provides 20 registry nodes to support using modules across projects.
 Each node is a child of the root registry in MMEngine.
 
+The nodes import the module defining a type on its first lookup, as recorded
+in :mod:`mmocr.registry_manifest`, instead of all the modules under their
+locations.
+
 More details can be found at
 https://mmengine.readthedocs.io/en/latest/tutorials/registry.html.
 """
+from importlib import import_module
+from typing import Optional, Type
 
 from mmengine.registry import DATA_SAMPLERS as MMENGINE_DATA_SAMPLERS
 from mmengine.registry import DATASETS as MMENGINE_DATASETS
@@ -31,127 +37,179 @@ from mmengine.registry import \
     WEIGHT_INITIALIZERS as MMENGINE_WEIGHT_INITIALIZERS
 from mmengine.registry import Registry
 
+from .registry_manifest import REGISTRY_MANIFEST
+
+
+class LazyRegistry(Registry):
+    """A registry which imports the module defining a type when it is looked
+    up, as recorded in the registry manifest, rather than all the modules
+    under ``locations``.
+
+    The modules under ``locations`` are still imported if a type is neither
+    in the manifest nor in the parent registries, e.g. if the manifest is
+    outdated.
+    """
+
+    def get(self, key: str) -> Optional[Type]:
+        """Get the registry record.
+
+        Args:
+            key (str): Name of the registered item, e.g. the class name in
+                string format.
+
+        Returns:
+            Type or None: Return the corresponding class if key exists,
+            otherwise return None.
+        """
+        scope, real_key = self.split_scope_key(key)
+        if scope is None or scope == self._scope:
+            module = REGISTRY_MANIFEST.get(self.name, {}).get(real_key)
+            if module is not None:
+                import_module(module)
+        imported = self._imported
+        # Skip importing the locations in ``Registry.get``
+        self._imported = True
+        try:
+            obj_cls = super().get(key)
+        finally:
+            self._imported = imported
+        if obj_cls is None and not imported:
+            obj_cls = super().get(key)
+        return obj_cls
+
+    def import_from_location(self) -> None:
+        """Import all the modules under ``locations``, including the
+        subpackages of the lazy packages."""
+        if not self._imported:
+            # Avoid circular import
+            from mmocr.utils.lazy_import import import_package
+            for location in self._locations:
+                import_package(location)
+            self._imported = True
+
+
 # manage all kinds of runners like `EpochBasedRunner` and `IterBasedRunner`
-RUNNERS = Registry(
+RUNNERS = LazyRegistry(
     'runner',
     parent=MMENGINE_RUNNERS,
     # TODO: update the location when mmocr has its own runner
     locations=['mmocr.engine'])
 # manage runner constructors that define how to initialize runners
-RUNNER_CONSTRUCTORS = Registry(
+RUNNER_CONSTRUCTORS = LazyRegistry(
     'runner constructor',
     parent=MMENGINE_RUNNER_CONSTRUCTORS,
     # TODO: update the location when mmocr has its own runner constructor
     locations=['mmocr.engine'])
 # manage all kinds of loops like `EpochBasedTrainLoop`
-LOOPS = Registry(
+LOOPS = LazyRegistry(
     'loop',
     parent=MMENGINE_LOOPS,
     # TODO: update the location when mmocr has its own loop
     locations=['mmocr.engine'])
 # manage all kinds of hooks like `CheckpointHook`
-HOOKS = Registry(
+HOOKS = LazyRegistry(
     'hook', parent=MMENGINE_HOOKS, locations=['mmocr.engine.hooks'])
 
 # manage data-related modules
-DATASETS = Registry(
+DATASETS = LazyRegistry(
     'dataset', parent=MMENGINE_DATASETS, locations=['mmocr.datasets'])
-DATA_SAMPLERS = Registry(
+DATA_SAMPLERS = LazyRegistry(
     'data sampler',
     parent=MMENGINE_DATA_SAMPLERS,
     locations=['mmocr.datasets.samplers'])
-TRANSFORMS = Registry(
+TRANSFORMS = LazyRegistry(
     'transform',
     parent=MMENGINE_TRANSFORMS,
     locations=['mmocr.datasets.transforms'])
 
 # manage all kinds of modules inheriting `nn.Module`
-MODELS = Registry('model', parent=MMENGINE_MODELS, locations=['mmocr.models'])
+MODELS = LazyRegistry(
+    'model', parent=MMENGINE_MODELS, locations=['mmocr.models'])
 # manage all kinds of model wrappers like 'MMDistributedDataParallel'
-MODEL_WRAPPERS = Registry(
+MODEL_WRAPPERS = LazyRegistry(
     'model wrapper',
     parent=MMENGINE_MODEL_WRAPPERS,
     locations=['mmocr.models'])
 # manage all kinds of weight initialization modules like `Uniform`
-WEIGHT_INITIALIZERS = Registry(
+WEIGHT_INITIALIZERS = LazyRegistry(
     'weight initializer',
     parent=MMENGINE_WEIGHT_INITIALIZERS,
     locations=['mmocr.models'])
 
 # manage all kinds of optimizers like `SGD` and `Adam`
-OPTIMIZERS = Registry(
+OPTIMIZERS = LazyRegistry(
     'optimizer',
     parent=MMENGINE_OPTIMIZERS,
     # TODO: update the location when mmocr has its own optimizer
     locations=['mmocr.engine'])
 # manage optimizer wrapper
-OPTIM_WRAPPERS = Registry(
+OPTIM_WRAPPERS = LazyRegistry(
     'optimizer wrapper',
     parent=MMENGINE_OPTIM_WRAPPERS,
     # TODO: update the location when mmocr has its own optimizer wrapper
     locations=['mmocr.engine'])
 # manage constructors that customize the optimization hyperparameters.
-OPTIM_WRAPPER_CONSTRUCTORS = Registry(
+OPTIM_WRAPPER_CONSTRUCTORS = LazyRegistry(
     'optimizer constructor',
     parent=MMENGINE_OPTIM_WRAPPER_CONSTRUCTORS,
     # TODO: update the location when mmocr has its own optimizer constructor
     locations=['mmocr.engine'])
 # manage all kinds of parameter schedulers like `MultiStepLR`
-PARAM_SCHEDULERS = Registry(
+PARAM_SCHEDULERS = LazyRegistry(
     'parameter scheduler',
     parent=MMENGINE_PARAM_SCHEDULERS,
     # TODO: update the location when mmocr has its own parameter scheduler
     locations=['mmocr.engine'])
 # manage all kinds of metrics
-METRICS = Registry(
+METRICS = LazyRegistry(
     'metric', parent=MMENGINE_METRICS, locations=['mmocr.evaluation.metrics'])
 # manage evaluator
-EVALUATOR = Registry(
+EVALUATOR = LazyRegistry(
     'evaluator',
     parent=MMENGINE_EVALUATOR,
     locations=['mmocr.evaluation.evaluator'])
 
 # manage task-specific modules like anchor generators and box coders
-TASK_UTILS = Registry(
+TASK_UTILS = LazyRegistry(
     'task util', parent=MMENGINE_TASK_UTILS, locations=['mmocr.models'])
 
 # manage visualizer
-VISUALIZERS = Registry(
+VISUALIZERS = LazyRegistry(
     'visualizer',
     parent=MMENGINE_VISUALIZERS,
     locations=['mmocr.visualization'])
 # manage visualizer backend
-VISBACKENDS = Registry(
+VISBACKENDS = LazyRegistry(
     'visualizer backend',
     parent=MMENGINE_VISBACKENDS,
     locations=['mmocr.visualization'])
 
 # manage logprocessor
-LOG_PROCESSORS = Registry(
+LOG_PROCESSORS = LazyRegistry(
     'logger processor',
     parent=MMENGINE_LOG_PROCESSORS,
     # TODO: update the location when mmocr has its own log processor
     locations=['mmocr.engine'])
 # manage data obtainer
-DATA_OBTAINERS = Registry(
+DATA_OBTAINERS = LazyRegistry(
     'data obtainer', locations=['mmocr.datasets.preparers.obtainers'])
 
 # manage data gatherer
-DATA_GATHERERS = Registry(
+DATA_GATHERERS = LazyRegistry(
     'data gatherer', locations=['mmocr.datasets.preparers.gatherers'])
 
 # manage data parser
-DATA_PARSERS = Registry(
+DATA_PARSERS = LazyRegistry(
     'data parser', locations=['mmocr.datasets.preparers.parsers'])
 
 # manage data packer
-DATA_PACKERS = Registry(
+DATA_PACKERS = LazyRegistry(
     'data packer', locations=['mmocr.datasets.preparers.packers'])
 
 # manage data dumper
-DATA_DUMPERS = Registry(
+DATA_DUMPERS = LazyRegistry(
     'data dumper', locations=['mmocr.datasets.preparers.dumpers'])
 
 # manage dataset config generator
-CFG_GENERATORS = Registry(
+CFG_GENERATORS = LazyRegistry(
     'cfg generator', locations=['mmocr.datasets.preparers.config_generators'])
@@ -0,0 +1,386 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+# Generated by .dev_scripts/update_registry_manifest.py, do not edit.
+# The modules defining the types registered in the registries of mmocr and
+# the names exported by its lazy packages, so that they are imported on demand.
+# flake8: noqa
+
+# yapf: disable
+REGISTRY_MANIFEST = {
+    'hook': {
+        'VisualizationHook': 'mmocr.engine.hooks.visualization_hook',
+    },
+    'dataset': {
+        'ConcatDataset': 'mmocr.datasets.dataset_wrapper',
+        'IcdarDataset': 'mmocr.datasets.icdar_dataset',
+        'OCRDataset': 'mmocr.datasets.ocr_dataset',
+        'RecogLMDBDataset': 'mmocr.datasets.recog_lmdb_dataset',
+        'RecogTextDataset': 'mmocr.datasets.recog_text_dataset',
+        'WildReceiptDataset': 'mmocr.datasets.wildreceipt_dataset',
+    },
+    'data sampler': {
+        'BatchAugSampler': 'mmocr.datasets.samplers.batch_aug',
+    },
+    'transform': {
+        'BoundedScaleAspectJitter': 'mmocr.datasets.transforms.textdet_transforms',
+        'ConditionApply': 'mmocr.datasets.transforms.wrappers',
+        'CropHeight': 'mmocr.datasets.transforms.textrecog_transforms',
+        'FixInvalidPolygon': 'mmocr.datasets.transforms.ocr_transforms',
+        'GenerateTextDetTargets': 'mmocr.datasets.transforms.textdet_transforms',
+        'ImageContentJitter': 'mmocr.datasets.transforms.textrecog_transforms',
+        'ImgAugWrapper': 'mmocr.datasets.transforms.wrappers',
+        'InferencerLoader': 'mmocr.datasets.transforms.loading',
+        'LoadImageFromFile': 'mmocr.datasets.transforms.loading',
+        'LoadImageFromNDArray': 'mmocr.datasets.transforms.loading',
+        'LoadKIEAnnotations': 'mmocr.datasets.transforms.loading',
+        'LoadOCRAnnotations': 'mmocr.datasets.transforms.loading',
+        'MMDet2MMOCR': 'mmocr.datasets.transforms.adapters',
+        'MMOCR2MMDet': 'mmocr.datasets.transforms.adapters',
+        'PackKIEInputs': 'mmocr.datasets.transforms.formatting',
+        'PackTextDetInputs': 'mmocr.datasets.transforms.formatting',
+        'PackTextRecogInputs': 'mmocr.datasets.transforms.formatting',
+        'PadToWidth': 'mmocr.datasets.transforms.textrecog_transforms',
+        'PyramidRescale': 'mmocr.datasets.transforms.textrecog_transforms',
+        'RandomCrop': 'mmocr.datasets.transforms.ocr_transforms',
+        'RandomFlip': 'mmocr.datasets.transforms.textdet_transforms',
+        'RandomRotate': 'mmocr.datasets.transforms.ocr_transforms',
+        'RemoveIgnored': 'mmocr.datasets.transforms.ocr_transforms',
+        'RescaleToHeight': 'mmocr.datasets.transforms.textrecog_transforms',
+        'Resize': 'mmocr.datasets.transforms.ocr_transforms',
+        'ReversePixels': 'mmocr.datasets.transforms.textrecog_transforms',
+        'ShortScaleAspectJitter': 'mmocr.datasets.transforms.textdet_transforms',
+        'SourceImagePad': 'mmocr.datasets.transforms.textdet_transforms',
+        'TextDetRandomCrop': 'mmocr.datasets.transforms.textdet_transforms',
+        'TextDetRandomCropFlip': 'mmocr.datasets.transforms.textdet_transforms',
+        'TextRecogGeneralAug': 'mmocr.datasets.transforms.textrecog_transforms',
+        'TorchVisionWrapper': 'mmocr.datasets.transforms.wrappers',
+    },
+    'model': {
+        'ABIEncoder': 'mmocr.models.textrecog.encoders.abi_encoder',
+        'ABIFuser': 'mmocr.models.textrecog.decoders.abi_fuser',
+        'ABILanguageDecoder': 'mmocr.models.textrecog.decoders.abi_language_decoder',
+        'ABIModuleLoss': 'mmocr.models.textrecog.module_losses.abi_module_loss',
+        'ABINet': 'mmocr.models.textrecog.recognizers.abinet',
+        'ABIVisionDecoder': 'mmocr.models.textrecog.decoders.abi_vision_decoder',
+        'ASTER': 'mmocr.models.textrecog.recognizers.aster',
+        'ASTERDecoder': 'mmocr.models.textrecog.decoders.aster_decoder',
+        'ASTEREncoder': 'mmocr.models.textrecog.encoders.aster_encoder',
+        'AttentionPostprocessor': 'mmocr.models.textrecog.postprocessors.attn_postprocessor',
+        'AvgPool2d': 'mmocr.models.common.plugins.common',
+        'BaseDecoder': 'mmocr.models.textrecog.decoders.base',
+        'BaseEncoder': 'mmocr.models.textrecog.encoders.base',
+        'BasePreprocessor': 'mmocr.models.textrecog.preprocessors.base',
+        'BaseTextDetHead': 'mmocr.models.textdet.heads.base',
+        'BaseTextDetModuleLoss': 'mmocr.models.textdet.module_losses.base',
+        'CEModuleLoss': 'mmocr.models.textrecog.module_losses.ce_module_loss',
+        'CLIPResNet': 'mmocr.models.common.backbones.clip_resnet',
+        'CRNN': 'mmocr.models.textrecog.recognizers.crnn',
+        'CRNNDecoder': 'mmocr.models.textrecog.decoders.crnn_decoder',
+        'CTCModuleLoss': 'mmocr.models.textrecog.module_losses.ctc_module_loss',
+        'CTCPostProcessor': 'mmocr.models.textrecog.postprocessors.ctc_postprocessor',
+        'ChannelReductionEncoder': 'mmocr.models.textrecog.encoders.channel_reduction_encoder',
+        'CrossEntropyLoss': 'mmocr.models.common.losses.ce_loss',
+        'DBHead': 'mmocr.models.textdet.heads.db_head',
+        'DBModuleLoss': 'mmocr.models.textdet.module_losses.db_module_loss',
+        'DBNet': 'mmocr.models.textdet.detectors.dbnet',
+        'DBPostprocessor': 'mmocr.models.textdet.postprocessors.db_postprocessor',
+        'DRRG': 'mmocr.models.textdet.detectors.drrg',
+        'DRRGHead': 'mmocr.models.textdet.heads.drrg_head',
+        'DRRGModuleLoss': 'mmocr.models.textdet.module_losses.drrg_module_loss',
+        'DRRGPostprocessor': 'mmocr.models.textdet.postprocessors.drrg_postprocessor',
+        'DeconvModule': 'mmocr.models.common.backbones.unet',
+        'EncoderDecoderRecognizer': 'mmocr.models.textrecog.recognizers.encoder_decoder_recognizer',
+        'EncoderDecoderRecognizerTTAModel': 'mmocr.models.textrecog.recognizers.encoder_decoder_recognizer_tta',
+        'FCEHead': 'mmocr.models.textdet.heads.fce_head',
+        'FCEModuleLoss': 'mmocr.models.textdet.module_losses.fce_module_loss',
+        'FCENet': 'mmocr.models.textdet.detectors.fcenet',
+        'FCEPostprocessor': 'mmocr.models.textdet.postprocessors.fce_postprocessor',
+        'FPEM_FFM': 'mmocr.models.textdet.necks.fpem_ffm',
+        'FPNC': 'mmocr.models.textdet.necks.fpn_cat',
+        'FPNF': 'mmocr.models.textdet.necks.fpnf',
+        'FPN_UNet': 'mmocr.models.textdet.necks.fpn_unet',
+        'GCAModule': 'mmocr.models.textrecog.plugins.common',
+        'InterpConv': 'mmocr.models.common.backbones.unet',
+        'MASTER': 'mmocr.models.textrecog.recognizers.master',
+        'MMDetWrapper': 'mmocr.models.textdet.detectors.mmdet_wrapper',
+        'MaskedBCELoss': 'mmocr.models.common.losses.bce_loss',
+        'MaskedBCEWithLogitsLoss': 'mmocr.models.common.losses.bce_loss',
+        'MaskedBalancedBCELoss': 'mmocr.models.common.losses.bce_loss',
+        'MaskedBalancedBCEWithLogitsLoss': 'mmocr.models.common.losses.bce_loss',
+        'MaskedDiceLoss': 'mmocr.models.common.losses.dice_loss',
+        'MaskedSmoothL1Loss': 'mmocr.models.common.losses.l1_loss',
+        'MaskedSquareDiceLoss': 'mmocr.models.common.losses.dice_loss',
+        'MasterDecoder': 'mmocr.models.textrecog.decoders.master_decoder',
+        'Maxpool2d': 'mmocr.models.textrecog.plugins.common',
+        'MiniVGG': 'mmocr.models.textrecog.backbones.mini_vgg',
+        'MobileNetV2': 'mmocr.models.textrecog.backbones.mobilenet_v2',
+        'NRTR': 'mmocr.models.textrecog.recognizers.nrtr',
+        'NRTRDecoder': 'mmocr.models.textrecog.decoders.nrtr_decoder',
+        'NRTREncoder': 'mmocr.models.textrecog.encoders.nrtr_encoder',
+        'NRTRModalityTransform': 'mmocr.models.textrecog.backbones.nrtr_modality_transformer',
+        'PANEmbLossV1': 'mmocr.models.textdet.module_losses.pan_module_loss',
+        'PANHead': 'mmocr.models.textdet.heads.pan_head',
+        'PANModuleLoss': 'mmocr.models.textdet.module_losses.pan_module_loss',
+        'PANPostprocessor': 'mmocr.models.textdet.postprocessors.pan_postprocessor',
+        'PANet': 'mmocr.models.textdet.detectors.panet',
+        'PSEHead': 'mmocr.models.textdet.heads.pse_head',
+        'PSEModuleLoss': 'mmocr.models.textdet.module_losses.pse_module_loss',
+        'PSENet': 'mmocr.models.textdet.detectors.psenet',
+        'PSEPostprocessor': 'mmocr.models.textdet.postprocessors.pse_postprocessor',
+        'ParallelSARDecoder': 'mmocr.models.textrecog.decoders.sar_decoder',
+        'ParallelSARDecoderWithBS': 'mmocr.models.textrecog.decoders.sar_decoder_with_bs',
+        'PositionAttentionDecoder': 'mmocr.models.textrecog.decoders.position_attention_decoder',
+        'ResNet': 'mmocr.models.textrecog.backbones.resnet',
+        'ResNet31OCR': 'mmocr.models.textrecog.backbones.resnet31_ocr',
+        'ResNetABI': 'mmocr.models.textrecog.backbones.resnet_abi',
+        'RobustScanner': 'mmocr.models.textrecog.recognizers.robust_scanner',
+        'RobustScannerFuser': 'mmocr.models.textrecog.decoders.robust_scanner_fuser',
+        'SAREncoder': 'mmocr.models.textrecog.encoders.sar_encoder',
+        'SARNet': 'mmocr.models.textrecog.recognizers.sar',
+        'SATRN': 'mmocr.models.textrecog.recognizers.satrn',
+        'SATRNEncoder': 'mmocr.models.textrecog.encoders.satrn_encoder',
+        'SDMGR': 'mmocr.models.kie.extractors.sdmgr',
+        'SDMGRHead': 'mmocr.models.kie.heads.sdmgr_head',
+        'SDMGRModuleLoss': 'mmocr.models.kie.module_losses.sdmgr_module_loss',
+        'SDMGRPostProcessor': 'mmocr.models.kie.postprocessors.sdmgr_postprocessor',
+        'STN': 'mmocr.models.textrecog.preprocessors.tps_preprocessor',
+        'SVTR': 'mmocr.models.textrecog.recognizers.svtr',
+        'SVTRDecoder': 'mmocr.models.textrecog.decoders.svtr_decoder',
+        'SVTREncoder': 'mmocr.models.textrecog.encoders.svtr_encoder',
+        'SequenceAttentionDecoder': 'mmocr.models.textrecog.decoders.sequence_attention_decoder',
+        'SequentialSARDecoder': 'mmocr.models.textrecog.decoders.sar_decoder',
+        'ShallowCNN': 'mmocr.models.textrecog.backbones.shallow_cnn',
+        'SingleStageTextDetector': 'mmocr.models.textdet.detectors.single_stage_text_detector',
+        'SmoothL1Loss': 'mmocr.models.common.losses.l1_loss',
+        'TextDetDataPreprocessor': 'mmocr.models.textdet.data_preprocessors.data_preprocessor',
+        'TextRecogDataPreprocessor': 'mmocr.models.textrecog.data_preprocessors.data_preprocessor',
+        'TextSnake': 'mmocr.models.textdet.detectors.textsnake',
+        'TextSnakeHead': 'mmocr.models.textdet.heads.textsnake_head',
+        'TextSnakeModuleLoss': 'mmocr.models.textdet.module_losses.textsnake_module_loss',
+        'TextSnakePostprocessor': 'mmocr.models.textdet.postprocessors.textsnake_postprocessor',
+        'UNet': 'mmocr.models.common.backbones.unet',
+    },
+    'metric': {
+        'CharMetric': 'mmocr.evaluation.metrics.recog_metric',
+        'F1Metric': 'mmocr.evaluation.metrics.f_metric',
+        'HmeanIOUMetric': 'mmocr.evaluation.metrics.hmean_iou_metric',
+        'OneMinusNEDMetric': 'mmocr.evaluation.metrics.recog_metric',
+        'WordMetric': 'mmocr.evaluation.metrics.recog_metric',
+    },
+    'evaluator': {
+        'MultiDatasetsEvaluator': 'mmocr.evaluation.evaluator.multi_datasets_evaluator',
+    },
+    'task util': {
+        'Dictionary': 'mmocr.models.common.dictionary.dictionary',
+        'LineJsonParser': 'mmocr.utils.parsers',
+        'LineStrParser': 'mmocr.utils.parsers',
+    },
+    'visualizer': {
+        'BaseLocalVisualizer': 'mmocr.visualization.base_visualizer',
+        'KIELocalVisualizer': 'mmocr.visualization.kie_visualizer',
+        'TextDetLocalVisualizer': 'mmocr.visualization.textdet_visualizer',
+        'TextRecogLocalVisualizer': 'mmocr.visualization.textrecog_visualizer',
+        'TextSpottingLocalVisualizer': 'mmocr.visualization.textspotting_visualizer',
+    },
+    'data obtainer': {
+        'AWSS3Obtainer': 'mmocr.datasets.preparers.obtainers.aws_s3_obtainer',
+        'NaiveDataObtainer': 'mmocr.datasets.preparers.obtainers.naive_data_obtainer',
+    },
+    'data gatherer': {
+        'MonoGatherer': 'mmocr.datasets.preparers.gatherers.mono_gatherer',
+        'NAFGatherer': 'mmocr.datasets.preparers.gatherers.naf_gatherer',
+        'PairGatherer': 'mmocr.datasets.preparers.gatherers.pair_gatherer',
+    },
+    'data parser': {
+        'COCOTextDetAnnParser': 'mmocr.datasets.preparers.parsers.coco_parser',
+        'CTW1500AnnParser': 'mmocr.datasets.preparers.parsers.ctw1500_parser',
+        'FUNSDTextDetAnnParser': 'mmocr.datasets.preparers.parsers.funsd_parser',
+        'ICDARTxtTextDetAnnParser': 'mmocr.datasets.preparers.parsers.icdar_txt_parser',
+        'ICDARTxtTextRecogAnnParser': 'mmocr.datasets.preparers.parsers.icdar_txt_parser',
+        'MJSynthAnnParser': 'mmocr.datasets.preparers.parsers.mjsynth_parser',
+        'NAFAnnParser': 'mmocr.datasets.preparers.parsers.naf_parser',
+        'SROIETextDetAnnParser': 'mmocr.datasets.preparers.parsers.sroie_parser',
+        'SVTTextDetAnnParser': 'mmocr.datasets.preparers.parsers.svt_parser',
+        'SynthTextAnnParser': 'mmocr.datasets.preparers.parsers.synthtext_parser',
+        'TotaltextTextDetAnnParser': 'mmocr.datasets.preparers.parsers.totaltext_parser',
+        'WildreceiptKIEAnnParser': 'mmocr.datasets.preparers.parsers.wildreceipt_parser',
+        'WildreceiptTextDetAnnParser': 'mmocr.datasets.preparers.parsers.wildreceipt_parser',
+    },
+    'data packer': {
+        'TextDetPacker': 'mmocr.datasets.preparers.packers.textdet_packer',
+        'TextRecogCropPacker': 'mmocr.datasets.preparers.packers.textrecog_packer',
+        'TextRecogPacker': 'mmocr.datasets.preparers.packers.textrecog_packer',
+        'TextSpottingPacker': 'mmocr.datasets.preparers.packers.textspotting_packer',
+        'WildReceiptPacker': 'mmocr.datasets.preparers.packers.wildreceipt_packer',
+    },
+    'data dumper': {
+        'JsonDumper': 'mmocr.datasets.preparers.dumpers.json_dumper',
+        'TextRecogLMDBDumper': 'mmocr.datasets.preparers.dumpers.lmdb_dumper',
+        'WildreceiptOpensetDumper': 'mmocr.datasets.preparers.dumpers.wild_receipt_openset_dumper',
+    },
+    'cfg generator': {
+        'TextDetConfigGenerator': 'mmocr.datasets.preparers.config_generators.textdet_config_generator',
+        'TextRecogConfigGenerator': 'mmocr.datasets.preparers.config_generators.textrecog_config_generator',
+        'TextSpottingConfigGenerator': 'mmocr.datasets.preparers.config_generators.textspotting_config_generator',
+    },
+}
+
+EXPORT_MANIFEST = {
+    'ABIEncoder': ['mmocr.models.textrecog.encoders.abi_encoder'],
+    'ABIFuser': ['mmocr.models.textrecog.decoders.abi_fuser'],
+    'ABILanguageDecoder': ['mmocr.models.textrecog.decoders.abi_language_decoder'],
+    'ABIModuleLoss': ['mmocr.models.textrecog.module_losses.abi_module_loss'],
+    'ABINet': ['mmocr.models.textrecog.recognizers.abinet'],
+    'ABIVisionDecoder': ['mmocr.models.textrecog.decoders.abi_vision_decoder'],
+    'ASTER': ['mmocr.models.textrecog.recognizers.aster'],
+    'ASTERDecoder': ['mmocr.models.textrecog.decoders.aster_decoder'],
+    'ASTEREncoder': ['mmocr.models.textrecog.encoders.aster_encoder'],
+    'Adaptive2DPositionalEncoding': ['mmocr.models.textrecog.layers.satrn_layers'],
+    'AttentionPostprocessor': ['mmocr.models.textrecog.postprocessors.attn_postprocessor'],
+    'AvgPool2d': ['mmocr.models.common.plugins.common'],
+    'BaseDecoder': ['mmocr.models.textrecog.decoders.base'],
+    'BaseEncoder': ['mmocr.models.textrecog.encoders.base'],
+    'BaseRecognizer': ['mmocr.models.textrecog.recognizers.base'],
+    'BaseTextDetHead': ['mmocr.models.textdet.heads.base'],
+    'BaseTextDetPostProcessor': ['mmocr.models.textdet.postprocessors.base'],
+    'BaseTextRecogModuleLoss': ['mmocr.models.textrecog.module_losses.base'],
+    'BaseTextRecogPostprocessor': ['mmocr.models.textrecog.postprocessors.base'],
+    'BasicBlock': ['mmocr.models.textrecog.layers.conv_layer'],
+    'BidirectionalLSTM': ['mmocr.models.textrecog.layers.lstm_layer'],
+    'Bottleneck': ['mmocr.models.textrecog.layers.conv_layer'],
+    'BoundedScaleAspectJitter': ['mmocr.datasets.transforms.textdet_transforms'],
+    'CEModuleLoss': ['mmocr.models.textrecog.module_losses.ce_module_loss'],
+    'CLIPResNet': ['mmocr.models.common.backbones.clip_resnet'],
+    'CRNN': ['mmocr.models.textrecog.recognizers.crnn'],
+    'CRNNDecoder': ['mmocr.models.textrecog.decoders.crnn_decoder'],
+    'CTCModuleLoss': ['mmocr.models.textrecog.module_losses.ctc_module_loss'],
+    'CTCPostProcessor': ['mmocr.models.textrecog.postprocessors.ctc_postprocessor'],
+    'ChannelReductionEncoder': ['mmocr.models.textrecog.encoders.channel_reduction_encoder'],
+    'ConcatDataset': ['mmocr.datasets.dataset_wrapper'],
+    'ConditionApply': ['mmocr.datasets.transforms.wrappers'],
+    'CropHeight': ['mmocr.datasets.transforms.textrecog_transforms'],
+    'CrossEntropyLoss': ['mmocr.models.common.losses.ce_loss'],
+    'DBHead': ['mmocr.models.textdet.heads.db_head'],
+    'DBModuleLoss': ['mmocr.models.textdet.module_losses.db_module_loss'],
+    'DBNet': ['mmocr.models.textdet.detectors.dbnet'],
+    'DBPostprocessor': ['mmocr.models.textdet.postprocessors.db_postprocessor'],
+    'DRRG': ['mmocr.models.textdet.detectors.drrg'],
+    'DRRGHead': ['mmocr.models.textdet.heads.drrg_head'],
+    'DRRGModuleLoss': ['mmocr.models.textdet.module_losses.drrg_module_loss'],
+    'DRRGPostprocessor': ['mmocr.models.textdet.postprocessors.drrg_postprocessor'],
+    'Dictionary': ['mmocr.models.common.dictionary.dictionary'],
+    'DotProductAttentionLayer': ['mmocr.models.textrecog.layers.dot_product_attention_layer'],
+    'EncoderDecoderRecognizer': ['mmocr.models.textrecog.recognizers.encoder_decoder_recognizer'],
+    'EncoderDecoderRecognizerTTAModel': ['mmocr.models.textrecog.recognizers.encoder_decoder_recognizer_tta'],
+    'FCEHead': ['mmocr.models.textdet.heads.fce_head'],
+    'FCEModuleLoss': ['mmocr.models.textdet.module_losses.fce_module_loss'],
+    'FCENet': ['mmocr.models.textdet.detectors.fcenet'],
+    'FCEPostprocessor': ['mmocr.models.textdet.postprocessors.fce_postprocessor'],
+    'FPEM_FFM': ['mmocr.models.textdet.necks.fpem_ffm'],
+    'FPNC': ['mmocr.models.textdet.necks.fpn_cat'],
+    'FPNF': ['mmocr.models.textdet.necks.fpnf'],
+    'FPN_UNet': ['mmocr.models.textdet.necks.fpn_unet'],
+    'FixInvalidPolygon': ['mmocr.datasets.transforms.ocr_transforms'],
+    'GCAModule': ['mmocr.models.textrecog.plugins.common'],
+    'GenerateTextDetTargets': ['mmocr.datasets.transforms.textdet_transforms'],
+    'IcdarDataset': ['mmocr.datasets.icdar_dataset'],
+    'ImageContentJitter': ['mmocr.datasets.transforms.textrecog_transforms'],
+    'ImgAugWrapper': ['mmocr.datasets.transforms.wrappers'],
+    'InferencerLoader': ['mmocr.datasets.transforms.loading'],
+    'LoadImageFromFile': ['mmocr.datasets.transforms.loading'],
+    'LoadImageFromNDArray': ['mmocr.datasets.transforms.loading'],
+    'LoadKIEAnnotations': ['mmocr.datasets.transforms.loading'],
+    'LoadOCRAnnotations': ['mmocr.datasets.transforms.loading'],
+    'MASTER': ['mmocr.models.textrecog.recognizers.master'],
+    'MMDet2MMOCR': ['mmocr.datasets.transforms.adapters'],
+    'MMDetWrapper': ['mmocr.models.textdet.detectors.mmdet_wrapper'],
+    'MMOCR2MMDet': ['mmocr.datasets.transforms.adapters'],
+    'MaskedBCELoss': ['mmocr.models.common.losses.bce_loss'],
+    'MaskedBCEWithLogitsLoss': ['mmocr.models.common.losses.bce_loss'],
+    'MaskedBalancedBCELoss': ['mmocr.models.common.losses.bce_loss'],
+    'MaskedBalancedBCEWithLogitsLoss': ['mmocr.models.common.losses.bce_loss'],
+    'MaskedDiceLoss': ['mmocr.models.common.losses.dice_loss'],
+    'MaskedSmoothL1Loss': ['mmocr.models.common.losses.l1_loss'],
+    'MaskedSquareDiceLoss': ['mmocr.models.common.losses.dice_loss'],
+    'MasterDecoder': ['mmocr.models.textrecog.decoders.master_decoder'],
+    'Maxpool2d': ['mmocr.models.textrecog.plugins.common'],
+    'MiniVGG': ['mmocr.models.textrecog.backbones.mini_vgg'],
+    'MobileNetV2': ['mmocr.models.textrecog.backbones.mobilenet_v2'],
+    'MultiHeadAttention': ['mmocr.models.common.modules.transformer_module'],
+    'NRTR': ['mmocr.models.textrecog.recognizers.nrtr'],
+    'NRTRDecoder': ['mmocr.models.textrecog.decoders.nrtr_decoder'],
+    'NRTREncoder': ['mmocr.models.textrecog.encoders.nrtr_encoder'],
+    'NRTRModalityTransform': ['mmocr.models.textrecog.backbones.nrtr_modality_transformer'],
+    'OCRDataset': ['mmocr.datasets.ocr_dataset'],
+    'PANHead': ['mmocr.models.textdet.heads.pan_head'],
+    'PANModuleLoss': ['mmocr.models.textdet.module_losses.pan_module_loss'],
+    'PANPostprocessor': ['mmocr.models.textdet.postprocessors.pan_postprocessor'],
+    'PANet': ['mmocr.models.textdet.detectors.panet'],
+    'PSEHead': ['mmocr.models.textdet.heads.pse_head'],
+    'PSEModuleLoss': ['mmocr.models.textdet.module_losses.pse_module_loss'],
+    'PSENet': ['mmocr.models.textdet.detectors.psenet'],
+    'PSEPostprocessor': ['mmocr.models.textdet.postprocessors.pse_postprocessor'],
+    'PackKIEInputs': ['mmocr.datasets.transforms.formatting'],
+    'PackTextDetInputs': ['mmocr.datasets.transforms.formatting'],
+    'PackTextRecogInputs': ['mmocr.datasets.transforms.formatting'],
+    'PadToWidth': ['mmocr.datasets.transforms.textrecog_transforms'],
+    'ParallelSARDecoder': ['mmocr.models.textrecog.decoders.sar_decoder'],
+    'ParallelSARDecoderWithBS': ['mmocr.models.textrecog.decoders.sar_decoder_with_bs'],
+    'PositionAttentionDecoder': ['mmocr.models.textrecog.decoders.position_attention_decoder'],
+    'PositionAwareLayer': ['mmocr.models.textrecog.layers.position_aware_layer'],
+    'PositionalEncoding': ['mmocr.models.common.modules.transformer_module'],
+    'PositionwiseFeedForward': ['mmocr.models.common.modules.transformer_module'],
+    'PyramidRescale': ['mmocr.datasets.transforms.textrecog_transforms'],
+    'RandomCrop': ['mmocr.datasets.transforms.ocr_transforms'],
+    'RandomFlip': ['mmocr.datasets.transforms.textdet_transforms'],
+    'RandomRotate': ['mmocr.datasets.transforms.ocr_transforms'],
+    'RecogLMDBDataset': ['mmocr.datasets.recog_lmdb_dataset'],
+    'RecogTextDataset': ['mmocr.datasets.recog_text_dataset'],
+    'RemoveIgnored': ['mmocr.datasets.transforms.ocr_transforms'],
+    'ResNet': ['mmocr.models.textrecog.backbones.resnet'],
+    'ResNet31OCR': ['mmocr.models.textrecog.backbones.resnet31_ocr'],
+    'ResNetABI': ['mmocr.models.textrecog.backbones.resnet_abi'],
+    'RescaleToHeight': ['mmocr.datasets.transforms.textrecog_transforms'],
+    'Resize': ['mmocr.datasets.transforms.ocr_transforms'],
+    'ReversePixels': ['mmocr.datasets.transforms.textrecog_transforms'],
+    'RobustScanner': ['mmocr.models.textrecog.recognizers.robust_scanner'],
+    'RobustScannerFuser': ['mmocr.models.textrecog.decoders.robust_scanner_fuser'],
+    'RobustScannerFusionLayer': ['mmocr.models.textrecog.layers.robust_scanner_fusion_layer'],
+    'SAREncoder': ['mmocr.models.textrecog.encoders.sar_encoder'],
+    'SARNet': ['mmocr.models.textrecog.recognizers.sar'],
+    'SATRN': ['mmocr.models.textrecog.recognizers.satrn'],
+    'SATRNEncoder': ['mmocr.models.textrecog.encoders.satrn_encoder'],
+    'SATRNEncoderLayer': ['mmocr.models.textrecog.layers.satrn_layers'],
+    'SDMGR': ['mmocr.models.kie.extractors.sdmgr'],
+    'SDMGRHead': ['mmocr.models.kie.heads.sdmgr_head'],
+    'SDMGRModuleLoss': ['mmocr.models.kie.module_losses.sdmgr_module_loss'],
+    'SDMGRPostProcessor': ['mmocr.models.kie.postprocessors.sdmgr_postprocessor'],
+    'STN': ['mmocr.models.textrecog.preprocessors.tps_preprocessor'],
+    'SVTR': ['mmocr.models.textrecog.recognizers.svtr'],
+    'SVTRDecoder': ['mmocr.models.textrecog.decoders.svtr_decoder'],
+    'SVTREncoder': ['mmocr.models.textrecog.encoders.svtr_encoder'],
+    'ScaledDotProductAttention': ['mmocr.models.common.modules.transformer_module'],
+    'SegBasedModuleLoss': ['mmocr.models.textdet.module_losses.seg_based_module_loss'],
+    'SequenceAttentionDecoder': ['mmocr.models.textrecog.decoders.sequence_attention_decoder'],
+    'SequentialSARDecoder': ['mmocr.models.textrecog.decoders.sar_decoder'],
+    'ShallowCNN': ['mmocr.models.textrecog.backbones.shallow_cnn'],
+    'ShortScaleAspectJitter': ['mmocr.datasets.transforms.textdet_transforms'],
+    'SingleStageTextDetector': ['mmocr.models.textdet.detectors.single_stage_text_detector'],
+    'SmoothL1Loss': ['mmocr.models.common.losses.l1_loss'],
+    'SourceImagePad': ['mmocr.datasets.transforms.textdet_transforms'],
+    'TFDecoderLayer': ['mmocr.models.common.layers.transformer_layers'],
+    'TFEncoderLayer': ['mmocr.models.common.layers.transformer_layers'],
+    'TPStransform': ['mmocr.models.textrecog.preprocessors.tps_preprocessor'],
+    'TextDetDataPreprocessor': ['mmocr.models.textdet.data_preprocessors.data_preprocessor'],
+    'TextDetRandomCrop': ['mmocr.datasets.transforms.textdet_transforms'],
+    'TextDetRandomCropFlip': ['mmocr.datasets.transforms.textdet_transforms'],
+    'TextRecogDataPreprocessor': ['mmocr.models.textrecog.data_preprocessors.data_preprocessor'],
+    'TextRecogGeneralAug': ['mmocr.datasets.transforms.textrecog_transforms'],
+    'TextSnake': ['mmocr.models.textdet.detectors.textsnake'],
+    'TextSnakeHead': ['mmocr.models.textdet.heads.textsnake_head'],
+    'TextSnakeModuleLoss': ['mmocr.models.textdet.module_losses.textsnake_module_loss'],
+    'TextSnakePostprocessor': ['mmocr.models.textdet.postprocessors.textsnake_postprocessor'],
+    'TorchVisionWrapper': ['mmocr.datasets.transforms.wrappers'],
+    'UNet': ['mmocr.models.common.backbones.unet'],
+    'WildReceiptDataset': ['mmocr.datasets.wildreceipt_dataset'],
+}
+# yapf: enable
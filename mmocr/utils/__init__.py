@@ -10,17 +10,23 @@ from .data_converter_utils import dump_ocr_data, recog_anno_to_imginfo
 from .fileio import (check_integrity, get_md5, is_archive, list_files,
                      list_from_file, list_to_file)
 from .img_utils import crop_img, warp_img
+from .lazy_import import import_package, lazy_package
 from .mask_utils import fill_hole
+from .model_cache import (get_cache_dir, load_checkpoint_mmap, load_config,
+                          load_metafile_index, skip_init)
 from .parsers import LineJsonParser, LineStrParser
 from .point_utils import point_distance, points_center
 from .polygon_utils import (boundary_iou, crop_polygon, is_poly_inside_rect,
                             offset_polygon, poly2bbox, poly2shapely,
                             poly_intersection, poly_iou, poly_make_valid,
-                            poly_union, polys2shapely, rescale_polygon,
-                            rescale_polygons, shapely2poly, sort_points,
-                            sort_vertex, sort_vertex8)
+                            poly_nms, poly_union, polys2shapely,
+                            rescale_polygon, rescale_polygons, shapely2poly,
+                            sort_points, sort_vertex, sort_vertex8)
 from .processing import track_parallel_progress_multi_args
-from .setup_env import register_all_modules
+from .profiler import InferenceProfiler, get_active_profiler, profile_span
+from .quantization import quantize_dynamic, quantize_static
+from .setup_env import (collect_export_manifest, collect_registry_manifest,
+                        register_all_modules)
 from .string_utils import StringStripper
 from .transform_utils import remove_pipeline_elements
 from .typing_utils import (ColorType, ConfigType, DetSampleList,
@@ -38,9 +44,9 @@ __all__ = [
     'bezier2polygon', 'sort_points', 'dump_ocr_data', 'recog_anno_to_imginfo',
     'rescale_polygons', 'rescale_polygon', 'rescale_bbox', 'rescale_bboxes',
     'bbox2poly', 'crop_polygon', 'is_poly_inside_rect', 'poly2bbox',
-    'poly_intersection', 'poly_iou', 'poly_make_valid', 'poly_union',
-    'poly2shapely', 'polys2shapely', 'register_all_modules', 'offset_polygon',
-    'sort_vertex8', 'sort_vertex', 'bbox_center_distance',
+    'poly_intersection', 'poly_iou', 'poly_make_valid', 'poly_nms',
+    'poly_union', 'poly2shapely', 'polys2shapely', 'register_all_modules',
+    'offset_polygon', 'sort_vertex8', 'sort_vertex', 'bbox_center_distance',
     'bbox_diag_distance', 'boundary_iou', 'point_distance', 'points_center',
     'fill_hole', 'LineJsonParser', 'LineStrParser', 'shapely2poly', 'crop_img',
     'warp_img', 'ConfigType', 'DetSampleList', 'RecForwardResults',
@@ -50,5 +56,9 @@ __all__ = [
     'is_archive', 'check_integrity', 'list_files', 'get_md5', 'InstanceList',
     'LabelList', 'OptInstanceList', 'OptLabelList', 'RangeType',
     'remove_pipeline_elements', 'bezier2poly', 'poly2bezier',
-    'track_parallel_progress_multi_args'
+    'track_parallel_progress_multi_args', 'InferenceProfiler',
+    'get_active_profiler', 'profile_span', 'quantize_dynamic',
+    'quantize_static', 'lazy_package', 'import_package',
+    'collect_registry_manifest', 'collect_export_manifest', 'get_cache_dir',
+    'load_config', 'load_metafile_index', 'load_checkpoint_mmap', 'skip_init'
 ]
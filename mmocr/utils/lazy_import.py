@@ -0,0 +1,83 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Callable, Dict, Sequence
+
+from mmocr.registry_manifest import EXPORT_MANIFEST
+
+# The subpackages of the packages made lazy by ``lazy_package``
+_LAZY_PACKAGES: Dict[str, Sequence[str]] = {}
+
+
+def lazy_package(name: str, submodules: Sequence[str]) -> Callable:
+    """Make a package import its subpackages when a name exported by them is
+    first accessed, instead of star-importing them all.
+
+    The subpackage defining a name is found with the export manifest in
+    :mod:`mmocr.registry_manifest`. The names missing from it, e.g. if it is
+    outdated, are looked for by importing the subpackages in turn. Accessing
+    ``__all__``, e.g. with a star import, imports all the subpackages.
+
+    Args:
+        name (str): The name of the package.
+        submodules (list[str]): The subpackages whose names are exported by
+            the package.
+
+    Returns:
+        callable: The ``__getattr__`` of the package.
+
+    Example:
+        >>> # in mmocr/models/__init__.py
+        >>> __getattr__ = lazy_package(
+        ...     __name__, ['common', 'kie', 'textdet', 'textrecog'])
+    """
+    _LAZY_PACKAGES[name] = submodules
+
+    def __getattr__(attr: str) -> Any:
+        package = sys.modules[name]
+        if attr == '__all__':
+            names = []
+            for submodule in submodules:
+                module = import_module(f'{name}.{submodule}')
+                names.extend(
+                    getattr(module, '__all__', None) or
+                    [key for key in vars(module) if not key.startswith('_')])
+            package.__all__ = names
+            return names
+        if attr.startswith('_'):
+            raise AttributeError(f'module {name!r} has no attribute {attr!r}')
+        if attr in submodules:
+            return import_module(f'{name}.{attr}')
+
+        prefix = f'{name}.'
+        candidates = [
+            module[len(prefix):].split('.')[0]
+            for module in EXPORT_MANIFEST.get(attr, [])
+            if module.startswith(prefix)
+        ]
+        for submodule in candidates + list(submodules):
+            module = import_module(f'{name}.{submodule}')
+            if hasattr(module, attr):
+                value = getattr(module, attr)
+                setattr(package, attr, value)
+                return value
+        raise AttributeError(f'module {name!r} has no attribute {attr!r}')
+
+    return __getattr__
+
+
+def import_package(name: str) -> ModuleType:
+    """Import a package and all the subpackages of the lazy packages in it,
+    which registers all the modules they define.
+
+    Args:
+        name (str): The name of the package.
+
+    Returns:
+        ModuleType: The package.
+    """
+    package = import_module(name)
+    for submodule in _LAZY_PACKAGES.get(name, []):
+        import_package(f'{name}.{submodule}')
+    return package
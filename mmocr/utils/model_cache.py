@@ -0,0 +1,267 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import contextlib
+import hashlib
+import os
+import os.path as osp
+import pickle
+import re
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import torch
+import torch.nn as nn
+from mmengine.config import Config
+from mmengine.fileio import load
+from mmengine.utils import import_modules_from_strings
+
+# The in-place initializers of torch.nn.init, which the layers of torch,
+# mmcv and mmengine call to initialize their parameters
+INIT_FUNCTIONS = ('uniform_', 'normal_', 'trunc_normal_', 'constant_', 'ones_',
+                  'zeros_', 'eye_', 'dirac_', 'xavier_uniform_',
+                  'xavier_normal_', 'kaiming_uniform_', 'kaiming_normal_',
+                  'orthogonal_', 'sparse_')
+
+# The environment variables substituted in configs, e.g. "{{$ROOT:data}}"
+ENV_VARIABLE_PATTERN = re.compile(r'\{\{[\'"]?\s*\$(\w+)')
+
+# Bumped when the format of the cached files changes
+CACHE_VERSION = 1
+
+
+def get_cache_dir() -> Optional[str]:
+    """Get the directory caching the resolved configs and metafile indexes.
+
+    It is ``$MMOCR_CACHE_DIR`` if set, and ``~/.cache/mmocr`` otherwise.
+    Setting ``MMOCR_CACHE_DIR`` to an empty string disables the cache.
+
+    Returns:
+        str, optional: The cache directory, or None if disabled.
+    """
+    cache_dir = os.environ.get('MMOCR_CACHE_DIR')
+    if cache_dir is None:
+        cache_dir = osp.join(
+            os.environ.get('XDG_CACHE_HOME', osp.expanduser('~/.cache')),
+            'mmocr')
+    return cache_dir or None
+
+
+def _stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_cache(kind: str, key: str) -> Optional[dict]:
+    """Read a cached entry, which is None if missing or unreadable."""
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    path = osp.join(cache_dir, kind, f'{key}.pkl')
+    try:
+        with open(path, 'rb') as f:
+            entry = pickle.load(f)
+    except Exception:
+        return None
+    if not isinstance(entry, dict) or entry.get('version') != CACHE_VERSION:
+        return None
+    return entry
+
+
+def _write_cache(kind: str, key: str, entry: dict) -> None:
+    """Write an entry atomically, so that concurrent processes never read a
+    partial file. The cache is best effort and errors are ignored."""
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return
+    path = osp.join(cache_dir, kind, f'{key}.pkl')
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(osp.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(dict(entry, version=CACHE_VERSION), f)
+        os.replace(tmp_path, path)
+    except Exception:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
+def _files_unchanged(files: Dict[str, Tuple[int, int]]) -> bool:
+    try:
+        return all(_stat(path) == stat for path, stat in files.items())
+    except OSError:
+        return False
+
+
+def _cache_key(path: str) -> str:
+    return hashlib.sha1(osp.abspath(path).encode()).hexdigest()
+
+
+def _get_config_files(filename: str) -> Iterator[str]:
+    """Yield a config file and all the files it inherits from."""
+    yield filename
+    for base in Config._get_base_files(filename):
+        base_path, _ = Config._get_cfg_path(base, filename)
+        yield from _get_config_files(base_path)
+
+
+def load_config(filename: str) -> Config:
+    """Load a config file like :meth:`mmengine.Config.fromfile`, with the
+    resolved config cached.
+
+    Parsing a config executes it and all of its ``_base_`` files, which is
+    done once here. The cached config is used as long as none of these files
+    are modified and the environment variables it refers to are unchanged.
+    Configs in the lazy import format are not cached.
+
+    Args:
+        filename (str): Path to the config file.
+
+    Returns:
+        Config: The loaded config.
+    """
+    filename = osp.abspath(filename)
+    if Config._is_lazy_import(filename):
+        return Config.fromfile(filename)
+    key = _cache_key(filename)
+    entry = _read_cache('configs', key)
+    if entry is not None and _files_unchanged(entry['files']) and all(
+            os.environ.get(name) == value
+            for name, value in entry['env_variables'].items()):
+        cfg = entry['config']
+        if cfg.get('custom_imports', None):
+            import_modules_from_strings(**cfg['custom_imports'])
+        return cfg
+
+    cfg = Config.fromfile(filename)
+    files = {}
+    env_variables = {}
+    try:
+        for path in _get_config_files(filename):
+            files[path] = _stat(path)
+            with open(path, encoding='utf-8') as f:
+                for name in ENV_VARIABLE_PATTERN.findall(f.read()):
+                    env_variables[name] = os.environ.get(name)
+    except Exception:
+        # e.g. the bases of the config are in a package that has moved
+        return cfg
+    _write_cache('configs', key,
+                 dict(files=files, env_variables=env_variables, config=cfg))
+    return cfg
+
+
+def load_metafile_index(repo_dir: str) -> Dict[str, Tuple[str, str]]:
+    """Load the index of the models defined in the metafiles of a repo, with
+    the index cached.
+
+    Args:
+        repo_dir (str): The directory of the repo or its ``.mim`` directory,
+            holding ``model-index.yml``.
+
+    Returns:
+        dict: The path to the config and the weights of each model, mapped
+        from its lower-cased name and aliases.
+    """
+    index_path = osp.join(repo_dir, 'model-index.yml')
+    key = _cache_key(index_path)
+    entry = _read_cache('metafiles', key)
+    if entry is not None and _files_unchanged(entry['files']):
+        return entry['index']
+
+    files = {index_path: _stat(index_path)}
+    index: Dict[str, Tuple[str, str]] = {}
+    for meta_path in load(index_path)['Import']:
+        meta_path = osp.join(repo_dir, meta_path)
+        files[meta_path] = _stat(meta_path)
+        for model_cfg in load(meta_path)['Models']:
+            aliases = model_cfg.get('Alias', [])
+            if isinstance(aliases, str):
+                aliases = [aliases]
+            weights = model_cfg['Weights']
+            weights = weights[0] if isinstance(weights, list) else weights
+            config = osp.join(repo_dir, model_cfg['Config'])
+            for name in [model_cfg['Name']] + list(aliases):
+                # The first model of a name wins, as in mmengine
+                index.setdefault(name.lower(), (config, weights))
+    _write_cache('metafiles', key, dict(files=files, index=index))
+    return index
+
+
+def get_local_checkpoint(weights: str) -> Optional[str]:
+    """Get the local file of a checkpoint.
+
+    Args:
+        weights (str): A path, or a URL of a checkpoint which may have been
+            downloaded to the checkpoint directory of ``torch.hub``.
+
+    Returns:
+        str, optional: The path to the local checkpoint, or None if it is not
+        available locally.
+    """
+    if weights.startswith(('http://', 'https://')):
+        weights = osp.join(torch.hub.get_dir(), 'checkpoints',
+                           osp.basename(urlparse(weights).path))
+    return weights if osp.isfile(weights) else None
+
+
+def load_checkpoint_mmap(filename: str) -> Optional[dict]:
+    """Load a local checkpoint to CPU with memory mapping.
+
+    The tensors are backed by the file and only read when used, e.g. when
+    copied into the model, instead of being read into memory first.
+
+    Args:
+        filename (str): Path to the checkpoint.
+
+    Returns:
+        dict, optional: The checkpoint, or None if it is not in the zip
+        format of ``torch.save``, which memory mapping requires.
+    """
+    try:
+        return torch.load(filename, map_location='cpu', mmap=True)
+    except (RuntimeError, TypeError, pickle.UnpicklingError):
+        # Legacy checkpoints or torch<2.1, whose torch.load has no mmap
+        return None
+
+
+def checkpoint_covers(model: nn.Module, checkpoint: dict) -> bool:
+    """Whether a checkpoint has the values of all the parameters and
+    persistent buffers of a model.
+
+    Args:
+        model (nn.Module): The model.
+        checkpoint (dict): The checkpoint, with its weights in
+            ``state_dict`` or at its root.
+
+    Returns:
+        bool: Whether loading the checkpoint overwrites the whole state of
+        the model.
+    """
+    state_dict = checkpoint.get('state_dict', checkpoint)
+    keys = {re.sub(r'^module\.', '', key) for key in state_dict}
+    return all(key in keys for key in model.state_dict())
+
+
+@contextlib.contextmanager
+def skip_init() -> Iterator[None]:
+    """Skip the initialization of parameters by ``torch.nn.init`` in the
+    context, e.g. to build a model whose weights will be loaded from a
+    checkpoint.
+
+    The parameters of the layers built in the context are left
+    uninitialized. As it patches ``torch.nn.init``, it affects the other
+    threads building models at the same time.
+    """
+
+    def skip(tensor, *args, **kwargs):
+        return tensor
+
+    init_functions = {
+        name: getattr(nn.init, name)
+        for name in INIT_FUNCTIONS if hasattr(nn.init, name)
+    }
+    try:
+        for name in init_functions:
+            setattr(nn.init, name, skip)
+        yield
+    finally:
+        for name, function in init_functions.items():
+            setattr(nn.init, name, function)
@@ -298,6 +298,61 @@ def poly_iou(poly_a: Polygon,
     return area_inters / area_union if area_union != 0 else zero_division
 
 
+def poly_nms(polygons: Sequence[ArrayLike],
+             scores: ArrayLike,
+             threshold: float,
+             mode: str = 'iou') -> List[int]:
+    """Greedy non-maximum suppression over polygons, which may have different
+    numbers of vertices.
+
+    Args:
+        polygons (list[ArrayLike]): Polygons in shape (2k, ).
+        scores (ArrayLike): Scores of polygons in shape (N, ).
+        threshold (float): Polygons whose overlap with a kept polygon of
+            higher score exceeds the threshold are suppressed.
+        mode (str): How the overlap is measured. 'iou' for the intersection
+            over union, and 'iom' for the intersection over the area of the
+            smaller polygon, which also suppresses fragments contained in a
+            larger polygon. Defaults to 'iou'.
+
+    Returns:
+        list[int]: Indices of the kept polygons in descending order of
+        scores.
+    """
+    assert mode in ['iou', 'iom']
+    assert len(polygons) == len(scores)
+    if len(polygons) == 0:
+        return []
+    scores = np.array(scores, dtype=np.float32)
+    bboxes = np.stack([poly2bbox(polygon) for polygon in polygons])
+    polys = [poly_make_valid(poly2shapely(polygon)) for polygon in polygons]
+    areas = np.array([poly.area for poly in polys])
+
+    order = np.argsort(-scores, kind='stable')
+    suppressed = np.zeros(len(polygons), dtype=bool)
+    keep = []
+    for i in order:
+        if suppressed[i]:
+            continue
+        keep.append(int(i))
+        suppressed[i] = True
+        # Only polygons whose bboxes overlap can overlap
+        candidates = np.where(~suppressed
+                              & (bboxes[:, 0] < bboxes[i, 2])
+                              & (bboxes[:, 2] > bboxes[i, 0])
+                              & (bboxes[:, 1] < bboxes[i, 3])
+                              & (bboxes[:, 3] > bboxes[i, 1]))[0]
+        for j in candidates:
+            area_inters = poly_intersection(polys[i], polys[j], invalid_ret=0)
+            if mode == 'iou':
+                denominator = areas[i] + areas[j] - area_inters
+            else:
+                denominator = min(areas[i], areas[j])
+            if denominator > 0 and area_inters / denominator > threshold:
+                suppressed[j] = True
+    return keep
+
+
 def is_poly_inside_rect(poly: ArrayLike, rect: np.ndarray) -> bool:
     """Check if the polygon is inside the target region.
         Args:
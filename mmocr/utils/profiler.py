@@ -0,0 +1,233 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
+
+import torch
+import torch.nn as nn
+
+_active_profilers: List['InferenceProfiler'] = []
+_null_span = contextlib.nullcontext()
+
+
+def get_active_profiler() -> Optional['InferenceProfiler']:
+    """Get the innermost active :class:`InferenceProfiler`, if any."""
+    return _active_profilers[-1] if _active_profilers else None
+
+
+def profile_span(name: str, category: str = 'inference', **args):
+    """Record a span in the active :class:`InferenceProfiler`.
+
+    Without an active profiler, a shared no-op context manager is returned,
+    so instrumented code costs a single list lookup.
+
+    Args:
+        name (str): The name of the span.
+        category (str): The category of the span, e.g. ``'transform'`` or
+            ``'module'``. Defaults to ``'inference'``.
+        **args: Extra information attached to the span in the trace, e.g.
+            the batch index.
+
+    Example:
+        >>> with profile_span('crop', 'postprocess', num_crops=4):
+        ...     crops = [crop_img(img, box) for box in boxes]
+    """
+    if not _active_profilers:
+        return _null_span
+    return _active_profilers[-1].span(name, category, **args)
+
+
+class _ProfiledCallable:
+    """Proxy recording a span around each call of a non-module callable,
+    e.g. a postprocessor."""
+
+    def __init__(self, obj, name: str, profiler: 'InferenceProfiler'):
+        self._obj = obj
+        self._name = name
+        self._profiler = profiler
+
+    def __call__(self, *args, **kwargs):
+        with self._profiler.span(self._name, 'postprocessor'):
+            return self._obj(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._obj, name)
+
+
+class InferenceProfiler:
+    """Context-managed profiler of the inferencers.
+
+    While the profiler is active, the inferencers record spans for each
+    pipeline transform, collate, data preprocessor, top-level submodule of the
+    model (e.g. backbone, neck and head), postprocessor, visualization and
+    postprocess step, per batch and per image. The spans can be summarized in
+    a table or exported as a Chrome trace, which can be opened in
+    ``chrome://tracing`` or https://ui.perfetto.dev.
+
+    Args:
+        synchronize (bool): Whether to synchronize CUDA at the end of each
+            span. CUDA kernels are asynchronous, so the spans of the modules
+            are meaningless on GPU without it. Defaults to False.
+
+    Example:
+        >>> ocr = MMOCRInferencer(det='DBNet', rec='CRNN')
+        >>> with InferenceProfiler() as profiler:
+        ...     ocr('demo/demo_text_ocr.jpg')
+        >>> print(profiler.table())
+        >>> profiler.export_chrome_trace('trace.json')
+    """
+
+    def __init__(self, synchronize: bool = False) -> None:
+        self.synchronize = synchronize and torch.cuda.is_available()
+        self.events: List[Dict] = []
+        self._origin = time.perf_counter_ns()
+
+    def __enter__(self) -> 'InferenceProfiler':
+        _active_profilers.append(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        _active_profilers.remove(self)
+
+    def record(self, name: str, category: str, start: int, end: int,
+               **args) -> None:
+        """Record a span.
+
+        Args:
+            name (str): The name of the span.
+            category (str): The category of the span.
+            start (int): The start time from :func:`time.perf_counter_ns`.
+            end (int): The end time from :func:`time.perf_counter_ns`.
+            **args: Extra information attached to the span.
+        """
+        self.events.append(
+            dict(
+                name=name,
+                cat=category,
+                start=start - self._origin,
+                dur=end - start,
+                tid=threading.get_ident(),
+                args=args))
+
+    @contextlib.contextmanager
+    def span(self,
+             name: str,
+             category: str = 'inference',
+             **args) -> Iterator[None]:
+        """Record the time spent in the context as a span."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            if self.synchronize:
+                torch.cuda.synchronize()
+            self.record(name, category, start, time.perf_counter_ns(), **args)
+
+    @contextlib.contextmanager
+    def watch_model(self, model: nn.Module) -> Iterator[None]:
+        """Record spans for the top-level submodules of a model, e.g. the data
+        preprocessor, backbone, neck and head, and for the postprocessors of
+        these submodules.
+
+        Forward hooks are registered and the postprocessors are wrapped only
+        within the context, so the model is left untouched afterwards.
+        """
+        prefix = type(model).__name__
+        starts: Dict[int, List[int]] = defaultdict(list)
+        handles = []
+        wrapped = []
+
+        def pre_hook(module, inputs):
+            starts[id(module)].append(time.perf_counter_ns())
+
+        def make_hook(name):
+
+            def hook(module, inputs, outputs):
+                if self.synchronize:
+                    torch.cuda.synchronize()
+                self.record(name, 'module', starts[id(module)].pop(),
+                            time.perf_counter_ns())
+
+            return hook
+
+        for child_name, child in model.named_children():
+            name = f'{prefix}.{child_name}'
+            handles.append(child.register_forward_pre_hook(pre_hook))
+            handles.append(child.register_forward_hook(make_hook(name)))
+            postprocessor = getattr(child, 'postprocessor', None)
+            if postprocessor is not None and not isinstance(
+                    postprocessor, (nn.Module, _ProfiledCallable)):
+                child.postprocessor = _ProfiledCallable(
+                    postprocessor, f'{name}.postprocessor', self)
+                wrapped.append((child, postprocessor))
+        try:
+            yield
+        finally:
+            for handle in handles:
+                handle.remove()
+            for child, postprocessor in wrapped:
+                child.postprocessor = postprocessor
+
+    def summary(self) -> List[Dict]:
+        """Aggregate the spans by category and name.
+
+        Returns:
+            list[dict]: One row per span name, sorted by decreasing total
+            time, with the keys ``name``, ``category``, ``count``,
+            ``total_ms``, ``mean_ms`` and ``max_ms``.
+        """
+        groups = defaultdict(list)
+        for event in self.events:
+            groups[(event['cat'], event['name'])].append(event['dur'] / 1e6)
+        rows = [
+            dict(
+                name=name,
+                category=category,
+                count=len(durations),
+                total_ms=sum(durations),
+                mean_ms=sum(durations) / len(durations),
+                max_ms=max(durations))
+            for (category, name), durations in groups.items()
+        ]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def table(self) -> str:
+        """Format :meth:`summary` as a text table."""
+        rows = self.summary()
+        width = max([len(row['name']) for row in rows] + [4])
+        lines = [
+            f'{"name":<{width}}  {"category":<13}  {"count":>6}  '
+            f'{"total_ms":>10}  {"mean_ms":>10}  {"max_ms":>10}'
+        ]
+        for row in rows:
+            lines.append(f'{row["name"]:<{width}}  {row["category"]:<13}  '
+                         f'{row["count"]:>6}  {row["total_ms"]:>10.2f}  '
+                         f'{row["mean_ms"]:>10.2f}  {row["max_ms"]:>10.2f}')
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> Dict:
+        """Convert the spans to the Chrome trace event format."""
+        pid = os.getpid()
+        return dict(
+            traceEvents=[
+                dict(
+                    name=event['name'],
+                    cat=event['cat'],
+                    ph='X',
+                    ts=event['start'] / 1e3,
+                    dur=event['dur'] / 1e3,
+                    pid=pid,
+                    tid=event['tid'],
+                    args=event['args']) for event in self.events
+            ],
+            displayTimeUnit='ms')
+
+    def export_chrome_trace(self, path: str) -> None:
+        """Write the spans as a Chrome trace JSON file, which can be opened in
+        ``chrome://tracing`` or https://ui.perfetto.dev."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
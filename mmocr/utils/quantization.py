@@ -0,0 +1,98 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type
+
+import torch
+import torch.nn as nn
+
+DYNAMIC_QUANT_MODULES = (nn.Linear, nn.LSTM, nn.GRU)
+
+
+def _check_cpu(model: nn.Module) -> None:
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        if tensor.device.type != 'cpu':
+            raise ValueError('Quantized models only run on CPU, please move '
+                             'the model to CPU first')
+
+
+def quantize_dynamic(
+    model: nn.Module,
+    module_types: Sequence[Type[nn.Module]] = DYNAMIC_QUANT_MODULES
+) -> nn.Module:
+    """Apply dynamic int8 quantization to a model in place.
+
+    The weights of the given module types are quantized to int8 ahead of
+    time, and their activations are quantized on the fly at each call. It
+    suits the Linear and LSTM heavy recognizers, e.g. CRNN, SAR, NRTR and
+    SVTR, whose convolutions are left in fp32.
+
+    Args:
+        model (nn.Module): The model on CPU.
+        module_types (Sequence[type]): The module types to quantize.
+            Defaults to :data:`DYNAMIC_QUANT_MODULES`.
+
+    Returns:
+        nn.Module: The quantized model.
+    """
+    _check_cpu(model)
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(
+        model, set(module_types), dtype=torch.qint8, inplace=True)
+
+
+def quantize_static(model: nn.Module,
+                    calibrate: Callable[[], Any],
+                    submodule: str = 'backbone',
+                    backend: Optional[str] = None) -> nn.Module:
+    """Apply static post-training int8 quantization to a submodule of a model
+    in place.
+
+    The submodule, e.g. the ResNet backbone of DBNet, is symbolically traced
+    with ``torch.fx``, its convolutions are fused with the following
+    batch normalizations and activations, and the ranges of its activations
+    are calibrated by ``calibrate``, which should run the whole model on a
+    few representative images. The submodule is then replaced by its int8
+    version, which takes and returns fp32 tensors so that the rest of the
+    model is unchanged.
+
+    Args:
+        model (nn.Module): The model on CPU.
+        calibrate (Callable): A function running the model on calibration
+            data.
+        submodule (str): The name of the submodule to quantize, which must
+            be traceable by ``torch.fx``. Defaults to 'backbone'.
+        backend (str, optional): The quantized engine, e.g. 'x86', 'fbgemm'
+            or 'qnnpack'. Defaults to the current engine of PyTorch.
+
+    Returns:
+        nn.Module: The quantized model.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    _check_cpu(model)
+    model.eval()
+    if backend is None:
+        backend = torch.backends.quantized.engine
+    torch.backends.quantized.engine = backend
+    module = getattr(model, submodule)
+
+    # The inputs of the submodule are recorded during the calibration, as
+    # tracing requires example inputs and happens before the observation
+    calib_inputs: List[Tuple] = []
+    handle = module.register_forward_pre_hook(
+        lambda _, inputs: calib_inputs.append(inputs))
+    try:
+        with torch.no_grad():
+            calibrate()
+    finally:
+        handle.remove()
+    if not calib_inputs:
+        raise ValueError(f'The calibration did not run model.{submodule}')
+
+    prepared = prepare_fx(module, get_default_qconfig_mapping(backend),
+                          calib_inputs[0])
+    with torch.no_grad():
+        for inputs in calib_inputs:
+            prepared(*inputs)
+    setattr(model, submodule, convert_fx(prepared))
+    return model
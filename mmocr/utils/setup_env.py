@@ -1,8 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import datetime
 import warnings
+from importlib import import_module
+from typing import Dict, List
 
-from mmengine.registry import DefaultScope
+from mmengine.registry import DefaultScope, Registry
+
+from .lazy_import import _LAZY_PACKAGES, import_package
 
 
 def register_all_modules(init_default_scope: bool = True) -> None:
@@ -16,13 +20,9 @@ def register_all_modules(init_default_scope: bool = True) -> None:
             to https://github.com/open-mmlab/mmengine/blob/main/docs/en/tutorials/registry.md
             Defaults to True.
     """  # noqa
-    import mmocr.apis  # noqa: F401,F403
-    import mmocr.datasets  # noqa: F401,F403
-    import mmocr.engine  # noqa: F401,F403
-    import mmocr.evaluation  # noqa: F401,F403
-    import mmocr.models  # noqa: F401,F403
-    import mmocr.structures  # noqa: F401,F403
-    import mmocr.visualization  # noqa: F401,F403
+    for package in ('apis', 'datasets', 'engine', 'evaluation', 'models',
+                    'structures', 'visualization'):
+        import_package(f'mmocr.{package}')
     if init_default_scope:
         never_created = DefaultScope.get_current_instance() is None \
                         or not DefaultScope.check_instance_created('mmocr')
@@ -39,3 +39,67 @@ def register_all_modules(init_default_scope: bool = True) -> None:
             # avoid name conflict
             new_instance_name = f'mmocr-{datetime.datetime.now()}'
             DefaultScope.get_instance(new_instance_name, scope_name='mmocr')
+
+
+def collect_registry_manifest() -> Dict[str, Dict[str, str]]:
+    """Collect the modules defining the types registered in the registries of
+    mmocr, which are imported on demand by the registries.
+
+    The manifest is saved to ``mmocr/registry_manifest.py`` by
+    ``.dev_scripts/update_registry_manifest.py``.
+
+    Returns:
+        dict: The modules by type name, for each registry name.
+    """
+    import mmocr.registry
+    register_all_modules(False)
+    manifest = {}
+    for registry in vars(mmocr.registry).values():
+        if not isinstance(registry, Registry) or registry.scope != 'mmocr':
+            continue
+        # Some locations, e.g. those of the dataset preparers, are not
+        # imported by ``register_all_modules``
+        registry.import_from_location()
+        # Skip the modules registered outside mmocr, e.g. in the tests
+        modules = {
+            name: module.__module__
+            for name, module in sorted(registry.module_dict.items())
+            if module.__module__.startswith('mmocr.')
+        }
+        if modules:
+            manifest[registry.name] = modules
+    return manifest
+
+
+def collect_export_manifest() -> Dict[str, List[str]]:
+    """Collect the modules defining the names exported by the lazy packages
+    of mmocr, e.g. ``mmocr.models``, which are imported on demand by the
+    packages.
+
+    The manifest is saved to ``mmocr/registry_manifest.py`` by
+    ``.dev_scripts/update_registry_manifest.py``.
+
+    Returns:
+        dict: The modules defining each name, as there can be several of them
+        in different packages.
+    """
+    register_all_modules(False)
+    manifest = {}
+    for package_name, submodules in sorted(_LAZY_PACKAGES.items()):
+        package = import_module(package_name)
+        # The names of the subpackages are collected from their modules
+        module_names = [
+            f'{package_name}.{submodule}' for submodule in submodules
+            if f'{package_name}.{submodule}' not in _LAZY_PACKAGES
+        ]
+        if not module_names:
+            continue
+        for name in sorted(set(package.__all__)):
+            module_name = getattr(getattr(package, name), '__module__', None)
+            if module_name not in module_names:
+                # Re-exported from another package
+                module_name = next(
+                    candidate for candidate in module_names
+                    if name in vars(import_module(candidate)))
+            manifest.setdefault(name, []).append(module_name)
+    return dict(sorted(manifest.items()))
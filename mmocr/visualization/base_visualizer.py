@@ -1,14 +1,16 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import math
-from typing import List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
 
 import numpy as np
 import torch
-from matplotlib.font_manager import FontProperties
 from mmengine.visualization import Visualizer
 
 from mmocr.registry import VISUALIZERS
 
+if TYPE_CHECKING:
+    from matplotlib.font_manager import FontProperties
+
 
 @VISUALIZERS.register_module()
 class BaseLocalVisualizer(Visualizer):
@@ -66,14 +68,16 @@ class BaseLocalVisualizer(Visualizer):
     def __init__(self,
                  name: str = 'visualizer',
                  font_families: Union[str, List[str]] = 'sans-serif',
-                 font_properties: Optional[Union[str, FontProperties]] = None,
+                 font_properties: Union[str, 'FontProperties', None] = None,
                  **kwargs) -> None:
         super().__init__(name=name, **kwargs)
         self.font_families = font_families
         self.font_properties = self._set_font_properties(font_properties)
 
     def _set_font_properties(self,
-                             fp: Optional[Union[str, FontProperties]] = None):
+                             fp: Union[str, 'FontProperties', None] = None):
+        from matplotlib.font_manager import FontProperties
+
         if fp is None:
             return None
         elif isinstance(fp, str):
@@ -94,7 +98,7 @@ class BaseLocalVisualizer(Visualizer):
         font_size: Union[int, float] = 10,
         auto_font_size: bool = False,
         font_families: Union[str, List[str]] = 'sans-serif',
-        font_properties: Optional[Union[str, FontProperties]] = None
+        font_properties: Optional[Union[str, 'FontProperties']] = None
     ) -> np.ndarray:
         """Draw labels on image.
 
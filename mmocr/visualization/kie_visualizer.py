@@ -5,8 +5,6 @@ from typing import Dict, List, Optional, Sequence, Union
 import mmcv
 import numpy as np
 import torch
-from matplotlib.collections import PatchCollection
-from matplotlib.patches import FancyArrow
 from mmengine.visualization import Visualizer
 from mmengine.visualization.utils import (check_type, check_type_and_length,
                                           color_val_matplotlib, tensor2ndarray,
@@ -382,6 +380,9 @@ class KIELocalVisualizer(BaseLocalVisualizer):
             warnings.warn(
                 'Warning: The line is out of bounds,'
                 ' the drawn line may not be in the image', UserWarning)
+        from matplotlib.collections import PatchCollection
+        from matplotlib.patches import FancyArrow
+
         arrows = []
         for i in range(number_arrow):
             arrows.append(
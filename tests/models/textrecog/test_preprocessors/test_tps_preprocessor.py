@@ -15,6 +15,24 @@ class TestTPS(TestCase):
         transformed_image = tps(image, control_points)
         self.assertEqual(transformed_image.shape, (2, 3, 32, 100))
 
+    def test_variable_width(self):
+        tps = TPStransform(output_image_size=(32, None), num_control_points=20)
+        control_points = torch.rand(2, 20, 2)
+        for width, output_width in [(64, 32), (200, 100), (1000, 500)]:
+            image = torch.rand(2, 3, 64, width)
+            self.assertEqual(
+                tps(image, control_points).shape, (2, 3, 32, output_width))
+
+        # Same as a fixed output size of the width
+        image = torch.rand(2, 3, 64, 200)
+        fixed_tps = TPStransform(
+            output_image_size=(32, 100), num_control_points=20)
+        self.assertTrue(
+            torch.allclose(
+                tps(image, control_points), fixed_tps(image, control_points)))
+        # The coordinates of a fixed width in the checkpoints are ignored
+        tps.load_state_dict(fixed_tps.state_dict())
+
     def test_stn(self):
         stn = STN(
             in_channels=3,
@@ -24,3 +42,12 @@ class TestTPS(TestCase):
         image = torch.rand(2, 3, 64, 256)
         transformed_image = stn(image)
         self.assertEqual(transformed_image.shape, (2, 3, 32, 100))
+
+        stn = STN(
+            in_channels=3,
+            resized_image_size=(32, 64),
+            output_image_size=(32, None),
+            num_control_points=20)
+        image = torch.rand(2, 3, 64, 400)
+        transformed_image = stn(image)
+        self.assertEqual(transformed_image.shape, (2, 3, 32, 200))
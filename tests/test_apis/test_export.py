@@ -0,0 +1,106 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import importlib.util
+import os.path as osp
+import tempfile
+from unittest import TestCase, mock, skipUnless
+
+import numpy as np
+
+from mmocr.apis import (ExportedInferencer, KIEInferencer, TextDetInferencer,
+                        TextRecInferencer, export_model)
+
+
+class TestExport(TestCase):
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def setUp(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        self.det_inferencer = TextDetInferencer(
+            'dbnet_resnet18_fpnc_1200e_icdar2015', device='cpu')
+        self.rec_inferencer = TextRecInferencer('CRNN', device='cpu')
+        self.det_imgs = [
+            'tests/data/det_toy_dataset/imgs/test/img_1.jpg',
+            'tests/data/det_toy_dataset/imgs/test/img_2.jpg'
+        ]
+        rec_dir = 'tests/data/rec_toy_dataset/imgs'
+        self.rec_imgs = [
+            osp.join(rec_dir, name)
+            for name in ['1036169.jpg', '1058891.jpg', '1058892.jpg']
+        ]
+
+    def assert_det_equal(self, results, expected):
+        self.assertEqual(len(results), len(expected))
+        for result, expected_result in zip(results, expected):
+            self.assertEqual(
+                len(result['polygons']), len(expected_result['polygons']))
+            for polygon, expected_polygon in zip(result['polygons'],
+                                                 expected_result['polygons']):
+                self.assertTrue(np.allclose(polygon, expected_polygon))
+            self.assertTrue(
+                np.allclose(result['scores'], expected_result['scores']))
+
+    def assert_rec_exported(self, exported):
+        self.assert_rec_equal(
+            exported(self.rec_imgs, batch_size=3)['predictions'],
+            self.rec_inferencer(self.rec_imgs, batch_size=3)['predictions'])
+        self.assert_rec_equal(
+            exported(self.rec_imgs[::-1], batch_size=2)['predictions'],
+            self.rec_inferencer(self.rec_imgs[::-1])['predictions'])
+
+    def assert_rec_equal(self, results, expected):
+        self.assertEqual(len(results), len(expected))
+        for result, expected_result in zip(results, expected):
+            self.assertEqual(result['text'], expected_result['text'])
+            # ONNX Runtime rounds the floats differently
+            self.assertAlmostEqual(
+                result['scores'], expected_result['scores'], places=5)
+
+    def test_torchscript(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_model(
+                self.det_inferencer, tmp_dir, example_shape=(320, 480))
+            self.assertTrue(osp.exists(osp.join(tmp_dir, 'model.pt')))
+            exported = ExportedInferencer(tmp_dir)
+            # Another shape than the traced one
+            self.assert_det_equal(
+                exported(self.det_imgs)['predictions'],
+                self.det_inferencer(self.det_imgs)['predictions'])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_model(self.rec_inferencer, tmp_dir)
+            exported = ExportedInferencer(tmp_dir)
+            self.assert_rec_exported(exported)
+            img = np.random.randint(0, 255, (40, 200, 3), dtype=np.uint8)
+            data_samples = exported(
+                img, return_datasamples=True)['predictions']
+            self.assertEqual(
+                data_samples[0].pred_text.item,
+                self.rec_inferencer(img)['predictions'][0]['text'])
+
+    @skipUnless(
+        importlib.util.find_spec('onnxruntime'), 'onnxruntime is required')
+    def test_onnx(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_model(self.rec_inferencer, tmp_dir, backend='onnx')
+            self.assertTrue(osp.exists(osp.join(tmp_dir, 'model.onnx')))
+            exported = ExportedInferencer(tmp_dir)
+            self.assert_rec_exported(exported)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_model(
+                self.det_inferencer, tmp_dir, backend='onnx', dynamic=False)
+            exported = ExportedInferencer(tmp_dir)
+            self.assertTrue(exported._static_batch)
+            img = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
+            self.assert_det_equal(
+                exported([img, img], batch_size=2)['predictions'],
+                self.det_inferencer([img, img])['predictions'])
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def test_invalid(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        with self.assertRaises(ValueError):
+            export_model(self.rec_inferencer, '', backend='tensorrt')
+        with self.assertRaises(TypeError):
+            export_model(
+                KIEInferencer('SDMGR'), tempfile.gettempdir(), 'torchscript')
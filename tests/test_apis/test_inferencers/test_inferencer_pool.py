@@ -0,0 +1,68 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+from unittest import TestCase, mock
+
+import torch
+
+from mmocr.apis.inferencers import (InferencerPool, MMOCRInferencer,
+                                    TextRecInferencer)
+from mmocr.apis.inferencers.inferencer_pool import (_get_models,
+                                                    _shared_inferencers)
+
+
+class TestInferencerPool(TestCase):
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def setUp(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        self.inferencer = TextRecInferencer('CRNN', device='cpu')
+        img_dir = 'tests/data/rec_toy_dataset/imgs'
+        self.img_paths = [
+            osp.join(img_dir, name) for name in
+            ['1036169.jpg', '1058891.jpg', '1058892.jpg', '1190237.jpg']
+        ]
+
+    def test_call(self):
+        # Random weights make the results depend on the batch padding, so
+        # compare with the same batches
+        expected = []
+        for i in range(0, 4, 2):
+            expected += self.inferencer(
+                self.img_paths[i:i + 2], batch_size=2)['predictions']
+        with InferencerPool(self.inferencer, num_workers=2) as pool:
+            self.assertIn(id(self.inferencer), _shared_inferencers)
+            results = pool(self.img_paths, batch_size=2)
+            self.assertEqual(results['visualization'], [])
+            self.assertEqual(len(results['predictions']), 4)
+            for result, expected_result in zip(results['predictions'],
+                                               expected):
+                self.assertEqual(result['text'], expected_result['text'])
+                self.assertAlmostEqual(result['scores'],
+                                       expected_result['scores'])
+        self.assertNotIn(id(self.inferencer), _shared_inferencers)
+        for param in self.inferencer.model.parameters():
+            self.assertTrue(param.is_shared())
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def test_get_models(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        inferencer = MMOCRInferencer(
+            det='dbnet_resnet18_fpnc_1200e_icdar2015', rec='CRNN')
+        models = _get_models(inferencer)
+        self.assertEqual(len(models), 2)
+        self.assertIs(models[0], inferencer.textdet_inferencer.model)
+        self.assertIs(models[1], inferencer.textrec_inferencer.model)
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(ValueError, 'Cannot pin'):
+            InferencerPool(
+                self.inferencer,
+                num_workers=1,
+                num_threads=torch.get_num_threads() + 1024,
+                pin_cpus=True)
+        with mock.patch.object(
+                self.inferencer.model,
+                'parameters',
+                return_value=[torch.empty(0, device='meta')]):
+            with self.assertRaisesRegex(ValueError, 'only supports'):
+                InferencerPool(self.inferencer, num_workers=1)
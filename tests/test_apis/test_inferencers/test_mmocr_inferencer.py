@@ -10,6 +10,7 @@ import numpy as np
 import torch
 
 from mmocr.apis.inferencers import MMOCRInferencer
+from mmocr.utils import InferenceProfiler
 
 
 class TestMMOCRInferencer(TestCase):
@@ -253,3 +254,128 @@ class TestMMOCRInferencer(TestCase):
                     osp.join(tmp_dir, 'preds', pred_dir))
                 self.assert_predictions_equal(res['predictions'][i],
                                               dumped_res)
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def test_sequence(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        inferencer = MMOCRInferencer(
+            det='dbnet_resnet18_fpnc_1200e_icdar2015',
+            rec='crnn_mini-vgg_5e_mj')
+        img_path = 'tests/data/det_toy_dataset/imgs/test/img_1.jpg'
+        img = mmcv.imread(img_path)
+        shifted_img = np.zeros_like(img)
+        shifted_img[4:, 8:] = img[:-4, :-8]
+        frames = [img_path, img.copy(), shifted_img]
+
+        det_inferencer = inferencer.textdet_inferencer
+        with mock.patch.object(
+                det_inferencer, 'forward',
+                wraps=det_inferencer.forward) as mock_forward:
+            res = inferencer(
+                frames, sequence=True, diff_thr=0.05, return_vis=True)
+            # Only the first frame is detected
+            self.assertEqual(mock_forward.call_count, 1)
+        self.assertEqual(len(res['predictions']), 3)
+        self.assertEqual(len(res['visualization']), 3)
+        res_single = inferencer(img_path)
+        for pred in res['predictions'][:2]:
+            self.assert_predictions_equal(pred, res_single['predictions'][0])
+        # Polygons are tracked by the global motion
+        for polygon, shifted_polygon in zip(
+                res['predictions'][0]['det_polygons'],
+                res['predictions'][2]['det_polygons']):
+            offset = np.array(shifted_polygon) - np.array(polygon)
+            self.assertTrue(np.allclose(offset[0::2], 8, atol=1))
+            self.assertTrue(np.allclose(offset[1::2], 4, atol=1))
+        self.assertEqual(res['predictions'][0]['rec_texts'],
+                         res['predictions'][2]['rec_texts'])
+
+        # The keyframe is kept across calls until the sequence is reset
+        with mock.patch.object(
+                det_inferencer, 'forward',
+                wraps=det_inferencer.forward) as mock_forward:
+            for frame in frames:
+                res_frame = inferencer(frame, sequence=True, diff_thr=0.05)
+            self.assertEqual(mock_forward.call_count, 0)
+            self.assert_predictions_equal(res_frame['predictions'][0],
+                                          res['predictions'][2])
+            inferencer.reset_sequence()
+            inferencer(img_path, sequence=True, diff_thr=0.05)
+            self.assertEqual(mock_forward.call_count, 1)
+
+        # Every frame is detected and recognized
+        img_paths = [
+            'tests/data/det_toy_dataset/imgs/test/img_1.jpg',
+            'tests/data/det_toy_dataset/imgs/test/img_2.jpg'
+        ]
+        res = inferencer(img_paths, sequence=True, diff_thr=-1, batch_size=2)
+        res_single = inferencer(img_paths, batch_size=2)
+        for pred, pred_single in zip(res['predictions'],
+                                     res_single['predictions']):
+            self.assert_predictions_equal(pred, pred_single)
+
+        with self.assertRaises(ValueError):
+            MMOCRInferencer(rec='crnn_mini-vgg_5e_mj')(img_path, sequence=True)
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def test_profile(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        inferencer = MMOCRInferencer(
+            det='dbnet_resnet18_fpnc_1200e_icdar2015',
+            rec='crnn_mini-vgg_5e_mj')
+        img_paths = [
+            'tests/data/det_toy_dataset/imgs/test/img_1.jpg',
+            'tests/data/det_toy_dataset/imgs/test/img_2.jpg'
+        ]
+        res = inferencer(img_paths)
+        with InferenceProfiler() as profiler:
+            res_profiled = inferencer(img_paths, return_vis=True)
+        for pred, pred_profiled in zip(res['predictions'],
+                                       res_profiled['predictions']):
+            self.assert_predictions_equal(pred, pred_profiled)
+        rows = {row['name']: row for row in profiler.summary()}
+        self.assertEqual(rows['MMOCRInferencer']['count'], 2)
+        for name in [
+                'TextDetInferencer', 'TextRecInferencer', 'decode', 'pipeline',
+                'InferencerLoader', 'collate', 'crop', 'visualize',
+                'DBNet.data_preprocessor', 'DBNet.backbone', 'DBNet.neck',
+                'DBNet.det_head', 'DBNet.det_head.postprocessor',
+                'CRNN.backbone', 'CRNN.decoder.postprocessor'
+        ]:
+            self.assertIn(name, rows)
+        # Per image spans of the detector, the crops are ndarrays
+        inputs = [
+            event['args']['input'] for event in profiler.events
+            if event['name'] == 'pipeline'
+        ]
+        self.assertEqual([i for i in inputs if i != 'ndarray'], img_paths)
+        # The hooks are removed afterwards
+        num_events = len(profiler.events)
+        inferencer(img_paths)
+        self.assertEqual(len(profiler.events), num_events)
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def test_quantize(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        inferencer = MMOCRInferencer(
+            det='dbnet_resnet18_fpnc_1200e_icdar2015',
+            rec='crnn_mini-vgg_5e_mj')
+        img_path = 'tests/data/det_toy_dataset/imgs/test/img_1.jpg'
+        with mock.patch.object(inferencer.textdet_inferencer,
+                               'quantize') as det_quantize, \
+                mock.patch.object(inferencer.textrec_inferencer,
+                                  'quantize') as rec_quantize:
+            inferencer.quantize('dynamic')
+            det_quantize.assert_called_once_with('dynamic', None, 1)
+            rec_quantize.assert_called_once_with('dynamic')
+            det_quantize.reset_mock()
+            rec_quantize.reset_mock()
+            inferencer.quantize('static', [img_path], 2)
+            det_quantize.assert_called_once_with('static', [img_path], 2)
+            rec_quantize.assert_called_once_with('dynamic')
+            with self.assertRaises(ValueError):
+                inferencer.quantize([img_path])
+        # The models still run once quantized
+        inferencer.quantize('static', [img_path])
+        res = inferencer(img_path)
+        self.assertIn('rec_texts', res['predictions'][0])
@@ -85,6 +85,126 @@ class TestTextDetinferencer(TestCase):
         self.assertTrue(
             np.array_equal(res_bs1['visualization'], res_bs3['visualization']))
 
+    def test_coarse_to_fine(self):
+        img_path = 'tests/data/det_toy_dataset/imgs/test/img_1.jpg'
+        img = mmcv.imread(img_path)
+
+        # The whole image is a region of interest, detected at its original
+        # resolution
+        res = self.inferencer(
+            img_path, coarse_to_fine=True, roi_thr=-1, return_vis=True)
+        self.assertEqual(len(res['predictions']), 1)
+        self.assertEqual(res['visualization'][0].shape, img.shape)
+        pipeline = self.inferencer.pipeline
+        self.inferencer.pipeline = self.inferencer._build_pipeline(
+            scale_factor=1.0)
+        res_full = self.inferencer(img_path)
+        self.inferencer.pipeline = pipeline
+        self.assert_predictions_equal(res['predictions'],
+                                      res_full['predictions'])
+
+        # No region of interest
+        res = self.inferencer([img_path, img],
+                              coarse_to_fine=True,
+                              batch_size=2,
+                              roi_thr=1.1)
+        self.assertEqual(len(res['predictions']), 2)
+        for pred in res['predictions']:
+            self.assertEqual(pred['polygons'], [])
+            self.assertEqual(pred['scores'], [])
+
+        # Custom scales
+        res = self.inferencer(
+            img_path,
+            coarse_to_fine=True,
+            coarse_scale=(320, 180),
+            fine_scale=(2666, 1472),
+            roi_thr=-1,
+            return_datasamples=True)
+        self.assertIsInstance(res['predictions'][0], TextDetDataSample)
+        self.assertEqual(res['predictions'][0].img_path, img_path)
+
+    def test_tiled(self):
+        img_path = 'tests/data/det_toy_dataset/imgs/test/img_1.jpg'
+        img = mmcv.imread(img_path)
+        h, w = img.shape[:2]
+
+        # A single tile covering the whole image
+        res = self.inferencer(
+            img_path, tile_size=(w, h), nms_thr=1.0, return_vis=True)
+        self.assertEqual(len(res['predictions']), 1)
+        self.assertEqual(res['visualization'][0].shape, img.shape)
+        pipeline = self.inferencer.pipeline
+        self.inferencer.pipeline = self.inferencer._build_pipeline(
+            scale_factor=1.0)
+        res_full = self.inferencer(img_path)
+        self.inferencer.pipeline = pipeline
+        self.assert_predictions_equal(res['predictions'],
+                                      res_full['predictions'])
+
+        # Multiple tiles and images
+        res = self.inferencer([img_path, img],
+                              tile_size=512,
+                              tile_overlap=128,
+                              tile_batch_size=3,
+                              batch_size=2,
+                              return_datasamples=True)
+        self.assertEqual(len(res['predictions']), 2)
+        for pred in res['predictions']:
+            self.assertIsInstance(pred, TextDetDataSample)
+            self.assertEqual(pred.ori_shape, (h, w))
+            self.assertEqual(
+                len(pred.pred_instances.polygons),
+                len(pred.pred_instances.scores))
+        self.assertEqual(res['predictions'][0].img_path, img_path)
+
+        with self.assertRaises(ValueError):
+            self.inferencer(img_path, tile_size=512, coarse_to_fine=True)
+        with self.assertRaises(AssertionError):
+            self.inferencer(img_path, tile_size=512, tile_overlap=512)
+
+    def test_quantize(self):
+        img_path = 'tests/data/det_toy_dataset/imgs/test/img_1.jpg'
+        with self.assertRaises(ValueError):
+            self.inferencer.quantize('static')
+        with self.assertRaises(ValueError):
+            self.inferencer.quantize('invalid')
+        self.inferencer.quantize('static', [img_path])
+        self.assertIsInstance(self.inferencer.model.backbone,
+                              torch.fx.GraphModule)
+        res = self.inferencer(img_path)
+        self.assertEqual(len(res['predictions']), 1)
+
+    def test_optimize(self):
+        img_path = 'tests/data/det_toy_dataset/imgs/test/img_1.jpg'
+        with self.assertRaises(ValueError):
+            self.inferencer.optimize('fp64')
+        with self.assertRaisesRegex(ValueError, 'CUDA'):
+            self.inferencer.optimize('fp16')
+        self.inferencer.optimize(
+            'bf16', channels_last=True, warmup_inputs=img_path)
+        self.assertTrue(
+            self.inferencer.model.backbone.conv1.weight.is_contiguous(
+                memory_format=torch.channels_last))
+        postprocessor = self.inferencer.model.det_head.postprocessor
+        with mock.patch.object(
+                postprocessor,
+                '_postprocessor',
+                wraps=postprocessor._postprocessor) as mock_postprocessor:
+            res = self.inferencer(img_path, coarse_to_fine=True)
+        prob_map = mock_postprocessor.call_args[0][0]
+        self.assertEqual(prob_map.dtype, torch.float32)
+        self.assertEqual(len(res['predictions']), 1)
+
+        # Repeated calls replace the hook, which is removed without
+        # channels-last
+        backbone = self.inferencer.model.backbone
+        self.inferencer.optimize(channels_last=True)
+        self.assertEqual(len(backbone._forward_pre_hooks), 1)
+        self.inferencer.optimize(channels_last=False)
+        self.assertEqual(len(backbone._forward_pre_hooks), 0)
+        self.assertTrue(backbone.conv1.weight.is_contiguous())
+
     def test_visualize(self):
         img_paths = [
             'tests/data/det_toy_dataset/imgs/test/img_1.jpg',
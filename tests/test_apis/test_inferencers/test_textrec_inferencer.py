@@ -38,6 +38,19 @@ class TestTextRecinferencer(TestCase):
             'crnn_mini-vgg_5e_mj/'
             'crnn_mini-vgg_5e_mj_20220826_224120-8afbedbb.pth')
 
+    def test_init_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            weights = osp.join(tmp_dir, 'crnn.pth')
+            torch.save(
+                dict(state_dict=self.inferencer.model.state_dict()), weights)
+            with mock.patch('mmocr.apis.inferencers.base_mmocr_inferencer.'
+                            'skip_init') as skip_init:
+                inferencer = TextRecInferencer('CRNN', weights)
+                skip_init.assert_called_once()
+        for key, value in self.inferencer.model.state_dict().items():
+            self.assertTrue(
+                torch.equal(inferencer.model.state_dict()[key], value))
+
     def assert_predictions_equal(self, preds1, preds2):
         for pred1, pred2 in zip(preds1, preds2):
             self.assert_prediction_equal(pred1, pred2)
@@ -81,6 +94,71 @@ class TestTextRecinferencer(TestCase):
         self.assertIn('visualization', res_bs3)
         self.assertIn('predictions', res_bs3)
 
+    def test_bucket_by_width(self):
+        img_dir = 'tests/data/rec_toy_dataset/imgs'
+        img_paths = sorted(
+            osp.join(img_dir, name)
+            for name in mmengine.list_dir_or_file(img_dir, list_dir=False))
+        batches = list(self.inferencer.preprocess(img_paths, batch_size=3))
+        widths = [
+            inputs.shape[-1] for _, data in batches
+            for inputs in data['inputs']
+        ]
+        self.assertEqual(widths, sorted(widths))
+        self.assertEqual(
+            sorted(path for ori_inputs, _ in batches for path in ori_inputs),
+            img_paths)
+
+        # The images are only sorted within a window of batches
+        self.inferencer.bucket_batches = 1
+        batches = list(self.inferencer.preprocess(img_paths, batch_size=3))
+        for i, (ori_inputs, data) in enumerate(batches):
+            self.assertEqual(sorted(ori_inputs), img_paths[3 * i:3 * i + 3])
+            widths = [inputs.shape[-1] for inputs in data['inputs']]
+            self.assertEqual(widths, sorted(widths))
+        self.assertEqual(
+            sorted(self.inferencer._order), list(range(len(img_paths))))
+        res = self.inferencer(
+            img_paths[::-1], batch_size=2, return_datasamples=True)
+        self.assertEqual([pred.img_path for pred in res['predictions']],
+                         img_paths[::-1])
+        self.inferencer.bucket_batches = 8
+
+        # The results are in the order of the inputs
+        res = self.inferencer(
+            img_paths, batch_size=3, return_vis=True, return_datasamples=True)
+        self.assertEqual([pred.img_path for pred in res['predictions']],
+                         img_paths)
+        self.assertEqual(len(res['visualization']), len(img_paths))
+        res = self.inferencer(
+            img_paths,
+            batch_size=3,
+            return_datasamples=True,
+            bucket_by_width=False)
+        self.assertEqual([pred.img_path for pred in res['predictions']],
+                         img_paths)
+
+    def test_quantize(self):
+        img_path = 'tests/data/rec_toy_dataset/imgs/1036169.jpg'
+        self.inferencer.quantize()
+        self.assertIsInstance(self.inferencer.model.decoder.decoder[0].rnn,
+                              torch.ao.nn.quantized.dynamic.LSTM)
+        res = self.inferencer(img_path)
+        self.assertEqual(len(res['predictions']), 1)
+        self.assertIsInstance(res['predictions'][0]['text'], str)
+
+    def test_optimize(self):
+        img_path = 'tests/data/rec_toy_dataset/imgs/1036169.jpg'
+        expected = self.inferencer(img_path)['predictions'][0]
+        self.inferencer.optimize('bf16')
+        self.assertEqual(self.inferencer._autocast_dtype, torch.bfloat16)
+        res = self.inferencer(img_path)['predictions'][0]
+        self.assertIsInstance(res['scores'], float)
+        self.assertAlmostEqual(res['scores'], expected['scores'], delta=0.05)
+        self.inferencer.optimize('fp32')
+        res = self.inferencer(img_path)['predictions'][0]
+        self.assertEqual(res, expected)
+
     def test_visualize(self):
         img_paths = [
             'tests/data/rec_toy_dataset/imgs/1036169.jpg',
@@ -0,0 +1,152 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import asyncio
+import json
+import os.path as osp
+import tempfile
+from unittest import TestCase, mock
+
+import mmcv
+import numpy as np
+
+from mmocr.apis import (InferenceServer, LatencyHistogram, MicroBatcher,
+                        QueueFullError)
+from mmocr.apis.inferencers import TextRecInferencer
+
+
+async def _request(socket_path, method, path, body=b''):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+                 f'Content-Length: {len(body)}\r\nConnection: close\r\n'
+                 '\r\n'.encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
+
+
+class TestLatencyHistogram(TestCase):
+
+    def test_observe(self):
+        histogram = LatencyHistogram(buckets=(10, 100))
+        for value in [1, 10, 50, 500]:
+            histogram.observe(value)
+        result = histogram.to_dict()
+        self.assertEqual(result['count'], 4)
+        self.assertEqual(result['sum_ms'], 561)
+        self.assertEqual(result['buckets'], dict(le_10=2, le_100=3, le_inf=4))
+        self.assertEqual(result['p50_ms'], 30)
+        self.assertNotIn('p50_ms', LatencyHistogram().to_dict())
+
+
+class TestMicroBatcher(TestCase):
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def setUp(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        self.inferencer = TextRecInferencer('CRNN')
+        img_dir = 'tests/data/rec_toy_dataset/imgs'
+        self.img_paths = [
+            osp.join(img_dir, name) for name in
+            ['1036169.jpg', '1058891.jpg', '1058892.jpg', '1190237.jpg']
+        ]
+        self.imgs = [mmcv.imread(img_path) for img_path in self.img_paths]
+
+    def test_submit(self):
+
+        async def run():
+            batcher = MicroBatcher(
+                self.inferencer, max_batch_size=4, max_wait_ms=500)
+            await batcher.start()
+            results = await asyncio.gather(
+                *[batcher.submit(img) for img in self.imgs + self.imgs[:2]])
+            metrics = batcher.metrics()
+            await batcher.stop()
+            return results, metrics
+
+        results, metrics = asyncio.run(run())
+        # Same batches as the batcher, since the images are padded in a batch
+        expected = self.inferencer(
+            self.imgs, batch_size=4)['predictions'] + self.inferencer(
+                self.imgs[:2], batch_size=2)['predictions']
+        self.assertEqual([result['text'] for result in results],
+                         [result['text'] for result in expected])
+        # A full batch, then the remaining images after max_wait_ms
+        self.assertEqual(metrics['batch_size_histogram'], {'2': 1, '4': 1})
+        self.assertEqual(metrics['requests_total'], 6)
+        self.assertEqual(metrics['batches_total'], 2)
+        self.assertAlmostEqual(metrics['batch_fill'], 0.75)
+        self.assertEqual(metrics['latency_ms']['count'], 6)
+        self.assertEqual(metrics['inference_ms']['count'], 2)
+        self.assertEqual(metrics['queue_depth'], 0)
+
+    def test_errors(self):
+
+        async def run():
+            batcher = MicroBatcher(self.inferencer, max_queue_size=0)
+            with self.assertRaises(RuntimeError):
+                await batcher.submit(self.imgs[0])
+            await batcher.start()
+            with self.assertRaises(QueueFullError):
+                await batcher.submit(self.imgs[0])
+            self.assertEqual(batcher.metrics()['requests_rejected'], 1)
+            await batcher.stop()
+
+            # Inference errors are propagated to the callers
+            batcher = MicroBatcher(self.inferencer)
+            await batcher.start()
+            with mock.patch.object(
+                    batcher, '_infer', side_effect=ValueError('error')):
+                with self.assertRaises(ValueError):
+                    await batcher.submit(self.imgs[0])
+            self.assertEqual(batcher.metrics()['requests_failed'], 1)
+            await batcher.stop()
+
+        asyncio.run(run())
+
+
+class TestInferenceServer(TestCase):
+
+    @mock.patch('mmengine.infer.infer._load_checkpoint')
+    def setUp(self, mock_load):
+        mock_load.side_effect = lambda *x, **y: None
+        self.inferencer = TextRecInferencer('CRNN')
+        self.img_path = 'tests/data/rec_toy_dataset/imgs/1036169.jpg'
+
+    def test_server(self):
+        with open(self.img_path, 'rb') as f:
+            content = f.read()
+
+        async def run(socket_path):
+            server = InferenceServer(
+                MicroBatcher(self.inferencer, max_batch_size=2),
+                unix_socket=socket_path)
+            await server.start()
+            responses = dict(
+                health=await _request(socket_path, 'GET', '/health'),
+                predict=await asyncio.gather(*[
+                    _request(socket_path, 'POST', '/predict', content)
+                    for _ in range(2)
+                ]),
+                invalid=await _request(socket_path, 'POST', '/predict',
+                                       b'not an image'),
+                not_found=await _request(socket_path, 'GET', '/dummy'),
+                metrics=await _request(socket_path, 'GET', '/metrics'))
+            await server.close()
+            return responses
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            responses = asyncio.run(run(osp.join(tmp_dir, 'mmocr.sock')))
+        self.assertEqual(responses['health'],
+                         (200, dict(status='ok', queue_depth=0)))
+        expected = self.inferencer(self.img_path)['predictions'][0]
+        for status, result in responses['predict']:
+            self.assertEqual(status, 200)
+            self.assertEqual(result['text'], expected['text'])
+            self.assertTrue(
+                np.allclose(result['scores'], expected['scores'], 0.1))
+        self.assertEqual(responses['invalid'][0], 400)
+        self.assertEqual(responses['not_found'][0], 404)
+        status, metrics = responses['metrics']
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics['requests_total'], 2)
@@ -76,6 +76,13 @@ class TestPackTextDetInputs(TestCase):
         results = transform(copy.deepcopy(datainfo))
         data_sample = results['data_samples']
         self.assertNotIn('texts', data_sample.gt_instances)
+        self.assertNotIn('gt_targets', data_sample)
+
+        datainfo['gt_targets'] = dict(settings=dict(), targets=(1, ))
+        results = transform(copy.deepcopy(datainfo))
+        data_sample = results['data_samples']
+        self.assertEqual(data_sample.gt_targets,
+                         dict(settings=dict(), targets=(1, )))
 
         datainfo = dict(img_shape=(10, 10))
         transform = PackTextDetInputs(meta_keys=('img_shape', ))
@@ -4,13 +4,17 @@ import unittest
 import unittest.mock as mock
 
 import numpy as np
+import torch
 from mmcv.transforms import Pad, RandomResize
+from mmengine.structures import InstanceData
 
-from mmocr.datasets.transforms import (BoundedScaleAspectJitter, RandomCrop,
+from mmocr.datasets.transforms import (BoundedScaleAspectJitter,
+                                       GenerateTextDetTargets, RandomCrop,
                                        RandomFlip, Resize,
                                        ShortScaleAspectJitter, SourceImagePad,
                                        TextDetRandomCrop,
                                        TextDetRandomCropFlip)
+from mmocr.structures import TextDetDataSample
 from mmocr.utils import bbox2poly, poly2shapely
 
 
@@ -491,3 +495,66 @@ class TestTextDetRandomCropFlip(unittest.TestCase):
             repr(transform),
             ('TextDetRandomCropFlip(pad_ratio = 0.1, crop_ratio = 0.5, '
              'iter_num = 1, min_area_ratio = 0.2, epsilon = 0.01)'))
+
+
+class TestGenerateTextDetTargets(unittest.TestCase):
+
+    def setUp(self):
+        self.data_info = dict(
+            img_shape=(64, 80),
+            gt_polygons=[
+                np.array([4, 4, 40, 4, 40, 20, 4, 20], dtype=np.float32),
+                np.array([10, 30, 70, 30, 70, 56, 10, 56], dtype=np.float32),
+                np.array([50, 4, 50.5, 4, 50.5, 4.5, 50, 4.5],
+                         dtype=np.float32)
+            ],
+            gt_ignored=np.array([False, False, True]))
+
+    def get_data_sample(self):
+        return TextDetDataSample(
+            metainfo=dict(img_shape=self.data_info['img_shape']),
+            gt_instances=InstanceData(
+                polygons=copy.deepcopy(self.data_info['gt_polygons']),
+                ignored=torch.tensor(self.data_info['gt_ignored'])))
+
+    def assert_targets_equal(self, targets, expected):
+        self.assertEqual(len(targets), len(expected))
+        for target, expected_target in zip(targets, expected):
+            if isinstance(target, torch.Tensor):
+                self.assertTrue(torch.equal(target, expected_target))
+            else:
+                self.assertTrue(np.array_equal(target, expected_target))
+
+    def test_transform(self):
+        for module_loss in [
+                dict(type='DBModuleLoss'),
+                dict(type='PANModuleLoss'),
+                dict(type='PSEModuleLoss'),
+                dict(type='FCEModuleLoss', fourier_degree=5, num_sample=50),
+                dict(type='TextSnakeModuleLoss')
+        ]:
+            transform = GenerateTextDetTargets(module_loss)
+            results = transform(copy.deepcopy(self.data_info))
+            gt_targets = results['gt_targets']
+            self.assertEqual(gt_targets['settings'],
+                             transform.module_loss._target_settings())
+            self.assert_targets_equal(
+                gt_targets['targets'],
+                transform.module_loss._get_target_single(
+                    self.get_data_sample()))
+
+        # The flags modified by the module loss are left untouched
+        self.data_info['gt_ignored'][2] = False
+        transform = GenerateTextDetTargets(dict(type='DBModuleLoss'))
+        results = transform(self.data_info)
+        self.assertFalse(results['gt_ignored'][2])
+
+    def test_invalid_module_loss(self):
+        with self.assertRaisesRegex(TypeError, 'MaskedBCELoss'):
+            GenerateTextDetTargets(dict(type='MaskedBCELoss'))
+
+    def test_repr(self):
+        transform = GenerateTextDetTargets(dict(type='DBModuleLoss'))
+        self.assertEqual(
+            repr(transform),
+            "GenerateTextDetTargets(module_loss={'type': 'DBModuleLoss'})")
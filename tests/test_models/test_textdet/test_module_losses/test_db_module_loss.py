@@ -1,12 +1,34 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from unittest import TestCase
+import copy
+from unittest import TestCase, mock
 
+import cv2
 import numpy as np
 import torch
 from mmengine.structures import InstanceData
+from shapely.geometry import Polygon
 
 from mmocr.models.textdet.module_losses import DBModuleLoss
 from mmocr.structures import TextDetDataSample
+from mmocr.utils import offset_polygon
+
+
+def dist_points2line_baseline(xs, ys, pt1, pt2):
+    """The distances from points to a line as computed from the cosine of
+    the angle between the ends in DB, as the reference of
+    ``DBModuleLoss._dist_points2line``."""
+    xs, ys = np.broadcast_arrays(xs, ys)
+    a_square = np.square(xs - pt1[0]) + np.square(ys - pt1[1])
+    b_square = np.square(xs - pt2[0]) + np.square(ys - pt2[1])
+    c_square = np.square(pt1[0] - pt2[0]) + np.square(pt1[1] - pt2[1])
+    neg_cos_c = ((c_square - a_square - b_square) /
+                 (np.finfo(np.float32).eps + 2 * np.sqrt(a_square * b_square)))
+    neg_cos_c = np.clip(neg_cos_c, -1.0, 1.0)
+    square_sin = np.nan_to_num(1 - np.square(neg_cos_c))
+    result = np.sqrt(a_square * b_square * square_sin /
+                     (np.finfo(np.float32).eps + c_square))
+    result[neg_cos_c < 0] = np.sqrt(np.fmin(a_square, b_square))[neg_cos_c < 0]
+    return result
 
 
 class TestDBModuleLoss(TestCase):
@@ -51,6 +73,84 @@ class TestDBModuleLoss(TestCase):
                            dtype=np.float32)
         self.db_loss._draw_border_map(polygon, thr_map, thr_mask)
 
+    def test_draw_border_map_parity(self):
+        # A curved polygon, and quadrangles crossing the border of the image
+        # or lying out of it
+        angles = np.linspace(0, np.pi * 0.8, 10)
+        polygons = [
+            np.concatenate([
+                np.stack([60 + 50 * np.cos(angles), 70 - 50 * np.sin(angles)],
+                         axis=1),
+                np.stack([
+                    60 + 30 * np.cos(angles[::-1]),
+                    70 - 30 * np.sin(angles[::-1])
+                ],
+                         axis=1)
+            ]).reshape(-1).astype(np.float32),
+            np.array([-20, 85, 60, 82, 62, 98, -18, 100], dtype=np.float32),
+            np.array([100, 20, 140, 20, 140, 40, 100, 40], dtype=np.float32),
+            np.array([130, 90, 150, 90, 150, 99, 130, 99], dtype=np.float32)
+        ]
+        for polygon in polygons:
+            thr_map = np.zeros((100, 120), dtype=np.float32)
+            thr_mask = np.zeros((100, 120), dtype=np.uint8)
+            self.db_loss._draw_border_map(polygon.copy(), thr_map, thr_mask)
+            expected_map = np.zeros((100, 120), dtype=np.float32)
+            expected_mask = np.zeros((100, 120), dtype=np.uint8)
+            self._draw_border_map_dense(polygon.copy(), expected_map,
+                                        expected_mask)
+            self.assertTrue(np.allclose(thr_map, expected_map, atol=3e-4))
+            self.assertTrue(np.array_equal(thr_mask, expected_mask))
+
+    def _draw_border_map_dense(self, polygon, canvas, mask):
+        """Draw the border map of a polygon with the baseline distances to all
+        of its edges from all the pixels of the image."""
+        polygon = polygon.reshape(-1, 2)
+        polygon_obj = Polygon(polygon)
+        distance = polygon_obj.area * (
+            1 - self.db_loss.shrink_ratio**2) / polygon_obj.length
+        expanded_polygon = offset_polygon(polygon,
+                                          distance).reshape(-1,
+                                                            2).astype(np.int32)
+        height, width = canvas.shape
+        xs = np.arange(width, dtype=np.float64).reshape(1, -1)
+        ys = np.arange(height, dtype=np.float64).reshape(-1, 1)
+        distance_map = np.ones_like(canvas)
+        for i in range(len(polygon)):
+            absolute_distance = dist_points2line_baseline(
+                xs, ys, polygon[i], polygon[(i + 1) % len(polygon)])
+            distance_map = np.fmin(distance_map,
+                                   np.clip(absolute_distance / distance, 0, 1))
+        x_min, y_min = expanded_polygon.min(axis=0)
+        x_max, y_max = expanded_polygon.max(axis=0)
+        in_box = np.zeros_like(mask, dtype=bool)
+        in_box[max(y_min, 0):y_max + 1, max(x_min, 0):x_max + 1] = True
+        if in_box.any():
+            cv2.fillPoly(mask, [expanded_polygon], 1)
+        canvas[in_box] = np.fmax(1 - distance_map[in_box], canvas[in_box])
+
+    def test_dist_points2line(self):
+        pt1 = np.array([0, 0], dtype=np.float32)
+        pt2 = np.array([4, 0], dtype=np.float32)
+        xs = np.array([2, 0, -3, 7, 2], dtype=np.float64)
+        ys = np.array([1, 0, 4, 4, 0], dtype=np.float64)
+        self.assertTrue(
+            np.allclose(
+                self.db_loss._dist_points2line(xs, ys, pt1, pt2),
+                [1, 0, 5, 5, 0]))
+        # As in DB, the distance to the closest end is used if the angle
+        # between the ends seen from the point is acute
+        self.assertAlmostEqual(
+            self.db_loss._dist_points2line(
+                np.array([2.]), np.array([3.]), pt1, pt2)[0], np.sqrt(13))
+        # A grid of points, and a degenerate line
+        distances = self.db_loss._dist_points2line(
+            np.arange(3).reshape(1, -1),
+            np.arange(2).reshape(-1, 1), pt1, pt1)
+        self.assertTrue(
+            np.allclose(distances,
+                        [[0, 1, 2], [1, np.sqrt(2), np.sqrt(5)]]))
+
     def test_generate_thr_map(self):
         data_sample = self.data_samples[0]
         text_polys = data_sample.gt_instances.polygons[:2]
@@ -63,3 +163,23 @@ class TestDBModuleLoss(TestCase):
         assert 'loss_prob' in losses
         assert 'loss_thr' in losses
         assert 'loss_db' in losses
+
+    def test_precomputed_targets(self):
+        data_sample = copy.deepcopy(self.data_samples[0])
+        targets = self.db_loss.get_targets(self.data_samples)
+        data_sample.gt_targets = self.db_loss.precompute_targets(
+            copy.deepcopy(data_sample))
+
+        # The precomputed targets are used
+        with mock.patch.object(self.db_loss,
+                               '_get_target_single') as get_target_single:
+            precomputed = self.db_loss.get_targets([data_sample])
+            get_target_single.assert_not_called()
+        for target, expected_target in zip(precomputed, targets):
+            self.assertTrue(torch.equal(target, expected_target))
+
+        # And regenerated if generated with other settings
+        db_loss = DBModuleLoss(thr_min=0.3, thr_max=0.7, shrink_ratio=0.5)
+        with self.assertWarnsRegex(UserWarning, 'regenerated'):
+            regenerated = db_loss.get_targets([data_sample])
+        self.assertFalse(torch.equal(regenerated[2], targets[2]))
@@ -1,6 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from unittest import TestCase
 
+import cv2
 import numpy as np
 import torch
 from mmengine.structures import InstanceData
@@ -43,3 +44,90 @@ class TestFCEModuleLoss(TestCase):
         assert 'loss_center' in losses
         assert 'loss_reg_x' in losses
         assert 'loss_reg_y' in losses
+
+    def _fourier_signature_reference(self, polygon, k):
+        """The Fourier signature of a polygon computed point by point."""
+        new_polygon = []
+        for i in range(len(polygon)):
+            p1, p2 = polygon[i], polygon[(i + 1) % len(polygon)]
+            num = int(
+                np.linalg.norm(p2 - p1) / (self._perimeter(polygon) + 1e-8) *
+                400)
+            new_polygon += [p1 + (p2 - p1) / num * j for j in range(num)]
+        polygon = np.array(new_polygon)
+        temp_polygon = polygon - polygon.mean(axis=0)
+        index_x = np.argsort(np.abs(temp_polygon[:, 0]))
+        index = index_x[np.argmin(temp_polygon[index_x[:8], 1])]
+        polygon = np.concatenate([polygon[index:], polygon[:index]])
+        c_fft = np.fft.fft(polygon[:, 0] + polygon[:, 1] * 1j) / len(polygon)
+        c = np.hstack((c_fft[-k:], c_fft[:k + 1]))
+        if np.abs(c[k + 1]) < np.abs(c[k - 1]) or (np.abs(c[k + 1]) == np.abs(
+                c[k - 1]) and np.abs(c[k + 2]) <= np.abs(c[k - 2])):
+            c = c[::-1]
+        return np.stack([np.real(c), np.imag(c)], axis=-1)
+
+    def _perimeter(self, polygon):
+        return np.linalg.norm(
+            np.roll(polygon, -1, axis=0) - polygon, axis=1).sum()
+
+    def _get_polygons(self):
+        rng = np.random.RandomState(0)
+        angles = np.linspace(0, np.pi * 0.8, 7)
+        polygons = [
+            np.array([[4, 4], [30, 4], [30, 14], [4, 14]], dtype=np.float64),
+            # Counter-clockwise
+            np.array([[20, 20], [20, 36], [50, 36], [50, 20]],
+                     dtype=np.float64)
+        ]
+        for _ in range(8):
+            radius = rng.uniform(10, 30)
+            center = rng.uniform(radius, 80 - radius, 2)
+            top = center + radius * np.stack([np.cos(angles), -np.sin(angles)],
+                                             axis=1)
+            bot = center + radius / 2 * np.stack(
+                [np.cos(angles), -np.sin(angles)], axis=1)
+            polygons.append(np.concatenate([top, bot[::-1]]))
+        return polygons
+
+    def test_cal_fourier_signatures(self):
+        polygons = self._get_polygons()
+        signatures = self.fce_loss._cal_fourier_signatures(polygons, 5)
+        self.assertEqual(signatures.shape, (len(polygons), 11, 2))
+        for polygon, signature in zip(polygons, signatures):
+            self.assertTrue(
+                np.allclose(signature,
+                            self._fourier_signature_reference(polygon, 5)))
+        self.assertTrue(
+            np.allclose(
+                self.fce_loss._cal_fourier_signature(polygons[0], 5),
+                signatures[0]))
+
+        # A polygon degenerated to a point has no signature
+        degenerated_signatures = self.fce_loss._cal_fourier_signatures(
+            [polygons[0], np.zeros((4, 2))], 5)
+        self.assertTrue(np.isnan(degenerated_signatures[1]).all())
+        self.assertTrue(np.allclose(degenerated_signatures[0], signatures[0]))
+
+    def test_generate_fourier_maps(self):
+        polygons = self._get_polygons()
+        # Left out as it has no contour
+        polygons.append(np.full((4, 2), 60.))
+        real_map, imag_map = self.fce_loss._generate_fourier_maps((80, 80),
+                                                                  polygons)
+        self.assertEqual(real_map.shape, (11, 80, 80))
+        self.assertEqual(imag_map.shape, (11, 80, 80))
+
+        # Filled polygon by polygon, the later ones overwriting the former
+        expected_real_map = np.zeros((11, 80, 80), dtype=np.float32)
+        expected_imag_map = np.zeros((11, 80, 80), dtype=np.float32)
+        for polygon in polygons[:-1]:
+            mask = np.zeros((80, 80), dtype=np.uint8)
+            cv2.fillPoly(mask, [polygon.astype(np.int32)], 1)
+            y, x = np.nonzero(mask)
+            signature = self._fourier_signature_reference(polygon, 5)
+            expected_real_map[:, y, x] = signature[:, 0, None]
+            expected_imag_map[:, y, x] = signature[:, 1, None]
+            expected_real_map[5, y, x] = signature[5, 0] - x
+            expected_imag_map[5, y, x] = signature[5, 1] - y
+        self.assertTrue(np.allclose(real_map, expected_real_map, atol=1e-5))
+        self.assertTrue(np.allclose(imag_map, expected_imag_map, atol=1e-5))
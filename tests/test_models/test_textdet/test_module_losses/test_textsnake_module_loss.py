@@ -1,6 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from unittest import TestCase
 
+import cv2
 import numpy as np
 import torch
 from mmengine.structures import InstanceData
@@ -9,6 +10,26 @@ from mmocr.models.textdet.module_losses import TextSnakeModuleLoss
 from mmocr.structures import TextDetDataSample
 
 
+def draw_center_region_maps_ref(loss, top_line, bot_line, center_line, maps,
+                                region_shrink_ratio):
+    """Draw the center region maps quad by quad, as a reference."""
+    center_region_mask, radius_map, sin_map, cos_map = maps
+    for i in range(len(center_line) - 1):
+        top_mid_point = (top_line[i] + top_line[i + 1]) / 2
+        bot_mid_point = (bot_line[i] + bot_line[i + 1]) / 2
+        radius = np.linalg.norm(top_mid_point - bot_mid_point) / 2
+        text_direction = center_line[i + 1] - center_line[i]
+        box = np.vstack([
+            center_line[j] + (line[j] - center_line[j]) * region_shrink_ratio
+            for line, j in ((top_line, i), (top_line, i + 1),
+                            (bot_line, i + 1), (bot_line, i))
+        ]).astype(np.int32)
+        cv2.fillPoly(center_region_mask, [box], color=1)
+        cv2.fillPoly(sin_map, [box], color=loss.vector_sin(text_direction))
+        cv2.fillPoly(cos_map, [box], color=loss.vector_cos(text_direction))
+        cv2.fillPoly(radius_map, [box], color=radius)
+
+
 class TestTextSnakeModuleLoss(TestCase):
 
     def setUp(self) -> None:
@@ -74,6 +95,14 @@ class TestTextSnakeModuleLoss(TestCase):
         self.assertTrue(
             np.allclose(resampled_line,
                         np.array([[0, 0], [0, 0], [0, 0], [0, 0]])))
+        # uneven edges
+        line = np.array([[0, 0], [3, 4], [3, 5], [9, 13]], dtype=np.float32)
+        resampled_line = self.loss._resample_line(line, 5)
+        self.assertTrue(
+            np.allclose(
+                resampled_line,
+                [[0, 0], [2.4, 3.2], [4.2, 6.6], [6.6, 9.8], [9, 13]],
+                atol=1e-4))
 
     def test_generate_text_region_mask(self):
         img_size = (3, 10)
@@ -108,3 +137,32 @@ class TestTextSnakeModuleLoss(TestCase):
         targets = self.loss.get_targets(self.data_samples)
         for target in targets:
             self.assertEqual(len(target), 1)
+
+    def test_draw_center_region_maps(self):
+        rng = np.random.RandomState(0)
+        x = np.linspace(-10, 50, 12)
+        center_line = np.stack([x, 20 + 10 * np.sin(x / 10)], axis=-1)
+        offset = rng.uniform(3, 8, size=(12, 1)) * np.array([[0.3, 1]])
+        top_line, bot_line = center_line - offset, center_line + offset
+        for ratio in (0.3, 1.0):
+            maps = [np.zeros((30, 40), dtype=np.uint8)] + [
+                np.zeros((30, 40), dtype=np.float32) for _ in range(3)
+            ]
+            ref_maps = [m.copy() for m in maps]
+            self.loss._draw_center_region_maps(top_line, bot_line, center_line,
+                                               *maps, ratio)
+            draw_center_region_maps_ref(self.loss, top_line, bot_line,
+                                        center_line, ref_maps, ratio)
+            self.assertTrue(maps[0].any())
+            self.assertTrue(np.array_equal(maps[0], ref_maps[0]))
+            self.assertTrue(np.array_equal(maps[1], ref_maps[1]))
+            self.assertTrue(np.allclose(maps[2], ref_maps[2], atol=1e-6))
+            self.assertTrue(np.allclose(maps[3], ref_maps[3], atol=1e-6))
+
+        # outside the image
+        maps = [np.zeros((30, 40), dtype=np.uint8)
+                ] + [np.zeros((30, 40), dtype=np.float32) for _ in range(3)]
+        self.loss._draw_center_region_maps(top_line + 100, bot_line + 100,
+                                           center_line + 100, *maps, 0.3)
+        for m in maps:
+            self.assertFalse(m.any())
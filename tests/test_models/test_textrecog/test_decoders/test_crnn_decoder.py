@@ -7,6 +7,7 @@ import torch
 import torch.nn as nn
 
 from mmocr.models.textrecog.decoders import CRNNDecoder
+from mmocr.structures import TextRecogDataSample
 from mmocr.testing import create_dummy_dict_file
 
 
@@ -54,3 +55,18 @@ class TestCRNNDecoder(TestCase):
                 in_channels=10, dictionary=dict_cfg, rnn_flag=True)
             output = decoder.forward_test(inputs)
             self.assertTupleEqual(tuple(output.shape), (3, 100, 37))
+
+            # The padded features of images skipped by the RNN
+            decoder.eval()
+            data_samples = [
+                TextRecogDataSample(metainfo=dict(valid_ratio=ratio))
+                for ratio in [0.5, 1.0, 0.25]
+            ]
+            with torch.no_grad():
+                output = decoder.forward_train(inputs, None, data_samples)
+                for i, length in enumerate([50, 100, 25]):
+                    expected = decoder.forward_train(inputs[i:i + 1,
+                                                            ..., :length])[0]
+                    self.assertTrue(
+                        torch.allclose(
+                            output[i, :length], expected, atol=1e-5))
@@ -1,13 +1,16 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from unittest import TestCase
 
+import numpy as np
 import torch
+import torch.nn.functional as F
 
 from mmocr.models.textrecog.encoders.svtr_encoder import (AttnMixer, ConvMixer,
                                                           MerigingBlock,
                                                           MixingBlock,
                                                           OverlapPatchEmbed,
                                                           SVTREncoder)
+from mmocr.structures import TextRecogDataSample
 
 
 class TestOverlapPatchEmbed(TestCase):
@@ -42,6 +45,54 @@ class TestAttnMixer(TestCase):
         self.assertEqual(
             attn_mixer(self.img).shape, torch.Size([1, 8 * 25, 768]))
 
+    @staticmethod
+    def masked_attention(mixer, x, height, width):
+        # The local mixer of the previous versions, masking the global one
+        hk, wk = mixer.local_k
+        mask = torch.ones([height * width, height + hk - 1, width + wk - 1])
+        for h in range(height):
+            for w in range(width):
+                mask[h * width + w, h:h + hk, w:w + wk] = 0.
+        mask = mask[:, hk // 2:height + hk // 2,
+                    wk // 2:width + wk // 2].flatten(1)
+        mask[mask >= 1] = -np.inf
+        n, input_size, embed_dims = x.shape
+        qkv = mixer.qkv(x).reshape(n, input_size, 3, mixer.num_heads,
+                                   -1).permute(2, 0, 3, 1, 4)
+        attn = (qkv[0] * mixer.scale).matmul(qkv[1].transpose(-2, -1))
+        x = F.softmax(attn + mask, dim=-1).matmul(qkv[2])
+        return mixer.proj(
+            x.permute(0, 2, 1, 3).reshape(n, input_size, embed_dims))
+
+    def test_local_attn_mixer(self):
+        torch.manual_seed(0)
+        # Narrow maps are masked, and wide ones are split into bands
+        for height, width, local_k in [(8, 25, [7, 11]), (4, 100, [7, 11]),
+                                       (3, 37, [4, 6])]:
+            mixer = AttnMixer(
+                32,
+                num_heads=2,
+                mixer='Local',
+                input_shape=[8, 25],
+                local_k=local_k)
+            x = torch.rand(2, height * width, 32)
+            self.assertTrue(
+                torch.allclose(
+                    mixer(x, [height, width]),
+                    self.masked_attention(mixer, x, height, width),
+                    atol=1e-6))
+
+        # The padded queries do not produce NaN
+        x = torch.rand(1, 4 * 100, 32, requires_grad=True)
+        mixer(x, [4, 100]).sum().backward()
+        self.assertFalse(x.grad.isnan().any())
+
+        # The mask buffer in the checkpoints of the previous versions
+        state_dict = mixer.state_dict()
+        state_dict['mask'] = torch.zeros(1, 1, 200, 200)
+        mixer.load_state_dict(state_dict)
+        self.assertNotIn('mask', mixer.state_dict())
+
 
 class TestMixingBlock(TestCase):
 
@@ -83,3 +134,50 @@ class TestSVTREncoder(TestCase):
         )
         model.train()
         self.assertEqual(model(self.img).shape, torch.Size([1, 192, 1, 25]))
+
+    def test_variable_width(self):
+        model = SVTREncoder(img_size=self.img.shape[-2:])
+        model.eval()
+        for width in [64, 101, 400]:
+            self.assertEqual(
+                model(torch.rand(2, 3, 32, width)).shape,
+                torch.Size([2, 192, 1, 25]))
+
+    def test_valid_ratio(self):
+        widths = [64, 200, 400]
+        imgs = [torch.rand(1, 3, 32, width) for width in widths]
+        batch = torch.zeros(len(widths), 3, 32, max(widths))
+        data_samples = []
+        for i, img in enumerate(imgs):
+            batch[i, ..., :img.size(-1)] = img
+            data_samples.append(
+                TextRecogDataSample(
+                    metainfo=dict(valid_ratio=img.size(-1) / max(widths))))
+        for mixer_types, window_size in [
+            (['Local'] * 6 + ['Global'] * 6, [[7, 11]] * 3),
+            (['Conv'] * 6 + ['Global'] * 6, [[3, 3]] * 3)
+        ]:
+            model = SVTREncoder(
+                img_size=self.img.shape[-2:],
+                mixer_types=mixer_types,
+                window_size=window_size,
+                max_seq_len=None)
+            model.eval()
+            with torch.no_grad():
+                outputs = model(batch, data_samples)
+                self.assertEqual(outputs.shape, torch.Size([3, 192, 1, 100]))
+                # The padded images are encoded as if they were not padded
+                for img, output in zip(imgs, outputs):
+                    expected = model(img)[0]
+                    length = expected.size(-1)
+                    self.assertEqual(length, img.size(-1) // 4)
+                    self.assertTrue(
+                        torch.allclose(
+                            output[..., :length], expected, atol=1e-4))
+                    self.assertTrue((output[..., length:] == 0).all())
+
+        # No NaN in the gradients of the padding
+        model.train()
+        batch.requires_grad_()
+        model(batch, data_samples).sum().backward()
+        self.assertTrue(torch.isfinite(batch.grad).all())
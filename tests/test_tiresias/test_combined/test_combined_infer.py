@@ -0,0 +1,128 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import torch
+from mmdet.structures import DetDataSample
+from mmengine.structures import InstanceData
+
+from tiresias.combined.combined_infer import merge_predictions
+from tiresias.ocr.galerie_matcher import GalerieMatcher
+
+
+def detection(bboxes, scores, labels=None):
+    result = DetDataSample()
+    result.pred_instances = InstanceData(
+        bboxes=torch.tensor(bboxes, dtype=torch.float32).reshape(-1, 4),
+        scores=torch.tensor(scores, dtype=torch.float32),
+        labels=torch.tensor(
+            labels if labels is not None else [0] * len(scores),
+            dtype=torch.long))
+    return result
+
+
+def box_polygon(x1, y1, x2, y2):
+    return [x1, y1, x2, y1, x2, y2, x1, y2]
+
+
+class TestMergePredictions(TestCase):
+
+    def setUp(self):
+        self.matcher = GalerieMatcher(['GAN', 'NED'])
+        self.result = detection([[0, 0, 10, 10], [100, 0, 110, 10],
+                                 [50, 50, 60, 60]], [0.9, 0.8, 0.3],
+                                labels=[0, 1, 0])
+        # The unmatched text is the nearest to the second object
+        self.ocr_prediction = dict(
+            rec_texts=['gan', 'NED', 'xyz'],
+            rec_scores=[0.7, 0.95, 0.99],
+            det_polygons=[
+                box_polygon(12, 0, 20, 10),
+                box_polygon(120, 0, 130, 10),
+                box_polygon(111, 0, 115, 10)
+            ],
+            det_scores=[0.9, 0.9, 0.9])
+
+    def test_labelling(self):
+        record = merge_predictions(
+            'a.jpg',
+            self.result,
+            self.ocr_prediction,
+            classes=['extinguisher', 'door'],
+            matcher=self.matcher)
+        self.assertEqual(record['img_path'], 'a.jpg')
+        self.assertEqual([text['galerie'] for text in record['texts']],
+                         ['GAN', 'NED', None])
+        self.assertEqual(record['texts'][0]['polygon'],
+                         [12., 0., 20., 0., 20., 10., 12., 10.])
+        objects = record['objects']
+        self.assertEqual(len(objects), 2)
+        self.assertEqual([obj['class_name'] for obj in objects],
+                         ['extinguisher', 'door'])
+        self.assertEqual([obj['galerie'] for obj in objects], ['GAN', 'NED'])
+        self.assertEqual([obj['galerie_distance'] for obj in objects],
+                         [2., 10.])
+        self.assertEqual(objects[1]['bbox'], [100., 0., 110., 10.])
+        self.assertAlmostEqual(objects[0]['score'], 0.9, places=6)
+        # The most confident matched text
+        self.assertEqual(record['galerie'], 'NED')
+
+    def test_score_threshold(self):
+        record = merge_predictions(
+            'a.jpg',
+            self.result,
+            self.ocr_prediction,
+            matcher=self.matcher,
+            pred_score_thr=0.2)
+        objects = record['objects']
+        self.assertEqual(len(objects), 3)
+        self.assertIsNone(objects[2]['class_name'])
+        self.assertEqual(objects[2]['galerie'], 'GAN')
+        self.assertAlmostEqual(objects[2]['galerie_distance'], 50.)
+        record = merge_predictions(
+            'a.jpg',
+            self.result,
+            self.ocr_prediction,
+            matcher=self.matcher,
+            pred_score_thr=0.95)
+        self.assertEqual(record['objects'], [])
+        self.assertEqual(record['galerie'], 'NED')
+
+    def test_without_matcher(self):
+        record = merge_predictions('a.jpg', self.result, self.ocr_prediction)
+        self.assertEqual([text['text'] for text in record['texts']],
+                         ['gan', 'NED', 'xyz'])
+        self.assertEqual([text['galerie'] for text in record['texts']],
+                         [None] * 3)
+        self.assertEqual(len(record['objects']), 2)
+        for obj in record['objects']:
+            self.assertIsNone(obj['galerie'])
+            self.assertIsNone(obj['galerie_distance'])
+        self.assertIsNone(record['galerie'])
+
+    def test_empty(self):
+        # No object
+        record = merge_predictions(
+            'a.jpg',
+            detection([], []),
+            self.ocr_prediction,
+            matcher=self.matcher)
+        self.assertEqual(record['objects'], [])
+        self.assertEqual(len(record['texts']), 3)
+        self.assertEqual(record['galerie'], 'NED')
+
+        # No text, or no matched text
+        no_text = dict(
+            rec_texts=[], rec_scores=[], det_polygons=[], det_scores=[])
+        unmatched = dict(
+            rec_texts=['', 'xyz'],
+            rec_scores=[0.5, 0.9],
+            det_polygons=[box_polygon(12, 0, 20, 10)] * 2,
+            det_scores=[0.9, 0.9])
+        for ocr_prediction in (no_text, unmatched):
+            record = merge_predictions(
+                'a.jpg', self.result, ocr_prediction, matcher=self.matcher)
+            self.assertEqual(len(record['objects']), 2)
+            for obj in record['objects']:
+                self.assertIsNone(obj['galerie'])
+                self.assertIsNone(obj['galerie_distance'])
+            self.assertIsNone(record['galerie'])
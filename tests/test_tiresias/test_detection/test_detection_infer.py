@@ -0,0 +1,142 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import pathlib
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+from mmdet.apis import init_detector
+from mmengine.config import Config
+
+from tiresias.detection.detection_infer import (DETECTION_STAGES,
+                                                infer_detection_batch,
+                                                predict_decoded_batch,
+                                                summarize_timings)
+
+# A RetinaNet small enough to run on a CPU with random weights
+DETECTOR_CFG = dict(
+    default_scope='mmdet',
+    model=dict(
+        type='RetinaNet',
+        data_preprocessor=dict(
+            type='DetDataPreprocessor',
+            mean=[0, 0, 0],
+            std=[255, 255, 255],
+            bgr_to_rgb=True,
+            pad_size_divisor=32),
+        backbone=dict(
+            type='ResNet', depth=18, num_stages=4, out_indices=(3, )),
+        neck=dict(
+            type='FPN',
+            in_channels=[512],
+            out_channels=16,
+            add_extra_convs='on_input',
+            num_outs=2),
+        bbox_head=dict(
+            type='RetinaHead',
+            num_classes=2,
+            in_channels=16,
+            stacked_convs=1,
+            feat_channels=16,
+            anchor_generator=dict(
+                type='AnchorGenerator',
+                octave_base_scale=4,
+                scales_per_octave=1,
+                ratios=[1.0],
+                strides=[32, 64]),
+            bbox_coder=dict(type='DeltaXYWHBBoxCoder'),
+            loss_cls=dict(type='FocalLoss', use_sigmoid=True),
+            loss_bbox=dict(type='L1Loss')),
+        test_cfg=dict(
+            nms_pre=100,
+            min_bbox_size=0,
+            score_thr=0.,
+            nms=dict(type='nms', iou_threshold=0.5),
+            max_per_img=10)),
+    test_dataloader=dict(
+        dataset=dict(
+            type='CocoDataset',
+            pipeline=[
+                dict(type='LoadImageFromFile'),
+                dict(type='Resize', scale=(64, 64), keep_ratio=True),
+                dict(
+                    type='PackDetInputs',
+                    meta_keys=('img_id', 'img_path', 'ori_shape', 'img_shape',
+                               'scale_factor'))
+            ])))
+
+
+class TestDetectionInfer(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.detector = init_detector(Config(DETECTOR_CFG), None, device='cpu')
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        # Images of distinct shapes, to match the results to their image
+        self.shapes = {}
+        for i in range(7):
+            img_path = osp.join(self.tmp_dir.name,
+                                f'{i}.png' if i % 2 else f'{i}.jpg')
+            shape = (20 + 4 * i, 50 - 3 * i)
+            cv2.imwrite(img_path, np.full(shape + (3, ), 30 * i, np.uint8))
+            self.shapes[img_path] = shape
+        with open(osp.join(self.tmp_dir.name, 'notes.txt'), 'w') as f:
+            f.write('not an image')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_results(self, results):
+        for img_path, result in results:
+            self.assertEqual(result.img_path, img_path)
+            self.assertEqual(result.ori_shape, self.shapes[img_path])
+            self.assertGreater(len(result.pred_instances), 0)
+
+    def test_infer_detection_batch(self):
+        img_paths = list(self.shapes)[::-1]
+        img_paths = img_paths[1::2] + img_paths[::2]
+        timings = {}
+        # The batches and the prefetched batches end in the middle of the
+        # inputs
+        results = list(
+            infer_detection_batch(
+                img_paths,
+                self.detector,
+                batch_size=3,
+                num_workers=2,
+                prefetch=1,
+                timings=timings))
+        self.assertEqual([img_path for img_path, _ in results], img_paths)
+        self.assert_results(results)
+
+        self.assertEqual(set(timings), set(DETECTION_STAGES))
+        self.assertEqual(len(timings['decode']), 7)
+        for stage in ('preprocess', 'forward', 'nms'):
+            self.assertEqual(len(timings[stage]), 3)
+        totals = summarize_timings(timings)
+        self.assertEqual(set(totals), set(DETECTION_STAGES))
+        self.assertAlmostEqual(totals['nms'], sum(timings['nms']))
+        for total in totals.values():
+            self.assertGreater(total, 0)
+
+    def test_infer_detection_batch_dir(self):
+        for inputs in (self.tmp_dir.name, pathlib.Path(self.tmp_dir.name)):
+            results = list(
+                infer_detection_batch(inputs, self.detector, batch_size=4))
+            self.assertEqual(
+                sorted(img_path for img_path, _ in results),
+                sorted(self.shapes))
+            self.assert_results(results)
+
+    def test_predict_decoded_batch(self):
+        img_paths = list(self.shapes)[:2]
+        imgs = [cv2.imread(img_path) for img_path in img_paths]
+        results = predict_decoded_batch(self.detector, imgs, img_paths)
+        self.assert_results(zip(img_paths, results))
+        timings = dict(forward=[1.])
+        predict_decoded_batch(self.detector, imgs, img_paths, timings)
+        self.assertEqual(len(timings['forward']), 2)
+        self.assertEqual(set(timings), set(DETECTION_STAGES) - {'decode'})
@@ -0,0 +1,69 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from tiresias.ocr.galerie_matcher import GalerieMatcher
+
+
+class TestGalerieMatcher(TestCase):
+
+    def setUp(self):
+        self.matcher = GalerieMatcher(
+            ['GAN', 'gam ', 'NED', 'G01', 'BOS', 'NORD', None, np.nan])
+
+    def test_normalize(self):
+        self.assertEqual(GalerieMatcher.normalize(' gan\n'), 'GAN')
+        self.assertEqual(GalerieMatcher.normalize(12), '12')
+        self.assertEqual(GalerieMatcher.normalize(None), '')
+        self.assertEqual(GalerieMatcher.normalize(np.nan), '')
+        self.assertEqual(GalerieMatcher.normalize(pd.NA), '')
+        self.assertEqual(self.matcher.names,
+                         {'GAN', 'GAM', 'NED', 'G01', 'BOS', 'NORD'})
+
+    def test_match(self):
+        # Exact hits, even if a fuzzy match is as close
+        self.assertEqual(self.matcher.match_with_cost('gan'), ('GAN', 0.))
+        self.assertEqual(self.matcher.match_with_cost(' GAM'), ('GAM', 0.))
+        # OCR confusions
+        self.assertEqual(self.matcher.match_with_cost('GO1'), ('G01', 0.5))
+        self.assertEqual(self.matcher.match_with_cost('GOI'), ('G01', 1.))
+        self.assertEqual(self.matcher.match_with_cost('B0S'), ('BOS', 0.5))
+        # A single insertion, deletion or substitution of a long name
+        self.assertEqual(self.matcher.match_with_cost('NOD'), ('NORD', 1.))
+        self.assertEqual(self.matcher.match_with_cost('NORDX'), ('NORD', 1.))
+        self.assertEqual(self.matcher.match_with_cost('NXRD'), ('NORD', 1.))
+        # But only OCR confusions of a short name
+        for text in ('NE', 'NEDX', 'NXD', 'GAX', 'G0IX'):
+            self.assertIsNone(self.matcher.match(text))
+        self.assertEqual(
+            GalerieMatcher(['NED'], min_edit_length=3).match('NE'), 'NED')
+        # Beyond the maximum cost
+        self.assertEqual(
+            self.matcher.match_with_cost('NXX'), (None, float('inf')))
+        self.assertIsNone(GalerieMatcher(['NORD'], max_cost=0.5).match('NOD'))
+        # Ambiguous ties
+        self.assertIsNone(GalerieMatcher(['NORD', 'NORM']).match('NORX'))
+        self.assertIsNone(GalerieMatcher(['G01', 'GO1']).match('GQ1'))
+        # Missing recognitions
+        self.assertEqual(
+            self.matcher.match_with_cost(np.nan), (None, float('inf')))
+        self.assertIsNone(self.matcher.match(None))
+        self.assertIsNone(GalerieMatcher(['A', 'B']).match(''))
+
+    def test_match_many(self):
+        texts = ['gan', 'GO1', 'GAX', 'gan', 'NOD', '', None]
+        self.assertEqual(
+            self.matcher.match_many(texts),
+            ['GAN', 'G01', None, 'GAN', 'NORD', None, None])
+        self.assertEqual(self.matcher.match_many([]), [])
+
+    def test_filter_predictions(self):
+        df = pd.DataFrame(
+            dict(rec_texts=['xyz', 'b0s', 'GO1'], rec_scores=[0.9, 0.8, 0.7]))
+        filtered = self.matcher.filter_predictions(df)
+        self.assertEqual(filtered['rec_texts'].tolist(), ['BOS', 'G01'])
+        self.assertEqual(filtered['raw_texts'].tolist(), ['b0s', 'GO1'])
+        self.assertEqual(filtered.index.tolist(), [1, 2])
+        self.assertIsNone(self.matcher.filter_predictions(df.iloc[:1]))
@@ -0,0 +1,77 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+
+from tiresias.ocr.ocr_benchmark import (compare_benchmarks, load_image_sets,
+                                        summarize)
+
+
+def report(p50s):
+    return dict(results=[
+        dict(
+            image_set='demo',
+            batch_size=batch_size,
+            num_threads=1,
+            latency_ms=dict(p50=p50)) for batch_size, p50 in p50s.items()
+    ])
+
+
+class TestOCRBenchmark(TestCase):
+
+    def test_load_image_sets(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            img = np.zeros((8, 8, 3), dtype=np.uint8)
+            for name in ('a.jpg', 'b.png', 'c.PNG', 'd.JPEG'):
+                cv2.imwrite(osp.join(tmp_dir, name), img)
+            with open(osp.join(tmp_dir, 'e.txt'), 'w') as f:
+                f.write('not an image')
+            image_sets = load_image_sets(
+                demo_dir=tmp_dir, resolutions=[(64, 48)], n_synthetic=2)
+        self.assertEqual(list(image_sets), ['demo', 'synthetic_64x48'])
+        self.assertEqual(len(image_sets['demo']), 4)
+        self.assertEqual(len(image_sets['synthetic_64x48']), 2)
+        decoded = cv2.imdecode(
+            np.frombuffer(image_sets['synthetic_64x48'][0], dtype=np.uint8),
+            cv2.IMREAD_COLOR)
+        self.assertEqual(decoded.shape, (48, 64, 3))
+        # Without a demo directory
+        self.assertEqual(
+            load_image_sets(demo_dir=None, resolutions=[]), dict())
+
+    def test_summarize(self):
+        summary = summarize([0.4, 0.1, 0.3, 0.2],
+                            n_images=8,
+                            stage_totals=dict(decode=0.25, det_forward=0.75))
+        latency = summary['latency_ms']
+        self.assertAlmostEqual(latency['p50'], 250)
+        self.assertAlmostEqual(latency['p95'], 385)
+        self.assertAlmostEqual(latency['p99'], 397)
+        self.assertAlmostEqual(latency['mean'], 250)
+        self.assertAlmostEqual(summary['images_per_second'], 8)
+        stages = summary['stages']
+        self.assertAlmostEqual(stages['decode']['total_s'], 0.25)
+        self.assertAlmostEqual(stages['decode']['ms_per_image'], 31.25)
+        self.assertAlmostEqual(stages['decode']['share'], 0.25)
+        self.assertAlmostEqual(stages['det_forward']['share'], 0.75)
+
+        # Stages that took no time
+        summary = summarize([0.], n_images=1, stage_totals=dict(decode=0.))
+        self.assertEqual(summary['images_per_second'], float('inf'))
+        self.assertEqual(summary['stages']['decode']['share'], 0)
+
+    def test_compare_benchmarks(self):
+        baseline = report({1: 100., 4: 200., 8: 300.})
+        current = report({1: 109., 4: 230., 8: 250., 16: 1000.})
+        # Only the p50 of batch size 4 is more than 10% slower, and batch
+        # size 16 has no baseline
+        regressions = compare_benchmarks(baseline, current)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("('demo', 4, 1)", regressions[0])
+        self.assertIn('200.0 ms -> 230.0 ms', regressions[0])
+        self.assertEqual(
+            len(compare_benchmarks(baseline, current, tolerance=0.05)), 2)
+        self.assertEqual(compare_benchmarks(baseline, baseline), [])
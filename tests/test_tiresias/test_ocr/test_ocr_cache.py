@@ -0,0 +1,134 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+import tempfile
+from unittest import TestCase, mock
+
+import numpy as np
+
+from tiresias.ocr.ocr_cache import (OCRResultCache, config_digest,
+                                    content_digest, is_cacheable, model_digest)
+
+
+def predictions(text):
+    return dict(
+        predictions=[dict(rec_texts=[text], rec_scores=[0.9])],
+        visualization=[np.zeros((2, 2, 3), dtype=np.uint8)])
+
+
+class TestOCRResultCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        env = mock.patch.dict(
+            os.environ, MMOCR_CACHE_DIR=osp.join(self.tmp_dir.name, 'mmocr'))
+        env.start()
+        self.addCleanup(env.stop)
+        self.cache = OCRResultCache(
+            'model', path=osp.join(self.tmp_dir.name, 'ocr.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def write(self, filename, content):
+        path = osp.join(self.tmp_dir.name, filename)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_content_digest(self):
+        path = self.write('a.jpg', 'abc')
+        copy = self.write('b.jpg', 'abc')
+        self.assertEqual(content_digest(path), content_digest(copy))
+        # Modified files are hashed again
+        self.write('a.jpg', 'abcd')
+        self.assertNotEqual(content_digest(path), content_digest(copy))
+        img = np.zeros((2, 3), dtype=np.uint8)
+        self.assertEqual(content_digest(img), content_digest(img.copy()))
+        self.assertNotEqual(
+            content_digest(img), content_digest(img.reshape(3, 2)))
+
+    def test_model_digest(self):
+        base = self.write('base.py', 'a = 1\n')
+        config = self.write('config.py', "_base_ = ['base.py']\nb = 2\n")
+        weights = self.write('model.pth', 'weights')
+        ocr_config = dict(
+            det=config, det_weights=weights, rec='CRNN', rec_weights=None)
+        digest = model_digest(ocr_config)
+        self.assertEqual(model_digest(ocr_config), digest)
+        # The bases of a config are part of its digest
+        config_hash = config_digest(config)
+        with open(base, 'w') as f:
+            f.write('a = 10\n')
+        self.assertNotEqual(config_digest(config), config_hash)
+        self.assertNotEqual(model_digest(ocr_config), digest)
+        self.assertEqual(config_digest('CRNN'), content_digest('CRNN'))
+
+    def test_put_get(self):
+        path = self.write('a.jpg', 'abc')
+        self.assertIsNone(self.cache.get(path))
+        self.assertNotIn(path, self.cache)
+        self.cache.put(path, predictions('GAN'))
+        self.assertIn(path, self.cache)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(
+            self.cache.get(path),
+            dict(
+                predictions=predictions('GAN')['predictions'],
+                visualization=[]))
+        # Keyed by content
+        self.assertIn(self.write('b.jpg', 'abc'), self.cache)
+        self.write('a.jpg', 'abcd')
+        self.assertIsNone(self.cache.get(path))
+
+        # And by model
+        other = OCRResultCache('other', path=self.cache.path)
+        self.assertEqual(len(other), 1)
+        self.assertIsNone(other.get(osp.join(self.tmp_dir.name, 'b.jpg')))
+        other.close()
+
+        img = np.ones((4, 4, 3), dtype=np.uint8)
+        self.cache.put(img, predictions('NED'))
+        self.assertEqual(
+            self.cache.get(img.copy())['predictions'][0]['rec_texts'], ['NED'])
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_not_cacheable(self):
+        self.write('a.jpg', 'abc')
+        for image in (self.tmp_dir.name, 'https://example.com/a.jpg',
+                      osp.join(self.tmp_dir.name, 'missing.jpg')):
+            self.assertFalse(is_cacheable(image))
+            self.cache.put(image, predictions('GAN'))
+            self.assertNotIn(image, self.cache)
+            self.assertIsNone(self.cache.get(image))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_evict(self):
+        paths = [self.write(f'{i}.jpg', str(i)) for i in range(3)]
+        size = len(
+            b'{"predictions": [{"rec_texts": ["GAN"], "rec_scores": [0.9]}],'
+            b' "visualization": []}')
+        cache = OCRResultCache(
+            'model',
+            path=osp.join(self.tmp_dir.name, 'cache.sqlite'),
+            max_bytes=2 * size)
+        with mock.patch('time.time', side_effect=range(100)):
+            cache.put(paths[0], predictions('GAN'))
+            cache.put(paths[1], predictions('GAN'))
+            # The first entry becomes the most recently used
+            self.assertIsNotNone(cache.get(paths[0]))
+            cache.put(paths[2], predictions('GAN'))
+        self.assertEqual(len(cache), 2)
+        self.assertIn(paths[0], cache)
+        self.assertNotIn(paths[1], cache)
+        self.assertIn(paths[2], cache)
+        cache.close()
+
+        # The entries persist
+        cache = OCRResultCache(
+            'model', path=osp.join(self.tmp_dir.name, 'cache.sqlite'))
+        self.assertEqual(len(cache), 2)
+        cache.close()
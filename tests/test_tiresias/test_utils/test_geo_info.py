@@ -0,0 +1,267 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+import tempfile
+from unittest import TestCase, mock
+
+import geopandas as gpd
+import shapely
+
+from tiresias.utils import geo_info
+
+
+def galerie_gdf(ids, xs, crs='EPSG:2154'):
+    """Unit squares whose lower left corners are at (x, 0)."""
+    return gpd.GeoDataFrame(
+        dict(GALERIE=ids),
+        geometry=[shapely.box(x, 0, x + 1, 1) for x in xs],
+        crs=crs)
+
+
+class TestGeoIndex(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = osp.join(self.tmp_dir.name, 'galerie.shp')
+        # B is exactly 0.5 away from A, C 0.2 away from B, D overlaps C and
+        # E is far from the others
+        self.gdf = galerie_gdf(['A', 'B', 'C', 'D', 'E'],
+                               [0, 1.5, 2.7, 3.2, 10])
+        self.gdf.to_file(self.filepath)
+        geo_indexes = mock.patch.dict(geo_info._GEO_INDEXES, clear=True)
+        geo_indexes.start()
+        self.addCleanup(geo_indexes.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_neighbors(self):
+        distance_max = 0.5
+        neighbors = geo_info.get_neighbors(
+            self.gdf, distance_max=distance_max, column_id='GALERIE')
+        expected = {
+            reference: [
+                other for other, other_geometry in zip(self.gdf['GALERIE'],
+                                                       self.gdf.geometry)
+                if other != reference
+                and geometry.distance(other_geometry) < distance_max
+            ]
+            for reference, geometry in zip(self.gdf['GALERIE'],
+                                           self.gdf.geometry)
+        }
+        self.assertEqual(neighbors, expected)
+        self.assertEqual(neighbors['A'], [])
+        self.assertEqual(neighbors['C'], ['B', 'D'])
+        self.assertEqual(
+            geo_info.get_neighbors(
+                self.gdf, distance_max=0.6, column_id='GALERIE')['A'], ['B'])
+
+    def test_build_geo_index(self):
+        geo_index = geo_info.build_geo_index(
+            self.gdf, distance_max=0.5, buffer_size=0.5, column_id='GALERIE')
+        self.assertEqual(geo_index.neighbors['D'], ['C'])
+        self.assertEqual(geo_index.centroids['A'], (0.5, 0.5))
+        self.assertEqual(set(geo_index.neighbor_crops['C']), {'B', 'D'})
+        # The neighbor B is cropped around its point nearest to C
+        crop = geo_index.neighbor_crops['C']['B']
+        self.assertGreater(crop.area, 0)
+        self.assertTrue(crop.within(shapely.box(2, 0, 2.5, 1)))
+
+    def load_geo_index(self, **kwargs):
+        with mock.patch.object(
+                geo_info, 'build_geo_index',
+                wraps=geo_info.build_geo_index) as build:
+            geo_index = geo_info.load_geo_index(
+                self.gdf, self.filepath, column_id='GALERIE', **kwargs)
+        return geo_index, build.called
+
+    def test_load_geo_index(self):
+        index_path = f'{self.filepath}.geoindex.pkl'
+        geo_index, built = self.load_geo_index(distance_max=0.5)
+        self.assertTrue(built)
+        self.assertTrue(osp.exists(index_path))
+        self.assertEqual(geo_index.source_digest,
+                         geo_info.shapefile_digest(self.filepath))
+
+        # The persisted index is reused by another process
+        geo_info._GEO_INDEXES.clear()
+        persisted, built = self.load_geo_index(distance_max=0.5)
+        self.assertFalse(built)
+        self.assertEqual(persisted.neighbors, geo_index.neighbors)
+
+        # But rebuilt for other parameters
+        geo_info._GEO_INDEXES.clear()
+        geo_index, built = self.load_geo_index(distance_max=0.6)
+        self.assertTrue(built)
+        self.assertEqual(geo_index.neighbors['A'], ['B'])
+        geo_info._GEO_INDEXES.clear()
+        _, built = self.load_geo_index(distance_max=0.6, buffer_size=5)
+        self.assertTrue(built)
+
+        # Or another content of the shapefile
+        geo_info._GEO_INDEXES.clear()
+        self.gdf = galerie_gdf(['A', 'B', 'C', 'D', 'E'],
+                               [0, 1.2, 2.7, 3.2, 10])
+        self.gdf.to_file(self.filepath)
+        geo_index, built = self.load_geo_index(distance_max=0.6)
+        self.assertTrue(built)
+        self.assertEqual(geo_index.neighbors['A'], ['B'])
+        self.assertEqual(geo_index.neighbors['B'], ['A', 'C'])
+
+    def test_load_geo_index_in_memory(self):
+        geo_index, _ = self.load_geo_index(distance_max=0.5)
+        self.assertIs(self.load_geo_index(distance_max=0.5)[0], geo_index)
+
+        # A new modification time only hashes the file again
+        stat = os.stat(self.filepath)
+        os.utime(
+            self.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        misses = geo_info._file_digest.cache_info().misses
+        reloaded, built = self.load_geo_index(distance_max=0.5)
+        self.assertEqual(geo_info._file_digest.cache_info().misses, misses + 1)
+        self.assertFalse(built)
+        self.assertIs(reloaded, geo_index)
+
+        # A new content invalidates the index in memory
+        self.gdf = galerie_gdf(['A', 'B', 'C', 'D', 'E'],
+                               [0, 1.2, 2.7, 3.2, 10])
+        self.gdf.to_file(self.filepath)
+        os.utime(
+            self.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        reloaded, built = self.load_geo_index(distance_max=0.5)
+        self.assertTrue(built)
+        self.assertEqual(reloaded.neighbors['A'], ['B'])
+        self.assertIs(
+            geo_info._GEO_INDEXES[(osp.abspath(self.filepath), 0.5, 10,
+                                   'GALERIE')], reloaded)
+
+    def test_load_geo_index_without_file(self):
+        geo_index = geo_info.load_geo_index(
+            self.gdf,
+            osp.join(self.tmp_dir.name, 'missing.shp'),
+            distance_max=0.5,
+            column_id='GALERIE')
+        self.assertIsNone(geo_index.source_digest)
+        self.assertEqual(geo_index.neighbors['C'], ['B', 'D'])
+        self.assertEqual(geo_info._GEO_INDEXES, {})
+
+
+def merge_geodataframe_baseline(gdf, id_nonunique, column_id):
+    """The merge of the non-unique identifiers by a groupby, as the
+    reference of ``merge_geodataframe``."""
+    new_geometries = []
+    new_identifiants = []
+    for identifier, group in gdf.groupby(column_id):
+        if len(identifier) > 3:
+            continue
+        if identifier in id_nonunique.keys():
+            new_geometries.append(shapely.unary_union(group['geometry']))
+        else:
+            new_geometries.append(group['geometry'].iloc[0])
+        new_identifiants.append(identifier)
+    return gpd.GeoDataFrame(
+        {
+            column_id: new_identifiants,
+            'geometry': new_geometries
+        }, crs=gdf.crs)
+
+
+class TestShapefile(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = osp.join(self.tmp_dir.name, 'galerie.shp')
+        self.gdf = galerie_gdf(
+            ['NED', 'GAN', None, 'GAM', 'GAN', 'GAN12', 'NED', 'BOS', 'NED'],
+            [0, 1, 2, 3, 1.5, 5, 6, 7, 10])
+        self.gdf['LEVEL'] = range(len(self.gdf))
+        self.gdf.to_file(self.filepath)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_merge_geodataframe(self):
+        merged = geo_info.check_id_unique(self.gdf, 'GALERIE')
+        expected = merge_geodataframe_baseline(self.gdf, dict(NED=3, GAN=2),
+                                               'GALERIE')
+        self.assertEqual(list(merged.columns), list(expected.columns))
+        self.assertEqual(merged['GALERIE'].tolist(),
+                         ['BOS', 'GAM', 'GAN', 'NED'])
+        self.assertEqual(merged['GALERIE'].tolist(),
+                         expected['GALERIE'].tolist())
+        for geometry, expected_geometry in zip(merged.geometry,
+                                               expected.geometry):
+            self.assertTrue(geometry.equals(expected_geometry))
+        self.assertEqual(merged.crs, self.gdf.crs)
+        self.assertAlmostEqual(
+            merged.geometry[merged['GALERIE'] == 'GAN'].iloc[0].area, 1.5)
+
+        # Unique identifiers are kept as they are
+        unique = self.gdf.iloc[[1, 3]]
+        self.assertIs(geo_info.check_id_unique(unique, 'GALERIE'), unique)
+
+    def load_shapefile(self):
+        with mock.patch.object(
+                geo_info.gpd, 'read_file', wraps=gpd.read_file) as read_file:
+            raw_gdf, gdf = geo_info.load_shapefile(
+                self.filepath, column_id='GALERIE')
+        self.assertEqual(len(raw_gdf), len(self.gdf))
+        return gdf, read_file.called
+
+    def sidecars(self):
+        if geo_info.CACHE_FORMAT == 'parquet':
+            return [
+                f'{self.filepath}.raw.parquet',
+                f'{self.filepath}.merged.parquet'
+            ]
+        return [f'{self.filepath}.cache.pkl']
+
+    def test_load_shapefile(self):
+        gdf, parsed = self.load_shapefile()
+        self.assertTrue(parsed)
+        self.assertEqual(gdf['GALERIE'].tolist(), ['BOS', 'GAM', 'GAN', 'NED'])
+        for sidecar in self.sidecars() + [f'{self.filepath}.cache.json']:
+            self.assertTrue(osp.exists(sidecar))
+
+        # The cache is reused while the shapefile is unchanged
+        cached, parsed = self.load_shapefile()
+        self.assertFalse(parsed)
+        self.assertTrue(cached.geometry.geom_equals(gdf.geometry).all())
+
+        # Or only touched
+        stat = os.stat(self.filepath)
+        os.utime(
+            self.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        _, parsed = self.load_shapefile()
+        self.assertFalse(parsed)
+
+        # But rebuilt once its content changes
+        self.gdf.loc[self.gdf['GALERIE'] == 'BOS', 'GALERIE'] = 'BOT'
+        self.gdf.to_file(self.filepath)
+        os.utime(
+            self.filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        gdf, parsed = self.load_shapefile()
+        self.assertTrue(parsed)
+        self.assertEqual(gdf['GALERIE'].tolist(), ['BOT', 'GAM', 'GAN', 'NED'])
+
+    def test_load_shapefile_broken_cache(self):
+        self.load_shapefile()
+        # A missing sidecar
+        os.remove(self.sidecars()[-1])
+        gdf, parsed = self.load_shapefile()
+        self.assertTrue(parsed)
+        self.assertEqual(len(gdf), 4)
+        self.assertFalse(self.load_shapefile()[1])
+
+        # A corrupt one
+        with open(self.sidecars()[-1], 'wb') as f:
+            f.write(b'corrupt')
+        gdf, parsed = self.load_shapefile()
+        self.assertTrue(parsed)
+        self.assertEqual(len(gdf), 4)
+        self.assertFalse(self.load_shapefile()[1])
+
+    def test_load_shapefile_pickle(self):
+        with mock.patch.object(geo_info, 'CACHE_FORMAT', 'pickle'):
+            self.test_load_shapefile()
+            self.test_load_shapefile_broken_cache()
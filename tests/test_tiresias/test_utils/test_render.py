@@ -0,0 +1,40 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import numpy as np
+import shapely
+
+from tiresias.utils.render import Basemap, fill_pixel_polygons
+
+
+class TestRender(TestCase):
+
+    def setUp(self):
+        basemap = Basemap(
+            raster=np.zeros((20, 20, 3), dtype=np.uint8),
+            scale=1.,
+            origin=(0., 20.),
+            pad=0,
+            polygons={})
+        polygon = shapely.Polygon([(0, 0), (19, 0), (19, 19), (0, 19)],
+                                  [[(5, 5), (14, 5), (14, 14), (5, 14)]])
+        self.pixel_polygons = basemap.geometry_to_pixels(polygon)
+
+    def test_fill_pixel_polygons(self):
+        color = (255, 0, 0)
+        # Holes are left as they are
+        img = np.full((20, 20, 3), 7, dtype=np.uint8)
+        fill_pixel_polygons(img, self.pixel_polygons, color)
+        self.assertEqual(img[2, 2].tolist(), list(color))
+        self.assertEqual(img[10, 10].tolist(), [7, 7, 7])
+
+        # Or restored from the background
+        img = np.full((20, 20, 3), 7, dtype=np.uint8)
+        background = np.full_like(img, 3)
+        fill_pixel_polygons(
+            img, self.pixel_polygons, color, background=background)
+        self.assertEqual(img[2, 2].tolist(), list(color))
+        self.assertEqual(img[10, 10].tolist(), [3, 3, 3])
+
+        fill_pixel_polygons(img, [], color)
+        self.assertEqual(img[10, 10].tolist(), [3, 3, 3])
@@ -0,0 +1,89 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import subprocess
+import sys
+from unittest import TestCase
+
+from mmocr.registry_manifest import EXPORT_MANIFEST, REGISTRY_MANIFEST
+from mmocr.utils import (collect_export_manifest, collect_registry_manifest,
+                         import_package)
+
+
+def run_isolated(script: str) -> str:
+    """Run a script in a fresh interpreter, where nothing is imported yet."""
+    return subprocess.run([sys.executable, '-c', script],
+                          check=True,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL,
+                          universal_newlines=True).stdout.strip()
+
+
+class TestLazyImport(TestCase):
+
+    def test_manifests(self):
+        # Run .dev_scripts/update_registry_manifest.py if this fails
+        self.assertEqual(collect_registry_manifest(), REGISTRY_MANIFEST)
+        self.assertEqual(collect_export_manifest(), EXPORT_MANIFEST)
+
+    def test_import_mmocr(self):
+        output = run_isolated('import sys\n'
+                              'import mmocr\n'
+                              'print("torch" in sys.modules, '
+                              '"mmcv" in sys.modules)')
+        self.assertEqual(output, 'False False')
+
+    def test_lazy_package(self):
+        output = run_isolated(
+            'import sys\n'
+            'import mmocr.models\n'
+            'print("mmocr.models.textrecog" in sys.modules)\n'
+            'from mmocr.models import CRNN\n'
+            'print(CRNN.__module__)\n'
+            '# Names exported but not registered\n'
+            'from mmocr.models.common import PositionalEncoding\n'
+            'print(PositionalEncoding.__module__)\n'
+            'for name in ("mmocr.models.textdet", "mmdet.models", '
+            '"mmocr.models.textrecog.backbones.mobilenet_v2"):\n'
+            '    print(name in sys.modules)\n')
+        self.assertEqual(output.splitlines(), [
+            'False', 'mmocr.models.textrecog.recognizers.crnn',
+            'mmocr.models.common.modules.transformer_module', 'False', 'False',
+            'False'
+        ])
+
+        import mmocr.models.textrecog as textrecog
+        with self.assertRaisesRegex(AttributeError, 'no attribute'):
+            textrecog.NotAModule
+        with self.assertRaisesRegex(AttributeError, 'no attribute'):
+            textrecog._private
+        self.assertIn('CRNN', textrecog.__all__)
+        self.assertIn('MobileNetV2', textrecog.__all__)
+
+    def test_import_package(self):
+        import_package('mmocr.models')
+        self.assertIn('mmocr.models.textrecog.backbones.mobilenet_v2',
+                      sys.modules)
+        self.assertIn('mmocr.models.kie.heads.sdmgr_head', sys.modules)
+
+    def test_lazy_registry(self):
+        output = run_isolated(
+            'import sys\n'
+            'from mmocr.registry import MODELS, TRANSFORMS\n'
+            'print(MODELS.get("CRNN").__name__, MODELS._imported)\n'
+            'print(TRANSFORMS.get("LoadImageFromFile").__module__)\n'
+            '# Types of the parent registries import nothing from mmocr\n'
+            'print(MODELS.get("mmdet.ResNet").__name__, MODELS._imported)\n'
+            'print(MODELS.get("Conv2d").__name__, MODELS._imported)\n'
+            'for name in ("mmocr.models.textdet", "imgaug"):\n'
+            '    print(name in sys.modules)\n')
+        self.assertEqual(output.splitlines(), [
+            'CRNN False', 'mmocr.datasets.transforms.loading', 'ResNet False',
+            'Conv2d False', 'False', 'False'
+        ])
+
+        # The locations are imported if the manifest is outdated
+        output = run_isolated(
+            'from mmocr.registry import MODELS, REGISTRY_MANIFEST\n'
+            'del REGISTRY_MANIFEST["model"]["DBNet"]\n'
+            'print(MODELS.get("DBNet").__name__, MODELS._imported)\n'
+            'print(MODELS.get("NotAModule"))\n')
+        self.assertEqual(output.splitlines(), ['DBNet True', 'None'])
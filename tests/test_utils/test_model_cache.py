@@ -0,0 +1,116 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+import tempfile
+from unittest import TestCase, mock
+
+import torch
+import torch.nn as nn
+
+from mmocr.utils import (get_cache_dir, load_checkpoint_mmap, load_config,
+                         load_metafile_index, skip_init)
+from mmocr.utils.model_cache import checkpoint_covers, get_local_checkpoint
+
+
+class TestModelCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = osp.join(self.tmp_dir.name, 'cache')
+        env = mock.patch.dict(os.environ, MMOCR_CACHE_DIR=self.cache_dir)
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, filename, text):
+        path = osp.join(self.tmp_dir.name, filename)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_get_cache_dir(self):
+        self.assertEqual(get_cache_dir(), self.cache_dir)
+        with mock.patch.dict(os.environ, MMOCR_CACHE_DIR=''):
+            self.assertIsNone(get_cache_dir())
+
+    def test_load_config(self):
+        base = self.write('base.py', 'a = 1\nb = dict(c=2)\n')
+        path = self.write(
+            'cfg.py', "_base_ = ['base.py']\n"
+            "b = dict(d='{{$MMOCR_TEST_VAR:x}}')\n")
+        cfg = load_config(path)
+        self.assertEqual(cfg.to_dict(), dict(a=1, b=dict(c=2, d='x')))
+        self.assertEqual(
+            len(os.listdir(osp.join(self.cache_dir, 'configs'))), 1)
+
+        # Loaded from the cache
+        with mock.patch('mmengine.config.Config.fromfile') as fromfile:
+            self.assertEqual(load_config(path).to_dict(), cfg.to_dict())
+            fromfile.assert_not_called()
+
+        # Parsed again if a base is modified or an env variable changes
+        with open(base, 'w') as f:
+            f.write('a = 10\nb = dict(c=2)\n')
+        self.assertEqual(load_config(path).a, 10)
+        with mock.patch.dict(os.environ, MMOCR_TEST_VAR='y'):
+            self.assertEqual(load_config(path).b.d, 'y')
+
+        # Nothing is cached if disabled
+        with mock.patch.dict(os.environ, MMOCR_CACHE_DIR=''):
+            path = self.write('cfg2.py', 'a = 2\n')
+            self.assertEqual(load_config(path).a, 2)
+        self.assertEqual(
+            len(os.listdir(osp.join(self.cache_dir, 'configs'))), 1)
+
+    def test_load_metafile_index(self):
+        index = load_metafile_index('.')
+        config, weights = index['crnn']
+        self.assertEqual(
+            config,
+            osp.join('.', 'configs', 'textrecog', 'crnn',
+                     'crnn_mini-vgg_5e_mj.py'))
+        self.assertTrue(weights.endswith('.pth'))
+        self.assertEqual(index['crnn_mini-vgg_5e_mj'], index['crnn'])
+        with mock.patch('mmocr.utils.model_cache.load') as load:
+            self.assertEqual(load_metafile_index('.'), index)
+            load.assert_not_called()
+
+    def test_load_checkpoint_mmap(self):
+        model = nn.Linear(4, 2)
+        path = osp.join(self.tmp_dir.name, 'model.pth')
+        torch.save(dict(state_dict=model.state_dict()), path)
+        checkpoint = load_checkpoint_mmap(path)
+        self.assertTrue(
+            torch.equal(checkpoint['state_dict']['weight'], model.weight))
+        self.assertTrue(checkpoint_covers(model, checkpoint))
+        self.assertFalse(checkpoint_covers(nn.BatchNorm1d(2), checkpoint))
+
+        # Legacy checkpoints can't be memory mapped
+        torch.save(
+            model.state_dict(), path, _use_new_zipfile_serialization=False)
+        self.assertIsNone(load_checkpoint_mmap(path))
+
+    def test_get_local_checkpoint(self):
+        path = self.write('model.pth', '')
+        self.assertEqual(get_local_checkpoint(path), path)
+        self.assertIsNone(get_local_checkpoint(path + '.missing'))
+        with mock.patch('torch.hub.get_dir', return_value=self.tmp_dir.name):
+            os.makedirs(osp.join(self.tmp_dir.name, 'checkpoints'))
+            self.assertIsNone(
+                get_local_checkpoint('https://example.com/a/model.pth'))
+            path = self.write(osp.join('checkpoints', 'model.pth'), '')
+            self.assertEqual(
+                get_local_checkpoint('https://example.com/a/model.pth'), path)
+
+    def test_skip_init(self):
+        uniform = nn.init.uniform_
+        torch.manual_seed(0)
+        with skip_init():
+            nn.Sequential(nn.Linear(4, 4), nn.Conv2d(3, 4, 3), nn.LSTM(4, 4))
+        # No random number is drawn
+        value = torch.rand(1)
+        torch.manual_seed(0)
+        self.assertTrue(torch.equal(torch.rand(1), value))
+        self.assertIs(nn.init.uniform_, uniform)
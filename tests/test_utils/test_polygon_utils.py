@@ -8,7 +8,7 @@ from shapely.geometry import MultiPolygon, Polygon
 
 from mmocr.utils import (boundary_iou, crop_polygon, offset_polygon, poly2bbox,
                          poly2shapely, poly_intersection, poly_iou,
-                         poly_make_valid, poly_union, polys2shapely,
+                         poly_make_valid, poly_nms, poly_union, polys2shapely,
                          rescale_polygon, rescale_polygons, shapely2poly,
                          sort_points, sort_vertex, sort_vertex8)
 
@@ -182,6 +182,26 @@ class TestPolygonUtils(unittest.TestCase):
         poly = poly_make_valid(poly)
         self.assertTrue(poly.is_valid)
 
+    def test_poly_nms(self):
+        self.assertEqual(poly_nms([], [], 0.5), [])
+        polygons = [
+            np.array([0, 0, 10, 0, 10, 10, 0, 10]),
+            np.array([1, 0, 11, 0, 11, 10, 1, 10]),
+            np.array([20, 0, 30, 0, 30, 10, 20, 10]),
+            np.array([2, 2, 5, 2, 5, 5, 2, 5]),
+        ]
+        scores = [0.8, 0.9, 0.7, 0.6]
+        # The small polygon inside the first one survives under 'iou' mode
+        self.assertEqual(poly_nms(polygons, scores, 0.5), [1, 2, 3])
+        self.assertEqual(poly_nms(polygons, scores, 0.9), [1, 0, 2, 3])
+        # but is suppressed under 'iom' mode
+        self.assertEqual(poly_nms(polygons, scores, 0.5, mode='iom'), [1, 2])
+        # polygons with different numbers of vertices
+        polygons[2] = np.array([0, 0, 5, 0, 10, 0, 10, 10, 0, 10])
+        self.assertEqual(poly_nms(polygons, scores, 0.5), [1, 3])
+        with self.assertRaises(AssertionError):
+            poly_nms(polygons, scores, 0.5, mode='giou')
+
     def test_poly_intersection(self):
 
         # test unsupported type
@@ -0,0 +1,104 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import tempfile
+from unittest import TestCase
+
+import mmengine
+import torch
+import torch.nn as nn
+
+from mmocr.utils import InferenceProfiler, get_active_profiler, profile_span
+
+
+class ToyPostprocessor:
+
+    def __init__(self):
+        self.scale = 2
+
+    def __call__(self, x):
+        return x * self.scale
+
+
+class ToyHead(nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.linear = nn.Linear(4, 2)
+        self.postprocessor = ToyPostprocessor()
+
+    def forward(self, x):
+        return self.linear(x)
+
+
+class ToyModel(nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.backbone = nn.Linear(4, 4)
+        self.head = ToyHead()
+
+    def forward(self, x):
+        return self.head.postprocessor(self.head(self.backbone(x)))
+
+
+class TestInferenceProfiler(TestCase):
+
+    def test_profile_span(self):
+        # A shared no-op context manager is returned when disabled
+        self.assertIsNone(get_active_profiler())
+        self.assertIs(profile_span('a'), profile_span('b'))
+        with InferenceProfiler() as profiler:
+            self.assertIs(get_active_profiler(), profiler)
+            with profile_span('outer', 'batch', batch_idx=0):
+                with profile_span('inner'):
+                    pass
+            with InferenceProfiler() as nested:
+                with profile_span('nested'):
+                    pass
+            self.assertIs(get_active_profiler(), profiler)
+        self.assertIsNone(get_active_profiler())
+        with profile_span('ignored'):
+            pass
+        self.assertEqual([event['name'] for event in profiler.events],
+                         ['inner', 'outer'])
+        self.assertEqual(profiler.events[1]['args'], dict(batch_idx=0))
+        self.assertGreaterEqual(profiler.events[1]['dur'],
+                                profiler.events[0]['dur'])
+        self.assertEqual([event['name'] for event in nested.events],
+                         ['nested'])
+
+    def test_watch_model(self):
+        model = ToyModel()
+        postprocessor = model.head.postprocessor
+        profiler = InferenceProfiler()
+        with profiler.watch_model(model):
+            self.assertEqual(model.head.postprocessor.scale, 2)
+            for _ in range(2):
+                model(torch.rand(3, 4))
+        names = [row['name'] for row in profiler.summary()]
+        self.assertCountEqual(names, [
+            'ToyModel.backbone', 'ToyModel.head', 'ToyModel.head.postprocessor'
+        ])
+        for row in profiler.summary():
+            self.assertEqual(row['count'], 2)
+            self.assertGreaterEqual(row['max_ms'], row['mean_ms'])
+        # The model is restored
+        self.assertIs(model.head.postprocessor, postprocessor)
+        model(torch.rand(3, 4))
+        self.assertEqual(len(profiler.events), 6)
+
+    def test_export(self):
+        with InferenceProfiler() as profiler:
+            with profile_span('forward', 'forward', batch_size=2):
+                pass
+        table = profiler.table()
+        self.assertIn('forward', table.splitlines()[1])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = osp.join(tmp_dir, 'trace.json')
+            profiler.export_chrome_trace(path)
+            trace = mmengine.load(path)
+        event = trace['traceEvents'][0]
+        self.assertEqual(event['name'], 'forward')
+        self.assertEqual(event['ph'], 'X')
+        self.assertEqual(event['args'], dict(batch_size=2))
+        self.assertAlmostEqual(event['dur'] * 1e3, profiler.events[0]['dur'])
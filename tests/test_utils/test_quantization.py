@@ -0,0 +1,59 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import torch
+import torch.nn as nn
+
+from mmocr.utils import quantize_dynamic, quantize_static
+
+
+class ToyModel(nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.backbone = nn.Sequential(
+            nn.Conv2d(3, 8, 3, padding=1), nn.BatchNorm2d(8), nn.ReLU())
+        self.head = nn.Linear(8, 4)
+
+    def forward(self, x):
+        return self.head(self.backbone(x).mean((2, 3)))
+
+
+class TestQuantization(TestCase):
+
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = ToyModel().eval()
+        self.inputs = [torch.rand(2, 3, 16, 16) for _ in range(4)]
+
+    def test_quantize_dynamic(self):
+        expected = self.model(self.inputs[0])
+        model = quantize_dynamic(self.model)
+        self.assertIs(model, self.model)
+        self.assertIsInstance(model.head, torch.ao.nn.quantized.dynamic.Linear)
+        self.assertIsInstance(model.backbone[0], nn.Conv2d)
+        self.assertTrue(
+            torch.allclose(model(self.inputs[0]), expected, atol=0.05))
+
+    def test_quantize_static(self):
+        expected = self.model(self.inputs[0])
+        num_calls = []
+
+        def calibrate():
+            num_calls.append(1)
+            for inputs in self.inputs:
+                self.model(inputs)
+
+        model = quantize_static(self.model, calibrate)
+        self.assertEqual(len(num_calls), 1)
+        self.assertIsInstance(model.backbone, torch.fx.GraphModule)
+        self.assertIsInstance(model.head, nn.Linear)
+        self.assertTrue(
+            torch.allclose(model(self.inputs[0]), expected, atol=0.05))
+
+        with self.assertRaisesRegex(ValueError, 'did not run'):
+            quantize_static(ToyModel().eval(), lambda: None)
+
+    def test_cpu_only(self):
+        with self.assertRaisesRegex(ValueError, 'CPU'):
+            quantize_dynamic(self.model.to('meta'))
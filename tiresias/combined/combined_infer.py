@@ -0,0 +1,177 @@
+import concurrent.futures
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import mmdet.models.detectors
+import mmdet.structures.det_data_sample
+import numpy as np
+import shapely
+from mmocr.apis import MMOCRInferencer
+
+import tiresias.detection.detection_infer
+import tiresias.utils.data
+from tiresias.config import DETECTION_ALLOW_INPUT
+from tiresias.ocr.galerie_matcher import GalerieMatcher
+from tiresias.ocr.ocr_cache import OCRResultCache
+
+COMBINED_STAGES = ('decode', 'detection', 'ocr', 'merge')
+
+
+def _text_geometries(polygons: Sequence[Sequence[float]]) -> np.ndarray:
+    """Build shapely polygons from flat [x1, y1, x2, y2, ...] coordinates, e.g. `det_polygons`."""
+    return np.array([shapely.Polygon(np.asarray(polygon, dtype=np.float64).reshape(-1, 2)) for polygon in polygons],
+                    dtype=object)
+
+
+def merge_predictions(img_path: str, result: mmdet.structures.det_data_sample.DetDataSample,
+                      ocr_prediction: Dict[str, Any], classes: Optional[Sequence[str]] = None,
+                      matcher: Optional[GalerieMatcher] = None, pred_score_thr: float = 0.5) -> Dict[str, Any]:
+    """
+    Merge the object detection and OCR predictions of one image in a single record.
+
+    Each object is labelled with the galerie of the nearest recognized text matching a galerie name,
+    i.e. the matched text polygon at the smallest distance of its bounding box. Without a matcher,
+    the raw recognitions are not galerie names, so the texts and objects are left unlabelled.
+
+    Args:
+        img_path (str): Path to the image.
+        result (DetDataSample): Detection results of the image.
+        ocr_prediction (Dict[str, Any]): A single OCR prediction of `MMOCRInferencer`, with the keys
+            'det_polygons', 'det_scores', 'rec_texts' and 'rec_scores'.
+        classes (Optional[Sequence[str]], optional): Class names of the detector. Defaults to None.
+        matcher (Optional[GalerieMatcher], optional): Matcher of the galerie names. Defaults to None,
+            in which case no galerie is assigned.
+        pred_score_thr (float, optional): Score threshold of the objects. Defaults to 0.5.
+
+    Returns:
+        Dict[str, Any]: The record with the keys
+            - 'img_path': the path to the image,
+            - 'texts': a list of dicts with 'text', 'score', 'polygon' and 'galerie' (None if not matched),
+            - 'objects': a list of dicts with 'label', 'class_name', 'score', 'bbox', and the 'galerie'
+              nearest to the object with its 'galerie_distance' in pixels (None if no label),
+            - 'galerie': the galerie of the most confident matched text, or None.
+    """
+    rec_texts = ocr_prediction['rec_texts']
+    galeries = matcher.match_many(rec_texts) if matcher is not None else [None] * len(rec_texts)
+    texts = [dict(text=text, score=float(score), polygon=[float(c) for c in polygon], galerie=galerie)
+             for text, score, polygon, galerie in zip(rec_texts, ocr_prediction['rec_scores'],
+                                                      ocr_prediction['det_polygons'], galeries)]
+    labelled = [text for text in texts if text['galerie'] is not None]
+    label_geometries = _text_geometries([text['polygon'] for text in labelled])
+
+    pred_instances = result.pred_instances
+    keep = pred_instances.scores > pred_score_thr
+    bboxes = pred_instances.bboxes[keep].cpu().numpy()
+    labels = pred_instances.labels[keep].cpu().numpy()
+    scores = pred_instances.scores[keep].cpu().numpy()
+    objects = []
+    if len(bboxes) and len(labelled):
+        boxes = shapely.box(bboxes[:, 0], bboxes[:, 1], bboxes[:, 2], bboxes[:, 3])
+        distances = shapely.distance(boxes[:, None], label_geometries[None, :])
+        nearest = distances.argmin(axis=1)
+    for i, (bbox, label, score) in enumerate(zip(bboxes, labels, scores)):
+        galerie, galerie_distance = None, None
+        if len(labelled):
+            galerie = labelled[nearest[i]]['galerie']
+            galerie_distance = float(distances[i, nearest[i]])
+        objects.append(dict(label=int(label), class_name=classes[label] if classes is not None else None,
+                            score=float(score), bbox=[float(c) for c in bbox], galerie=galerie,
+                            galerie_distance=galerie_distance))
+    return dict(img_path=img_path, texts=texts, objects=objects,
+                galerie=max(labelled, key=lambda text: text['score'])['galerie'] if labelled else None)
+
+
+def infer_combined(
+    inputs: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]],
+    detector: mmdet.models.detectors.BaseDetector,
+    mmocr: Optional[MMOCRInferencer],
+    matcher: Optional[GalerieMatcher] = None,
+    cache: Optional[OCRResultCache] = None,
+    batch_size: int = 4,
+    num_workers: int = 2,
+    prefetch: int = 2,
+    parallel: bool = True,
+    pred_score_thr: float = 0.5,
+    timings: Optional[Dict[str, List[float]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Perform object detection and OCR on the same photos, decoding each photo only once.
+
+    Batches of photos are decoded by `tiresias.utils.data.iter_decoded_batches`, and the same arrays
+    are given to the detector and to the OCR models. With `parallel`, the OCR of a batch runs in a
+    worker thread while the detector runs in the calling thread; PyTorch releases the GIL in its
+    operators, so both models compute at the same time. On a CPU with few cores, the intra-op
+    threads of both models compete, and `parallel=False` may be faster.
+
+    Args:
+        inputs (Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]]): A path to an image or a
+            directory, or a list of image paths.
+        detector (mmdet.models.detectors.BaseDetector): Inference detector object.
+        mmocr (Optional[MMOCRInferencer]): OCR inferencer. It may be None if all the images are cached.
+        matcher (Optional[GalerieMatcher], optional): Matcher of the galerie names, see `merge_predictions`.
+            Defaults to None.
+        cache (Optional[OCRResultCache], optional): Cache of OCR predictions, keyed by the image files.
+            Defaults to None.
+        batch_size (int, optional): Number of images per batch. Defaults to 4.
+        num_workers (int, optional): Number of decoding threads. Defaults to 2.
+        prefetch (int, optional): Number of batches decoded in advance. Defaults to 2.
+        parallel (bool, optional): Whether to run the OCR concurrently with the detector. Defaults to True.
+        pred_score_thr (float, optional): Score threshold of the objects. Defaults to 0.5.
+        timings (Optional[Dict[str, List[float]]], optional): If given, the durations in seconds of the
+            stages in COMBINED_STAGES are appended to it, per image for 'decode' and per batch for the
+            others. Defaults to None.
+
+    Yields:
+        Dict[str, Any]: The merged record of each image, in the input order, see `merge_predictions`.
+
+    Example:
+        >>> matcher = GalerieMatcher(galerie_gdf['GALERIE'])
+        >>> for record in infer_combined('photos/', detector, mmocr, matcher=matcher):
+        ...     print(record['img_path'], [(o['class_name'], o['galerie']) for o in record['objects']])
+    """
+    if isinstance(inputs, (str, os.PathLike)):
+        inputs = tiresias.utils.data.get_path_from_input(input_path=inputs, allowed_extensions=DETECTION_ALLOW_INPUT)
+    if timings is None:
+        timings = {}
+    for stage in COMBINED_STAGES:
+        timings.setdefault(stage, [])
+    classes = (detector.dataset_meta or {}).get('classes')
+
+    def run_ocr(imgs):
+        a = time.perf_counter()
+        predictions = mmocr(list(imgs), batch_size=len(imgs))['predictions'] if imgs else []
+        timings['ocr'].append(time.perf_counter() - a)
+        return [dict(predictions=[prediction]) for prediction in predictions]
+
+    def run_detection(img_paths, imgs):
+        a = time.perf_counter()
+        results = tiresias.detection.detection_infer.predict_decoded_batch(detector, imgs, img_paths)
+        timings['detection'].append(time.perf_counter() - a)
+        return results
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        for batch in tiresias.utils.data.iter_decoded_batches(inputs, batch_size=batch_size, num_workers=num_workers, prefetch=prefetch):
+            img_paths, imgs, decode_times = zip(*batch)
+            timings['decode'].extend(decode_times)
+            # The SQLite connection of the cache is only used in the calling thread
+            ocr_predictions = [cache.get(img_path) if cache is not None else None for img_path in img_paths]
+            missing = [i for i, prediction in enumerate(ocr_predictions) if prediction is None]
+            missing_imgs = [imgs[i] for i in missing]
+            if parallel:
+                ocr_future = executor.submit(run_ocr, missing_imgs)
+                results = run_detection(img_paths, imgs)
+                inferred = ocr_future.result()
+            else:
+                results = run_detection(img_paths, imgs)
+                inferred = run_ocr(missing_imgs)
+            for i, prediction in zip(missing, inferred):
+                ocr_predictions[i] = prediction
+                if cache is not None:
+                    cache.put(img_paths[i], prediction)
+            a = time.perf_counter()
+            records = [merge_predictions(img_path, result, ocr_prediction['predictions'][0], classes=classes,
+                                         matcher=matcher, pred_score_thr=pred_score_thr)
+                       for img_path, result, ocr_prediction in zip(img_paths, results, ocr_predictions)]
+            timings['merge'].append(time.perf_counter() - a)
+            yield from records
@@ -5,8 +5,22 @@ OCR_CONFIG = {
     "rec_weights": './tiresias/model/ocr/svtr-small_20e_st_mj-35d800d6.pth'
 }
 
+OCR_CACHE = {
+    'path': './tiresias/data/cache/ocr_results.sqlite',
+    'max_bytes': 256 * 1024 ** 2
+}
+
+OCR_BENCHMARK = {
+    'demo_dir': './tiresias/data/img/ocr/demo',
+    'resolutions': [(640, 480), (1280, 960), (2560, 1920)],
+    'n_synthetic': 4,
+    'allowed_extensions': {'.jpg', '.JPG', '.jpeg', '.JPEG', '.png', '.PNG'}
+}
+
 OCR_ALLOW_INPUT = {".jpg", ".JPG", ".jpeg", ".JPEG"}
 
+DETECTION_ALLOW_INPUT = {".jpg", ".JPG", ".jpeg", ".JPEG", ".png", ".PNG"}
+
 OCR_DISPLAY_VAR = {
     'neighbor_color': 'red',
     'ocr_color': 'yellow',
@@ -1,7 +1,19 @@
+import copy
+import os
 import time
+import numpy as np
+import torch
 import mmdet.models.detectors
 import mmdet.structures.det_data_sample
+from mmcv.transforms import Compose
+from mmengine.registry import DefaultScope
 from mmdet.apis import init_detector, inference_detector
+from mmdet.utils import get_test_pipeline_cfg
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import tiresias.utils.data
+from tiresias.config import DETECTION_ALLOW_INPUT
+
+DETECTION_STAGES = ('decode', 'preprocess', 'forward', 'nms')
 
 
 def load_inference_detector(config_file: str, checkpoint_file: str, device: str) -> mmdet.models.detectors.BaseDetector:
@@ -19,11 +31,11 @@ def load_inference_detector(config_file: str, checkpoint_file: str, device: str)
     return model
 
 
-def infer_detection(img_path: str, inferencer: mmdet.models.detectors.BaseDetector, timing: bool = False) -> mmdet.structures.det_data_sample.DetDataSample:
+def infer_detection(img_path: Union[str, np.ndarray], inferencer: mmdet.models.detectors.BaseDetector, timing: bool = False) -> mmdet.structures.det_data_sample.DetDataSample:
     """Perform object detection inference on an image using the given detector.
 
     Args:
-        img_path (str): Path to the input image.
+        img_path (Union[str, np.ndarray]): Path to the input image, or the decoded BGR image.
         inferencer (mmdet.models.detectors.BaseDetector): Inference detector object.
         timing (bool, optional): Whether to measure inference timing. Defaults to False.
 
@@ -44,3 +56,142 @@ def infer_detection(img_path: str, inferencer: mmdet.models.detectors.BaseDetect
     return result
 
 
+def _get_test_pipeline(inferencer: mmdet.models.detectors.BaseDetector) -> Compose:
+    """Return the test pipeline of a detector for decoded images, built on the first call only."""
+    if getattr(inferencer, '_tiresias_test_pipeline', None) is None:
+        pipeline_cfg = get_test_pipeline_cfg(copy.deepcopy(inferencer.cfg))
+        pipeline_cfg[0].type = 'mmdet.LoadImageFromNDArray'
+        # Other OpenMMLab inferencers (e.g. MMOCR) may have changed the default registry scope
+        with DefaultScope.overwrite_default_scope(inferencer.cfg.get('default_scope', 'mmdet')):
+            inferencer._tiresias_test_pipeline = Compose(pipeline_cfg)
+    return inferencer._tiresias_test_pipeline
+
+
+def _collate(pipeline: Compose, imgs: Sequence[np.ndarray], img_paths: Sequence[str]) -> Dict[str, list]:
+    """Run decoded images through the test pipeline and gather them in a batch for `_predict_batch`."""
+    data = {'inputs': [], 'data_samples': []}
+    for img, img_path in zip(imgs, img_paths):
+        # TODO: remove img_id, as in mmdet.apis.inference_detector
+        data_ = pipeline(dict(img=img, img_id=0))
+        # LoadImageFromNDArray discards the path of the image
+        data_['data_samples'].set_metainfo(dict(img_path=img_path))
+        data['inputs'].append(data_['inputs'])
+        data['data_samples'].append(data_['data_samples'])
+    return data
+
+
+def _synchronize(inferencer: mmdet.models.detectors.BaseDetector):
+    if inferencer.data_preprocessor.device.type == 'cuda':
+        torch.cuda.synchronize()
+
+
+@torch.no_grad()
+def _predict_batch(inferencer: mmdet.models.detectors.BaseDetector, data: Dict, timings: Dict[str, List[float]]) -> List[mmdet.structures.det_data_sample.DetDataSample]:
+    """Run a collated batch through the detector, timing the data preprocessor, forward and NMS stages.
+
+    The NMS is only timed separately for single-stage detectors, whose head exposes
+    `predict_by_feat`. For other detectors it is included in the forward stage.
+    """
+    a = time.perf_counter()
+    data = inferencer.data_preprocessor(data, False)
+    _synchronize(inferencer)
+    b = time.perf_counter()
+    timings['preprocess'].append(b - a)
+    if isinstance(inferencer, mmdet.models.detectors.SingleStageDetector):
+        outs = inferencer.bbox_head(inferencer.extract_feat(data['inputs']))
+        _synchronize(inferencer)
+        c = time.perf_counter()
+        batch_img_metas = [data_sample.metainfo for data_sample in data['data_samples']]
+        results_list = inferencer.bbox_head.predict_by_feat(*outs, batch_img_metas=batch_img_metas, rescale=True)
+        results = inferencer.add_pred_to_datasample(data['data_samples'], results_list)
+        _synchronize(inferencer)
+        timings['forward'].append(c - b)
+        timings['nms'].append(time.perf_counter() - c)
+    else:
+        results = inferencer(**data, mode='predict')
+        _synchronize(inferencer)
+        timings['forward'].append(time.perf_counter() - b)
+    return results
+
+
+def predict_decoded_batch(
+    inferencer: mmdet.models.detectors.BaseDetector,
+    imgs: Sequence[np.ndarray],
+    img_paths: Sequence[str],
+    timings: Optional[Dict[str, List[float]]] = None
+) -> List[mmdet.structures.det_data_sample.DetDataSample]:
+    """Perform object detection on a batch of decoded images in a single forward pass.
+
+    Args:
+        inferencer (mmdet.models.detectors.BaseDetector): Inference detector object.
+        imgs (Sequence[np.ndarray]): The decoded BGR images.
+        img_paths (Sequence[str]): The path of each image, set in the results.
+        timings (Optional[Dict[str, List[float]]], optional): If given, the durations in seconds of the
+            'preprocess', 'forward' and 'nms' stages of the batch are appended to it. Defaults to None.
+
+    Returns:
+        List[DetDataSample]: The detection results of each image.
+    """
+    if timings is None:
+        timings = {}
+    for stage in DETECTION_STAGES[1:]:
+        timings.setdefault(stage, [])
+    pipeline = _get_test_pipeline(inferencer)
+    a = time.perf_counter()
+    data = _collate(pipeline, imgs, img_paths)
+    pipeline_time = time.perf_counter() - a
+    results = _predict_batch(inferencer, data, timings)
+    timings['preprocess'][-1] += pipeline_time
+    return results
+
+
+def infer_detection_batch(
+    inputs: Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]],
+    inferencer: mmdet.models.detectors.BaseDetector,
+    batch_size: int = 4,
+    num_workers: int = 2,
+    prefetch: int = 2,
+    timings: Optional[Dict[str, List[float]]] = None
+) -> Iterator[Tuple[str, mmdet.structures.det_data_sample.DetDataSample]]:
+    """Perform object detection on many images, streaming the results in the input order.
+
+    Images are decoded by a pool of workers ahead of the model, up to `prefetch` batches in
+    advance, and fed to the detector by batches of `batch_size`.
+
+    Args:
+        inputs (Union[str, os.PathLike, Sequence[Union[str, os.PathLike]]]): A path to an image or a
+            directory, or a list of image paths.
+        inferencer (mmdet.models.detectors.BaseDetector): Inference detector object.
+        batch_size (int, optional): Number of images per forward pass. Defaults to 4.
+        num_workers (int, optional): Number of decoding threads. Defaults to 2.
+        prefetch (int, optional): Number of batches decoded in advance. Defaults to 2.
+        timings (Optional[Dict[str, List[float]]], optional): If given, the durations in seconds of the
+            stages in DETECTION_STAGES are appended to it, per image for 'decode' and per batch for the
+            others. See `summarize_timings`. Defaults to None.
+
+    Yields:
+        Tuple[str, DetDataSample]: The image path and its detection results.
+
+    Example:
+        >>> timings = {}
+        >>> for img_path, result in infer_detection_batch('photos/', model, batch_size=8, timings=timings):
+        ...     print(img_path, len(result.pred_instances))
+        >>> summarize_timings(timings)
+    """
+    if isinstance(inputs, (str, os.PathLike)):
+        inputs = tiresias.utils.data.get_path_from_input(input_path=inputs, allowed_extensions=DETECTION_ALLOW_INPUT)
+    img_paths = [str(img_path) for img_path in inputs]
+    if timings is None:
+        timings = {}
+    timings.setdefault('decode', [])
+
+    for batch in tiresias.utils.data.iter_decoded_batches(img_paths, batch_size=batch_size, num_workers=num_workers, prefetch=prefetch):
+        batch_paths, imgs, decode_times = zip(*batch)
+        timings['decode'].extend(decode_times)
+        results = predict_decoded_batch(inferencer, imgs, batch_paths, timings)
+        yield from zip(batch_paths, results)
+
+
+def summarize_timings(timings: Dict[str, List[float]]) -> Dict[str, float]:
+    """Return the total time in seconds spent in each stage recorded by `infer_detection_batch`."""
+    return {stage: float(sum(durations)) for stage, durations in timings.items()}
@@ -1,14 +1,30 @@
+import cv2
 import matplotlib.pyplot as plt
 import mmcv
 import mmdet.models.detectors
+import mmdet.structures.det_data_sample
+import numpy as np
 from mmdet.registry import VISUALIZERS
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from tiresias.detection.detection_infer import infer_detection
+import tiresias.utils.render
 
 import warnings
 warnings.filterwarnings("ignore", message="__floordiv__ is deprecated")
 
 
+def get_visualizer(inferencer: mmdet.models.detectors.BaseDetector):
+    """Return the visualizer of a detector, built on the first call only.
+
+    Args:
+        inferencer (mmdet.models.detectors.BaseDetector): Inference object with detection capabilities.
+    """
+    if getattr(inferencer, '_tiresias_visualizer', None) is None:
+        inferencer._tiresias_visualizer = VISUALIZERS.build(inferencer.cfg.visualizer)
+        inferencer._tiresias_visualizer.dataset_meta = inferencer.dataset_meta
+    return inferencer._tiresias_visualizer
+
+
 def generate_pred_plot(img_path: str, inferencer: mmdet.models.detectors.BaseDetector, timing: bool = False, pred_score_thr: float = 0.5) -> Dict[str, Any]:
     """Generate prediction visualization for an image according to a detector.
 
@@ -20,14 +36,11 @@ def generate_pred_plot(img_path: str, inferencer: mmdet.models.detectors.BaseDet
     Returns:
         Dict[str, Any]: Dictionary containing model name, file name, and result plot.
     """
-    # Get prediction
-    result = infer_detection(img_path=img_path, inferencer=inferencer, timing=timing)
-    # Get raw image
-    img = mmcv.imread(img_path)
-    img = mmcv.imconvert(img, 'bgr', 'rgb')
-    # Init visualizer
-    inferencer_visualizer = VISUALIZERS.build(inferencer.cfg.visualizer)
-    inferencer_visualizer.dataset_meta = inferencer.dataset_meta
+    # Decode the image once for both the prediction and the visualization
+    img_bgr = mmcv.imread(img_path)
+    result = infer_detection(img_path=img_bgr, inferencer=inferencer, timing=timing)
+    img = mmcv.imconvert(img_bgr, 'bgr', 'rgb')
+    inferencer_visualizer = get_visualizer(inferencer)
     # Show the results
     inferencer_visualizer.add_datasample(
         'result',
@@ -134,4 +147,33 @@ def benchmark_model(img_path: str, inferencer_benchmark: List[mmdet.models.detec
     for detector in inferencer_benchmark:
         result.append(generate_pred_plot(img_path=img_path, inferencer=detector, pred_score_thr=pred_score_thr, timing=timing))
     display_pred_mosaic(result)
-    
\ No newline at end of file
+    
+
+def render_detection(img: np.ndarray, result: mmdet.structures.det_data_sample.DetDataSample,
+                     classes: Optional[Sequence[str]] = None, pred_score_thr: float = 0.5,
+                     color: str = 'red') -> np.ndarray:
+    """Headless counterpart of `generate_pred_plot`, drawn with OpenCV on the already decoded image.
+
+    Args:
+        img (np.ndarray): The decoded BGR image.
+        result (DetDataSample): Detection results, see `infer_detection`.
+        classes (Optional[Sequence[str]], optional): Class names, e.g. `inferencer.dataset_meta['classes']`.
+            Defaults to None, in which case the label indices are displayed.
+        pred_score_thr (float, optional): Prediction score threshold. Defaults to 0.5.
+        color (str, optional): Color of the boxes. Defaults to 'red'.
+
+    Returns:
+        np.ndarray: A BGR copy of the image with the boxes, labels and scores.
+    """
+    canvas = img.copy()
+    pred_instances = result.pred_instances
+    keep = pred_instances.scores > pred_score_thr
+    bboxes = pred_instances.bboxes[keep].cpu().numpy().round().astype(np.int32)
+    labels = pred_instances.labels[keep].cpu().numpy()
+    scores = pred_instances.scores[keep].cpu().numpy()
+    bgr = tiresias.utils.render.to_bgr(color)
+    for (x1, y1, x2, y2), label, score in zip(bboxes, labels, scores):
+        cv2.rectangle(canvas, (x1, y1), (x2, y2), bgr, 2, cv2.LINE_AA)
+        name = classes[label] if classes is not None else str(label)
+        tiresias.utils.render.put_label(canvas, f'{name} {score:.2f}', (x1, max(y1 - 5, 15)), bgr, scale=0.6)
+    return canvas
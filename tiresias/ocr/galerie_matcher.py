@@ -0,0 +1,165 @@
+import itertools
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+
+# Groups of characters commonly confused by the OCR, substituted at a reduced cost
+OCR_CONFUSIONS = ['O0DQ', 'I1L', 'S5', 'B8', 'Z2', 'G6', 'T7', 'A4']
+
+
+class GalerieMatcher:
+    """
+    Index of galerie names matching OCR recognitions exactly or with a bounded edit distance.
+
+    Exact matches are looked up in a hashed set. Fuzzy matches use a symmetric deletion index
+    built on canonical forms of the names, where every character of a confusion group is
+    replaced by the first one of the group. The candidates are then ranked with an edit
+    distance where substitutions within a confusion group cost `confusion_cost` and other
+    edits cost 1.
+
+    The galerie names are short, so that a single arbitrary edit turns many misreads into
+    another valid name. Names shorter than `min_edit_length` are therefore only matched up to
+    OCR confusions, and the other edits are only allowed for longer names.
+
+    Args:
+        names (Iterable[str]): The galerie names, e.g. `galerie_gdf[COLUMN_ID]`.
+        max_cost (float, optional): Maximum edit cost of a fuzzy match. Defaults to 1.0, i.e.
+            one insertion, deletion or non-confusion substitution, or two OCR confusions.
+        min_edit_length (int, optional): Minimum length of the names matched with insertions,
+            deletions or non-confusion substitutions. Defaults to 4, i.e. the 3-character galerie
+            names are only matched up to OCR confusions.
+        confusion_cost (float, optional): Cost of a substitution within a confusion group.
+            Defaults to 0.5.
+        confusions (List[str], optional): Groups of confused characters. Defaults to
+            OCR_CONFUSIONS.
+
+    Example:
+        >>> matcher = GalerieMatcher(['GAN', 'G01', 'NORD'])
+        >>> matcher.match_many(['gan', 'GO1', 'GN', 'NOD', 'XYZ'])
+        ['GAN', 'G01', None, 'NORD', None]
+    """
+
+    def __init__(self, names: Iterable[str], max_cost: float = 1.0, confusion_cost: float = 0.5,
+                 confusions: List[str] = OCR_CONFUSIONS, min_edit_length: int = 4):
+        self.max_cost = max_cost
+        self.min_edit_length = min_edit_length
+        self.confusion_cost = confusion_cost
+        self._canonical = {char: group[0] for group in confusions for char in group}
+        self.names: Set[str] = {self.normalize(name) for name in names} - {''}
+        # Non-confusion edits cost 1, so the canonical forms differ by at most this many edits
+        self.max_deletions = int(max_cost)
+        self._deletions: Dict[str, Set[str]] = {}
+        for name in self.names:
+            for deletion in self._get_deletions(self._canonicalize(name)):
+                self._deletions.setdefault(deletion, set()).add(name)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Uppercase and strip a text. Missing values, e.g. None or NaN, become an empty text."""
+        if not isinstance(text, str) and pd.isna(text):
+            return ''
+        return str(text).strip().upper()
+
+    def _canonicalize(self, text: str) -> str:
+        return ''.join(self._canonical.get(char, char) for char in text)
+
+    def _get_deletions(self, text: str) -> Set[str]:
+        deletions = {text}
+        for n_deletions in range(1, min(self.max_deletions, len(text)) + 1):
+            for indices in itertools.combinations(range(len(text)), n_deletions):
+                deletions.add(''.join(char for i, char in enumerate(text) if i not in indices))
+        return deletions
+
+    def edit_cost(self, text: str, name: str) -> float:
+        """
+        Edit distance between two normalized texts, with reduced cost for OCR confusions.
+
+        Names shorter than `min_edit_length` are only reached by OCR confusions, otherwise the
+        cost is inf.
+        """
+        if len(name) < self.min_edit_length:
+            if len(text) != len(name):
+                return float('inf')
+            cost = 0.
+            for char, name_char in zip(text, name):
+                if char == name_char:
+                    continue
+                if self._canonical.get(char, char) != self._canonical.get(name_char, name_char):
+                    return float('inf')
+                cost += self.confusion_cost
+            return cost
+        previous = [float(j) for j in range(len(name) + 1)]
+        for i, char in enumerate(text, 1):
+            current = [float(i)]
+            for j, name_char in enumerate(name, 1):
+                if char == name_char:
+                    substitution = 0.
+                elif self._canonical.get(char, char) == self._canonical.get(name_char, name_char):
+                    substitution = self.confusion_cost
+                else:
+                    substitution = 1.
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + substitution))
+            previous = current
+        return previous[-1]
+
+    def match_with_cost(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Match a single recognition.
+
+        Args:
+            text (str): The recognized text.
+
+        Returns:
+            Tuple[Optional[str], float]: The matched galerie name and the edit cost, or None and
+                inf if no name is within `max_cost` or if several names are equally close.
+        """
+        text = self.normalize(text)
+        if text in self.names:
+            return text, 0.
+        if not text:
+            return None, float('inf')
+        candidates = set()
+        for deletion in self._get_deletions(self._canonicalize(text)):
+            candidates |= self._deletions.get(deletion, set())
+        best_name, best_cost, ambiguous = None, float('inf'), False
+        for name in candidates:
+            cost = self.edit_cost(text, name)
+            if cost < best_cost:
+                best_name, best_cost, ambiguous = name, cost, False
+            elif cost == best_cost:
+                ambiguous = True
+        if best_cost > self.max_cost or ambiguous:
+            return None, float('inf')
+        return best_name, best_cost
+
+    def match(self, text: str) -> Optional[str]:
+        """Return the galerie name matching a recognized text, or None."""
+        return self.match_with_cost(text)[0]
+
+    def match_many(self, texts: Iterable[str]) -> List[Optional[str]]:
+        """Match a batch of recognitions, e.g. all those of a batch of images. Each distinct text
+        is only looked up once."""
+        texts = list(texts)
+        matches = {text: self.match(text) for text in set(texts)}
+        return [matches[text] for text in texts]
+
+    def filter_predictions(self, ocr_pred_df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Return the OCR predictions matching a galerie name.
+
+        Args:
+            ocr_pred_df (pd.DataFrame): OCR predictions, see
+                `tiresias.ocr.ocr_infer.ocr_predictions_to_df`.
+
+        Returns:
+            Optional[pd.DataFrame]: The matching rows, where `rec_texts` is replaced by the galerie
+                name and the recognition is kept in `raw_texts`, or None if no row matches.
+        """
+        matches = pd.Series(self.match_many(ocr_pred_df['rec_texts']), index=ocr_pred_df.index)
+        galerie_prediction_df = ocr_pred_df[matches.notna()].copy()
+        if galerie_prediction_df.shape[0] == 0:
+            return None
+        galerie_prediction_df['raw_texts'] = galerie_prediction_df['rec_texts']
+        galerie_prediction_df['rec_texts'] = matches[matches.notna()]
+        return galerie_prediction_df
@@ -6,6 +6,8 @@ from PIL import Image
 import tiresias.utils.geo_info
 from tiresias.config import OCR_ALLOW_INPUT, OCR_CONFIG
 import tiresias.utils.data
+import tiresias.ocr.ocr_cache
+from tiresias.ocr.galerie_matcher import GalerieMatcher
 import tiresias.ocr.ocr_infer
 import tiresias.ocr.ocr_viz
 from tiresias.data import LABO_GALERIE_SHAPEFILE
@@ -18,21 +20,25 @@ COLUMN_ID_GALERIE = LABO_GALERIE_SHAPEFILE['column_id']
 #COLUMN_ID_CINTRE = 
 
 
-def get_galerie_ocr(ocr_pred_df: pd.DataFrame, galerie_name: pd.Series) -> Optional[pd.DataFrame]:
+def get_galerie_ocr(ocr_pred_df: pd.DataFrame, galerie_name: Optional[pd.Series] = None, matcher: Optional[GalerieMatcher] = None) -> Optional[pd.DataFrame]:
     """ Return ocr prediction filtered on possible galerie name.
 
+    Recognitions matching a galerie name up to OCR confusions (e.g. O/0, I/1) are kept, with `rec_texts`
+    replaced by the galerie name and the raw recognition kept in `raw_texts`. Names of 4 characters or more
+    also match up to a single other edit.
+
     Args:
-        ocr_prediction (pd.DataFrame): _description_
-        galerie_name (pd.Series): _description_
+        ocr_pred_df (pd.DataFrame): OCR predictions of one or several images.
+        galerie_name (Optional[pd.Series]): Galerie names, only used to build a matcher if
+            `matcher` is None.
+        matcher (Optional[GalerieMatcher]): Matcher built once from the galerie names.
 
     Returns:
-        _type_: _description_
+        Optional[pd.DataFrame]: The predictions matching a galerie name, or None.
     """
-    ocr_pred_df['rec_texts'] = ocr_pred_df['rec_texts'].apply(lambda x : x.upper())
-    galerie_prediction_df = ocr_pred_df[ocr_pred_df['rec_texts'].isin(galerie_name)]
-    if galerie_prediction_df.shape[0] == 0:
-        return None
-    return galerie_prediction_df
+    if matcher is None:
+        matcher = GalerieMatcher(galerie_name)
+    return matcher.filter_predictions(ocr_pred_df)
 
 
 def test_galerie_unique(ocr_pred_galerie_df: pd.DataFrame) -> bool:
@@ -50,7 +56,7 @@ def test_galerie_unique(ocr_pred_galerie_df: pd.DataFrame) -> bool:
 #OCR_DOM = tiresias.ocr.ocr_infer.load_ocr_inferencer(device='cuda')
 
 
-def main(image_path: str, device: str ='cpu', ocr_config: dict = OCR_CONFIG):
+def main(image_path: str, device: str ='cpu', ocr_config: dict = OCR_CONFIG, use_cache: bool = True):
     # load data path
     paths = tiresias.utils.data.get_path_from_input(input_path=image_path, allowed_extensions=OCR_ALLOW_INPUT)
     _, galerie_gdf = tiresias.utils.geo_info.load_shapefile()
@@ -60,13 +66,18 @@ def main(image_path: str, device: str ='cpu', ocr_config: dict = OCR_CONFIG):
     det_weights = ocr_config['det_weights']
     rec = ocr_config['rec']
     rec_weights = ocr_config['rec_weights']
-    ocr = tiresias.ocr.ocr_infer.load_ocr_inferencer(det=det, det_weights=det_weights, rec=rec, rec_weights=rec_weights, device=device)
+    cache = tiresias.ocr.ocr_cache.OCRResultCache.from_ocr_config(ocr_config) if use_cache else None
+    # only load the models if the image is not cached
+    ocr = None
+    if cache is None or image_path not in cache:
+        ocr = tiresias.ocr.ocr_infer.load_ocr_inferencer(det=det, det_weights=det_weights, rec=rec, rec_weights=rec_weights, device=device)
     # inference
-    ocr_pred = tiresias.ocr.ocr_infer.infer_ocr(image_path=image_path, mmocr=ocr)
+    ocr_pred = tiresias.ocr.ocr_infer.infer_ocr(image_path=image_path, mmocr=ocr, cache=cache)
     # transform result in usable DF
     ocr_pred_df = tiresias.ocr.ocr_infer.ocr_predictions_to_df(ocr_pred)
     # check if specific detection
-    ocr_pred_galerie_df = get_galerie_ocr(ocr_pred_df=ocr_pred_df, galerie_name=galerie_gdf[COLUMN_ID_GALERIE])
+    matcher = GalerieMatcher(galerie_gdf[COLUMN_ID_GALERIE])
+    ocr_pred_galerie_df = get_galerie_ocr(ocr_pred_df=ocr_pred_df, matcher=matcher)
     if ocr_pred_galerie_df is None:
         print("No galerie detected")
         plt.title(f'File : {image_path}')
@@ -74,7 +85,8 @@ def main(image_path: str, device: str ='cpu', ocr_config: dict = OCR_CONFIG):
         return
     if test_galerie_unique(ocr_pred_galerie_df=ocr_pred_galerie_df):
         detected_galerie_name = ocr_pred_galerie_df.rec_texts.unique()[0]
-        tiresias.ocr.ocr_viz.plot_ocr_results(image_path=image_path, ocr_pred_galerie_df=ocr_pred_galerie_df, galerie_gdf=galerie_gdf, detected_galerie_name=detected_galerie_name)
+        geo_index = tiresias.utils.geo_info.load_geo_index(galerie_gdf)
+        tiresias.ocr.ocr_viz.plot_ocr_results(image_path=image_path, ocr_pred_galerie_df=ocr_pred_galerie_df, galerie_gdf=galerie_gdf, detected_galerie_name=detected_galerie_name, geo_index=geo_index)
     # # check if specific detection
     # ocr_pred_cintre = None
     # if ocr_pred_cintre is None and ocr_pred_galerie.rec_texts.unique().size == 1:
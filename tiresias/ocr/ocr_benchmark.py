@@ -0,0 +1,326 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import pathlib
+import platform
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import mmocr
+import numpy as np
+import torch
+from mmengine.dataset import pseudo_collate
+from mmocr.apis import MMOCRInferencer
+from mmocr.utils import bbox2poly, crop_img, poly2bbox
+
+import tiresias.ocr.ocr_infer
+import tiresias.utils.data
+import tiresias.utils.geo_info
+from tiresias.config import OCR_BENCHMARK, OCR_CONFIG
+from tiresias.data import LABO_GALERIE_SHAPEFILE
+from tiresias.ocr.galerie_matcher import GalerieMatcher
+
+OCR_STAGES = ('decode', 'det_preprocess', 'det_forward', 'det_postprocess', 'crop', 'rec_preprocess', 'rec_forward',
+              'rec_decode', 'galerie_match')
+
+
+class StageTimer:
+    """
+    Accumulate the wall-clock time spent in named stages.
+
+    CUDA kernels are asynchronous, so the device is synchronized at the end of each stage when
+    `device` is a GPU. A disabled timer only runs the stages, e.g. during the warm-up.
+
+    Args:
+        device (str): The device the models run on. Default is 'cpu'.
+        enabled (bool): Whether to record the stages. Default is True.
+    """
+
+    def __init__(self, device: str = 'cpu', enabled: bool = True):
+        self.synchronize = torch.device(device).type == 'cuda'
+        self.enabled = enabled
+        self.totals: Dict[str, float] = {stage: 0. for stage in OCR_STAGES}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        a = time.perf_counter()
+        yield
+        if self.synchronize:
+            torch.cuda.synchronize()
+        if self.enabled:
+            self.totals[name] = self.totals.get(name, 0.) + time.perf_counter() - a
+
+
+@torch.no_grad()
+def run_staged(mmocr_inferencer: MMOCRInferencer, encoded_imgs: Sequence[bytes], batch_size: int, timer: StageTimer,
+               matcher: Optional[GalerieMatcher] = None) -> List[List[str]]:
+    """
+    Run the text detection and recognition of `MMOCRInferencer` stage by stage on a batch of
+    encoded images, timing each stage of OCR_STAGES.
+
+    The stages are the ones of `MMOCRInferencer.forward` in 'det_rec' mode, except that the crops
+    of all the images are recognized together by batches of `batch_size`.
+
+    Args:
+        mmocr_inferencer (MMOCRInferencer): Inferencer with a text detector and a text recognizer.
+        encoded_imgs (Sequence[bytes]): The encoded images, e.g. the content of JPEG files.
+        batch_size (int): Batch size of the detector and of the recognizer.
+        timer (StageTimer): Timer of the stages.
+        matcher (Optional[GalerieMatcher], optional): If given, the recognized texts are matched
+            to the galerie names. Defaults to None.
+
+    Returns:
+        List[List[str]]: The recognized texts of each image.
+    """
+    det = mmocr_inferencer.textdet_inferencer
+    rec = mmocr_inferencer.textrec_inferencer
+    with timer.stage('decode'):
+        imgs = [cv2.imdecode(np.frombuffer(encoded_img, dtype=np.uint8), cv2.IMREAD_COLOR)
+                for encoded_img in encoded_imgs]
+    with timer.stage('det_preprocess'):
+        data = det.model.data_preprocessor(pseudo_collate([det.pipeline(img) for img in imgs]), False)
+    with timer.stage('det_forward'):
+        outs = det.model.det_head(det.model.extract_feat(data['inputs']), data['data_samples'])
+    with timer.stage('det_postprocess'):
+        det_data_samples = det.model.det_head.postprocessor(outs, data['data_samples'])
+    with timer.stage('crop'):
+        crops, img_indices = [], []
+        for i, (img, det_data_sample) in enumerate(zip(imgs, det_data_samples)):
+            for polygon in det_data_sample.pred_instances.polygons:
+                crops.append(crop_img(img, bbox2poly(poly2bbox(polygon)).tolist()))
+                img_indices.append(i)
+    texts = [[] for _ in imgs]
+    for start in range(0, len(crops), batch_size):
+        with timer.stage('rec_preprocess'):
+            data = rec.model.data_preprocessor(
+                pseudo_collate([rec.pipeline(crop) for crop in crops[start:start + batch_size]]), False)
+        with timer.stage('rec_forward'):
+            feat = rec.model.extract_feat(data['inputs'])
+            out_enc = rec.model.encoder(feat, data['data_samples']) if rec.model.with_encoder else None
+            out_dec = rec.model.decoder(feat, out_enc, data['data_samples'])
+        with timer.stage('rec_decode'):
+            rec_data_samples = rec.model.decoder.postprocessor(out_dec, data['data_samples'])
+        for i, rec_data_sample in zip(img_indices[start:start + batch_size], rec_data_samples):
+            texts[i].append(rec_data_sample.pred_text.item)
+    if matcher is not None:
+        with timer.stage('galerie_match'):
+            matcher.match_many([text for img_texts in texts for text in img_texts])
+    return texts
+
+
+def synthetic_images(resolution: Tuple[int, int], n_images: int = 4, n_texts: int = 6, seed: int = 0) -> List[bytes]:
+    """
+    Generate JPEG images of a given resolution with random galerie-like labels on a noisy background.
+
+    Args:
+        resolution (Tuple[int, int]): The (width, height) of the images.
+        n_images (int): The number of images. Default is 4.
+        n_texts (int): The number of labels per image. Default is 6.
+        seed (int): The seed of the random generator. Default is 0.
+
+    Returns:
+        List[bytes]: The encoded images.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = resolution
+    alphabet = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'))
+    encoded_imgs = []
+    for _ in range(n_images):
+        img = rng.integers(60, 200, size=(height, width, 3), dtype=np.uint8)
+        img = cv2.GaussianBlur(img, (0, 0), 3)
+        for _ in range(n_texts):
+            text = ''.join(rng.choice(alphabet, size=rng.integers(2, 6)))
+            scale = rng.uniform(0.5, 2.) * width / 640
+            org = (int(rng.integers(0, width * 3 // 4)), int(rng.integers(height // 8, height)))
+            cv2.putText(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255),
+                        max(int(scale * 3), 1), cv2.LINE_AA)
+        encoded_imgs.append(cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes())
+    return encoded_imgs
+
+
+def load_image_sets(demo_dir: Optional[str] = OCR_BENCHMARK['demo_dir'],
+                    resolutions: Sequence[Tuple[int, int]] = OCR_BENCHMARK['resolutions'],
+                    n_synthetic: int = OCR_BENCHMARK['n_synthetic']) -> Dict[str, List[bytes]]:
+    """
+    Load the encoded images of the benchmark: the JPEG and PNG demo images if `demo_dir` exists, and
+    one set of synthetic images per resolution. The files are read once, so the disk is not benchmarked.
+    """
+    image_sets = {}
+    if demo_dir and os.path.isdir(demo_dir):
+        paths = tiresias.utils.data.get_path_from_input(input_path=demo_dir,
+                                                        allowed_extensions=OCR_BENCHMARK['allowed_extensions'])
+        image_sets['demo'] = [pathlib.Path(path).read_bytes() for path in sorted(paths)]
+    for width, height in resolutions:
+        image_sets[f'synthetic_{width}x{height}'] = synthetic_images((width, height), n_images=n_synthetic)
+    return image_sets
+
+
+def summarize(latencies: Sequence[float], n_images: int, stage_totals: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Summarize the latencies in seconds of the batches of a benchmark run.
+
+    Returns:
+        Dict[str, Any]: The p50/p95/p99 and mean batch latencies in milliseconds, the throughput in
+            images per second, and for each stage its total time, time per image and share of the
+            time spent in the stages.
+    """
+    latencies_ms = np.asarray(latencies) * 1000
+    total = float(np.sum(latencies))
+    stages_total = sum(stage_totals.values()) or 1.
+    return {
+        'latency_ms': {
+            'p50': float(np.percentile(latencies_ms, 50)),
+            'p95': float(np.percentile(latencies_ms, 95)),
+            'p99': float(np.percentile(latencies_ms, 99)),
+            'mean': float(np.mean(latencies_ms)),
+        },
+        'images_per_second': n_images / total if total else float('inf'),
+        'stages': {
+            stage: {'total_s': seconds, 'ms_per_image': seconds * 1000 / n_images, 'share': seconds / stages_total}
+            for stage, seconds in stage_totals.items()
+        },
+    }
+
+
+def benchmark(mmocr_inferencer: MMOCRInferencer, image_sets: Dict[str, List[bytes]], batch_sizes: Sequence[int] = (1, 4),
+              thread_counts: Sequence[int] = (1, 4), warmup: int = 1, iterations: int = 3,
+              matcher: Optional[GalerieMatcher] = None, device: str = 'cpu') -> List[Dict[str, Any]]:
+    """
+    Benchmark the OCR models on every image set, batch size and number of threads.
+
+    For each configuration, the image set is processed `warmup` times without timing, then
+    `iterations` times. Each batch is one latency sample.
+
+    Args:
+        mmocr_inferencer (MMOCRInferencer): Inferencer with a text detector and a text recognizer.
+        image_sets (Dict[str, List[bytes]]): The encoded images by set name, see `load_image_sets`.
+        batch_sizes (Sequence[int]): The batch sizes to sweep. Default is (1, 4).
+        thread_counts (Sequence[int]): The numbers of PyTorch intra-op threads to sweep. Default is (1, 4).
+        warmup (int): Number of untimed passes over each image set. Default is 1.
+        iterations (int): Number of timed passes over each image set. Default is 3.
+        matcher (Optional[GalerieMatcher]): Matcher of the galerie names. Default is None.
+        device (str): The device of the models. Default is 'cpu'.
+
+    Returns:
+        List[Dict[str, Any]]: One result per configuration, see `summarize`.
+    """
+    results = []
+    default_threads = torch.get_num_threads()
+    try:
+        for num_threads in thread_counts:
+            torch.set_num_threads(num_threads)
+            for set_name, encoded_imgs in image_sets.items():
+                for batch_size in batch_sizes:
+                    batches = [encoded_imgs[i:i + batch_size] for i in range(0, len(encoded_imgs), batch_size)]
+                    warmup_timer = StageTimer(device=device, enabled=False)
+                    for _ in range(warmup):
+                        for batch in batches:
+                            run_staged(mmocr_inferencer, batch, batch_size, warmup_timer, matcher=matcher)
+                    timer = StageTimer(device=device)
+                    latencies = []
+                    for _ in range(iterations):
+                        for batch in batches:
+                            a = time.perf_counter()
+                            run_staged(mmocr_inferencer, batch, batch_size, timer, matcher=matcher)
+                            latencies.append(time.perf_counter() - a)
+                    result = {'image_set': set_name, 'batch_size': batch_size, 'num_threads': num_threads,
+                              'num_images': len(encoded_imgs) * iterations}
+                    result.update(summarize(latencies, len(encoded_imgs) * iterations, timer.totals))
+                    print(f"{set_name} batch_size={batch_size} threads={num_threads}: "
+                          f"p50 {result['latency_ms']['p50']:.1f} ms, {result['images_per_second']:.2f} img/s")
+                    results.append(result)
+    finally:
+        torch.set_num_threads(default_threads)
+    return results
+
+
+def compare_benchmarks(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.1) -> List[str]:
+    """
+    List the configurations whose p50 latency regressed by more than `tolerance` relatively to a baseline.
+
+    Args:
+        baseline (Dict[str, Any]): A report written by `main`, e.g. of the previous release.
+        current (Dict[str, Any]): A report written by `main`.
+        tolerance (float): The allowed relative slowdown. Default is 0.1.
+
+    Returns:
+        List[str]: A description of each regression. Empty if there is none.
+    """
+    def key(result):
+        return result['image_set'], result['batch_size'], result['num_threads']
+
+    baseline_results = {key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        reference = baseline_results.get(key(result))
+        if reference is None:
+            continue
+        before, after = reference['latency_ms']['p50'], result['latency_ms']['p50']
+        if after > before * (1 + tolerance):
+            regressions.append(f'{key(result)}: p50 {before:.1f} ms -> {after:.1f} ms')
+    return regressions
+
+
+def main(output: str = 'ocr_benchmark.json', device: str = 'cpu', batch_sizes: Sequence[int] = (1, 4),
+         thread_counts: Sequence[int] = (1, 4), warmup: int = 1, iterations: int = 3,
+         demo_dir: Optional[str] = OCR_BENCHMARK['demo_dir'], galerie_names: Optional[Sequence[str]] = None,
+         baseline: Optional[str] = None, ocr_config: dict = OCR_CONFIG) -> Dict[str, Any]:
+    """
+    Benchmark the OCR models of `ocr_config` and write the report as JSON.
+
+    The galerie names are read from LABO_GALERIE_SHAPEFILE if they are not given and the
+    shapefile exists, otherwise the galerie matching stage is skipped. If `baseline` is the path
+    of a previous report, the p50 regressions are printed.
+    """
+    if galerie_names is None and os.path.exists(LABO_GALERIE_SHAPEFILE['filepath']):
+        _, galerie_gdf = tiresias.utils.geo_info.load_shapefile()
+        galerie_names = galerie_gdf[LABO_GALERIE_SHAPEFILE['column_id']]
+    mmocr_inferencer = tiresias.ocr.ocr_infer.load_ocr_inferencer(det=ocr_config['det'], det_weights=ocr_config['det_weights'],
+                                                                  rec=ocr_config['rec'], rec_weights=ocr_config['rec_weights'], device=device)
+    matcher = GalerieMatcher(galerie_names) if galerie_names is not None else None
+    image_sets = load_image_sets(demo_dir=demo_dir)
+    report = {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'mmocr': mmocr.__version__,
+            'device': device,
+            'ocr_config': ocr_config,
+            'warmup': warmup,
+            'iterations': iterations,
+            'image_sets': {name: len(encoded_imgs) for name, encoded_imgs in image_sets.items()},
+        },
+        'results': benchmark(mmocr_inferencer, image_sets, batch_sizes=batch_sizes, thread_counts=thread_counts,
+                             warmup=warmup, iterations=iterations, matcher=matcher, device=device),
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark written to {output}")
+    if baseline is not None:
+        with open(baseline) as f:
+            regressions = compare_benchmarks(json.load(f), report)
+        for regression in regressions:
+            print(f"Regression {regression}")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the tiresias OCR models')
+    parser.add_argument('--output', default='ocr_benchmark.json')
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--iterations', type=int, default=3)
+    parser.add_argument('--demo-dir', default=OCR_BENCHMARK['demo_dir'])
+    parser.add_argument('--baseline', default=None, help='Previous report to compare the p50 latencies with')
+    args = parser.parse_args()
+    main(output=args.output, device=args.device, batch_sizes=args.batch_sizes, thread_counts=args.threads,
+         warmup=args.warmup, iterations=args.iterations, demo_dir=args.demo_dir, baseline=args.baseline)
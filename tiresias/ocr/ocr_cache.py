@@ -0,0 +1,216 @@
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from mmocr.utils import load_config
+from tiresias.config import OCR_CACHE, OCR_CONFIG
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str, mtime: float, size: int) -> str:
+    """Hash the content of a file. The modification time and size are only part
+    of the memoization key, so that a file is hashed again once it changes."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def content_digest(item: Union[str, pathlib.Path, np.ndarray]) -> str:
+    """
+    Compute the content hash of an image or a model file.
+
+    Args:
+        item (Union[str, pathlib.Path, np.ndarray]): Path to a file, or an image array.
+            Strings which are not existing files (e.g. model names of the metafile) are
+            hashed as is.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    if isinstance(item, np.ndarray):
+        sha = hashlib.sha256(str((item.shape, item.dtype.str)).encode())
+        sha.update(np.ascontiguousarray(item).tobytes())
+        return sha.hexdigest()
+    path = str(item)
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return _file_digest(os.path.abspath(path), stat.st_mtime, stat.st_size)
+    return hashlib.sha256(path.encode()).hexdigest()
+
+
+def is_cacheable(image: Union[str, pathlib.Path, np.ndarray]) -> bool:
+    """
+    Whether the predictions of an image can be cached, i.e. it is an image array or an existing
+    file. Directories, URLs and missing files are not, as their content is not hashed.
+
+    Args:
+        image (Union[str, pathlib.Path, np.ndarray]): Path to the image, or the image array.
+
+    Returns:
+        bool: Whether `image` can be cached.
+    """
+    return isinstance(image, np.ndarray) or os.path.isfile(str(image))
+
+
+def config_digest(config: str) -> str:
+    """
+    Compute the hash of a model configuration, resolved with its `_base_` files so that a change in
+    any of them changes the hash.
+
+    Args:
+        config (str): Path to a configuration file, or a model name of the metafile, which is hashed
+            as is.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    if not os.path.isfile(config):
+        return content_digest(config)
+    return hashlib.sha256(load_config(config).pretty_text.encode()).hexdigest()
+
+
+def model_digest(ocr_config: Dict[str, Optional[str]] = OCR_CONFIG) -> str:
+    """
+    Compute a hash identifying the OCR models, from their resolved configurations and the content
+    of their weights files.
+
+    Args:
+        ocr_config (Dict[str, Optional[str]], optional): Dictionary with the keys 'det',
+            'det_weights', 'rec' and 'rec_weights'. Defaults to OCR_CONFIG.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    sha = hashlib.sha256()
+    for key in ('det', 'det_weights', 'rec', 'rec_weights'):
+        value = ocr_config.get(key)
+        if value:
+            value = config_digest(value) if key in ('det', 'rec') else content_digest(value)
+        sha.update(f'{key}={value};'.encode())
+    return sha.hexdigest()
+
+
+class OCRResultCache:
+    """
+    Persistent cache of OCR predictions stored in a SQLite database.
+
+    Entries are keyed by the content hash of the image and the hash of the OCR models, so
+    renamed or copied photos hit the cache, while retrained models or edited images miss it.
+    The least recently used entries are evicted once the cache exceeds `max_bytes`. Only image
+    files and arrays are cached, see `is_cacheable`; the other inputs always miss the cache.
+
+    Args:
+        model_key (str): Hash of the OCR models, see `model_digest`.
+        path (str, optional): Path to the SQLite database. Defaults to OCR_CACHE['path'].
+        max_bytes (int, optional): Maximum total size of the cached predictions.
+            Defaults to OCR_CACHE['max_bytes'].
+
+    Example:
+        >>> cache = OCRResultCache(model_digest(OCR_CONFIG))
+        >>> predictions = cache.get('photo.jpg')
+        >>> if predictions is None:
+        ...     predictions = mmocr('photo.jpg')
+        ...     cache.put('photo.jpg', predictions)
+    """
+
+    def __init__(self, model_key: str, path: str = OCR_CACHE['path'], max_bytes: int = OCR_CACHE['max_bytes']):
+        self.model_key = model_key
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ':memory:':
+            pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS ocr_results ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ocr_results_access ON ocr_results (last_access)')
+        self._conn.commit()
+
+    @classmethod
+    def from_ocr_config(cls, ocr_config: Dict[str, Optional[str]] = OCR_CONFIG, **kwargs) -> 'OCRResultCache':
+        """Create a cache for the OCR models described by `ocr_config`."""
+        return cls(model_digest(ocr_config), **kwargs)
+
+    def _key(self, image: Union[str, pathlib.Path, np.ndarray]) -> str:
+        return f'{self.model_key}:{content_digest(image)}'
+
+    def get(self, image: Union[str, pathlib.Path, np.ndarray]) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached predictions of an image.
+
+        Args:
+            image (Union[str, pathlib.Path, np.ndarray]): Path to the image, or the image array.
+
+        Returns:
+            Optional[Dict[str, Any]]: The predictions as returned by `MMOCRInferencer`, without
+                visualization, or None if the image is not cached.
+        """
+        if not is_cacheable(image):
+            return None
+        key = self._key(image)
+        row = self._conn.execute('SELECT value FROM ocr_results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute('UPDATE ocr_results SET last_access = ? WHERE key = ?', (time.time(), key))
+        self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, image: Union[str, pathlib.Path, np.ndarray], predictions: Dict[str, Any]):
+        """
+        Cache the predictions of an image, then evict the least recently used entries if the
+        cache is too large.
+
+        Args:
+            image (Union[str, pathlib.Path, np.ndarray]): Path to the image, or the image array.
+            predictions (Dict[str, Any]): The predictions returned by `MMOCRInferencer`. The
+                visualization is not cached.
+        """
+        if not is_cacheable(image):
+            return
+        value = json.dumps({'predictions': predictions['predictions'], 'visualization': []})
+        size = len(value.encode())
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO ocr_results (key, value, size, last_access) VALUES (?, ?, ?, ?)',
+                (self._key(image), value, size, time.time()))
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute('SELECT key, size FROM ocr_results ORDER BY last_access').fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany('DELETE FROM ocr_results WHERE key = ?', evicted)
+
+    def __contains__(self, image: Union[str, pathlib.Path, np.ndarray]) -> bool:
+        if not is_cacheable(image):
+            return False
+        key = self._key(image)
+        return self._conn.execute('SELECT 1 FROM ocr_results WHERE key = ?', (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM ocr_results').fetchone()[0]
+
+    def clear(self):
+        """Remove all the cached predictions."""
+        with self._conn:
+            self._conn.execute('DELETE FROM ocr_results')
+
+    def close(self):
+        """Close the connection to the database."""
+        self._conn.close()
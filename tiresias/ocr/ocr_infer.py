@@ -1,6 +1,7 @@
 import pandas as pd
 import time
 import tiresias.ocr.ocr_viz
+from tiresias.ocr.ocr_cache import OCRResultCache
 from mmocr.apis import MMOCRInferencer
 from tiresias.config import OCR_CONFIG
 from typing import Dict, Optional, List
@@ -49,22 +50,30 @@ def load_ocr_inferencer(
     )
 
 
-def infer_ocr(image_path: str, mmocr: MMOCRInferencer) -> Optional[Dict[str, str]]:
+def infer_ocr(image_path: str, mmocr: Optional[MMOCRInferencer], cache: Optional[OCRResultCache] = None) -> Optional[Dict[str, str]]:
     """
     Perform Optical Character Recognition (OCR) on the specified image.
 
     This function uses the provided MMOCRInferencer object to perform OCR
-    on the image located at the given image_path.
+    on the image located at the given image_path. If a cache is given, it is
+    consulted first and the models only run on a cache miss.
 
     Args:
         image_path (str): Path to the image file for OCR.
-        mmocr (MMOCRInferencer): An instance of MMOCRInferencer with loaded OCR models.
+        mmocr (Optional[MMOCRInferencer]): An instance of MMOCRInferencer with loaded OCR models.
+            It may be None if the image is known to be cached.
+        cache (Optional[OCRResultCache], optional): Cache of OCR predictions built for the
+            same models as `mmocr`. Defaults to None.
 
     Returns:
         Dict[str, str]: A dictionary containing the OCR predictions.
             The keys represent the predictions and the values are the corresponding vizualisations.
     """
-    predictions = mmocr(inputs=image_path)
+    predictions = cache.get(image_path) if cache is not None else None
+    if predictions is None:
+        predictions = mmocr(inputs=image_path)
+        if cache is not None:
+            cache.put(image_path, predictions)
     if not predictions['predictions'][0]['rec_texts']:
         print("No text detected")
         return None
@@ -93,6 +102,7 @@ def ocr_predictions_to_df(ocr_prediction: Dict[str, any]) -> Optional[pd.DataFra
             returns None.
 
     Note:
+        Predictions read from an `OCRResultCache` have the same structure as fresh ones.
         The structure of the `ocr_prediction` dictionary may vary based on the OCR model used.
         Please ensure that the `ocr_prediction` dictionary contains OCR predictions in the
         expected format to avoid errors during DataFrame creation.
@@ -105,47 +115,7 @@ def ocr_predictions_to_df(ocr_prediction: Dict[str, any]) -> Optional[pd.DataFra
     return final_df
 
 
-def test_perf_gpu_cpu(image_path: str, n_iter: int = 3):
-    """
-    Compare the performance of OCR inference on GPU and CPU for multiple iterations.
-
-    Parameters:
-    image_path (str): Path to the input image.
-    n_iter (int, optional): Number of iterations for testing. Default is 3.
-
-    Returns:
-    None
-    """
-    time_gpu = []
-    time_cpu = []
-
-    # Load OCR inference models for CPU and GPU
-    ocr_cpu = load_ocr_inferencer(device='cpu')
-    ocr_gpu = load_ocr_inferencer(device='cuda')
-
-    for i in range(n_iter):
-        # Measure GPU inference time
-        a = time.time()
-        ocr_gpu(image_path)
-        b = time.time()
-        print(f"GPU inference iteration {i} took {b - a} seconds")
-        time_gpu.append(b - a)
-
-        # Measure CPU inference time
-        a = time.time()
-        ocr_cpu(image_path)
-        b = time.time()
-        print(f"CPU inference iteration {i} took {b - a} seconds")
-        time_cpu.append(b - a)
-
-    # Calculate and display average inference times
-    avg_time_gpu = sum(time_gpu) / len(time_gpu)
-    avg_time_cpu = sum(time_cpu) / len(time_cpu)
-    print(f"Average GPU inference time: {avg_time_gpu} seconds")
-    print(f"Average CPU inference time: {avg_time_cpu} seconds")
-
-
-def infer_time_plot(image_path: str, ocr_infer: MMOCRInferencer, output_text: bool = False) -> Optional[List[str]]:
+def infer_time_plot(image_path: str, ocr_infer: MMOCRInferencer, output_text: bool = False, cache: Optional[OCRResultCache] = None) -> Optional[List[str]]:
     """
     Perform OCR inference on an image, report the inference time, and display raw image alongside the image with detections.
 
@@ -153,12 +123,13 @@ def infer_time_plot(image_path: str, ocr_infer: MMOCRInferencer, output_text: bo
     image_path (str): Path to the input image.
     ocr_infer (MMOCRInferencer): An instance of MMOCRInferencer with loaded OCR models.
     output_text (bool, optional): Whether to output the recognized text. Default is False.
+    cache (Optional[OCRResultCache], optional): Cache of OCR predictions. Default is None.
 
     Returns:
     Optional[List[str]]: A list of recognized text strings if output_text is True, otherwise None.
     """
     a = time.time()
-    ocr_pred = infer_ocr(image_path=image_path, mmocr=ocr_infer)
+    ocr_pred = infer_ocr(image_path=image_path, mmocr=ocr_infer, cache=cache)
     if ocr_pred is None:
         return
     
@@ -1,11 +1,13 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from PIL import Image
+from typing import Optional
 from tiresias.config import OCR_DISPLAY_VAR
 import tiresias.utils.geo_info
-import shapely.ops
+import tiresias.utils.render
 
 
 NEIGHBOR_COLOR = OCR_DISPLAY_VAR['neighbor_color']
@@ -36,12 +38,16 @@ def ocr_figure_detection(ax, image_path: str, ocr_pred_galerie_df: pd.DataFrame)
     ax.set_yticks([])
     ax.set_title('OCR detection')
 
-def ocr_figure_map_unique(ax, galerie_gdf: gpd.GeoDataFrame, detected_galerie_name: str, neighbors_display: bool =True, buffer_size: int = 10):
+def ocr_figure_map_unique(ax, galerie_gdf: gpd.GeoDataFrame, detected_galerie_name: str, neighbors_display: bool =True, buffer_size: int = 10, geo_index: Optional[tiresias.utils.geo_info.GeoIndex] = None):
+    """ Plot the location of the detected galerie in the Labo, and optionally the crops of its neighbors.
 
+    The neighbors, their crops and the centroid are read from `geo_index`, which is loaded
+    with `tiresias.utils.geo_info.load_geo_index` if not given.
+    """
+    if geo_index is None:
+        geo_index = tiresias.utils.geo_info.load_geo_index(galerie_gdf, column_id=COLUMN_ID)
     galerie_gdf.plot(ax=ax, facecolor=LABO_COLOR, edgecolor='black')
-    detected_galerie_gdf = galerie_gdf.loc[galerie_gdf[COLUMN_ID] == detected_galerie_name]
-    centroid_point = detected_galerie_gdf.centroid.iloc[0]
-    x, y = centroid_point.x, centroid_point.y
+    x, y = geo_index.centroids[detected_galerie_name]
     detected_galerie_gdf = galerie_gdf.loc[galerie_gdf[COLUMN_ID] == detected_galerie_name]['geometry']
     detected_galerie_gdf.plot(color=OCR_COLOR, ax=ax)  
     ax.set_title("Localisation OCR")
@@ -50,13 +56,17 @@ def ocr_figure_map_unique(ax, galerie_gdf: gpd.GeoDataFrame, detected_galerie_na
 
 
     if neighbors_display:
-        neighbors = tiresias.utils.geo_info.get_neighbors(galerie_gdf)
-        neighbors = neighbors[detected_galerie_name]
-        for neighbor in neighbors:
-            neighbor_gdf = galerie_gdf.loc[galerie_gdf[COLUMN_ID] == neighbor].geometry
-            reference_point = shapely.ops.nearest_points(neighbor_gdf.iloc[0], detected_galerie_gdf.iloc[0])[0]
-            cropped_geometry = neighbor_gdf.intersection(reference_point.buffer(buffer_size))
-            gpd.GeoDataFrame({COLUMN_ID: [neighbor], 'geometry': [cropped_geometry.geometry.iloc[0]]}).plot(color=NEIGHBOR_COLOR, ax=ax)
+        neighbors = geo_index.neighbors[detected_galerie_name]
+        if buffer_size == geo_index.buffer_size:
+            cropped_geometries = [geo_index.neighbor_crops[detected_galerie_name][neighbor] for neighbor in neighbors]
+        else:
+            geometry_by_id = dict(zip(galerie_gdf[COLUMN_ID], galerie_gdf.geometry))
+            cropped_geometries = [
+                tiresias.utils.geo_info.crop_neighbor(geometry_by_id[detected_galerie_name], geometry_by_id[neighbor], buffer_size)
+                for neighbor in neighbors
+            ]
+        if neighbors:
+            gpd.GeoDataFrame({COLUMN_ID: neighbors, 'geometry': cropped_geometries}).plot(color=NEIGHBOR_COLOR, ax=ax)
 
     ax.annotate(f'{detected_galerie_name}', xy=(x, y), xytext=(x, y+20), fontsize=15, fontweight='bold')
 
@@ -68,12 +78,12 @@ def ocr_figure_map_unique(ax, galerie_gdf: gpd.GeoDataFrame, detected_galerie_na
     plt.legend(handles=[target_legend, neighbor_legend, labo_legend], loc='lower left')
 
 
-def plot_ocr_results(image_path: str, ocr_pred_galerie_df: pd.DataFrame, galerie_gdf: gpd.GeoDataFrame, detected_galerie_name: str):
+def plot_ocr_results(image_path: str, ocr_pred_galerie_df: pd.DataFrame, galerie_gdf: gpd.GeoDataFrame, detected_galerie_name: str, geo_index: Optional[tiresias.utils.geo_info.GeoIndex] = None):
     """ Plot raw image versus OCR detection plus view of location from Labo."""
     fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(30, 20))
     ocr_figure_raw(ax1, image_path=image_path)
     ocr_figure_detection(ax2, image_path=image_path, ocr_pred_galerie_df=ocr_pred_galerie_df)
-    ocr_figure_map_unique(ax3, galerie_gdf=galerie_gdf, detected_galerie_name=detected_galerie_name)
+    ocr_figure_map_unique(ax3, galerie_gdf=galerie_gdf, detected_galerie_name=detected_galerie_name, geo_index=geo_index)
     plt.show()
 
 
@@ -82,4 +92,33 @@ def plot_ocr_results_raw(image_path: str, ocr_pred_df: pd.DataFrame):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(30, 20))
     ocr_figure_raw(ax1, image_path=image_path)
     ocr_figure_detection(ax2, image_path=image_path, ocr_pred_galerie_df=ocr_pred_df)
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def render_ocr_results(img: np.ndarray, ocr_pred_galerie_df: pd.DataFrame, detected_galerie_name: Optional[str] = None,
+                       basemap: Optional[tiresias.utils.render.Basemap] = None,
+                       geo_index: Optional[tiresias.utils.geo_info.GeoIndex] = None,
+                       neighbors_display: bool = True) -> np.ndarray:
+    """ Headless counterpart of `plot_ocr_results`, drawn with OpenCV on the already decoded image.
+
+    Args:
+        img (np.ndarray): The decoded BGR image, e.g. from `cv2.imread`.
+        ocr_pred_galerie_df (pd.DataFrame): The OCR predictions to draw.
+        detected_galerie_name (Optional[str]): The detected galerie. If None, only the raw image and
+            the OCR detection are rendered, as in `plot_ocr_results_raw`.
+        basemap (Optional[tiresias.utils.render.Basemap]): The pre-rasterized Labo, see
+            `tiresias.utils.render.load_basemap`. Required with `detected_galerie_name`.
+        geo_index (Optional[tiresias.utils.geo_info.GeoIndex]): The neighbors of the galeries, see
+            `tiresias.utils.geo_info.load_geo_index`. Required with `detected_galerie_name`.
+        neighbors_display (bool): Whether to display the crops of the neighbors.
+
+    Returns:
+        np.ndarray: The BGR panels raw image | OCR detection | location in the Labo.
+    """
+    detection = tiresias.utils.render.draw_polygons(img, ocr_pred_galerie_df['det_polygons'].tolist(),
+                                                    ocr_pred_galerie_df['rec_texts'].tolist())
+    panels = [img, detection]
+    if detected_galerie_name is not None:
+        panels.append(tiresias.utils.render.draw_location(basemap, geo_index, detected_galerie_name,
+                                                          neighbors_display=neighbors_display,
+                                                          target_color=OCR_COLOR, neighbor_color=NEIGHBOR_COLOR))
+    return tiresias.utils.render.hconcat(panels, height=img.shape[0])
@@ -1,5 +1,11 @@
+import collections
+import concurrent.futures
 import pathlib
-from typing import List, Union
+import time
+from typing import Iterator, List, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
 
 def get_path_from_input(input_path: str, allowed_extensions: List[str]) -> List[pathlib.Path]:
     """
@@ -35,3 +41,53 @@ def get_path_from_input(input_path: str, allowed_extensions: List[str]) -> List[
 
     raise ValueError('Input should be a file path or a directory path')
 
+
+def decode_image(img_path: Union[str, pathlib.Path]) -> Tuple[np.ndarray, float]:
+    """
+    Decode an image to a BGR array.
+
+    Args:
+        img_path (Union[str, pathlib.Path]): Path to the image.
+
+    Returns:
+        Tuple[np.ndarray, float]: The decoded BGR image and the decoding time in seconds.
+
+    Raises:
+        IOError: If the image cannot be decoded.
+    """
+    a = time.perf_counter()
+    img = cv2.imread(str(img_path), cv2.IMREAD_COLOR)
+    if img is None:
+        raise IOError(f'Failed to decode {img_path}')
+    return img, time.perf_counter() - a
+
+
+def iter_decoded_batches(img_paths: Sequence[Union[str, pathlib.Path]], batch_size: int = 4, num_workers: int = 2,
+                         prefetch: int = 2) -> Iterator[List[Tuple[str, np.ndarray, float]]]:
+    """
+    Decode images by a pool of threads, `prefetch` batches ahead of the consumer.
+    OpenCV releases the GIL while decoding, so the decoding overlaps the inference.
+
+    Args:
+        img_paths (Sequence[Union[str, pathlib.Path]]): Paths to the images.
+        batch_size (int): Number of images per batch. Default is 4.
+        num_workers (int): Number of decoding threads. Default is 2.
+        prefetch (int): Number of batches decoded in advance. Default is 2.
+
+    Yields:
+        List[Tuple[str, np.ndarray, float]]: The path, the decoded BGR image and the decoding time of
+            each image of a batch, in the input order.
+    """
+    img_paths = [str(img_path) for img_path in img_paths]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        pending = collections.deque()
+        next_index = 0
+        for start in range(0, len(img_paths), batch_size):
+            while next_index < min(len(img_paths), start + batch_size * (prefetch + 1)):
+                pending.append(executor.submit(decode_image, img_paths[next_index]))
+                next_index += 1
+            batch = []
+            for img_path in img_paths[start:start + batch_size]:
+                img, decode_time = pending.popleft().result()
+                batch.append((img_path, img, decode_time))
+            yield batch
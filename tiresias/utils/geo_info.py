@@ -1,7 +1,16 @@
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import pickle
 import geopandas as gpd
+import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from typing import Union, List, Dict
+import numpy as np
+from typing import Optional, Tuple, Union, List, Dict
+import shapely
 import shapely.ops
 from tiresias.data import LABO_GALERIE_SHAPEFILE
 
@@ -10,13 +19,78 @@ FILEPATH = LABO_GALERIE_SHAPEFILE['filepath']
 CRS_INFO = LABO_GALERIE_SHAPEFILE['crs_info']
 COLUMN_ID = LABO_GALERIE_SHAPEFILE['column_id']
 
-def load_shapefile(filepath: str = FILEPATH, column_id: str = COLUMN_ID) -> List[gpd.GeoDataFrame]:
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+
+def load_shapefile(filepath: str = FILEPATH, column_id: str = COLUMN_ID, use_cache: bool = True) -> List[gpd.GeoDataFrame]:
     """
     Load the file from the specified `filepath` and check for uniqueness of the specified identifier.
     If the identifier is not unique, the corresponding geometries will be geometrically merged.
+
+    The parsed and merged GeoDataFrames are cached next to the source file (GeoParquet if pyarrow
+    is installed, pickle otherwise), so that only the first load pays the parsing and merging costs.
+    The cache is invalidated when the modification times and sizes of the files of the shapefile
+    change, unless their content hash is unchanged. It is rebuilt if a cache file is missing or unreadable.
     """
+    if not use_cache:
+        raw_gdf = gpd.read_file(filepath, crs_wkt=CRS_INFO)
+        return raw_gdf, check_id_unique(gdf=raw_gdf, column_id=column_id)
+
+    meta_path = f'{filepath}.cache.json'
+    stats = [os.stat(path) for path in shapefile_parts(filepath)]
+    mtime = [stat.st_mtime for stat in stats]
+    size = [stat.st_size for stat in stats]
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+    if meta is not None and meta['format'] == CACHE_FORMAT and meta['column_id'] == column_id:
+        if meta['mtime'] == mtime and meta['size'] == size:
+            cached = _read_shapefile_cache(filepath)
+            if cached is not None:
+                return cached
+        source_digest = shapefile_digest(filepath)
+        if meta['sha256'] == source_digest:
+            cached = _read_shapefile_cache(filepath)
+            if cached is not None:
+                meta.update(mtime=mtime, size=size)
+                with open(meta_path, 'w') as f:
+                    json.dump(meta, f)
+                return cached
+    else:
+        source_digest = shapefile_digest(filepath)
+
     raw_gdf = gpd.read_file(filepath, crs_wkt=CRS_INFO)
-    return raw_gdf, check_id_unique(gdf=raw_gdf, column_id=column_id)
+    gdf = check_id_unique(gdf=raw_gdf, column_id=column_id)
+    _write_shapefile_cache(filepath, raw_gdf, gdf)
+    with open(meta_path, 'w') as f:
+        json.dump({'format': CACHE_FORMAT, 'column_id': column_id, 'mtime': mtime,
+                   'size': size, 'sha256': source_digest}, f)
+    return raw_gdf, gdf
+
+
+def _read_shapefile_cache(filepath: str) -> Optional[List[gpd.GeoDataFrame]]:
+    """Read the cached GeoDataFrames, or return None if a cache file is missing or unreadable."""
+    try:
+        if CACHE_FORMAT == 'parquet':
+            return gpd.read_parquet(f'{filepath}.raw.parquet'), gpd.read_parquet(f'{filepath}.merged.parquet')
+        with open(f'{filepath}.cache.pkl', 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_shapefile_cache(filepath: str, raw_gdf: gpd.GeoDataFrame, gdf: gpd.GeoDataFrame):
+    if CACHE_FORMAT == 'parquet':
+        raw_gdf.to_parquet(f'{filepath}.raw.parquet')
+        gdf.to_parquet(f'{filepath}.merged.parquet')
+    else:
+        with open(f'{filepath}.cache.pkl', 'wb') as f:
+            pickle.dump([raw_gdf, gdf], f)
 
 
 def check_id_unique(gdf: gpd.GeoDataFrame, column_id: str) -> gpd.GeoDataFrame:
@@ -34,52 +108,188 @@ def check_id_unique(gdf: gpd.GeoDataFrame, column_id: str) -> gpd.GeoDataFrame:
 def merge_geodataframe(gdf: gpd.GeoDataFrame, id_nonunique: Dict[str, List[str]], column_id: str) -> gpd.GeoDataFrame:
     """ 
     Return a new GeoDataFrame with merged geometries and only id and geometry columns.
+    The geometries of non-unique identifiers are merged with a single dissolve.
     """
-    grouped = gdf.groupby(column_id)  
-    new_geometries = []
-    new_identifiants = []
-    for identifier, group in grouped:
-        # TODO check that identifier should be in 3 digits and avoid GAN1 GAN2 etc
-        if len(identifier)>3:
-            continue
-        if identifier in id_nonunique.keys():
-            merged_geometry = group['geometry'].unary_union
-            new_geometries.append(merged_geometry)
-            new_identifiants.append(identifier)
-        else:
-            new_geometries.append(group['geometry'].iloc[0])
-            new_identifiants.append(identifier) 
-    new_gdf = gpd.GeoDataFrame({column_id: new_identifiants, 'geometry': new_geometries}, crs=gdf.crs)
-    return new_gdf
+    # TODO check that identifier should be in 3 digits and avoid GAN1 GAN2 etc
+    # Null identifiers are dropped, as by a groupby
+    is_valid = gdf[column_id].notna() & (gdf[column_id].astype(str).str.len() <= 3)
+    gdf = gdf.loc[is_valid, [column_id, 'geometry']]
+    is_nonunique = gdf[column_id].isin(list(id_nonunique.keys()))
+    merged_gdf = gdf[is_nonunique].dissolve(by=column_id, as_index=False)
+    new_gdf = pd.concat([gdf[~is_nonunique], merged_gdf[[column_id, 'geometry']]])
+    new_gdf = new_gdf.sort_values(column_id, kind='stable').reset_index(drop=True)
+    return gpd.GeoDataFrame(new_gdf, geometry='geometry', crs=gdf.crs)
 
 
 def get_neighbors(gdf, distance_max=0.1, column_id=COLUMN_ID ) -> Dict[str, List[str]]:
     """
     Return neighbors for each item in the GeoDataFrame within a maximum distance.
 
+    Candidate pairs are found with a `shapely.STRtree` query, and only those are checked
+    with an exact distance, instead of comparing every pair of geometries.
+
     Parameters:
         gdf: The GeoDataFrame containing the geometries to find neighbors for.
         distance_max: The maximum distance for considering items as neighbors. Default is 0.1.
         column_id: The name of the column containing the unique identifiers. Default is COLUMN_ID.
 
     """
-    relations_neigbhors = {}
-    geometry_by_id = gdf.set_index(column_id)['geometry'].apply(lambda x: x).to_dict()   
-    for reference_id, reference_geometry in geometry_by_id.items():
-        neighbors = []
-        for others_id, others_geometry in geometry_by_id.items():
-            if reference_id == others_id:
-                continue  # Ne pas comparer avec lui-même
-            distance = reference_geometry.distance(others_geometry)
-            if distance < distance_max:
-                neighbors.append(others_id)
-
-        relations_neigbhors[reference_id] = neighbors
-    
+    ids = gdf[column_id].tolist()
+    geometries = np.asarray(gdf.geometry.values, dtype=object)
+    tree = shapely.STRtree(geometries)
+    # dwithin also keeps the pairs exactly at distance_max, which are removed below
+    references, others = tree.query(geometries, predicate='dwithin', distance=distance_max)
+    keep = references != others
+    references, others = references[keep], others[keep]
+    keep = shapely.distance(geometries[references], geometries[others]) < distance_max
+    relations_neigbhors = {identifier: [] for identifier in ids}
+    for reference, other in sorted(zip(references[keep], others[keep])):
+        relations_neigbhors[ids[reference]].append(ids[other])
     return relations_neigbhors
 
 
-def display_id_simple(gdf: gpd.GeoDataFrame, id_value: Union[str, int],  neighbors_display: bool = True, column_id: str = COLUMN_ID):
+@dataclasses.dataclass
+class GeoIndex:
+    """
+    Precomputed neighborhood of every galerie, built once per version of the shapefile.
+
+    Attributes:
+        neighbors: The neighbors of each identifier, see `get_neighbors`.
+        centroids: The (x, y) centroid of each identifier.
+        neighbor_crops: For each identifier, the geometry of each neighbor cropped around
+            the point of the neighbor nearest to it, within `buffer_size`.
+        distance_max: The maximum distance between neighbors.
+        buffer_size: The radius of the neighbor crops.
+        source_digest: The SHA-256 of the shapefile the index is built from, see `shapefile_digest`.
+    """
+    neighbors: Dict[str, List[str]]
+    centroids: Dict[str, Tuple[float, float]]
+    neighbor_crops: Dict[str, Dict[str, shapely.Geometry]]
+    distance_max: float
+    buffer_size: float
+    source_digest: Optional[str] = None
+
+
+# The GeoIndex last loaded for each shapefile and parameters, see `load_geo_index`
+_GEO_INDEXES: Dict[Tuple[str, float, float, str], GeoIndex] = {}
+
+
+def crop_neighbor(geometry: shapely.Geometry, neighbor_geometry: shapely.Geometry, buffer_size: float) -> shapely.Geometry:
+    """
+    Crop the geometry of a neighbor around its point nearest to the reference geometry.
+    """
+    reference_point = shapely.ops.nearest_points(neighbor_geometry, geometry)[0]
+    return neighbor_geometry.intersection(reference_point.buffer(buffer_size))
+
+
+def build_geo_index(gdf: gpd.GeoDataFrame, distance_max: float = 0.1, buffer_size: float = 10, column_id: str = COLUMN_ID, source_digest: Optional[str] = None) -> GeoIndex:
+    """
+    Build the neighbor adjacency, centroids and neighbor crops of every item of the GeoDataFrame.
+
+    Parameters:
+        gdf: The GeoDataFrame with unique identifiers.
+        distance_max: The maximum distance for considering items as neighbors. Default is 0.1.
+        buffer_size: The radius of the neighbor crops. Default is 10 meters.
+        column_id: The name of the column containing the unique identifiers. Default is COLUMN_ID.
+        source_digest: The `shapefile_digest` of the shapefile `gdf` is loaded from. Default is None.
+    """
+    geometry_by_id = dict(zip(gdf[column_id], gdf.geometry))
+    neighbors = get_neighbors(gdf, distance_max=distance_max, column_id=column_id)
+    centroids = {identifier: (centroid.x, centroid.y) for identifier, centroid in zip(gdf[column_id], gdf.geometry.centroid)}
+    neighbor_crops = {
+        identifier: {
+            neighbor: crop_neighbor(geometry_by_id[identifier], geometry_by_id[neighbor], buffer_size)
+            for neighbor in neighbors_id
+        }
+        for identifier, neighbors_id in neighbors.items()
+    }
+    return GeoIndex(neighbors=neighbors, centroids=centroids, neighbor_crops=neighbor_crops,
+                    distance_max=distance_max, buffer_size=buffer_size, source_digest=source_digest)
+
+
+def file_digest(filepath: str) -> str:
+    """
+    Return the SHA-256 of the content of a file.
+
+    The digest is memoized for the modification time and size of the file, so that a file is only
+    hashed again once it changes.
+    """
+    stat = os.stat(filepath)
+    return _file_digest(os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(filepath: str, mtime_ns: int, size: int) -> str:
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def shapefile_parts(filepath: str) -> List[str]:
+    """
+    Return the files a shapefile is read from: the .shp file and its existing .shx, .dbf, .prj
+    and .cpg companions. The identifiers are stored in the .dbf file. Other formats are a single file.
+    """
+    root, extension = os.path.splitext(filepath)
+    if extension.lower() != '.shp':
+        return [filepath]
+    companions = [f'{root}{suffix}' for suffix in ('.shx', '.dbf', '.prj', '.cpg')]
+    return [filepath] + [path for path in companions if os.path.exists(path)]
+
+
+def shapefile_digest(filepath: str) -> str:
+    """
+    Return the SHA-256 of the files of a shapefile, see `shapefile_parts`.
+    """
+    digests = [file_digest(path) for path in shapefile_parts(filepath)]
+    if len(digests) == 1:
+        return digests[0]
+    return hashlib.sha256(''.join(digests).encode()).hexdigest()
+
+
+def load_geo_index(gdf: gpd.GeoDataFrame, filepath: str = FILEPATH, distance_max: float = 0.1, buffer_size: float = 10, column_id: str = COLUMN_ID) -> GeoIndex:
+    """
+    Load the GeoIndex of the GeoDataFrame loaded from `filepath`.
+
+    The index is persisted next to the shapefile as `<filepath>.geoindex.pkl`, and is only
+    rebuilt when the content of the shapefile, the parameters or the identifiers change.
+    It is also kept in memory, so that later calls only check the modification time and size
+    of the shapefile. If the shapefile does not exist, the index is built without being persisted.
+
+    Parameters:
+        gdf: The GeoDataFrame returned by `load_shapefile(filepath)`.
+        filepath: Path to the shapefile. Default is FILEPATH.
+        distance_max: The maximum distance for considering items as neighbors. Default is 0.1.
+        buffer_size: The radius of the neighbor crops. Default is 10 meters.
+        column_id: The name of the column containing the unique identifiers. Default is COLUMN_ID.
+    """
+    if not os.path.exists(filepath):
+        return build_geo_index(gdf, distance_max=distance_max, buffer_size=buffer_size, column_id=column_id)
+    index_path = f'{filepath}.geoindex.pkl'
+    source_digest = shapefile_digest(filepath)
+
+    def is_valid(geo_index: Optional[GeoIndex]) -> bool:
+        return (geo_index is not None and geo_index.source_digest == source_digest
+                and geo_index.distance_max == distance_max and geo_index.buffer_size == buffer_size
+                and set(geo_index.neighbors) == set(gdf[column_id]))
+
+    key = (os.path.abspath(filepath), distance_max, buffer_size, column_id)
+    geo_index = _GEO_INDEXES.get(key)
+    if not is_valid(geo_index) and os.path.exists(index_path):
+        with open(index_path, 'rb') as f:
+            geo_index = pickle.load(f)
+    if not is_valid(geo_index):
+        geo_index = build_geo_index(gdf, distance_max=distance_max, buffer_size=buffer_size,
+                                    column_id=column_id, source_digest=source_digest)
+        with open(index_path, 'wb') as f:
+            pickle.dump(geo_index, f)
+    _GEO_INDEXES[key] = geo_index
+    return geo_index
+
+
+def display_id_simple(gdf: gpd.GeoDataFrame, id_value: Union[str, int],  neighbors_display: bool = True, column_id: str = COLUMN_ID, geo_index: Optional[GeoIndex] = None):
     """
     Display the selected GeoDataFrame element with the given `id_value`.
     
@@ -88,13 +298,16 @@ def display_id_simple(gdf: gpd.GeoDataFrame, id_value: Union[str, int],  neighbo
         id_value: The identifier (unique value) of the element to display. It can be either a string or an integer.
         neighbors_display: Whether to display neighboring elements. Default is True.
         column_id: The name of the column containing the unique identifiers. Default is COLUMN_ID.
+        geo_index: The GeoIndex of `gdf`. Default is None, in which case it is loaded with `load_geo_index`.
 
     """
     selected_elements = gdf[gdf[column_id] == id_value]
     fig, ax = plt.subplots(figsize=(10, 10))
     gdf.plot(ax=ax, facecolor='blue', edgecolor='black')
     if neighbors_display:
-        neighbors = get_neighbors(gdf)[id_value]
+        if geo_index is None:
+            geo_index = load_geo_index(gdf, column_id=column_id)
+        neighbors = geo_index.neighbors[id_value]
         for neighbor in neighbors:
             gdf[gdf[column_id] == neighbor].plot(color='red', ax=ax)
     selected_elements.plot(color='yellow', ax=ax)
@@ -107,7 +320,7 @@ def display_id_simple(gdf: gpd.GeoDataFrame, id_value: Union[str, int],  neighbo
     plt.title("Localisation OCR")
     plt.show()
 
-def display_id(gdf: gpd.GeoDataFrame, id_value: Union[str, int], neighbors_display: bool = True, buffer_size: float = 10, column_id: str = COLUMN_ID):
+def display_id(gdf: gpd.GeoDataFrame, id_value: Union[str, int], neighbors_display: bool = True, buffer_size: float = 10, column_id: str = COLUMN_ID, geo_index: Optional[GeoIndex] = None):
     """
     Display the selected GeoDataFrame element with the given `id_value`, and optionally its closest neighbors within a range of `buffer_size`.
 
@@ -119,34 +332,37 @@ def display_id(gdf: gpd.GeoDataFrame, id_value: Union[str, int], neighbors_displ
         buffer_size: The buffer size in meters to add around the reference point when cropping neighbor geometries.
                                        Default is 10 meters.
         column_id: The name of the column containing the unique identifiers.
+        geo_index: The GeoIndex of `gdf`. Default is None, in which case it is loaded with `load_geo_index`.
 
     """
     LABO_COLOR = 'blue'
     OCR_COLOR = 'yellow'
     NEIGHBOR_COLOR = 'red'
 
+    if geo_index is None:
+        geo_index = load_geo_index(gdf, column_id=column_id)
     selected_elements = gdf[gdf[column_id] == id_value]
-    selected_geometry = selected_elements.iloc[0]['geometry']
     fig, ax = plt.subplots(figsize=(10, 10))
     # display labo
     gdf.plot(ax=ax, facecolor='blue', edgecolor='black')
     # display neighbors
     if neighbors_display:
-        neighbors = get_neighbors(gdf)[id_value]
-        for neighbor in neighbors:
-            neighbor_element = gdf[gdf[column_id] == neighbor]
-            neighbor_geometry = neighbor_element.iloc[0]['geometry']
-            reference_point = shapely.ops.nearest_points(selected_geometry, neighbor_geometry)[0]
-            cropped_geometry = neighbor_geometry.intersection(reference_point.buffer(buffer_size))
-            gpd.GeoDataFrame({column_id: [neighbor], 'geometry': [cropped_geometry]}).plot(color=NEIGHBOR_COLOR, ax=ax)
+        neighbors = geo_index.neighbors[id_value]
+        if buffer_size == geo_index.buffer_size:
+            cropped_geometries = [geo_index.neighbor_crops[id_value][neighbor] for neighbor in neighbors]
+        else:
+            geometry_by_id = dict(zip(gdf[column_id], gdf.geometry))
+            cropped_geometries = [crop_neighbor(geometry_by_id[id_value], geometry_by_id[neighbor], buffer_size) for neighbor in neighbors]
+        if neighbors:
+            gpd.GeoDataFrame({column_id: neighbors, 'geometry': cropped_geometries}).plot(color=NEIGHBOR_COLOR, ax=ax)
     # display selected galerie
     selected_elements.plot(color='yellow', ax=ax)            
     # add North arrow
     ax.annotate("Nord", xy=(0.1, 0.95), xycoords='axes fraction', xytext=(0.1, 0.85),
                 arrowprops=dict(arrowstyle="fancy", color="black"), fontsize=15, fontweight='bold')
-    x, y = selected_elements.geometry.iloc[0].centroid.xy
+    x, y = geo_index.centroids[id_value]
     
-    plt.annotate(f'{id_value}', xy=(x[0], y[0]), xytext=(x[0]+2.0, y[0]+2.0), fontsize=15, fontweight='bold')
+    plt.annotate(f'{id_value}', xy=(x, y), xytext=(x+2.0, y+2.0), fontsize=15, fontweight='bold')
     plt.xticks([])
     plt.yticks([])
     plt.title("Localisation OCR")
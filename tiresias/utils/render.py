@@ -0,0 +1,265 @@
+import concurrent.futures
+import dataclasses
+import os
+import pickle
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import geopandas as gpd
+import matplotlib.colors
+import numpy as np
+import shapely
+
+import tiresias.utils.geo_info
+from tiresias.data import LABO_GALERIE_SHAPEFILE
+
+
+FILEPATH = LABO_GALERIE_SHAPEFILE['filepath']
+COLUMN_ID = LABO_GALERIE_SHAPEFILE['column_id']
+
+PixelPolygon = Tuple[np.ndarray, List[np.ndarray]]
+
+
+def to_bgr(color: str) -> Tuple[int, int, int]:
+    """
+    Convert a matplotlib color (e.g. 'red' or '#ff0000') to an OpenCV BGR tuple.
+    """
+    r, g, b = matplotlib.colors.to_rgb(color)
+    return int(b * 255), int(g * 255), int(r * 255)
+
+
+@dataclasses.dataclass
+class Basemap:
+    """
+    Raster of the laboratory rendered once per version of the shapefile.
+
+    Attributes:
+        raster: The BGR image of all the galeries.
+        scale: Pixels per unit of the shapefile coordinates.
+        origin: The (min x, max y) coordinates mapped to the top left corner, padding excluded.
+        pad: The padding in pixels around the galeries.
+        polygons: The pixel polygons of each identifier, as (exterior, interiors) tuples.
+        source_digest: The SHA-256 of the shapefile the basemap is rendered from.
+    """
+    raster: np.ndarray
+    scale: float
+    origin: Tuple[float, float]
+    pad: int
+    polygons: Dict[str, List[PixelPolygon]]
+    source_digest: Optional[str] = None
+
+    def to_pixels(self, coords: np.ndarray) -> np.ndarray:
+        """Map an array of (x, y) coordinates of the shapefile to pixel coordinates."""
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        x = (coords[:, 0] - self.origin[0]) * self.scale + self.pad
+        y = (self.origin[1] - coords[:, 1]) * self.scale + self.pad
+        return np.round(np.stack([x, y], axis=1)).astype(np.int32)
+
+    def geometry_to_pixels(self, geometry: shapely.Geometry) -> List[PixelPolygon]:
+        """Map the polygons of a geometry to pixel polygons. Other geometry types are ignored."""
+        pixel_polygons = []
+        for part in shapely.get_parts(geometry):
+            if isinstance(part, shapely.GeometryCollection):
+                pixel_polygons += self.geometry_to_pixels(part)
+            elif isinstance(part, shapely.Polygon) and not part.is_empty:
+                pixel_polygons.append((self.to_pixels(part.exterior.coords),
+                                       [self.to_pixels(interior.coords) for interior in part.interiors]))
+        return pixel_polygons
+
+
+def fill_pixel_polygons(img: np.ndarray, pixel_polygons: Sequence[PixelPolygon], color: Tuple[int, int, int],
+                        background: Optional[np.ndarray] = None, edge_color: Optional[Tuple[int, int, int]] = None):
+    """
+    Fill pixel polygons in place. Their holes are restored from `background` if given, and are
+    left as they are in `img` otherwise.
+    """
+    if not pixel_polygons:
+        return
+    exteriors = [exterior for exterior, _ in pixel_polygons]
+    interiors = [interior for _, polygon_interiors in pixel_polygons for interior in polygon_interiors]
+    if background is None:
+        # fillPoly uses the even-odd rule, so the holes of a polygon filled along with it are not painted
+        for exterior, polygon_interiors in pixel_polygons:
+            cv2.fillPoly(img, [exterior] + polygon_interiors, color)
+    else:
+        cv2.fillPoly(img, exteriors, color)
+        if interiors:
+            mask = np.zeros(img.shape[:2], dtype=np.uint8)
+            cv2.fillPoly(mask, interiors, 1)
+            img[mask > 0] = background[mask > 0]
+    if edge_color is not None:
+        cv2.polylines(img, exteriors + interiors, True, edge_color, 1, cv2.LINE_AA)
+
+
+def render_basemap(gdf: gpd.GeoDataFrame, width: int = 1024, pad: int = 20, color: str = 'blue',
+                   column_id: str = COLUMN_ID, source_digest: Optional[str] = None) -> Basemap:
+    """
+    Rasterize all the galeries of the GeoDataFrame with OpenCV.
+
+    Args:
+        gdf: The GeoDataFrame with unique identifiers.
+        width: The width of the raster in pixels. Default is 1024.
+        pad: The padding in pixels around the galeries. Default is 20.
+        color: The fill color of the galeries. Default is 'blue'.
+        column_id: The name of the column containing the unique identifiers. Default is COLUMN_ID.
+        source_digest: The SHA-256 of the shapefile `gdf` is loaded from. Default is None.
+    """
+    min_x, min_y, max_x, max_y = gdf.total_bounds
+    scale = (width - 2 * pad) / max(max_x - min_x, 1e-9)
+    height = int(np.ceil((max_y - min_y) * scale)) + 2 * pad
+    basemap = Basemap(raster=np.full((height, width, 3), 255, dtype=np.uint8), scale=scale,
+                      origin=(min_x, max_y), pad=pad, polygons={}, source_digest=source_digest)
+    background = basemap.raster.copy()
+    for identifier, geometry in zip(gdf[column_id], gdf.geometry):
+        basemap.polygons[identifier] = basemap.geometry_to_pixels(geometry)
+        fill_pixel_polygons(basemap.raster, basemap.polygons[identifier], to_bgr(color), background=background,
+                            edge_color=(0, 0, 0))
+    return basemap
+
+
+# The Basemap last loaded for each shapefile and parameters, see `load_basemap`
+_BASEMAPS: Dict[Tuple[str, int, str, str], Basemap] = {}
+
+
+def load_basemap(gdf: gpd.GeoDataFrame, filepath: str = FILEPATH, width: int = 1024, color: str = 'blue',
+                 column_id: str = COLUMN_ID) -> Basemap:
+    """
+    Load the Basemap of the GeoDataFrame loaded from `filepath`.
+
+    The basemap is persisted next to the shapefile as `<filepath>.basemap.pkl`, and is only
+    rendered again when the content of the shapefile, the width or the identifiers change.
+    It is also kept in memory, so that later calls only check the modification time and size
+    of the shapefile. If the shapefile does not exist, the basemap is rendered without being persisted.
+    """
+    if not os.path.exists(filepath):
+        return render_basemap(gdf, width=width, color=color, column_id=column_id)
+    basemap_path = f'{filepath}.basemap.pkl'
+    source_digest = tiresias.utils.geo_info.file_digest(filepath)
+
+    def is_valid(basemap: Optional[Basemap]) -> bool:
+        return (basemap is not None and basemap.source_digest == source_digest
+                and basemap.raster.shape[1] == width and set(basemap.polygons) == set(gdf[column_id]))
+
+    key = (os.path.abspath(filepath), width, color, column_id)
+    basemap = _BASEMAPS.get(key)
+    if not is_valid(basemap) and os.path.exists(basemap_path):
+        with open(basemap_path, 'rb') as f:
+            basemap = pickle.load(f)
+    if not is_valid(basemap):
+        basemap = render_basemap(gdf, width=width, color=color, column_id=column_id, source_digest=source_digest)
+        with open(basemap_path, 'wb') as f:
+            pickle.dump(basemap, f)
+    _BASEMAPS[key] = basemap
+    return basemap
+
+
+def put_label(img: np.ndarray, text: str, org: Tuple[int, int], color: Tuple[int, int, int], scale: float = 0.8):
+    """
+    Draw a text with a white outline, so that it stays readable on any background.
+    """
+    org = (int(org[0]), int(org[1]))
+    cv2.putText(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), 4, cv2.LINE_AA)
+    cv2.putText(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, 2, cv2.LINE_AA)
+
+
+def draw_polygons(img: np.ndarray, polygons: Sequence[Sequence[float]], labels: Sequence[str],
+                  fill_color: str = 'green', label_color: str = 'red', alpha: float = 0.4) -> np.ndarray:
+    """
+    Draw text polygons and their labels on a copy of a BGR image.
+
+    Args:
+        img: The decoded BGR image.
+        polygons: Polygons as flat [x1, y1, x2, y2, ...] coordinates, e.g. `det_polygons`.
+        labels: The label of each polygon, e.g. `rec_texts`.
+        fill_color: The fill color of the polygons. Default is 'green'.
+        label_color: The color of the labels. Default is 'red'.
+        alpha: The opacity of the fill. Default is 0.4.
+    """
+    canvas = img.copy()
+    points = [np.round(np.asarray(polygon, dtype=np.float64).reshape(-1, 2)).astype(np.int32)
+              for polygon in polygons]
+    if points:
+        overlay = canvas.copy()
+        cv2.fillPoly(overlay, points, to_bgr(fill_color))
+        cv2.addWeighted(overlay, alpha, canvas, 1 - alpha, 0, dst=canvas)
+        cv2.polylines(canvas, points, True, (0, 0, 0), 2, cv2.LINE_AA)
+    for polygon_points, label in zip(points, labels):
+        x = (polygon_points[:, 0].min() + polygon_points[:, 0].max()) / 2
+        y = polygon_points[:, 1].min() - 10
+        put_label(canvas, str(label), (x, max(y, 20)), to_bgr(label_color))
+    return canvas
+
+
+def draw_location(basemap: Basemap, geo_index: tiresias.utils.geo_info.GeoIndex, identifier: str,
+                  neighbors_display: bool = True, target_color: str = 'yellow',
+                  neighbor_color: str = 'red') -> np.ndarray:
+    """
+    Draw a galerie and optionally the crops of its neighbors on a copy of the basemap.
+    """
+    canvas = basemap.raster.copy()
+    if neighbors_display:
+        for neighbor in geo_index.neighbors[identifier]:
+            crop = geo_index.neighbor_crops[identifier][neighbor]
+            fill_pixel_polygons(canvas, basemap.geometry_to_pixels(crop), to_bgr(neighbor_color),
+                                background=basemap.raster)
+    fill_pixel_polygons(canvas, basemap.polygons[identifier], to_bgr(target_color), background=basemap.raster,
+                        edge_color=(0, 0, 0))
+    x, y = basemap.to_pixels(geo_index.centroids[identifier])[0]
+    put_label(canvas, str(identifier), (x, y - 10), (0, 0, 0))
+    put_label(canvas, 'N ^', (10, 30), (0, 0, 0))
+    return canvas
+
+
+def hconcat(imgs: Sequence[np.ndarray], height: Optional[int] = None) -> np.ndarray:
+    """
+    Concatenate BGR images side by side, resized to the same height.
+    """
+    height = height or max(img.shape[0] for img in imgs)
+    resized = [cv2.resize(img, (max(int(round(img.shape[1] * height / img.shape[0])), 1), height),
+                          interpolation=cv2.INTER_AREA) for img in imgs]
+    return np.concatenate(resized, axis=1)
+
+
+class ImageWriter:
+    """
+    Pool of workers encoding and writing images, so that rendering does not wait for the disk.
+    OpenCV releases the GIL while encoding, so threads are enough.
+
+    Args:
+        num_workers: The number of writing threads. Default is 4.
+        jpeg_quality: The quality of the JPEG outputs. Default is 90.
+
+    Example:
+        >>> with ImageWriter() as writer:
+        ...     writer.submit('out/report.jpg', img)
+    """
+
+    def __init__(self, num_workers: int = 4, jpeg_quality: int = 90):
+        self.jpeg_quality = jpeg_quality
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_workers)
+        self._futures: List[concurrent.futures.Future] = []
+
+    def _write(self, path: str, img: np.ndarray):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality] if path.lower().endswith(('.jpg', '.jpeg')) else []
+        if not cv2.imwrite(path, img, params):
+            raise IOError(f'Failed to write {path}')
+
+    def submit(self, path: str, img: np.ndarray) -> concurrent.futures.Future:
+        """Write a BGR image in the background. The format is deduced from the extension."""
+        future = self._executor.submit(self._write, path, img)
+        self._futures.append(future)
+        return future
+
+    def close(self):
+        """Wait for all the writes, raising the first error if any."""
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            future.result()
+        self._futures = []
+
+    def __enter__(self) -> 'ImageWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
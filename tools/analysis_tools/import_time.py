@@ -0,0 +1,119 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# The modules slow to import, reported when a benchmark imports them
+HEAVY_MODULES = ('torch', 'mmcv', 'mmdet.models', 'mmdet.datasets', 'imgaug',
+                 'skimage', 'matplotlib', 'albumentations', 'scipy')
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+modules = [name for name in {heavy_modules!r} if name in sys.modules]
+print(json.dumps(dict(time=elapsed, modules=modules)))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Measure the time spent importing MMOCR and building '
+        'inferencers, each in a fresh interpreter')
+    parser.add_argument(
+        '--det', help='Config of a text detector to build an inferencer for')
+    parser.add_argument(
+        '--rec', help='Config of a text recognizer to build an inferencer for')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Number of runs of each benchmark, whose median is reported')
+    parser.add_argument('--out', help='Path to dump the report in json')
+    parser.add_argument(
+        '--baseline',
+        help='Report dumped by a previous run, e.g. on the main branch, to '
+        'compare with')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='Exit with an error if a benchmark is slower than in the '
+        'baseline by more than this ratio')
+    args = parser.parse_args()
+    return args
+
+
+def get_benchmarks(args):
+    """The statements to time, by name."""
+    benchmarks = {
+        'import mmocr':
+        'import mmocr',
+        'import mmocr.apis':
+        'import mmocr.apis',
+        'register_all_modules':
+        'from mmocr.utils import register_all_modules\n'
+        'register_all_modules()',
+    }
+    if args.det:
+        benchmarks['TextDetInferencer'] = (
+            'from mmocr.apis import TextDetInferencer\n'
+            f'TextDetInferencer({args.det!r}, device="cpu")')
+    if args.rec:
+        benchmarks['TextRecInferencer'] = (
+            'from mmocr.apis import TextRecInferencer\n'
+            f'TextRecInferencer({args.rec!r}, device="cpu")')
+    return benchmarks
+
+
+def run(statement):
+    """Run a statement in a fresh interpreter and return the time it took
+    and the heavy modules it imported."""
+    script = SCRIPT.format(statement=statement, heavy_modules=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', script],
+                            check=True,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL,
+                            universal_newlines=True).stdout
+    # The inferencers may log to stdout before the result
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+    report = {}
+    for name, statement in get_benchmarks(args).items():
+        results = [run(statement) for _ in range(args.repeat)]
+        report[name] = dict(
+            time=statistics.median(result['time'] for result in results),
+            modules=results[0]['modules'])
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(f'{"benchmark":<24}  {"time_s":>7}  {"baseline_s":>10}  '
+          'heavy modules imported')
+    regressions = []
+    for name, result in report.items():
+        baseline_time = baseline.get(name, {}).get('time')
+        baseline_str = '-' if baseline_time is None else f'{baseline_time:.3f}'
+        print(f'{name:<24}  {result["time"]:>7.3f}  {baseline_str:>10}  '
+              f'{", ".join(result["modules"])}')
+        if baseline_time is not None and \
+                result['time'] > baseline_time * (1 + args.tolerance):
+            regressions.append(name)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=4)
+    if regressions:
+        sys.exit(f'Import time regressed by more than {args.tolerance:.0%} '
+                 f'for: {", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
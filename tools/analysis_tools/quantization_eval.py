@@ -0,0 +1,142 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import json
+import os
+import sys
+import time
+
+import torch
+from mmengine.config import Config, DictAction
+from mmengine.evaluator import Evaluator
+from mmengine.registry import init_default_scope
+from mmengine.runner import Runner, load_checkpoint
+
+from mmocr.registry import EVALUATOR, MODELS
+from mmocr.utils import quantize_dynamic, quantize_static
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Compare the accuracy and CPU latency of a model in fp32 '
+        'and int8 on the test dataset of its config')
+    parser.add_argument('config', help='Config of the model')
+    parser.add_argument('checkpoint', help='Checkpoint file')
+    parser.add_argument(
+        '--mode',
+        choices=['dynamic', 'static'],
+        default='dynamic',
+        help='Dynamic quantization of the Linear/LSTM layers, or static '
+        'quantization of the backbone calibrated on the first test batches')
+    parser.add_argument(
+        '--calib-batches',
+        type=int,
+        default=8,
+        help='Number of test batches used to calibrate the static '
+        'quantization')
+    parser.add_argument(
+        '--max-drop',
+        type=float,
+        help='Exit with an error if any metric drops by more than this value')
+    parser.add_argument('--out', help='Path to dump the report in json')
+    parser.add_argument(
+        '--cfg-options',
+        nargs='+',
+        action=DictAction,
+        help='Override some settings in the used config, the key-value pair '
+        'in xxx=yyy format will be merged into config file. If the value to '
+        'be overwritten is a list, it should be like key="[a,b]" or key=a,b '
+        'It also allows nested list/tuple values, e.g. key="[(a,b),(c,d)]" '
+        'Note that the quotation marks are necessary and that no white space '
+        'is allowed.')
+    args = parser.parse_args()
+    return args
+
+
+@torch.no_grad()
+def evaluate(model, dataloader, evaluator):
+    """Evaluate the model and measure the time spent in the model only."""
+    model_time = 0.
+    for data in dataloader:
+        start = time.perf_counter()
+        outputs = model.test_step(data)
+        model_time += time.perf_counter() - start
+        evaluator.process(data_samples=outputs, data_batch=data)
+    metrics = evaluator.evaluate(len(dataloader.dataset))
+    return metrics, model_time / len(dataloader.dataset)
+
+
+def main():
+    args = parse_args()
+
+    cfg = Config.fromfile(args.config)
+    init_default_scope(cfg.get('default_scope', 'mmocr'))
+    if args.cfg_options is not None:
+        cfg.merge_from_dict(args.cfg_options)
+
+    model = MODELS.build(cfg.model)
+    load_checkpoint(model, args.checkpoint, map_location='cpu')
+    model.eval()
+    dataloader = Runner.build_dataloader(cfg.test_dataloader)
+    if isinstance(cfg.test_evaluator, dict) and 'type' in cfg.test_evaluator:
+        evaluator = EVALUATOR.build(cfg.test_evaluator)
+    else:
+        evaluator = Evaluator(cfg.test_evaluator)
+    evaluator.dataset_meta = dataloader.dataset.metainfo
+
+    fp32_metrics, fp32_time = evaluate(model, dataloader, evaluator)
+
+    if args.mode == 'dynamic':
+        quantize_dynamic(model)
+    else:
+
+        def calibrate():
+            for i, data in enumerate(dataloader):
+                if i == args.calib_batches:
+                    break
+                model.test_step(data)
+
+        quantize_static(model, calibrate)
+    int8_metrics, int8_time = evaluate(model, dataloader, evaluator)
+
+    report = dict(
+        mode=args.mode,
+        num_threads=torch.get_num_threads(),
+        metrics={
+            name: dict(
+                fp32=value,
+                int8=int8_metrics[name],
+                delta=int8_metrics[name] - value)
+            for name, value in fp32_metrics.items()
+            if isinstance(value, (int, float))
+        },
+        latency_ms=dict(
+            fp32=fp32_time * 1e3,
+            int8=int8_time * 1e3,
+            speedup=fp32_time / int8_time))
+
+    width = max([len(name) for name in report['metrics']] + [6])
+    print(f'{"metric":<{width}}  {"fp32":>8}  {"int8":>8}  {"delta":>8}')
+    for name, row in report['metrics'].items():
+        print(f'{name:<{width}}  {row["fp32"]:>8.4f}  {row["int8"]:>8.4f}  '
+              f'{row["delta"]:>+8.4f}')
+    latency = report['latency_ms']
+    print(f'model latency per image: {latency["fp32"]:.2f} ms (fp32), '
+          f'{latency["int8"]:.2f} ms (int8), {latency["speedup"]:.2f}x')
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.max_drop is not None:
+        drops = [
+            name for name, row in report['metrics'].items()
+            if -row['delta'] > args.max_drop
+        ]
+        if drops:
+            print(f'Metrics dropping by more than {args.max_drop}: '
+                  f'{", ".join(drops)}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from argparse import ArgumentParser
+from collections import defaultdict
 
 from mmocr.apis.inferencers import MMOCRInferencer
+from mmocr.utils import InferenceProfiler
 
 
 def parse_args():
@@ -76,6 +78,33 @@ def parse_args():
         '--save_vis',
         action='store_true',
         help='Save the visualization results to out_dir.')
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        help='Profile the inference, print the time spent in each stage and '
+        'save a Chrome trace to the given JSON file.')
+    parser.add_argument(
+        '--precision',
+        type=str,
+        default='fp32',
+        choices=['fp32', 'bf16', 'fp16'],
+        help='Precision of the forward. fp16 is only supported on CUDA.')
+    parser.add_argument(
+        '--channels-last',
+        action='store_true',
+        help='Run the backbone and neck of the detector in the channels-last '
+        'memory format.')
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Compile the models with torch.compile, warmed up on the inputs.')
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Run the inputs in fp32 eager mode, then with the optimizations '
+        'above, and print the speedup of each model instead of saving or '
+        'showing the results.')
 
     call_args = vars(parser.parse_args())
 
@@ -90,10 +119,59 @@ def parse_args():
     return init_args, call_args
 
 
+def benchmark(ocr, init_args, call_args, optimize_args):
+    """Print the time spent in each model before and after the
+    optimizations."""
+    model_names = dict(
+        TextDetInferencer=init_args['det'],
+        TextRecInferencer=init_args['rec'],
+        KIEInferencer=init_args['kie'])
+
+    def run():
+        with InferenceProfiler(synchronize=True) as profiler:
+            ocr(call_args['inputs'],
+                batch_size=call_args['batch_size'],
+                progress_bar=False)
+        times = defaultdict(float)
+        for event in profiler.events:
+            if event['cat'] == 'batch' and event['name'] in model_names:
+                times[event['name']] += event['dur'] / 1e6
+        return times
+
+    # The first run loads the libraries and allocates the buffers
+    run()
+    baseline = run()
+    ocr.optimize(warmup_inputs=call_args['inputs'], **optimize_args)
+    optimized = run()
+
+    print(f'{"model":<50}  {"fp32_ms":>10}  {"optimized_ms":>12}  '
+          f'{"speedup":>7}')
+    for name, time_ms in baseline.items():
+        print(f'{model_names[name]:<50}  {time_ms:>10.1f}  '
+              f'{optimized[name]:>12.1f}  {time_ms / optimized[name]:>6.2f}x')
+
+
 def main():
     init_args, call_args = parse_args()
+    profile = call_args.pop('profile')
+    optimize_args = dict(
+        precision=call_args.pop('precision'),
+        channels_last=call_args.pop('channels_last'),
+        compile=call_args.pop('compile'))
     ocr = MMOCRInferencer(**init_args)
-    ocr(**call_args)
+    if call_args.pop('benchmark'):
+        benchmark(ocr, init_args, call_args, optimize_args)
+        return
+    if optimize_args != dict(
+            precision='fp32', channels_last=False, compile=False):
+        ocr.optimize(**optimize_args)
+    if profile is None:
+        ocr(**call_args)
+        return
+    with InferenceProfiler(synchronize=True) as profiler:
+        ocr(**call_args)
+    print(profiler.table())
+    profiler.export_chrome_trace(profile)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,100 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+
+import numpy as np
+
+from mmocr.apis import (ExportedInferencer, TextDetInferencer,
+                        TextRecInferencer, export_model)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Export the tensor part of a text detector or recognizer '
+        'to TorchScript or ONNX')
+    parser.add_argument('task', choices=['textdet', 'textrec'], help='Task')
+    parser.add_argument(
+        'model', help='Config file or model name defined in metafile')
+    parser.add_argument('out_dir', help='Directory to save the exported model')
+    parser.add_argument('--weights', help='Checkpoint file')
+    parser.add_argument(
+        '--backend',
+        choices=['torchscript', 'onnx'],
+        default='torchscript',
+        help='Export backend')
+    parser.add_argument(
+        '--example-shape',
+        type=int,
+        nargs=2,
+        help='The (h, w) of the blank image to trace the model on')
+    parser.add_argument(
+        '--static',
+        action='store_true',
+        help='Export the ONNX graph with static shapes')
+    parser.add_argument(
+        '--check',
+        nargs='+',
+        help='Images, preferably of various sizes, to compare the exported '
+        'model with the PyTorch model on')
+    parser.add_argument(
+        '--device', default='cpu', help='Device used for the export')
+    args = parser.parse_args()
+    return args
+
+
+def max_diff(result, expected_result):
+    """The maximum absolute difference between the scores and polygons of two
+    detection results, or infinity if their polygons differ in number or
+    shape."""
+    if len(result['polygons']) != len(expected_result['polygons']):
+        return float('inf')
+    diffs = [np.abs(np.subtract(result['scores'], expected_result['scores']))]
+    for polygon, expected_polygon in zip(result['polygons'],
+                                         expected_result['polygons']):
+        if len(polygon) != len(expected_polygon):
+            return float('inf')
+        diffs.append(np.abs(np.subtract(polygon, expected_polygon)))
+    return max(diff.max(initial=0) for diff in diffs)
+
+
+def check(inferencer, exported, imgs):
+    """Compare the predictions of the exported model with those of the
+    PyTorch model, image by image."""
+    expected = inferencer(imgs, progress_bar=False)['predictions']
+    start = time.perf_counter()
+    results = exported(imgs)['predictions']
+    exported_time = time.perf_counter() - start
+    for img, result, expected_result in zip(imgs, results, expected):
+        if 'text' in result:
+            match = result['text'] == expected_result['text']
+            diff = abs(result['scores'] - expected_result['scores'])
+        else:
+            diff = max_diff(result, expected_result)
+            match = diff != float('inf')
+        print(f'{img}: {"match" if match else "MISMATCH"}, max diff {diff:g}')
+    print(f'Exported model: {exported_time / len(imgs) * 1e3:.1f} ms/img')
+
+
+def main():
+    args = parse_args()
+    inferencer_cls = dict(
+        textdet=TextDetInferencer, textrec=TextRecInferencer)[args.task]
+    inferencer = inferencer_cls(args.model, args.weights, args.device)
+    export_model(
+        inferencer,
+        args.out_dir,
+        backend=args.backend,
+        example_shape=args.example_shape,
+        dynamic=not args.static)
+    print(f'Exported to {args.out_dir}')
+
+    if args.check:
+        start = time.perf_counter()
+        exported = ExportedInferencer(args.out_dir, args.device)
+        print(f'Exported model loaded in '
+              f'{(time.perf_counter() - start) * 1e3:.1f} ms')
+        check(inferencer, exported, args.check)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import asyncio
+from argparse import ArgumentParser
+
+from mmocr.apis import InferenceServer, MicroBatcher
+from mmocr.apis.inferencers import MMOCRInferencer
+
+
+def parse_args():
+    parser = ArgumentParser(
+        description='Serve MMOCRInferencer over HTTP with dynamic batching')
+    parser.add_argument(
+        '--det',
+        type=str,
+        default=None,
+        help='Pretrained text detection algorithm. It\'s the path to the '
+        'config file or the model name defined in metafile.')
+    parser.add_argument(
+        '--det-weights',
+        type=str,
+        default=None,
+        help='Path to the custom checkpoint file of the selected det model.')
+    parser.add_argument(
+        '--rec',
+        type=str,
+        default=None,
+        help='Pretrained text recognition algorithm. It\'s the path to the '
+        'config file or the model name defined in metafile.')
+    parser.add_argument(
+        '--rec-weights',
+        type=str,
+        default=None,
+        help='Path to the custom checkpoint file of the selected rec model.')
+    parser.add_argument(
+        '--device',
+        type=str,
+        default=None,
+        help='Device used for inference. '
+        'If not specified, the available device will be automatically used.')
+    parser.add_argument(
+        '--host', type=str, default='127.0.0.1', help='Host to listen on.')
+    parser.add_argument(
+        '--port', type=int, default=8000, help='Port to listen on.')
+    parser.add_argument(
+        '--unix-socket',
+        type=str,
+        default=None,
+        help='Path of a Unix socket to listen on instead of host and port.')
+    parser.add_argument(
+        '--max-batch-size',
+        type=int,
+        default=8,
+        help='Maximum number of images per batch.')
+    parser.add_argument(
+        '--max-wait-ms',
+        type=float,
+        default=10.,
+        help='Maximum time to wait for a batch to fill up, in milliseconds.')
+    parser.add_argument(
+        '--max-queue-size',
+        type=int,
+        default=256,
+        help='Maximum number of queued images before rejecting requests.')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    inferencer = MMOCRInferencer(
+        det=args.det,
+        det_weights=args.det_weights,
+        rec=args.rec,
+        rec_weights=args.rec_weights,
+        device=args.device)
+    batcher = MicroBatcher(
+        inferencer,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue_size=args.max_queue_size)
+    server = InferenceServer(
+        batcher, host=args.host, port=args.port, unix_socket=args.unix_socket)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()